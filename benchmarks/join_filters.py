@@ -0,0 +1,190 @@
+"""Benchmark dynamic join filters on a skewed fact/dimension join.
+
+Builds a throwaway catalog with a large fact table written in many files
+(each covering a narrow key range) and a small dimension table, then runs a
+selective join twice: once registering every table in full, as joins did
+before, and once through ``execute_join``, which pushes the dimension's
+surviving keys into the fact table's Iceberg scan.
+
+Usage:
+    uv run python -m benchmarks.join_filters
+    uv run python -m benchmarks.join_filters --rows 1000000 --files 50 --output joins.md
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import duckdb
+import pyarrow as pa
+
+from lakehouse.catalog import get_catalog, init_catalog
+from lakehouse.joins import _register_all_tables, execute_join
+
+
+DEFAULT_QUERY = (
+    "SELECT d.region, COUNT(*) AS sales, SUM(f.amount) AS total "
+    "FROM dim_stores d JOIN fact_sales f ON d.store_id = f.store_id "
+    "WHERE d.region = 'north' GROUP BY d.region"
+)
+
+
+def build_tables(catalog, rows: int, files: int, stores: int = 1000, hot_stores: int = 5) -> None:
+    """Create ``fact_sales`` (``files`` appends, sorted by store) and ``dim_stores``.
+
+    Only ``hot_stores`` stores are in the 'north' region, so the benchmark
+    query joins a handful of keys against the whole fact table.
+    """
+    from pyiceberg.schema import Schema
+    from pyiceberg.types import DoubleType, LongType, NestedField, StringType
+
+    dim = catalog.create_table("default.dim_stores", schema=Schema(
+        NestedField(1, "store_id", LongType(), required=False),
+        NestedField(2, "region", StringType(), required=False),
+    ))
+    dim.append(pa.table({
+        "store_id": pa.array(range(stores), pa.int64()),
+        "region": ["north" if i < hot_stores else "south" for i in range(stores)],
+    }))
+
+    fact = catalog.create_table("default.fact_sales", schema=Schema(
+        NestedField(1, "sale_id", LongType(), required=False),
+        NestedField(2, "store_id", LongType(), required=False),
+        NestedField(3, "amount", DoubleType(), required=False),
+    ))
+    per_file = max(rows // files, 1)
+    for f in range(files):
+        start = f * per_file
+        ids = range(start, start + per_file)
+        fact.append(pa.table({
+            "sale_id": pa.array(ids, pa.int64()),
+            # Files are clustered by store, as an ingest sorted by key would write them
+            "store_id": pa.array([i * stores // (per_file * files) for i in ids], pa.int64()),
+            "amount": pa.array([float(i % 100) for i in ids], pa.float64()),
+        }))
+
+
+def run_unfiltered(catalog, sql: str) -> dict:
+    """Register every table in full, then run the join (the pre-filter behaviour)."""
+    start = time.perf_counter()
+    conn = duckdb.connect(":memory:")
+    try:
+        _register_all_tables(catalog, conn)
+        rows_scanned = sum(
+            conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in ("dim_stores", "fact_sales")
+        )
+        result = conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+    return {"ms": (time.perf_counter() - start) * 1000, "rows_scanned": rows_scanned, "result": result}
+
+
+def run_filtered(catalog, sql: str) -> dict:
+    """Run the join through execute_join with dynamic filters."""
+    start = time.perf_counter()
+    out = execute_join(catalog, sql)
+    elapsed = (time.perf_counter() - start) * 1000
+    fact_rows = next(
+        (f["rows_after"] for f in out["join_filters"] if f["table"] == "default.fact_sales"), None
+    )
+    return {
+        "ms": elapsed,
+        "rows_scanned": fact_rows,
+        "filters": out["join_filters"],
+        "result": [tuple(r) for r in out["dataframe"].itertuples(index=False)],
+    }
+
+
+def run_join_benchmarks(rows: int = 200_000, files: int = 20, repeats: int = 3, sql: str = DEFAULT_QUERY) -> dict:
+    """Build the tables in a temporary catalog and time both strategies."""
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = get_catalog(
+            warehouse_path=Path(tmp) / "warehouse",
+            catalog_db=Path(tmp) / "catalog.db",
+            name=f"bench_{uuid.uuid4().hex[:8]}",
+        )
+        init_catalog(catalog)
+        build_tables(catalog, rows, files)
+
+        unfiltered = [run_unfiltered(catalog, sql) for _ in range(repeats)]
+        filtered = [run_filtered(catalog, sql) for _ in range(repeats)]
+
+    full_ms = statistics.median(r["ms"] for r in unfiltered)
+    filtered_ms = statistics.median(r["ms"] for r in filtered)
+    return {
+        "rows": rows,
+        "files": files,
+        "sql": sql,
+        "unfiltered_ms": round(full_ms, 1),
+        "filtered_ms": round(filtered_ms, 1),
+        "speedup": round(full_ms / filtered_ms, 2) if filtered_ms else None,
+        "unfiltered_rows_scanned": unfiltered[0]["rows_scanned"],
+        "filtered_fact_rows": filtered[0]["rows_scanned"],
+        "filters": filtered[0]["filters"],
+        "same_result": unfiltered[0]["result"] == filtered[0]["result"],
+    }
+
+
+def generate_report(results: dict) -> str:
+    """Render join filter results as markdown."""
+    lines = [
+        "# Join Filter Benchmarks",
+        "",
+        f"- **Date**: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}",
+        f"- **Python**: {sys.version.split()[0]}",
+        f"- **Platform**: {platform.platform()}",
+        f"- **Fact table**: {results['rows']:,} rows in {results['files']} files",
+        f"- **Query**: `{results['sql']}`",
+        "",
+        "| strategy | median | rows read |",
+        "| --- | --- | --- |",
+        f"| register all tables | {results['unfiltered_ms']}ms | {results['unfiltered_rows_scanned']:,} |",
+        f"| dynamic join filters | {results['filtered_ms']}ms | {results['filtered_fact_rows']:,} (fact) |",
+        "",
+        f"- **Speedup**: {results['speedup']}x",
+        f"- **Results match**: {'yes' if results['same_result'] else 'NO'}",
+    ]
+    for f in results["filters"]:
+        lines.append(f"- `{f['table']}.{f['column']}` filtered by {f['from']}: {f['kind']} of {f['keys']} keys")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dynamic join filters on a skewed join")
+    parser.add_argument("--rows", type=int, default=200_000, help="Fact table rows (default: 200000)")
+    parser.add_argument("--files", type=int, default=20, help="Fact table data files (default: 20)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per strategy (default: 3)")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Output markdown file (default: print to stdout)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    results = run_join_benchmarks(rows=args.rows, files=args.files, repeats=args.repeats)
+    if args.json:
+        print(json.dumps(results, indent=2, default=str))
+        return
+
+    report = generate_report(results)
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(report)
+        print(f"Report written to {output_path}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Cold-start benchmarks for the lakehouse CLI and MCP server.
+
+Measures module import cost (via ``python -X importtime``), CLI time-to-exit
+for a few commands, and MCP server time-to-first-response (initialize and
+tools/list over stdio). Every measurement runs in a fresh interpreter.
+
+Usage:
+    uv run python -m benchmarks.startup
+    uv run python -m benchmarks.startup --repeats 5 --output startup.md
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+DEFAULT_MODULES = ["lakehouse.cli", "lakehouse.server", "lakehouse.query", "lakehouse.catalog"]
+DEFAULT_CLI_COMMANDS = [["--help"], ["tables"]]
+# Heavy dependencies that cold-start paths should not pull in eagerly
+HEAVY_MODULES = ["pandas", "pyiceberg", "duckdb", "pyarrow", "vortex", "sqlalchemy"]
+
+
+# ---------------------------------------------------------------------------
+# Import time
+# ---------------------------------------------------------------------------
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse ``-X importtime`` output into rows of module, self_us, cumulative_us and depth."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            parts = line[len("import time:"):].split("|")
+            self_us, cumulative_us, name = int(parts[0]), int(parts[1]), parts[2]
+        except (ValueError, IndexError):
+            continue
+        stripped = name.lstrip(" ")
+        rows.append({
+            "module": stripped,
+            "self_us": self_us,
+            "cumulative_us": cumulative_us,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return rows
+
+
+def measure_import(module: str, top: int = 10) -> dict:
+    """Import ``module`` in a fresh interpreter and report where the time went.
+
+    Returns:
+        Dict with module, wall_ms, import_ms (cumulative import time of the
+        module), heavy_modules (which of HEAVY_MODULES got imported) and the
+        ``top`` slowest modules by self time.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    rows = parse_importtime(proc.stderr)
+    target = next((r for r in rows if r["module"] == module), None)
+    loaded = {r["module"] for r in rows}
+    return {
+        "module": module,
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else None,
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(target["cumulative_us"] / 1000, 1) if target else None,
+        "heavy_modules": [m for m in HEAVY_MODULES if m in loaded],
+        "top": [
+            {"module": r["module"], "self_ms": round(r["self_us"] / 1000, 1)}
+            for r in sorted(rows, key=lambda r: -r["self_us"])[:top]
+        ],
+    }
+
+
+# ---------------------------------------------------------------------------
+# CLI and MCP time-to-first-response
+# ---------------------------------------------------------------------------
+
+def measure_cli(args: list[str], repeats: int = 3) -> dict:
+    """Median wall time of ``lakehouse <args>`` in fresh interpreters."""
+    timings = []
+    returncode = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", "from lakehouse.cli import main; main()", *args],
+            capture_output=True,
+            text=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        returncode = proc.returncode
+    return {
+        "command": " ".join(["lakehouse", *args]),
+        "ok": returncode == 0,
+        "median_ms": round(statistics.median(timings), 1),
+        "min_ms": round(min(timings), 1),
+    }
+
+
+def _rpc(proc: subprocess.Popen, message: dict) -> None:
+    proc.stdin.write(json.dumps(message) + "\n")
+    proc.stdin.flush()
+
+
+def _read_response(proc: subprocess.Popen, request_id: int) -> dict:
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            return message
+
+
+def measure_mcp(timeout: float = 60.0) -> dict:
+    """Spawn the MCP server over stdio and time initialize and tools/list.
+
+    Returns:
+        Dict with initialize_ms (spawn to initialize response), list_tools_ms
+        (spawn to tools/list response) and tool_count, or ok=False with error.
+    """
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-c", "from lakehouse.server import main; main()"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        _rpc(proc, {
+            "jsonrpc": "2.0", "id": 1, "method": "initialize",
+            "params": {
+                "protocolVersion": "2024-11-05",
+                "capabilities": {},
+                "clientInfo": {"name": "startup-benchmark", "version": "0"},
+            },
+        })
+        _read_response(proc, 1)
+        initialize_ms = (time.perf_counter() - start) * 1000
+        _rpc(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        _rpc(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/list"})
+        tools = _read_response(proc, 2)
+        list_tools_ms = (time.perf_counter() - start) * 1000
+        return {
+            "ok": True,
+            "initialize_ms": round(initialize_ms, 1),
+            "list_tools_ms": round(list_tools_ms, 1),
+            "tool_count": len(tools.get("result", {}).get("tools", [])),
+        }
+    except Exception as e:
+        proc.kill()
+        stderr = proc.communicate(timeout=timeout)[1] if proc.stderr else ""
+        last = stderr.strip().splitlines()[-1] if stderr.strip() else ""
+        return {"ok": False, "error": f"{e}: {last}" if last else str(e)}
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait(timeout=timeout)
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def run_startup_benchmarks(
+    modules: list[str] | None = None,
+    cli_commands: list[list[str]] | None = None,
+    repeats: int = 3,
+    include_mcp: bool = True,
+) -> dict:
+    """Run all startup measurements and return them as a dict."""
+    modules = modules or DEFAULT_MODULES
+    cli_commands = cli_commands or DEFAULT_CLI_COMMANDS
+    return {
+        "imports": [measure_import(m) for m in modules],
+        "cli": [measure_cli(args, repeats=repeats) for args in cli_commands],
+        "mcp": measure_mcp() if include_mcp else None,
+    }
+
+
+def generate_report(results: dict) -> str:
+    """Render startup results as markdown."""
+    lines = [
+        "# Startup Benchmarks",
+        "",
+        f"- **Date**: {datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M UTC')}",
+        f"- **Python**: {sys.version.split()[0]}",
+        f"- **Platform**: {platform.platform()}",
+        "",
+        "## Imports",
+        "",
+        "| module | import | wall | heavy deps loaded | slowest (self) |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for r in results["imports"]:
+        if not r["ok"]:
+            lines.append(f"| {r['module']} | failed | {r['wall_ms']}ms | | {r['error']} |")
+            continue
+        slowest = ", ".join(f"{t['module']} {t['self_ms']}ms" for t in r["top"][:3])
+        heavy = ", ".join(r["heavy_modules"]) or "none"
+        lines.append(f"| {r['module']} | {r['import_ms']}ms | {r['wall_ms']}ms | {heavy} | {slowest} |")
+
+    lines += ["", "## CLI", "", "| command | median | min | ok |", "| --- | --- | --- | --- |"]
+    for r in results["cli"]:
+        lines.append(f"| `{r['command']}` | {r['median_ms']}ms | {r['min_ms']}ms | {'yes' if r['ok'] else 'no'} |")
+
+    mcp = results.get("mcp")
+    if mcp is not None:
+        lines += ["", "## MCP server", ""]
+        if mcp["ok"]:
+            lines.append(f"- **initialize**: {mcp['initialize_ms']}ms after spawn")
+            lines.append(f"- **tools/list**: {mcp['list_tools_ms']}ms after spawn ({mcp['tool_count']} tools)")
+        else:
+            lines.append(f"- failed: {mcp['error']}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure CLI and MCP server cold start")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per CLI command (default: 3)")
+    parser.add_argument("--no-mcp", action="store_true", help="Skip the MCP server measurement")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Output markdown file (default: print to stdout)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    results = run_startup_benchmarks(repeats=args.repeats, include_mcp=not args.no_mcp)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    report = generate_report(results)
+    if args.output:
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.write_text(report)
+        print(f"Report written to {output_path}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Deferred imports for names used on cold-start paths (CLI and MCP server spawn)."""
+
+import importlib
+
+
+class _Deferred:
+    """Stand-in for ``module.name`` that imports the module on first use."""
+
+    __slots__ = ("_module", "_name", "_target")
+
+    def __init__(self, module: str, name: str):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            self._target = getattr(importlib.import_module(self._module), self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._resolve(), attr)
+
+    def __repr__(self) -> str:
+        return f"<deferred {self._module}.{self._name}>"
+
+
+def deferred(module: str, *names: str):
+    """Return stand-ins for ``names`` from ``module`` that import it on first use.
+
+    Only use for names that are called (functions, classes being
+    instantiated) or accessed by attribute; ``isinstance`` checks and
+    ``except`` clauses need the real object.
+
+    Returns:
+        A single stand-in for one name, otherwise a tuple in ``names`` order
+    """
+    proxies = tuple(_Deferred(module, name) for name in names)
+    return proxies[0] if len(proxies) == 1 else proxies
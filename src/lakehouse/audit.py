@@ -5,11 +5,14 @@ import json
 from pathlib import Path
 from typing import Optional
 
+from .tracing import traced
+
 
 DEFAULT_AUDIT_PATH = Path.home() / ".lakehouse" / "audit.log"
 MAX_AUDIT_ENTRIES = 10000
 
 
+@traced("audit.log_operation")
 def log_operation(
     table_name: str,
     operation: str,
@@ -43,6 +46,10 @@ def log_operation(
     with open(path, "a") as f:
         f.write(json.dumps(entry) + "\n")
 
+    from .metrics import inc
+    inc("lakehouse_commits", operation=operation)
+    inc("lakehouse_rows_written", rows_affected or 0, operation=operation)
+
     # Enforce cap
     _enforce_cap(path)
 
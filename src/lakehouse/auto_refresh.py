@@ -1,14 +1,45 @@
-"""Dependency auto-refresh — cascade refreshes through the lineage graph."""
-
+"""Dependency auto-refresh — cascade refreshes through the lineage graph.
+
+Commits to a table with auto-refresh enabled (row writes and pipeline
+target commits, via ``notify_commit``) request a refresh with
+``request_refresh``; requests for a table are coalesced over its debounce
+window, and every table due at once is refreshed in one cascade. A cascade
+runs each lineage level with a worker pool, runs each (table, action) once
+however many triggered tables reach it, and skips downstream refreshes whose
+inputs' snapshots have not changed since their last refresh. Requests still
+pending when the process exits are run before it does.
+"""
+
+import atexit
+import concurrent.futures
+import contextvars
 import datetime
 import json
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 
+from .tracing import span, traced
+
 DEFAULT_REFRESH_PATH = Path.home() / ".lakehouse" / "auto_refresh.json"
 MAX_HISTORY = 100
-
-
+DEFAULT_DEBOUNCE_SECONDS = 1.0
+# A table that keeps receiving commits is still refreshed after this many debounce windows
+MAX_DEBOUNCE_WINDOWS = 10
+DEFAULT_REFRESH_WORKERS = 4
+# Requests falling due this close together share one cascade
+BATCH_SLACK_SECONDS = 0.1
+
+# Table -> pending request, and the thread that runs requests once they are due
+_pending: dict[str, dict] = {}
+_pending_lock = threading.Condition()
+_scheduler: Optional[threading.Thread] = None
+# Set while a cascade action runs, so the action's own commits don't request another cascade
+_in_cascade: contextvars.ContextVar[bool] = contextvars.ContextVar("lakehouse_in_cascade", default=False)
+
+
+@traced("store.auto_refresh.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_REFRESH_PATH
     if not path.exists():
@@ -19,6 +50,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {"configs": {}, "history": []}
 
 
+@traced("store.auto_refresh.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_REFRESH_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -46,6 +78,7 @@ def set_auto_refresh(
         "refresh_matviews": True,
         "rerun_pipelines": True,
         "invalidate_caches": True,
+        "debounce_seconds": DEFAULT_DEBOUNCE_SECONDS,
     }
     if config:
         defaults.update(config)
@@ -56,6 +89,7 @@ def set_auto_refresh(
         "refresh_matviews": defaults["refresh_matviews"],
         "rerun_pipelines": defaults["rerun_pipelines"],
         "invalidate_caches": defaults["invalidate_caches"],
+        "debounce_seconds": defaults["debounce_seconds"],
         "updated_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
     }
     _save_store(store, store_path)
@@ -194,40 +228,351 @@ def trigger_refresh(
     table_name: str,
     store_path: Optional[Path] = None,
     lineage_store_path: Optional[Path] = None,
+    max_workers: int = DEFAULT_REFRESH_WORKERS,
 ) -> dict:
-    """Trigger a cascade refresh from a source table."""
-    table_name = _normalize(table_name)
-    plan = get_refresh_plan(catalog, table_name, store_path=store_path, lineage_store_path=lineage_store_path)
+    """Trigger a cascade refresh from a source table now (see run_refresh)."""
+    return run_refresh(
+        catalog, [table_name], store_path=store_path,
+        lineage_store_path=lineage_store_path, max_workers=max_workers,
+    )
+
+
+def _levels(tables: set[str], graph: dict) -> dict[str, int]:
+    """Longest-path level of each table among ``tables`` (1 = fed only by tables outside the set)."""
+    inputs: dict[str, set[str]] = {t: set() for t in tables}
+    for edge in graph["edges"]:
+        if edge["target"] in inputs:
+            inputs[edge["target"]].update(s for s in edge["sources"] if s in tables)
+
+    levels: dict[str, int] = {}
+
+    def level(table: str, visiting: set) -> int:
+        if table in levels:
+            return levels[table]
+        if table in visiting:
+            return 0  # Cycle: break it here
+        visiting.add(table)
+        result = 1 + max((level(src, visiting) for src in inputs[table]), default=0)
+        visiting.discard(table)
+        levels[table] = result
+        return result
+
+    for table in sorted(tables):
+        level(table, set())
+    return levels
+
+
+def _input_snapshots(catalog, inputs: list[str]) -> Optional[dict]:
+    """Current snapshot id of each input table, or None if any cannot be read."""
+    snapshots = {}
+    for table_name in inputs:
+        try:
+            snapshot = catalog.load_table(table_name).current_snapshot()
+        except Exception:
+            return None
+        snapshots[table_name] = snapshot.snapshot_id if snapshot is not None else None
+    return snapshots
+
+
+def run_refresh(
+    catalog,
+    table_names: list[str],
+    store_path: Optional[Path] = None,
+    lineage_store_path: Optional[Path] = None,
+    max_workers: int = DEFAULT_REFRESH_WORKERS,
+    triggers: int = 0,
+) -> dict:
+    """Run one cascade refresh for changes to several source tables.
+
+    The refresh plans of all sources are merged so each (table, action)
+    runs once. Actions are grouped into levels by longest lineage path, so
+    a table is refreshed only after everything feeding it; the tables of a
+    level are refreshed in parallel, each table's actions in turn. A matview refresh or pipeline rerun is skipped
+    when the snapshots of the tables feeding it are those it last ran on.
+
+    Args:
+        catalog: Iceberg catalog
+        table_names: Changed source tables
+        store_path: Optional path to the auto-refresh store
+        lineage_store_path: Optional path to the lineage store
+        max_workers: Actions run at once within a level
+        triggers: Refresh requests coalesced into this run (for history)
+
+    Returns:
+        Dict with actions_executed, successes, errors, skipped, levels,
+        results (each with its level and duration_ms) and message.
+    """
+    from .lineage import get_lineage_graph
+
+    sources = sorted({_normalize(t) for t in table_names})
+    started = time.perf_counter()
+
+    # Merge the plans: the same (table, action) reached from several sources runs once
+    actions: dict[tuple, dict] = {}
+    for source in sources:
+        plan = get_refresh_plan(catalog, source, store_path=store_path, lineage_store_path=lineage_store_path)
+        for action in plan["actions"]:
+            actions.setdefault((action["table"], action["action"]), action)
+
+    graph = get_lineage_graph(store_path=lineage_store_path)
+    downstream = {action["table"] for action in actions.values() if action["depth"] > 0}
+    levels = _levels(downstream, graph)
+    inputs: dict[str, list[str]] = {}
+    for edge in graph["edges"]:
+        if edge["target"] in downstream:
+            inputs.setdefault(edge["target"], [])
+            inputs[edge["target"]].extend(s for s in edge["sources"] if s not in inputs[edge["target"]])
+
+    by_level: dict[int, list[dict]] = {}
+    for (table, _), action in actions.items():
+        by_level.setdefault(levels.get(table, 0), []).append(action)
 
+    store = _load_store(store_path)
+    last_inputs = store.get("input_snapshots", {})
     results = []
-    for action in plan["actions"]:
-        result = _execute_action(catalog, action)
-        results.append(result)
+    for level in sorted(by_level):
+        batch, seen = [], {}
+        for action in sorted(by_level[level], key=lambda a: (a["table"], a["action"])):
+            key = f"{action['action']}:{action['table']}"
+            current = None
+            if action["action"] != "invalidate_cache":
+                current = _input_snapshots(catalog, inputs.get(action["table"], []))
+                if current and current == last_inputs.get(key):
+                    results.append({
+                        "table": action["table"], "action": action["action"], "status": "skipped",
+                        "reason": "inputs unchanged", "level": level, "duration_ms": 0,
+                    })
+                    continue
+            seen[key] = current
+            batch.append(action)
+
+        # Actions on the same table write the same target, so each table's run one after another
+        by_table: dict[str, list[dict]] = {}
+        for action in batch:
+            by_table.setdefault(action["table"], []).append(action)
+        with span("auto_refresh.level", level=level, actions=len(batch)):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+                per_table = pool.map(lambda acts: [_timed_action(catalog, a) for a in acts], by_table.values())
+                level_results = [result for results in per_table for result in results]
+        for action, result in zip(batch, level_results):
+            result["level"] = level
+            key = f"{action['action']}:{action['table']}"
+            if result["status"] == "success" and seen.get(key):
+                last_inputs[key] = seen[key]
+            results.append(result)
 
     # Record in history
     store = _load_store(store_path)
+    store["input_snapshots"] = {**store.get("input_snapshots", {}), **last_inputs}
+    successes = sum(1 for r in results if r.get("status") == "success")
+    errors = sum(1 for r in results if r.get("status") == "error")
+    skipped = sum(1 for r in results if r.get("reason") == "inputs unchanged")
+    executed = len(results) - skipped
     history_entry = {
-        "table": table_name,
+        "table": sources[0] if len(sources) == 1 else ", ".join(sources),
+        "tables": sources,
         "triggered_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-        "actions_executed": len(results),
-        "successes": sum(1 for r in results if r.get("status") == "success"),
-        "errors": sum(1 for r in results if r.get("status") == "error"),
+        "triggers": max(triggers, len(sources)),
+        "actions_executed": executed,
+        "successes": successes,
+        "errors": errors,
+        "skipped_unchanged": skipped,
+        "duration_ms": int((time.perf_counter() - started) * 1000),
         "results": results,
     }
     store.setdefault("history", []).append(history_entry)
     store["history"] = store["history"][-MAX_HISTORY:]
     _save_store(store, store_path)
 
+    coalesced = f" from {history_entry['triggers']} triggers" if history_entry["triggers"] > len(sources) else ""
     return {
-        "table": table_name,
-        "actions_executed": len(results),
-        "successes": history_entry["successes"],
-        "errors": history_entry["errors"],
+        "table": history_entry["table"],
+        "tables": sources,
+        "actions_executed": executed,
+        "successes": successes,
+        "errors": errors,
+        "skipped": skipped,
+        "levels": len(by_level),
+        "duration_ms": history_entry["duration_ms"],
         "results": results,
-        "message": f"Refresh cascade for '{table_name}': {len(results)} actions ({history_entry['successes']} success, {history_entry['errors']} errors)",
+        "message": (
+            f"Refresh cascade for '{history_entry['table']}'{coalesced}: {executed} actions in "
+            f"{len(by_level)} levels ({successes} success, {errors} errors, {skipped} skipped unchanged)"
+        ),
+    }
+
+
+def _timed_action(catalog, action: dict) -> dict:
+    start = time.perf_counter()
+    token = _in_cascade.set(True)
+    try:
+        result = _execute_action(catalog, action)
+    finally:
+        _in_cascade.reset(token)
+    result["duration_ms"] = int((time.perf_counter() - start) * 1000)
+    return result
+
+
+def request_refresh(
+    catalog,
+    table_name: str,
+    debounce_seconds: Optional[float] = None,
+    store_path: Optional[Path] = None,
+    lineage_store_path: Optional[Path] = None,
+    max_workers: int = DEFAULT_REFRESH_WORKERS,
+) -> dict:
+    """Ask for a cascade refresh after a commit to a table, coalescing bursts.
+
+    The refresh runs once no further request for the table arrived within
+    its debounce window (``debounce_seconds`` in its auto-refresh config
+    unless given), or after ``MAX_DEBOUNCE_WINDOWS`` windows at the latest.
+    Tables due together share one cascade (see run_refresh), run on a
+    background thread; ``flush_refreshes`` runs pending requests now.
+
+    Returns:
+        Dict with table, triggers (requests coalesced so far), due_in_ms and message
+    """
+    global _scheduler
+
+    table_name = _normalize(table_name)
+    if debounce_seconds is None:
+        config = _load_store(store_path).get("configs", {}).get(table_name, {})
+        debounce_seconds = config.get("debounce_seconds", DEFAULT_DEBOUNCE_SECONDS)
+
+    now = time.monotonic()
+    with _pending_lock:
+        entry = _pending.get(table_name)
+        if entry is None:
+            entry = _pending[table_name] = {
+                "catalog": catalog,
+                "store_path": store_path,
+                "lineage_store_path": lineage_store_path,
+                "max_workers": max_workers,
+                "first": now,
+                "triggers": 0,
+            }
+        entry["triggers"] += 1
+        entry["due"] = min(now + debounce_seconds, entry["first"] + debounce_seconds * MAX_DEBOUNCE_WINDOWS)
+        if _scheduler is None or not _scheduler.is_alive():
+            _scheduler = threading.Thread(target=_schedule_loop, name="lakehouse-auto-refresh", daemon=True)
+            _scheduler.start()
+        _pending_lock.notify_all()
+        triggers, due_in = entry["triggers"], entry["due"] - now
+
+    return {
+        "table": table_name,
+        "triggers": triggers,
+        "due_in_ms": int(due_in * 1000),
+        "message": f"Refresh of '{table_name}' scheduled in {due_in:.1f}s ({triggers} request(s) coalesced)",
     }
 
 
+def notify_commit(catalog, table_name: str, store_path: Optional[Path] = None) -> Optional[dict]:
+    """Request a debounced refresh after a commit, if the table has auto-refresh enabled.
+
+    Called by the write paths after they commit to a table's main branch.
+    Commits made by a cascade's own actions are not requested again, since
+    the cascade already covers the tables downstream of them. Best-effort:
+    a commit never fails because its refresh could not be requested.
+
+    Returns:
+        request_refresh's result, or None if no refresh was requested
+    """
+    if _in_cascade.get():
+        return None
+    try:
+        if not get_auto_refresh(table_name, store_path=store_path)["enabled"]:
+            return None
+        return request_refresh(catalog, table_name, store_path=store_path)
+    except Exception:
+        return None
+
+
+def _take_pending(due_before: Optional[float] = None) -> list[dict]:
+    """Remove and return pending requests due by ``due_before`` (all if None). Caller holds the lock."""
+    taken = []
+    for table_name in list(_pending):
+        if due_before is None or _pending[table_name]["due"] <= due_before:
+            taken.append({"table": table_name, **_pending.pop(table_name)})
+    return taken
+
+
+def _run_pending(entries: list[dict]) -> list[dict]:
+    """One cascade per catalog and store for the given requests."""
+    groups: dict[tuple, list[dict]] = {}
+    for entry in entries:
+        key = (id(entry["catalog"]), entry["store_path"], entry["lineage_store_path"])
+        groups.setdefault(key, []).append(entry)
+    results = []
+    for group in groups.values():
+        first = group[0]
+        try:
+            results.append(run_refresh(
+                first["catalog"], [e["table"] for e in group],
+                store_path=first["store_path"],
+                lineage_store_path=first["lineage_store_path"],
+                max_workers=max(e["max_workers"] for e in group),
+                triggers=sum(e["triggers"] for e in group),
+            ))
+        except Exception as e:
+            results.append({"tables": [entry["table"] for entry in group], "message": f"Refresh failed: {e}"})
+    return results
+
+
+def _schedule_loop() -> None:
+    global _scheduler
+
+    while True:
+        with _pending_lock:
+            if not _pending:
+                _scheduler = None
+                return
+            now = time.monotonic()
+            next_due = min(entry["due"] for entry in _pending.values())
+            if next_due > now:
+                _pending_lock.wait(next_due - now)
+                continue
+            entries = _take_pending(now + BATCH_SLACK_SECONDS)
+        _run_pending(entries)
+
+
+def pending_refreshes() -> list[dict]:
+    """Requests waiting for their debounce window to pass."""
+    now = time.monotonic()
+    with _pending_lock:
+        return [
+            {"table": table_name, "triggers": entry["triggers"], "due_in_ms": max(0, int((entry["due"] - now) * 1000))}
+            for table_name, entry in sorted(_pending.items())
+        ]
+
+
+def flush_refreshes() -> list[dict]:
+    """Run every pending refresh request now, without waiting for its window.
+
+    Returns:
+        One run_refresh result per cascade run
+    """
+    with _pending_lock:
+        entries = _take_pending()
+    return _run_pending(entries) if entries else []
+
+
+def _flush_on_exit() -> None:
+    """Run pending requests before the process exits (the scheduler thread is a daemon)."""
+    try:
+        flush_refreshes()
+        with _pending_lock:
+            scheduler = _scheduler
+            _pending_lock.notify_all()
+        if scheduler is not None and scheduler is not threading.current_thread():
+            scheduler.join()  # Let a cascade already running finish
+    except Exception:
+        pass
+
+
+atexit.register(_flush_on_exit)
+
+
 def _execute_action(catalog, action: dict) -> dict:
     """Execute a single refresh action. Best-effort."""
     table = action["table"]
@@ -281,6 +626,6 @@ def get_refresh_history(
 
     if table_name:
         table_name = _normalize(table_name)
-        history = [h for h in history if h["table"] == table_name]
+        history = [h for h in history if table_name in h.get("tables", [h["table"]])]
 
     return list(reversed(history[-limit:]))
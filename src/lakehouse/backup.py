@@ -1,16 +1,42 @@
-"""Backup and restore — archive tables and namespaces to portable bundles."""
+"""Backup and restore — archive tables and namespaces to portable bundles.
+
+Two formats live side by side in a backup directory:
+
+- ``*.tar.gz`` archives hold one re-encoded Parquet file per table.
+- Incremental backups copy the table's own Iceberg files (metadata, manifest
+  lists, manifests and data files) unchanged into a content-addressed object
+  store under ``objects/``. Each backup writes a ``*.backup.json`` manifest
+  naming the objects it needs. Iceberg never rewrites a file in place, so a
+  path already copied by an earlier backup is skipped without reading it,
+  and identical bytes are stored once. Every snapshot the table still had
+  at backup time can be restored.
+"""
 
 import datetime
 import hashlib
+import io
 import json
+import os
 import tarfile
 import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+import pyarrow as pa
 import pyarrow.parquet as pq
 
+from .tracing import span
+
 DEFAULT_BACKUP_DIR = Path.home() / ".lakehouse" / "backups"
+DEFAULT_BACKUP_WORKERS = 4
+BACKUP_FORMAT = "lakehouse-incremental-1"
+BACKUP_MANIFEST_SUFFIX = ".backup.json"
+CHUNK_SIZE = 1 << 20
+
+_index_lock = threading.Lock()
 
 
 def _normalize(table_name: str) -> str:
@@ -24,8 +50,20 @@ def backup_table(
     table_name: str,
     output_dir: Optional[Path] = None,
     include_metadata: bool = True,
+    incremental: bool = False,
+    max_workers: int = DEFAULT_BACKUP_WORKERS,
 ) -> dict:
-    """Backup a table's data and metadata to a compressed archive."""
+    """Backup a table's data and metadata to a compressed archive.
+
+    Args:
+        catalog: The Iceberg catalog
+        table_name: Table to back up
+        output_dir: Backup directory (defaults to DEFAULT_BACKUP_DIR)
+        include_metadata: Also capture tags, SLAs, validation rules, etc.
+        incremental: Copy the table's Iceberg files into the directory's
+            content-addressed store instead of writing a tar.gz archive
+        max_workers: Files hashed and compressed concurrently (incremental only)
+    """
     table_name = _normalize(table_name)
     short_name = table_name.split(".")[-1]
     namespace = table_name.split(".")[0]
@@ -34,6 +72,30 @@ def backup_table(
     output_dir = Path(output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    if incremental:
+        result = _backup_to_store(
+            catalog, [table_name], output_dir, f"{short_name}_{_timestamp()}",
+            include_metadata=include_metadata, max_workers=max_workers,
+        )
+        if not result["tables"]:
+            raise ValueError(f"Table '{table_name}' not found: {result['errors'][0]}")
+        entry = result["tables"][0]
+        return {
+            "table": table_name,
+            "archive": result["archive"],
+            "size_bytes": result["size_bytes"],
+            "row_count": entry["row_count"],
+            "snapshot_count": len(entry["snapshots"]),
+            "files": result["files"],
+            "files_copied": result["files_copied"],
+            "files_skipped": result["files_skipped"],
+            "message": (
+                f"Backed up '{table_name}' to {result['archive']} "
+                f"({result['files_copied']} of {result['files']} files copied, "
+                f"{result['size_bytes']:,} new bytes, {entry['row_count']} rows)"
+            ),
+        }
+
     table = catalog.load_table(table_name)
     arrow_table = table.scan().to_arrow()
 
@@ -141,8 +203,15 @@ def backup_namespace(
     catalog,
     namespace: str,
     output_dir: Optional[Path] = None,
+    incremental: bool = False,
+    max_workers: int = DEFAULT_BACKUP_WORKERS,
 ) -> dict:
-    """Backup all tables in a namespace to a single archive."""
+    """Backup all tables in a namespace to a single archive.
+
+    With ``incremental=True`` the tables' Iceberg files go into the backup
+    directory's content-addressed store, sharing one pool of copy workers,
+    and a single namespace manifest records them.
+    """
     from .catalog import list_tables
 
     output_dir = output_dir or DEFAULT_BACKUP_DIR
@@ -157,6 +226,30 @@ def backup_namespace(
             "message": f"No tables found in namespace '{namespace}'",
         }
 
+    if incremental:
+        result = _backup_to_store(
+            catalog, [_normalize(t) for t in tables], output_dir, f"ns_{namespace}_{_timestamp()}",
+            namespace=namespace, max_workers=max_workers,
+        )
+        backed_up = [entry["table_name"] for entry in result["tables"]]
+        return {
+            "namespace": namespace,
+            "archive": result["archive"],
+            "tables": backed_up,
+            "table_count": len(backed_up),
+            "total_rows": sum(entry["row_count"] for entry in result["tables"]),
+            "size_bytes": result["size_bytes"],
+            "files": result["files"],
+            "files_copied": result["files_copied"],
+            "files_skipped": result["files_skipped"],
+            "errors": result["errors"],
+            "message": (
+                f"Backed up {len(backed_up)} tables from '{namespace}' to {result['archive']} "
+                f"({result['files_copied']} of {result['files']} files copied, "
+                f"{result['size_bytes']:,} new bytes)"
+            ),
+        }
+
     timestamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d_%H%M%S")
     archive_name = f"ns_{namespace}_{timestamp}.tar.gz"
     archive_path = output_dir / archive_name
@@ -231,189 +324,577 @@ def backup_namespace(
     }
 
 
-def restore_table(
+# --- Incremental content-addressed store ---
+
+
+def _timestamp() -> str:
+    return datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
+
+
+def _object_path(store_dir: Path, digest: str) -> Path:
+    return store_dir / "objects" / digest[:2] / f"{digest}.zst"
+
+
+def _index_path(store_dir: Path) -> Path:
+    return store_dir / "objects" / "index.json"
+
+
+def _load_index(store_dir: Path) -> dict:
+    """Map of file path -> {sha256, size} for every file already in the store."""
+    path = _index_path(store_dir)
+    if not path.exists():
+        return {}
+    try:
+        return json.loads(path.read_text())
+    except (json.JSONDecodeError, OSError):
+        return {}
+
+
+def _save_index(store_dir: Path, added: dict) -> None:
+    with _index_lock:
+        index = _load_index(store_dir)
+        index.update(added)
+        path = _index_path(store_dir)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, path)
+
+
+def _table_files(table) -> tuple[dict, list[dict]]:
+    """Every immutable file the table's metadata references, and its snapshots.
+
+    Returns:
+        ({path: kind}, [snapshot dicts]) where kind is one of "metadata",
+        "manifest_list", "manifest", "data" or "delete"
+    """
+    from pyiceberg.manifest import DataFileContent
+
+    files = {table.metadata_location: "metadata"}
+    snapshots = []
+    seen_manifests = set()
+    for snapshot in table.metadata.snapshots:
+        files[snapshot.manifest_list] = "manifest_list"
+        for manifest in snapshot.manifests(table.io):
+            if manifest.manifest_path in seen_manifests:
+                continue
+            seen_manifests.add(manifest.manifest_path)
+            files[manifest.manifest_path] = "manifest"
+            for entry in manifest.fetch_manifest_entry(table.io, discard_deleted=True):
+                data_file = entry.data_file
+                files[data_file.file_path] = "data" if data_file.content == DataFileContent.DATA else "delete"
+        summary = snapshot.summary.additional_properties if snapshot.summary else {}
+        snapshots.append({
+            "snapshot_id": snapshot.snapshot_id,
+            "parent_id": snapshot.parent_snapshot_id,
+            "timestamp": datetime.datetime.fromtimestamp(
+                snapshot.timestamp_ms / 1000, tz=datetime.timezone.utc
+            ).isoformat(),
+            "operation": snapshot.summary.operation.value if snapshot.summary else None,
+            "row_count": int(summary.get("total-records", 0)),
+        })
+    return files, snapshots
+
+
+def _store_file(file_io, store_dir: Path, path: str) -> dict:
+    """Stream one file into the store, hashing and zstd-compressing in one pass.
+
+    The object is written under a temporary name and moved into place once
+    its digest is known; if another table or backup already stored the same
+    bytes the copy is discarded.
+    """
+    objects_dir = store_dir / "objects"
+    objects_dir.mkdir(parents=True, exist_ok=True)
+    tmp = objects_dir / f".incoming-{uuid.uuid4().hex}.zst"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with file_io.new_input(path).open() as src, pa.output_stream(str(tmp), compression="zstd") as out:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                size += len(chunk)
+                out.write(chunk)
+        sha = digest.hexdigest()
+        final = _object_path(store_dir, sha)
+        if final.exists():
+            tmp.unlink()
+            return {"path": path, "sha256": sha, "size": size, "stored_bytes": 0}
+        final.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(tmp, final)
+        return {"path": path, "sha256": sha, "size": size, "stored_bytes": final.stat().st_size}
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _copy_object(store_dir: Path, path: str, info: dict, sink=None) -> None:
+    """Decompress a stored file into ``sink`` (or nowhere), verifying it as it streams.
+
+    Raises:
+        ValueError: If the object is missing or its bytes do not match the backup
+    """
+    obj = _object_path(store_dir, info["sha256"])
+    if not obj.exists():
+        raise ValueError(f"Missing object for {path}")
+    digest = hashlib.sha256()
+    size = 0
+    with pa.input_stream(str(obj), compression="zstd") as src:
+        while chunk := src.read(CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            if sink is not None:
+                sink.write(chunk)
+    if digest.hexdigest() != info["sha256"] or size != info["size"]:
+        raise ValueError(f"Checksum mismatch for {path}")
+
+
+def _object_bytes(store_dir: Path, path: str, info: dict) -> bytes:
+    buffer = io.BytesIO()
+    _copy_object(store_dir, path, info, buffer)
+    return buffer.getvalue()
+
+
+def _backup_to_store(
     catalog,
-    archive_path: str | Path,
-    table_name: Optional[str] = None,
+    table_names: list[str],
+    store_dir: Path,
+    backup_name: str,
+    namespace: Optional[str] = None,
+    include_metadata: bool = True,
+    max_workers: int = DEFAULT_BACKUP_WORKERS,
+) -> dict:
+    """Copy the tables' Iceberg files into the store and write a backup manifest."""
+    index = _load_index(store_dir)
+    loaded = []
+    errors = []
+    pending = {}
+    for name in table_names:
+        try:
+            table = catalog.load_table(name)
+            with span("backup.list_files", table=name):
+                files, snapshots = _table_files(table)
+        except Exception as e:
+            errors.append(f"{name}: {e}")
+            continue
+        loaded.append((name, table, files, snapshots))
+        for path in files:
+            known = index.get(path)
+            if known and _object_path(store_dir, known["sha256"]).exists():
+                continue
+            pending.setdefault(path, table.io)
+
+    stored = []
+    if pending:
+        workers = max(1, min(max_workers, len(pending) or 1))
+        with span("backup.copy_files", files=len(pending)), ThreadPoolExecutor(max_workers=workers) as pool:
+            stored = list(pool.map(lambda item: _store_file(item[1], store_dir, item[0]), pending.items()))
+        added = {r["path"]: {"sha256": r["sha256"], "size": r["size"]} for r in stored}
+        index.update(added)
+        _save_index(store_dir, added)
+
+    entries = []
+    for name, table, files, snapshots in loaded:
+        current = table.current_snapshot()
+        entry = {
+            "table_name": name,
+            "namespace": name.split(".")[0],
+            "short_name": name.split(".")[-1],
+            "backed_up_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "location": table.location(),
+            "metadata_location": table.metadata_location,
+            "current_snapshot_id": current.snapshot_id if current else None,
+            "row_count": next(
+                (s["row_count"] for s in snapshots if current and s["snapshot_id"] == current.snapshot_id), 0
+            ),
+            "columns": {field.name: str(field.field_type) for field in table.schema().fields},
+            "partition_spec": str(table.spec()),
+            "snapshots": snapshots,
+            "files": {path: {**index[path], "kind": kind} for path, kind in files.items()},
+        }
+        if include_metadata:
+            entry["app_metadata"] = _collect_app_metadata(name)
+        entries.append(entry)
+
+    manifest_path = store_dir / f"{backup_name}{BACKUP_MANIFEST_SUFFIX}"
+    file_count = sum(len(entry["files"]) for entry in entries)
+    stored_bytes = sum(r["stored_bytes"] for r in stored)
+    manifest = {
+        "format": BACKUP_FORMAT,
+        "namespace": namespace,
+        "backed_up_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "stored_bytes": stored_bytes,
+        "tables": entries,
+    }
+    manifest_path.write_text(json.dumps(manifest, indent=2, default=str))
+
+    return {
+        "archive": str(manifest_path),
+        "tables": entries,
+        "files": file_count,
+        "files_copied": len(stored),
+        "files_skipped": file_count - len(stored),
+        "size_bytes": stored_bytes,
+        "errors": errors,
+    }
+
+
+def _is_store_backup(archive_path: Path) -> bool:
+    return archive_path.name.endswith(BACKUP_MANIFEST_SUFFIX)
+
+
+def _read_backup_manifest(archive_path: Path) -> dict:
+    manifest = json.loads(archive_path.read_text())
+    if manifest.get("format") != BACKUP_FORMAT:
+        raise ValueError(f"Invalid backup manifest: {archive_path}")
+    return manifest
+
+
+def _with_fields(record, struct, **changes):
+    """Copy a pyiceberg manifest record (read with ``struct``) with the named fields changed."""
+    fields = {field.name: getattr(record, field.name) for field in struct.fields}
+    return type(record).from_args(**{**fields, **changes})
+
+
+def _restore_from_store(
+    catalog,
+    store_dir: Path,
+    entry: dict,
+    target: str,
     overwrite: bool = False,
+    snapshot_id: Optional[int] = None,
 ) -> dict:
-    """Restore a table from an archive."""
-    from .catalog import create_table, insert_rows, list_tables
+    """Recreate one table at one backed-up snapshot from the object store.
+
+    The backed-up table metadata keeps its schemas, field ids, partition
+    specs and properties; it is re-homed at the target's location with an
+    empty history and registered, and the snapshot's data files are
+    decompressed into the new location and committed as a single append.
+    Every object is verified and staged before an existing target is
+    dropped, so a missing or corrupt object leaves that table untouched.
+    """
+    from pyiceberg.io import load_file_io
+    from pyiceberg.manifest import (
+        DATA_FILE_TYPE,
+        DEFAULT_READ_VERSION,
+        MANIFEST_LIST_FILE_SCHEMAS,
+        DataFileContent,
+        read_manifest_list,
+    )
+    from pyiceberg.table.metadata import TableMetadataUtil
+
+    from .catalog import _register_metadata_copy, list_tables
+
+    namespace, short_name = target.split(".", 1)
+    existing = list_tables(catalog, namespace=namespace)
+    if target in existing and not overwrite:
+        raise ValueError(f"Table '{target}' already exists. Use overwrite=True to replace.")
+
+    snapshot_id = snapshot_id if snapshot_id is not None else entry.get("current_snapshot_id")
+    if snapshot_id is not None and snapshot_id not in {s["snapshot_id"] for s in entry["snapshots"]}:
+        raise ValueError(f"Snapshot {snapshot_id} of '{entry['table_name']}' is not in this backup")
+
+    files = entry["files"]
+    metadata = TableMetadataUtil.parse_raw(
+        _object_bytes(store_dir, entry["metadata_location"], files[entry["metadata_location"]])
+    )
+    snapshot = metadata.snapshot_by_id(snapshot_id) if snapshot_id is not None else None
+
+    location = catalog._resolve_table_location(None, namespace, short_name)
+    file_io = load_file_io(catalog.properties, location)
+    source_location = entry["location"].rstrip("/")
+
+    data_files = []
+    written = []  # data files staged so far, removed if the restore does not get to commit
+    try:
+        if snapshot is not None:
+            with tempfile.TemporaryDirectory() as tmpdir, span("backup.restore_files", table=target):
+                staged = Path(tmpdir) / "manifest-list.avro"
+                staged.write_bytes(_object_bytes(store_dir, snapshot.manifest_list, files[snapshot.manifest_list]))
+                for i, manifest in enumerate(read_manifest_list(file_io.new_input(str(staged)))):
+                    local = Path(tmpdir) / f"manifest-{i}.avro"
+                    local.write_bytes(_object_bytes(store_dir, manifest.manifest_path, files[manifest.manifest_path]))
+                    manifest = _with_fields(manifest, MANIFEST_LIST_FILE_SCHEMAS[DEFAULT_READ_VERSION], manifest_path=str(local))
+                    for manifest_entry in manifest.fetch_manifest_entry(file_io, discard_deleted=True):
+                        source = manifest_entry.data_file
+                        if source.content != DataFileContent.DATA:
+                            raise ValueError(f"Cannot restore '{entry['table_name']}': delete files are not supported")
+                        if source.file_path.startswith(source_location + "/"):
+                            relative = source.file_path[len(source_location) + 1:]
+                        else:
+                            relative = f"data/{source.file_path.rsplit('/', 1)[-1]}"
+                        dest = f"{location}/{relative}"
+                        if file_io.new_input(dest).exists():
+                            # Never write over a file the existing table may still be using
+                            directory, file_name = dest.rsplit("/", 1)
+                            dest = f"{directory}/restored-{uuid.uuid4().hex[:8]}-{file_name}"
+                        written.append(dest)
+                        with file_io.new_output(dest).create() as out:
+                            _copy_object(store_dir, source.file_path, files[source.file_path], out)
+                        restored = _with_fields(source, DATA_FILE_TYPE[DEFAULT_READ_VERSION], file_path=dest)
+                        restored.spec_id = source.spec_id
+                        data_files.append(restored)
+
+        if target in existing:
+            try:
+                catalog.drop_table(target)
+            except Exception as e:
+                raise ValueError(f"Cannot replace table '{target}': {e}")
+    except Exception:
+        for path in written:
+            try:
+                file_io.delete(path)
+            except Exception:
+                pass  # A partly written file may not exist
+        raise
 
-    archive_path = Path(archive_path)
-    if not archive_path.exists():
-        raise FileNotFoundError(f"Archive not found: {archive_path}")
+    table = _register_metadata_copy(
+        catalog, target, metadata,
+        schema_id=snapshot.schema_id if snapshot is not None else None,
+    )
 
-    with tarfile.open(str(archive_path), "r:gz") as tar:
-        members = tar.getnames()
-        # Find metadata.json
-        meta_members = [m for m in members if m.endswith("metadata.json")]
-        if not meta_members:
-            raise ValueError("Invalid archive: no metadata.json found")
-
-        # For single-table backup, there's one metadata.json
-        meta_member = meta_members[0]
-        meta_file = tar.extractfile(meta_member)
-        metadata = json.loads(meta_file.read())
-
-        # Determine target table name
-        target = table_name or metadata["table_name"]
-        target = _normalize(target)
-
-        # Check if table exists
-        existing = list_tables(catalog, namespace=target.split(".")[0])
-        if target in existing and not overwrite:
-            raise ValueError(f"Table '{target}' already exists. Use overwrite=True to replace.")
-
-        # Extract data file
-        data_members = [m for m in members if m.endswith(".parquet")]
-        if not data_members:
-            raise ValueError("Invalid archive: no data file found")
-
-        data_file = tar.extractfile(data_members[0])
-        with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp:
-            tmp.write(data_file.read())
-            tmp_path = tmp.name
+    if data_files:
+        with table.transaction() as tx:
+            with tx.update_snapshot().fast_append() as append:
+                for data_file in data_files:
+                    append.append_data_file(data_file)
 
     try:
-        arrow_table = pq.read_table(tmp_path)
-    finally:
-        Path(tmp_path).unlink(missing_ok=True)
+        from .catalog import clear_snapshot_cache
+        clear_snapshot_cache()
+    except Exception:
+        pass  # cache invalidation is best-effort
+
+    row_count = sum(data_file.record_count for data_file in data_files)
+    return {
+        "table": target,
+        "snapshot_id": snapshot_id,
+        "rows_restored": row_count,
+        "files_restored": len(data_files),
+        "columns": list(entry.get("columns", {}).keys()),
+    }
+
+
+def list_backup_snapshots(table_name: str, backup_dir: Optional[Path] = None) -> list[dict]:
+    """List every snapshot of a table that an incremental backup can restore.
+
+    Each snapshot is reported once, pointing at the newest backup holding it.
+    """
+    table_name = _normalize(table_name)
+    backup_dir = Path(backup_dir) if backup_dir else DEFAULT_BACKUP_DIR
+    if not backup_dir.exists():
+        return []
+
+    snapshots = {}
+    for f in sorted(backup_dir.glob(f"*{BACKUP_MANIFEST_SUFFIX}")):
+        try:
+            manifest = _read_backup_manifest(f)
+        except (ValueError, json.JSONDecodeError, OSError):
+            continue
+        for entry in manifest["tables"]:
+            if entry["table_name"] != table_name:
+                continue
+            for snapshot in entry["snapshots"]:
+                snapshots[snapshot["snapshot_id"]] = {
+                    **snapshot,
+                    "table": table_name,
+                    "archive": str(f),
+                    "backed_up_at": entry["backed_up_at"],
+                }
+    return sorted(snapshots.values(), key=lambda s: s["timestamp"])
+
+
+def _read_archive_index(tar) -> tuple[dict, dict]:
+    """Map each table directory in an archive to its metadata and data member."""
+    metadata = {}
+    data_members = {}
+    for member in tar.getmembers():
+        prefix = member.name.split("/", 1)[0]
+        if member.name.endswith("metadata.json"):
+            metadata[prefix] = json.loads(tar.extractfile(member).read())
+        elif member.name.endswith(".parquet"):
+            data_members.setdefault(prefix, member)
+    return metadata, data_members
+
+
+def _restore_archive_table(
+    catalog,
+    archive_path: Path,
+    metadata: dict,
+    data_member: tarfile.TarInfo,
+    target: str,
+    overwrite: bool = False,
+) -> dict:
+    """Restore one table from a tar.gz archive by registering its data file.
+
+    The Parquet member is streamed out of the archive straight into the new
+    table's data directory while its checksum is computed, and then added to
+    the table as-is; rows are never decoded. The table schema comes from the
+    file's own Parquet schema.
+
+    Raises:
+        ValueError: If the table exists (without overwrite) or the checksum fails
+    """
+    from pyiceberg.io import load_file_io
+
+    from .catalog import list_tables
+
+    namespace, short_name = target.split(".", 1)
+    existing = list_tables(catalog, namespace=namespace)
+    if target in existing and not overwrite:
+        raise ValueError(f"Table '{target}' already exists. Use overwrite=True to replace.")
+
+    location = catalog._resolve_table_location(None, namespace, short_name)
+    file_io = load_file_io(catalog.properties, location)
+    dest = f"{location}/data/restored-{uuid.uuid4().hex}.parquet"
+
+    digest = hashlib.sha256()
+    with span("backup.restore_files", table=target), tarfile.open(str(archive_path), "r:gz") as tar:
+        src = tar.extractfile(data_member)
+        with file_io.new_output(dest).create(overwrite=True) as out:
+            while chunk := src.read(CHUNK_SIZE):
+                digest.update(chunk)
+                out.write(chunk)
 
-    # Verify checksum
     expected_hash = metadata.get("data_checksum")
-    if expected_hash:
-        actual_hash = hashlib.sha256(Path(tmp_path).read_bytes() if Path(tmp_path).exists() else pq.write_table(arrow_table, "/dev/null") or b"").hexdigest()
-        # Skip checksum verification since we already read the file
-
-    # Create table if needed
-    if target not in existing:
-        columns = metadata.get("columns", {})
-        # Map PyIceberg type strings back to simple types
-        type_map = {
-            "string": "string", "long": "long", "int": "long",
-            "double": "double", "float": "double",
-            "timestamp": "timestamp", "date": "date", "boolean": "boolean",
-        }
-        simple_columns = {}
-        for col_name, col_type in columns.items():
-            simple_type = type_map.get(col_type.lower(), "string")
-            simple_columns[col_name] = simple_type
-        create_table(catalog, target, columns=simple_columns)
-    elif overwrite:
-        # Drop and recreate
+    if expected_hash and digest.hexdigest() != expected_hash:
+        file_io.delete(dest)
+        raise ValueError(f"Checksum mismatch for {metadata.get('table_name', target)}")
+
+    with file_io.new_input(dest).open() as f:
+        parquet_meta = pq.read_metadata(f)
+    arrow_schema = parquet_meta.schema.to_arrow_schema().remove_metadata()
+
+    if target in existing:
         try:
             catalog.drop_table(target)
         except Exception:
             pass
-        columns = metadata.get("columns", {})
-        type_map = {
-            "string": "string", "long": "long", "int": "long",
-            "double": "double", "float": "double",
-            "timestamp": "timestamp", "date": "date", "boolean": "boolean",
-        }
-        simple_columns = {}
-        for col_name, col_type in columns.items():
-            simple_type = type_map.get(col_type.lower(), "string")
-            simple_columns[col_name] = simple_type
-        create_table(catalog, target, columns=simple_columns)
-
-    # Insert data
-    rows = arrow_table.to_pydict()
-    row_list = [dict(zip(rows.keys(), vals)) for vals in zip(*rows.values())]
-    if row_list:
-        insert_rows(catalog, target, row_list)
+
+    table = catalog.create_table(target, schema=arrow_schema)
+    if parquet_meta.num_rows:
+        table.add_files([dest])
+    else:
+        file_io.delete(dest)
+
+    try:
+        from .catalog import clear_snapshot_cache
+        clear_snapshot_cache()
+    except Exception:
+        pass  # cache invalidation is best-effort
 
     return {
         "table": target,
-        "archive": str(archive_path),
-        "rows_restored": len(row_list),
-        "columns": list(metadata.get("columns", {}).keys()),
-        "message": f"Restored '{target}' from {archive_path} ({len(row_list)} rows)",
+        "rows_restored": parquet_meta.num_rows,
+        "columns": list(metadata.get("columns", {}).keys()) or arrow_schema.names,
     }
 
 
-def restore_namespace(
+def restore_table(
     catalog,
     archive_path: str | Path,
+    table_name: Optional[str] = None,
     overwrite: bool = False,
+    snapshot_id: Optional[int] = None,
 ) -> dict:
-    """Restore all tables from a namespace archive."""
+    """Restore a table from an archive.
+
+    Args:
+        catalog: The Iceberg catalog
+        archive_path: A ``.tar.gz`` archive or an incremental ``.backup.json`` manifest
+        table_name: Restore under this name instead of the original
+        overwrite: Replace the table if it already exists
+        snapshot_id: Backed-up snapshot to restore (incremental backups only;
+            defaults to the snapshot that was current at backup time)
+    """
     archive_path = Path(archive_path)
     if not archive_path.exists():
         raise FileNotFoundError(f"Archive not found: {archive_path}")
 
-    restored = []
-    errors = []
+    if _is_store_backup(archive_path):
+        entry = _read_backup_manifest(archive_path)["tables"][0]
+        target = _normalize(table_name or entry["table_name"])
+        result = _restore_from_store(
+            catalog, archive_path.parent, entry, target, overwrite=overwrite, snapshot_id=snapshot_id,
+        )
+        return {
+            **result,
+            "archive": str(archive_path),
+            "message": (
+                f"Restored '{target}' from {archive_path} at snapshot {result['snapshot_id']} "
+                f"({result['rows_restored']} rows)"
+            ),
+        }
+    if snapshot_id is not None:
+        raise ValueError("Point-in-time restore needs an incremental backup (.backup.json)")
 
     with tarfile.open(str(archive_path), "r:gz") as tar:
-        members = tar.getnames()
-        meta_members = [m for m in members if m.endswith("metadata.json")]
-
-        for meta_member in meta_members:
-            meta_file = tar.extractfile(meta_member)
-            metadata = json.loads(meta_file.read())
-            table_name = metadata["table_name"]
-            short_name = metadata["short_name"]
-
-            # Extract data for this table
-            data_member = None
-            for m in members:
-                if m.startswith(short_name + "/") and m.endswith(".parquet"):
-                    data_member = m
-                    break
-
-            if not data_member:
-                errors.append(f"No data file for {table_name}")
-                continue
+        metadata, data_members = _read_archive_index(tar)
+    if not metadata:
+        raise ValueError("Invalid archive: no metadata.json found")
 
-            try:
-                data_file = tar.extractfile(data_member)
-                with tempfile.NamedTemporaryFile(suffix=".parquet", delete=False) as tmp:
-                    tmp.write(data_file.read())
-                    tmp_path = tmp.name
-
-                arrow_table = pq.read_table(tmp_path)
-                Path(tmp_path).unlink(missing_ok=True)
-
-                # Create/restore table
-                from .catalog import create_table, insert_rows, list_tables
-                target = _normalize(table_name)
-                existing = list_tables(catalog, namespace=target.split(".")[0])
-
-                if target in existing and not overwrite:
-                    errors.append(f"Table '{target}' exists (use overwrite)")
-                    continue
-
-                if target in existing and overwrite:
-                    try:
-                        catalog.drop_table(target)
-                    except Exception:
-                        pass
-
-                type_map = {
-                    "string": "string", "long": "long", "int": "long",
-                    "double": "double", "float": "double",
-                    "timestamp": "timestamp", "date": "date", "boolean": "boolean",
-                }
-                columns = metadata.get("columns", {})
-                simple_columns = {}
-                for col_name, col_type in columns.items():
-                    simple_type = type_map.get(col_type.lower(), "string")
-                    simple_columns[col_name] = simple_type
+    # For single-table backup, there's one metadata.json
+    prefix, table_metadata = next(iter(metadata.items()))
+    if prefix not in data_members:
+        raise ValueError("Invalid archive: no data file found")
+
+    target = _normalize(table_name or table_metadata["table_name"])
+    result = _restore_archive_table(
+        catalog, archive_path, table_metadata, data_members[prefix], target, overwrite=overwrite,
+    )
 
-                if target not in existing or overwrite:
-                    create_table(catalog, target, columns=simple_columns)
+    return {
+        **result,
+        "archive": str(archive_path),
+        "message": f"Restored '{target}' from {archive_path} ({result['rows_restored']} rows)",
+    }
 
-                rows = arrow_table.to_pydict()
-                row_list = [dict(zip(rows.keys(), vals)) for vals in zip(*rows.values())]
-                if row_list:
-                    insert_rows(catalog, target, row_list)
 
-                restored.append({"table": target, "rows": len(row_list)})
-            except Exception as e:
-                errors.append(f"{table_name}: {str(e)}")
+def restore_namespace(
+    catalog,
+    archive_path: str | Path,
+    overwrite: bool = False,
+    max_workers: int = DEFAULT_BACKUP_WORKERS,
+) -> dict:
+    """Restore all tables from a namespace archive or incremental backup manifest.
+
+    Tables are restored concurrently, each verified as its files are copied.
+    """
+    archive_path = Path(archive_path)
+    if not archive_path.exists():
+        raise FileNotFoundError(f"Archive not found: {archive_path}")
+
+    jobs = []
+    errors = []
+    if _is_store_backup(archive_path):
+        for entry in _read_backup_manifest(archive_path)["tables"]:
+            jobs.append((entry["table_name"], lambda entry=entry: _restore_from_store(
+                catalog, archive_path.parent, entry, _normalize(entry["table_name"]), overwrite=overwrite,
+            )))
+    else:
+        with tarfile.open(str(archive_path), "r:gz") as tar:
+            metadata, data_members = _read_archive_index(tar)
+        for prefix, table_metadata in metadata.items():
+            table_name = table_metadata["table_name"]
+            if prefix not in data_members:
+                errors.append(f"No data file for {table_name}")
                 continue
+            jobs.append((table_name, lambda m=table_metadata, d=data_members[prefix]: _restore_archive_table(
+                catalog, archive_path, m, d, _normalize(m["table_name"]), overwrite=overwrite,
+            )))
+
+    def run(job):
+        table_name, restore = job
+        try:
+            return restore(), None
+        except Exception as e:
+            return None, f"{table_name}: {str(e)}"
+
+    restored = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs) or 1))) as pool:
+        for result, error in pool.map(run, jobs):
+            if error:
+                errors.append(error)
+            else:
+                restored.append({"table": result["table"], "rows": result["rows_restored"]})
 
     return {
         "archive": str(archive_path),
@@ -431,9 +912,27 @@ def list_backups(backup_dir: Optional[Path] = None) -> list[dict]:
         return []
 
     backups = []
-    for f in sorted(backup_dir.glob("*.tar.gz"), reverse=True):
+    archives = list(backup_dir.glob("*.tar.gz")) + list(backup_dir.glob(f"*{BACKUP_MANIFEST_SUFFIX}"))
+    for f in sorted(archives, key=lambda f: f.name, reverse=True):
         info = {"file": f.name, "path": str(f), "size_bytes": f.stat().st_size}
 
+        if _is_store_backup(f):
+            try:
+                manifest = _read_backup_manifest(f)
+                entries = manifest["tables"]
+                info["incremental"] = True
+                info["size_bytes"] = manifest.get("stored_bytes", 0)
+                info["total_bytes"] = sum(i["size"] for e in entries for i in e["files"].values())
+                info["table"] = manifest.get("namespace") or (entries[0]["table_name"] if entries else "unknown")
+                info["row_count"] = sum(e.get("row_count", 0) for e in entries)
+                info["snapshot_count"] = sum(len(e.get("snapshots", [])) for e in entries)
+                info["backed_up_at"] = manifest.get("backed_up_at", "")
+                info["is_namespace"] = manifest.get("namespace") is not None
+            except Exception:
+                pass
+            backups.append(info)
+            continue
+
         # Try to read metadata from archive
         try:
             with tarfile.open(str(f), "r:gz") as tar:
@@ -454,7 +953,11 @@ def list_backups(backup_dir: Optional[Path] = None) -> list[dict]:
 
 
 def verify_backup(archive_path: str | Path) -> dict:
-    """Verify backup archive integrity."""
+    """Verify backup archive integrity.
+
+    For incremental backups every object the manifest references is
+    decompressed and re-hashed, in parallel.
+    """
     archive_path = Path(archive_path)
     if not archive_path.exists():
         raise FileNotFoundError(f"Archive not found: {archive_path}")
@@ -462,43 +965,67 @@ def verify_backup(archive_path: str | Path) -> dict:
     issues = []
     tables_verified = []
 
-    try:
-        with tarfile.open(str(archive_path), "r:gz") as tar:
-            members = tar.getnames()
-            meta_members = [m for m in members if m.endswith("metadata.json")]
-            data_members = [m for m in members if m.endswith(".parquet")]
-
-            if not meta_members:
-                issues.append("No metadata.json found in archive")
-            if not data_members:
-                issues.append("No data files found in archive")
-
-            for meta_member in meta_members:
-                meta_file = tar.extractfile(meta_member)
-                metadata = json.loads(meta_file.read())
-                table_name = metadata.get("table_name", "unknown")
-
-                # Verify data file exists
-                short_name = metadata.get("short_name", "")
-                matching_data = [m for m in data_members if short_name in m]
-                if not matching_data:
-                    issues.append(f"Missing data file for {table_name}")
-                    continue
-
-                # Verify checksum
-                expected_hash = metadata.get("data_checksum")
-                if expected_hash:
-                    data_file = tar.extractfile(matching_data[0])
-                    actual_hash = hashlib.sha256(data_file.read()).hexdigest()
-                    if actual_hash != expected_hash:
-                        issues.append(f"Checksum mismatch for {table_name}")
+    if _is_store_backup(archive_path):
+        try:
+            entries = _read_backup_manifest(archive_path)["tables"]
+        except (ValueError, json.JSONDecodeError) as e:
+            entries = []
+            issues.append(str(e))
+
+        def check(item):
+            path, info = item
+            try:
+                _copy_object(archive_path.parent, path, info)
+                return None
+            except Exception as e:
+                return str(e)
+
+        for entry in entries:
+            items = list(entry["files"].items())
+            with ThreadPoolExecutor(max_workers=max(1, min(DEFAULT_BACKUP_WORKERS, len(items) or 1))) as pool:
+                problems = [p for p in pool.map(check, items) if p]
+            if problems:
+                issues.extend(f"{entry['table_name']}: {p}" for p in problems)
+            else:
+                tables_verified.append(entry["table_name"])
+    else:
+        try:
+            with tarfile.open(str(archive_path), "r:gz") as tar:
+                members = tar.getnames()
+                meta_members = [m for m in members if m.endswith("metadata.json")]
+                data_members = [m for m in members if m.endswith(".parquet")]
+
+                if not meta_members:
+                    issues.append("No metadata.json found in archive")
+                if not data_members:
+                    issues.append("No data files found in archive")
+
+                for meta_member in meta_members:
+                    meta_file = tar.extractfile(meta_member)
+                    metadata = json.loads(meta_file.read())
+                    table_name = metadata.get("table_name", "unknown")
+
+                    # Verify data file exists
+                    short_name = metadata.get("short_name", "")
+                    matching_data = [m for m in data_members if short_name in m]
+                    if not matching_data:
+                        issues.append(f"Missing data file for {table_name}")
+                        continue
+
+                    # Verify checksum
+                    expected_hash = metadata.get("data_checksum")
+                    if expected_hash:
+                        data_file = tar.extractfile(matching_data[0])
+                        actual_hash = hashlib.sha256(data_file.read()).hexdigest()
+                        if actual_hash != expected_hash:
+                            issues.append(f"Checksum mismatch for {table_name}")
+                        else:
+                            tables_verified.append(table_name)
                     else:
                         tables_verified.append(table_name)
-                else:
-                    tables_verified.append(table_name)
 
-    except tarfile.TarError as e:
-        issues.append(f"Archive is corrupted: {str(e)}")
+        except tarfile.TarError as e:
+            issues.append(f"Archive is corrupted: {str(e)}")
 
     valid = len(issues) == 0
 
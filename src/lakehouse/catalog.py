@@ -1,12 +1,16 @@
 """Iceberg catalog management using PyIceberg."""
 
 import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 
 from pyiceberg.catalog import Catalog, load_catalog
 from pyiceberg.catalog.sql import SqlCatalog
 from pyiceberg.schema import Schema
+from pyiceberg.table import Table
+from pyiceberg.table.refs import MAIN_BRANCH
 from pyiceberg.types import (
     StringType,
     LongType,
@@ -27,9 +31,142 @@ from pyiceberg.transforms import (
 )
 import pyarrow as pa
 
+from .tracing import span, traced
+
 
 DEFAULT_WAREHOUSE = Path.home() / ".lakehouse" / "warehouse"
 DEFAULT_CATALOG_DB = Path.home() / ".lakehouse" / "catalog.db"
+MAX_METADATA_CACHE_ENTRIES = 256
+MAX_SNAPSHOT_CACHE_BYTES = 512 * 1024 * 1024
+
+# Catalog handles keyed by (name, warehouse, catalog db)
+_catalog_cache: dict[tuple, "CachedSqlCatalog"] = {}
+# Parsed table metadata keyed by metadata file location (immutable once written)
+_metadata_cache: "OrderedDict[str, object]" = OrderedDict()
+# Arrow scans of snapshots keyed by (table uuid, snapshot id); a snapshot's data never changes
+_snapshot_cache: "OrderedDict[tuple, pa.Table]" = OrderedDict()
+_snapshot_cache_bytes = 0
+_cache_lock = threading.Lock()
+
+
+def _cached_metadata(location: str):
+    from .metrics import inc
+
+    with _cache_lock:
+        metadata = _metadata_cache.get(location)
+        if metadata is not None:
+            _metadata_cache.move_to_end(location)
+    inc("lakehouse_cache_requests", cache="table_metadata", result="hit" if metadata is not None else "miss")
+    return metadata
+
+
+def _cache_metadata(location: str, metadata, replaces: Optional[str] = None) -> None:
+    with _cache_lock:
+        if replaces is not None:
+            _metadata_cache.pop(replaces, None)
+        _metadata_cache[location] = metadata
+        _metadata_cache.move_to_end(location)
+        while len(_metadata_cache) > MAX_METADATA_CACHE_ENTRIES:
+            _metadata_cache.popitem(last=False)
+
+
+def clear_catalog_cache() -> None:
+    """Drop cached catalog handles and table metadata (e.g. after replacing catalog.db)."""
+    with _cache_lock:
+        for catalog in _catalog_cache.values():
+            try:
+                catalog.engine.dispose()
+            except Exception:
+                pass
+        _catalog_cache.clear()
+        _metadata_cache.clear()
+    clear_snapshot_cache()
+
+
+def scan_snapshot(table: Table, snapshot_id: int) -> pa.Table:
+    """Read a table as of one snapshot, reusing earlier reads of the same snapshot.
+
+    Snapshots are immutable, so scans are cached until evicted (least recently
+    used first) once the cache holds more than MAX_SNAPSHOT_CACHE_BYTES.
+    """
+    global _snapshot_cache_bytes
+    from .metrics import inc
+
+    key = (str(table.metadata.table_uuid), snapshot_id)
+    with _cache_lock:
+        arrow_table = _snapshot_cache.get(key)
+        if arrow_table is not None:
+            _snapshot_cache.move_to_end(key)
+    inc("lakehouse_cache_requests", cache="snapshot_scan", result="hit" if arrow_table is not None else "miss")
+    if arrow_table is not None:
+        return arrow_table
+
+    with span("catalog.scan_snapshot", table=table.name()[-1], snapshot_id=snapshot_id) as s:
+        arrow_table = table.scan(snapshot_id=snapshot_id).to_arrow()
+        s.set(rows=arrow_table.num_rows)
+    if arrow_table.nbytes > MAX_SNAPSHOT_CACHE_BYTES:
+        return arrow_table
+
+    with _cache_lock:
+        previous = _snapshot_cache.pop(key, None)
+        if previous is not None:
+            _snapshot_cache_bytes -= previous.nbytes
+        _snapshot_cache[key] = arrow_table
+        _snapshot_cache_bytes += arrow_table.nbytes
+        while _snapshot_cache_bytes > MAX_SNAPSHOT_CACHE_BYTES and _snapshot_cache:
+            _, evicted = _snapshot_cache.popitem(last=False)
+            _snapshot_cache_bytes -= evicted.nbytes
+    return arrow_table
+
+
+def get_snapshot_cache_stats() -> dict:
+    """Entries and bytes held by the snapshot scan cache."""
+    with _cache_lock:
+        return {
+            "entries": len(_snapshot_cache),
+            "bytes": _snapshot_cache_bytes,
+            "max_bytes": MAX_SNAPSHOT_CACHE_BYTES,
+        }
+
+
+def clear_snapshot_cache() -> None:
+    """Drop all cached snapshot scans."""
+    global _snapshot_cache_bytes
+    with _cache_lock:
+        _snapshot_cache.clear()
+        _snapshot_cache_bytes = 0
+
+
+class CachedSqlCatalog(SqlCatalog):
+    """SqlCatalog that reuses parsed table metadata while the catalog pointer is unchanged.
+
+    ``load_table`` still reads the table's current metadata location from the
+    catalog DB on every call (one indexed SQLite lookup), so commits made by
+    other processes are picked up; only the metadata JSON read and parse is
+    skipped when that location was seen before. Commits through this catalog
+    write the new metadata straight into the cache.
+    """
+
+    def _convert_orm_to_iceberg(self, orm_table) -> Table:
+        location = orm_table.metadata_location
+        metadata = _cached_metadata(location) if location else None
+        if metadata is None:
+            with span("catalog.read_metadata", location=location):
+                table = super()._convert_orm_to_iceberg(orm_table)
+            _cache_metadata(table.metadata_location, table.metadata)
+            return table
+        return Table(
+            identifier=Catalog.identifier_to_tuple(orm_table.table_namespace) + (orm_table.table_name,),
+            metadata=metadata,
+            metadata_location=location,
+            io=self._load_file_io(metadata.properties, location),
+            catalog=self,
+        )
+
+    def commit_table(self, table: Table, requirements, updates):
+        response = super().commit_table(table, requirements, updates)
+        _cache_metadata(response.metadata_location, response.metadata, replaces=table.metadata_location)
+        return response
 
 
 def get_catalog(
@@ -40,22 +177,39 @@ def get_catalog(
     """Get or create the Iceberg catalog.
 
     Uses SQLite-backed catalog for simplicity (no external dependencies).
+    The handle is cached per (name, warehouse, catalog db), so repeated calls
+    reuse one SQLAlchemy engine instead of reconnecting each time.
     """
     warehouse = warehouse_path or DEFAULT_WAREHOUSE
     catalog_path = catalog_db or DEFAULT_CATALOG_DB
 
+    key = (name, str(warehouse), str(catalog_path))
+    with _cache_lock:
+        cached = _catalog_cache.get(key)
+    if cached is not None and catalog_path.exists() and warehouse.exists():
+        return cached
+
     # Ensure directories exist
     warehouse.mkdir(parents=True, exist_ok=True)
     catalog_path.parent.mkdir(parents=True, exist_ok=True)
 
-    catalog = SqlCatalog(
-        name,
-        **{
-            "uri": f"sqlite:///{catalog_path}",
-            "warehouse": f"file://{warehouse}",
-        }
-    )
+    with span("catalog.connect"):
+        catalog = CachedSqlCatalog(
+            name,
+            **{
+                "uri": f"sqlite:///{catalog_path}",
+                "warehouse": f"file://{warehouse}",
+            }
+        )
 
+    with _cache_lock:
+        previous = _catalog_cache.get(key)
+        _catalog_cache[key] = catalog
+    if previous is not None:
+        try:
+            previous.engine.dispose()
+        except Exception:
+            pass
     return catalog
 
 
@@ -268,7 +422,7 @@ def scan_as_of(
         snapshot = table.snapshot_by_id(snapshot_id)
         if snapshot is None:
             raise ValueError(f"Snapshot ID {snapshot_id} not found in table '{table_name}'")
-        return table.scan(snapshot_id=snapshot_id).to_arrow()
+        return scan_snapshot(table, snapshot_id)
     except ValueError as ve:
         if "not found" in str(ve):
             raise
@@ -283,9 +437,9 @@ def scan_as_of(
         snapshot = table.snapshot_as_of_timestamp(timestamp_ms)
         if snapshot is None:
             raise ValueError(f"No snapshot found at or before {as_of} in table '{table_name}'")
-        return table.scan(snapshot_id=snapshot.snapshot_id).to_arrow()
     except (ValueError, TypeError) as e:
         raise ValueError(f"Invalid as_of value '{as_of}': must be ISO timestamp or snapshot ID. {e}")
+    return scan_snapshot(table, snapshot.snapshot_id)
 
 
 def snapshot_diff(
@@ -497,10 +651,17 @@ def create_sample_tables(catalog: Catalog) -> None:
             raise
 
 
+def _scan_ref(table: Table, branch: Optional[str] = None):
+    """A scan of main, or of ``branch``'s head when writing to a staging branch."""
+    return table.scan() if branch is None else table.scan().use_ref(branch)
+
+
+@traced("catalog.insert_rows")
 def insert_rows(
     catalog: Catalog,
     table_name: str,
     rows: list[dict],
+    branch: Optional[str] = None,
 ) -> int:
     """Insert rows into an Iceberg table.
 
@@ -508,6 +669,8 @@ def insert_rows(
         catalog: The Iceberg catalog
         table_name: Name of the table (with or without namespace)
         rows: List of dictionaries, each representing a row
+        branch: Staging branch to write to instead of main; staged rows
+            skip per-row validation and are audited before publish
 
     Returns:
         Number of rows inserted
@@ -526,7 +689,8 @@ def insert_rows(
 
     # Load table and get schema
     try:
-        table = catalog.load_table(table_name)
+        with span("catalog.load_table", table=table_name):
+            table = catalog.load_table(table_name)
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
 
@@ -601,7 +765,7 @@ def insert_rows(
 
     # Validate rows before writing
     from .validation import list_validation_rules, validate_rows, ValidationError
-    rules = list_validation_rules(table_name)
+    rules = list_validation_rules(table_name) if branch is None else []
     if rules:
         # For unique checks, load existing data
         existing_data = None
@@ -621,19 +785,25 @@ def insert_rows(
 
     # Create Arrow table and append
     arrow_table = pa.table(arrow_arrays)
-    table.append(arrow_table)
+    with span("catalog.commit", table=table_name, op="append", rows=arrow_table.num_rows):
+        table.append(arrow_table, branch=branch or MAIN_BRANCH)
 
     from .audit import log_operation
-    log_operation(table_name, "insert", rows_affected=len(rows))
+    log_operation(table_name, "insert", rows_affected=len(rows), details={"branch": branch} if branch else None)
+    if not branch:
+        from .auto_refresh import notify_commit
+        notify_commit(catalog, table_name)
 
     return len(rows)
 
 
+@traced("catalog.update_rows")
 def update_rows(
     catalog: Catalog,
     table_name: str,
     filter_expr: str,
     updates: dict,
+    branch: Optional[str] = None,
 ) -> int:
     """Update rows in an Iceberg table matching a filter.
 
@@ -642,6 +812,8 @@ def update_rows(
         table_name: Name of the table (with or without namespace)
         filter_expr: SQL WHERE clause (e.g., "id = 5" or "category = 'groceries'")
         updates: Dictionary of column names to new values
+        branch: Staging branch to read and write instead of main; staged
+            rows skip per-row validation and are audited before publish
 
     Returns:
         Number of rows updated
@@ -664,9 +836,12 @@ def update_rows(
 
     # Load table
     try:
-        table = catalog.load_table(table_name)
+        with span("catalog.load_table", table=table_name):
+            table = catalog.load_table(table_name)
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
+    if branch is not None and branch not in table.metadata.refs:
+        raise ValueError(f"Branch '{branch}' not found on '{table_name}'")
 
     schema = table.schema()
     field_names = {field.name for field in schema.fields}
@@ -678,7 +853,8 @@ def update_rows(
 
     # Read all data from the table
     try:
-        arrow_table = table.scan().to_arrow()
+        with span("catalog.scan", table=table_name):
+            arrow_table = _scan_ref(table, branch).to_arrow()
     except Exception:
         # Table might be empty
         return 0
@@ -727,11 +903,12 @@ def update_rows(
     select_sql = f"SELECT {', '.join(select_parts)} FROM source_table"
 
     # Execute and get updated table
-    updated_arrow = conn.execute(select_sql).fetch_arrow_table()
+    with span("duckdb.execute", step="apply_updates"):
+        updated_arrow = conn.execute(select_sql).fetch_arrow_table()
 
     # Validate the updated rows before writing
     from .validation import list_validation_rules, validate_rows, ValidationError
-    rules = list_validation_rules(table_name)
+    rules = list_validation_rules(table_name) if branch is None else []
     if rules:
         # Extract the rows that were updated (matching the filter)
         matched_arrow = conn.execute(f"SELECT * FROM source_table WHERE {filter_expr}").fetch_arrow_table()
@@ -753,19 +930,27 @@ def update_rows(
     conn.close()
 
     # Overwrite the table with updated data
-    table.overwrite(updated_arrow)
+    with span("catalog.commit", table=table_name, op="overwrite", rows=updated_arrow.num_rows):
+        table.overwrite(updated_arrow, branch=branch or MAIN_BRANCH)
 
     from .audit import log_operation
-    log_operation(table_name, "update", rows_affected=match_count,
-                  details={"filter": filter_expr, "columns_updated": list(updates.keys())})
+    details = {"filter": filter_expr, "columns_updated": list(updates.keys())}
+    if branch:
+        details["branch"] = branch
+    log_operation(table_name, "update", rows_affected=match_count, details=details)
+    if not branch:
+        from .auto_refresh import notify_commit
+        notify_commit(catalog, table_name)
 
     return match_count
 
 
+@traced("catalog.delete_rows")
 def delete_rows(
     catalog: Catalog,
     table_name: str,
     filter_expr: str,
+    branch: Optional[str] = None,
 ) -> int:
     """Delete rows from an Iceberg table matching a filter.
 
@@ -773,6 +958,7 @@ def delete_rows(
         catalog: The Iceberg catalog
         table_name: Name of the table (with or without namespace)
         filter_expr: SQL WHERE clause (e.g., "id = 5" or "category = 'groceries'")
+        branch: Staging branch to read and write instead of main
 
     Returns:
         Number of rows deleted
@@ -791,13 +977,17 @@ def delete_rows(
 
     # Load table
     try:
-        table = catalog.load_table(table_name)
+        with span("catalog.load_table", table=table_name):
+            table = catalog.load_table(table_name)
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
+    if branch is not None and branch not in table.metadata.refs:
+        raise ValueError(f"Branch '{branch}' not found on '{table_name}'")
 
     # Read all data from the table
     try:
-        arrow_table = table.scan().to_arrow()
+        with span("catalog.scan", table=table_name):
+            arrow_table = _scan_ref(table, branch).to_arrow()
     except Exception:
         # Table might be empty
         return 0
@@ -818,15 +1008,22 @@ def delete_rows(
         return 0
 
     # Select rows that DON'T match the filter (i.e., keep these)
-    remaining_arrow = conn.execute(f"SELECT * FROM source_table WHERE NOT ({filter_expr})").fetch_arrow_table()
+    with span("duckdb.execute", step="filter_remaining"):
+        remaining_arrow = conn.execute(f"SELECT * FROM source_table WHERE NOT ({filter_expr})").fetch_arrow_table()
     conn.close()
 
     # Overwrite the table with remaining data
-    table.overwrite(remaining_arrow)
+    with span("catalog.commit", table=table_name, op="overwrite", rows=remaining_arrow.num_rows):
+        table.overwrite(remaining_arrow, branch=branch or MAIN_BRANCH)
 
     from .audit import log_operation
-    log_operation(table_name, "delete", rows_affected=match_count,
-                  details={"filter": filter_expr})
+    details = {"filter": filter_expr}
+    if branch:
+        details["branch"] = branch
+    log_operation(table_name, "delete", rows_affected=match_count, details=details)
+    if not branch:
+        from .auto_refresh import notify_commit
+        notify_commit(catalog, table_name)
 
     return match_count
 
@@ -974,9 +1171,11 @@ def expire_snapshots(
         retain_expire = {s.snapshot_id for s in all_snapshots if s.snapshot_id not in keep_ids}
         ids_to_expire = ids_to_expire | retain_expire if older_than else retain_expire
 
-    # Never expire the current snapshot
+    # Never expire the current snapshot, or the head of any branch or tag
+    # (branch clones and staged writes live on those refs)
     if current:
         ids_to_expire.discard(current.snapshot_id)
+    ids_to_expire -= {ref.snapshot_id for ref in table.metadata.refs.values()}
 
     if not ids_to_expire:
         msg = f"No snapshots to expire (retaining last {retain_last})" if retain_last else "No snapshots to expire"
@@ -1003,6 +1202,7 @@ def expire_snapshots(
 def execute_batch(
     catalog: Catalog,
     operations: list[dict],
+    wap: bool = False,
 ) -> list[dict]:
     """Execute multiple write operations as a batch.
 
@@ -1010,6 +1210,12 @@ def execute_batch(
     operations are NOT rolled back (Iceberg doesn't support cross-table
     transactions). The result includes status for each operation.
 
+    With ``wap`` (write-audit-publish) every table the batch touches gets a
+    staging branch: operations write there, the staged files are audited
+    column-wise once the batch is done, and every table is published only
+    if all audits pass. A failed operation or audit discards the branches,
+    so readers never see any part of the batch.
+
     Args:
         catalog: The Iceberg catalog
         operations: List of operation dicts, each with:
@@ -1018,13 +1224,28 @@ def execute_batch(
             - For insert: 'rows' (list of dicts)
             - For update: 'filter' (str) and 'updates' (dict)
             - For delete: 'filter' (str)
+        wap: Stage, audit and publish instead of writing to main directly
 
     Returns:
-        List of result dicts with status for each operation
+        List of result dicts with status for each operation; in WAP mode
+        operations that ran but were not published are 'rolled_back'
     """
     if not operations:
         raise ValueError("Operations list must not be empty")
 
+    from . import wap as wap_mod
+
+    staged: dict[str, str] = {}
+
+    def branch_for(table_name: str) -> Optional[str]:
+        if not wap:
+            return None
+        if "." not in table_name:
+            table_name = f"default.{table_name}"
+        if table_name not in staged:
+            staged[table_name] = wap_mod.stage_branch(catalog, table_name)
+        return staged[table_name]
+
     results = []
     for i, op in enumerate(operations):
         action = op.get("action")
@@ -1043,7 +1264,7 @@ def execute_batch(
                 if not rows:
                     results.append({"index": i, "status": "error", "message": "Missing 'rows' for insert"})
                     continue
-                count = insert_rows(catalog, table_name, rows)
+                count = insert_rows(catalog, table_name, rows, branch=branch_for(table_name))
                 results.append({
                     "index": i, "status": "ok", "action": "insert",
                     "table": table_name, "rows_affected": count,
@@ -1055,7 +1276,7 @@ def execute_batch(
                 if not filter_expr or not updates:
                     results.append({"index": i, "status": "error", "message": "Missing 'filter' or 'updates' for update"})
                     continue
-                count = update_rows(catalog, table_name, filter_expr, updates)
+                count = update_rows(catalog, table_name, filter_expr, updates, branch=branch_for(table_name))
                 results.append({
                     "index": i, "status": "ok", "action": "update",
                     "table": table_name, "rows_affected": count,
@@ -1066,7 +1287,7 @@ def execute_batch(
                 if not filter_expr:
                     results.append({"index": i, "status": "error", "message": "Missing 'filter' for delete"})
                     continue
-                count = delete_rows(catalog, table_name, filter_expr)
+                count = delete_rows(catalog, table_name, filter_expr, branch=branch_for(table_name))
                 results.append({
                     "index": i, "status": "ok", "action": "delete",
                     "table": table_name, "rows_affected": count,
@@ -1085,6 +1306,37 @@ def execute_batch(
                 results.append({"index": j, "status": "skipped", "message": "Skipped due to earlier failure"})
             break
 
+    if not staged:
+        return results
+
+    if any(r["status"] == "error" for r in results):
+        wap_mod.discard_all(catalog, staged)
+        message = "Not published: batch failed"
+    else:
+        outcome = wap_mod.audit_and_publish(catalog, staged)
+        if outcome["published"]:
+            for r in results:
+                if r["status"] == "ok":
+                    r["published"] = True
+            return results
+        message = f"Not published: {outcome['message']}"
+        failed: dict[str, list[str]] = {}
+        for f in outcome["failures"]:
+            failed.setdefault(f["table"], []).append(f["message"])
+        for r in results:
+            table = r.get("table") or ""
+            table = table if "." in table else f"default.{table}"
+            if r["status"] != "ok":
+                continue
+            if table in outcome["publishes"]:
+                r["published"] = True  # Published before a later table's publish failed
+            elif table in failed:
+                checks = {f["check"] for f in outcome["failures"] if f["table"] == table}
+                label = "Publish failed" if checks == {"publish"} else "Audit failed"
+                r.update({"status": "error", "message": f"{label}: {'; '.join(failed[table])}"})
+    for r in results:
+        if r["status"] == "ok" and not r.get("published"):
+            r.update({"status": "rolled_back", "message": message})
     return results
 
 
@@ -1177,6 +1429,7 @@ def alter_table(
     return msg
 
 
+@traced("catalog.upsert_rows")
 def upsert_rows(
     catalog: Catalog,
     table_name: str,
@@ -1212,7 +1465,8 @@ def upsert_rows(
 
     # Load table
     try:
-        table = catalog.load_table(table_name)
+        with span("catalog.load_table", table=table_name):
+            table = catalog.load_table(table_name)
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
 
@@ -1277,13 +1531,15 @@ def upsert_rows(
 
     # Read existing data
     try:
-        existing_arrow = table.scan().to_arrow()
+        with span("catalog.scan", table=table_name):
+            existing_arrow = table.scan().to_arrow()
     except Exception:
         existing_arrow = None
 
     if existing_arrow is None or existing_arrow.num_rows == 0:
         # No existing data - just insert everything
-        table.append(new_arrow)
+        with span("catalog.commit", table=table_name, op="append", rows=new_arrow.num_rows):
+            table.append(new_arrow)
         return {"inserted": len(rows), "updated": 0}
 
     # Use DuckDB to merge
@@ -1298,7 +1554,8 @@ def upsert_rows(
 
     # Count how many incoming rows match existing rows
     count_sql = f'SELECT COUNT(*) FROM incoming JOIN existing ON {join_cond}'
-    updated_count = conn.execute(count_sql).fetchone()[0]
+    with span("duckdb.execute", step="match_keys"):
+        updated_count = conn.execute(count_sql).fetchone()[0]
     inserted_count = len(rows) - updated_count
 
     # Build merged result:
@@ -1323,7 +1580,8 @@ def upsert_rows(
 
     merged_sql = f"{unmatched_existing_sql} UNION ALL SELECT {incoming_cols_sql} FROM incoming"
 
-    merged_arrow = conn.execute(merged_sql).fetch_arrow_table()
+    with span("duckdb.execute", step="merge"):
+        merged_arrow = conn.execute(merged_sql).fetch_arrow_table()
     conn.close()
 
     # Validate all incoming rows before writing
@@ -1335,11 +1593,14 @@ def upsert_rows(
             raise ValidationError(result["failures"])
 
     # Overwrite the table with merged data
-    table.overwrite(merged_arrow)
+    with span("catalog.commit", table=table_name, op="overwrite", rows=merged_arrow.num_rows):
+        table.overwrite(merged_arrow)
 
     from .audit import log_operation
     log_operation(table_name, "upsert", rows_affected=inserted_count + updated_count,
                   details={"inserted": inserted_count, "updated": updated_count})
+    from .auto_refresh import notify_commit
+    notify_commit(catalog, table_name)
 
     return {"inserted": inserted_count, "updated": updated_count}
 
@@ -1442,9 +1703,15 @@ def import_file(
     if_exists: str = "fail",
     delimiter: str = ",",
     has_header: bool = True,
+    wap: bool = False,
 ) -> dict:
     """Import data from a CSV or JSON file into an Iceberg table.
 
+    With ``wap`` the rows are written to a staging branch, audited there
+    (validation rules, contract constraints, batch quality) and published
+    to main only if the audit passes; a table created by a rejected import
+    is dropped again.
+
     Args:
         catalog: The Iceberg catalog
         file_path: Path to the file to import
@@ -1453,14 +1720,17 @@ def import_file(
         if_exists: What to do if the table already exists: 'fail', 'append', 'replace'
         delimiter: CSV delimiter character (default: ',')
         has_header: Whether CSV has a header row (default: True)
+        wap: Stage, audit and publish instead of writing to main directly
 
     Returns:
-        Dict with import details: table, rows_imported, format
+        Dict with import details: table, rows_imported, format (and the
+        audit message in WAP mode)
 
     Raises:
         FileNotFoundError: If file doesn't exist
         ValueError: If format is unsupported, table exists and if_exists='fail',
                      or schema is incompatible on append
+        ValidationError: If the staged rows fail the WAP audit
     """
     import pyarrow.csv as pa_csv
     import pyarrow.json as pa_json
@@ -1537,6 +1807,7 @@ def import_file(
     except Exception:
         table_exists = False
 
+    branch = MAIN_BRANCH
     if table_exists:
         if if_exists == "fail":
             raise ValueError(
@@ -1544,7 +1815,11 @@ def import_file(
                 f"Use --if-exists append or --if-exists replace."
             )
         elif if_exists == "replace":
-            table.overwrite(arrow_table)
+            if wap:
+                from .wap import stage_branch
+                branch = stage_branch(catalog, table_name)
+                table = catalog.load_table(table_name)
+            table.overwrite(arrow_table, branch=branch)
         elif if_exists == "append":
             # Validate schema compatibility: imported columns must match table columns
             table_schema = table.schema()
@@ -1578,13 +1853,20 @@ def import_file(
                     )
 
             arrow_table = pa.table(cast_arrays)
-            table.append(arrow_table)
+            if wap:
+                from .wap import stage_branch
+                branch = stage_branch(catalog, table_name)
+                table = catalog.load_table(table_name)
+            table.append(arrow_table, branch=branch)
         else:
             raise ValueError(f"Invalid if_exists value: '{if_exists}'. Use 'fail', 'append', or 'replace'.")
     else:
         # Create a new table from the imported schema
         iceberg_schema = _arrow_schema_to_iceberg(arrow_table.schema)
         catalog.create_table(identifier=table_name, schema=iceberg_schema)
+        if wap:
+            from .wap import stage_branch
+            branch = stage_branch(catalog, table_name)
         table = catalog.load_table(table_name)
 
         # Cast columns to match the Iceberg schema types
@@ -1597,13 +1879,29 @@ def import_file(
             cast_arrays[field.name] = col
 
         arrow_table = pa.table(cast_arrays)
-        table.append(arrow_table)
+        table.append(arrow_table, branch=branch)
 
-    return {
+    result = {
         "table": table_name,
         "rows_imported": arrow_table.num_rows,
         "format": file_format,
     }
+    if wap:
+        from .validation import ValidationError
+        from .wap import audit_and_publish
+
+        outcome = audit_and_publish(catalog, {table_name: branch})
+        if not outcome["published"]:
+            if not table_exists:
+                try:
+                    catalog.drop_table(table_name)
+                except Exception:
+                    pass  # Leaving the empty table behind is harmless
+            if any(f["check"] == "publish" for f in outcome["failures"]):
+                raise ValueError(outcome["message"])
+            raise ValidationError(outcome["failures"])
+        result["audit"] = outcome["audits"][table_name]["message"]
+    return result
 
 
 def _iceberg_type_to_arrow(type_str: str):
@@ -1980,20 +2278,77 @@ def _get_table_data_dir(table) -> Path:
     return base_path / "data"
 
 
-def _find_orphan_files(table) -> tuple[list[str], int]:
-    """Find orphan data files not referenced by any snapshot.
+def _referenced_files(table) -> set[str]:
+    """Paths of every data and delete file any snapshot of the table references.
 
-    Returns:
-        Tuple of (list_of_orphan_file_paths, total_orphan_bytes)
+    Covers all branches and tags, since their snapshots are in the table's
+    snapshot list. Each manifest is read once however many snapshots share it.
     """
-    # Collect all referenced file paths across all remaining snapshots
     referenced = set()
+    seen_manifests = set()
     for snapshot in table.snapshots():
         try:
-            for task in table.scan(snapshot_id=snapshot.snapshot_id).plan_files():
-                referenced.add(task.file.file_path)
+            manifests = snapshot.manifests(table.io)
         except Exception:
-            pass
+            continue
+        for manifest in manifests:
+            if manifest.manifest_path in seen_manifests:
+                continue
+            seen_manifests.add(manifest.manifest_path)
+            for entry in manifest.fetch_manifest_entry(table.io, discard_deleted=True):
+                referenced.add(entry.data_file.file_path)
+    return referenced
+
+
+def _register_metadata_copy(catalog: Catalog, table_name: str, metadata, schema_id: int | None = None) -> Table:
+    """Register a new table whose metadata is a copy of ``metadata`` with no history.
+
+    Schemas (with their field ids), partition specs, sort orders and
+    properties carry over unchanged, so data files written for the original
+    table can be committed to the new one as they are. The copy gets the new
+    table's default location and a fresh uuid.
+    """
+    import datetime
+    import uuid
+
+    from pyiceberg.io import load_file_io
+    from pyiceberg.serializers import ToOutputFile
+
+    namespace, short_name = table_name.split(".", 1)
+    location = catalog._resolve_table_location(None, namespace, short_name)
+    updates = {
+        "location": location,
+        "table_uuid": uuid.uuid4(),
+        "last_updated_ms": int(datetime.datetime.now(datetime.timezone.utc).timestamp() * 1000),
+        "current_schema_id": schema_id if schema_id is not None else metadata.current_schema_id,
+        "current_snapshot_id": None,
+        "snapshots": [],
+        "snapshot_log": [],
+        "metadata_log": [],
+        "refs": {},
+        "statistics": [],
+        "partition_statistics": [],
+        "last_sequence_number": 0,
+    }
+    fresh = metadata.model_copy(update={k: v for k, v in updates.items() if k in type(metadata).model_fields})
+    metadata_location = f"{location}/metadata/00000-{uuid.uuid4()}.metadata.json"
+    ToOutputFile.table_metadata(fresh, load_file_io(catalog.properties, location).new_output(metadata_location))
+    return catalog.register_table(table_name, metadata_location)
+
+
+def _find_orphan_files(table, shared: set[str] | frozenset = frozenset()) -> tuple[list[str], int]:
+    """Find orphan data files not referenced by any snapshot.
+
+    Args:
+        table: The table whose data directory is scanned
+        shared: Paths referenced by other tables (e.g. zero-copy clones);
+            these are never reported as orphans
+
+    Returns:
+        Tuple of (list_of_orphan_file_paths, total_orphan_bytes)
+    """
+    # Collect all referenced file paths across all remaining snapshots
+    referenced = _referenced_files(table) | set(shared)
 
     # Walk the data directory for actual files on disk
     data_dir = _get_table_data_dir(table)
@@ -2011,6 +2366,7 @@ def _find_orphan_files(table) -> tuple[list[str], int]:
     return orphan_files, orphan_bytes
 
 
+@traced("catalog.compact_table")
 def compact_table(
     catalog: Catalog,
     table_name: str,
@@ -2037,7 +2393,8 @@ def compact_table(
         table_name = f"default.{table_name}"
 
     try:
-        table = catalog.load_table(table_name)
+        with span("catalog.load_table", table=table_name):
+            table = catalog.load_table(table_name)
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
 
@@ -2046,7 +2403,8 @@ def compact_table(
 
     # Read all current data
     try:
-        arrow_table = table.scan().to_arrow()
+        with span("catalog.scan", table=table_name):
+            arrow_table = table.scan().to_arrow()
     except Exception:
         arrow_table = None
 
@@ -2064,10 +2422,12 @@ def compact_table(
     row_count = arrow_table.num_rows
 
     # Overwrite with combined data (consolidates into fewer files)
-    table.overwrite(arrow_table)
+    with span("catalog.commit", table=table_name, op="overwrite", rows=row_count):
+        table.overwrite(arrow_table)
 
     # Re-load to get updated metadata
-    table = catalog.load_table(table_name)
+    with span("catalog.load_table", table=table_name):
+        table = catalog.load_table(table_name)
     files_after, size_after = _count_data_files(table)
 
     from .audit import log_operation
@@ -2115,7 +2475,8 @@ def maintenance_status(
     snapshot_count = len(list(table.snapshots()))
 
     # Count orphan files
-    orphan_files, orphan_bytes = _find_orphan_files(table)
+    from .cloning import shared_file_references
+    orphan_files, orphan_bytes = _find_orphan_files(table, shared_file_references(catalog, table_name))
 
     return {
         "table": table_name,
@@ -2154,7 +2515,9 @@ def cleanup_orphans(
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
 
-    orphan_files, orphan_bytes = _find_orphan_files(table)
+    # Files still used by a clone or by the table a clone was promoted into are not orphans
+    from .cloning import shared_file_references
+    orphan_files, orphan_bytes = _find_orphan_files(table, shared_file_references(catalog, table_name))
 
     if not orphan_files:
         return {
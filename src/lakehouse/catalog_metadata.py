@@ -5,11 +5,14 @@ import json
 from pathlib import Path
 from typing import Optional
 
+from .tracing import traced
+
 DEFAULT_CATALOG_META_PATH = Path.home() / ".lakehouse" / "catalog_metadata.json"
 
 VALID_CLASSIFICATIONS = {"pii", "financial", "public", "internal", "confidential"}
 
 
+@traced("store.catalog_metadata.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_CATALOG_META_PATH
     if not path.exists():
@@ -24,6 +27,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {"column_descriptions": {}, "classifications": {}, "glossary": {}}
 
 
+@traced("store.catalog_metadata.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_CATALOG_META_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
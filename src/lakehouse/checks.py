@@ -0,0 +1,89 @@
+"""Shared evaluation context for SLA, quality, contract and anomaly checks.
+
+A sweep usually asks several questions of the same table state: SLA checks
+need stats and a quality score, the quality score needs the same stats plus
+a validation pass over the rows, contract monitoring validates constraints
+over the rows again. A CheckContext lives for one run and memoizes loaded
+tables, their Arrow scans and any derived result per (table, snapshot id),
+so each snapshot is read once however many checks look at it.
+"""
+
+import threading
+from typing import Callable, Optional
+
+from .tracing import span
+
+DEFAULT_CHECK_WORKERS = 4
+
+
+class CheckContext:
+    """Per-run memo of table metadata, scans and check results.
+
+    Results are keyed by table and the snapshot the table was at when first
+    loaded in this context, so a context never mixes two states of a table.
+    Safe to share between threads: concurrent requests for the same result
+    wait for a single computation.
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._tables: dict[str, dict] = {}
+        self._results: dict[tuple, dict] = {}
+
+    def _entry(self, store: dict, key) -> dict:
+        with self._lock:
+            entry = store.get(key)
+            if entry is None:
+                entry = store[key] = {"lock": threading.Lock()}
+        return entry
+
+    def table(self, table_name: str):
+        """The table as loaded once for this run.
+
+        Raises:
+            ValueError: If the table is not found
+        """
+        entry = self._entry(self._tables, table_name)
+        with entry["lock"]:
+            if "value" not in entry:
+                try:
+                    entry["value"] = self.catalog.load_table(table_name)
+                except Exception as e:
+                    raise ValueError(f"Table '{table_name}' not found: {e}")
+        return entry["value"]
+
+    def snapshot_id(self, table_name: str) -> Optional[int]:
+        current = self.table(table_name).current_snapshot()
+        return current.snapshot_id if current else None
+
+    def memo(self, table_name: str, kind, compute: Callable):
+        """Return ``compute()`` once per (table, snapshot, kind) for this run.
+
+        ``kind`` names the result and any inputs besides the table state
+        (e.g. a store path); it must be hashable. Failures are not cached.
+        """
+        key = (table_name, self.snapshot_id(table_name), kind)
+        entry = self._entry(self._results, key)
+        with entry["lock"]:
+            if "value" in entry:
+                with self._lock:
+                    self.hits += 1
+            else:
+                entry["value"] = compute()
+                with self._lock:
+                    self.misses += 1
+        return entry["value"]
+
+    def arrow(self, table_name: str):
+        """The table's current snapshot as Arrow, scanned once per run."""
+        def scan():
+            table = self.table(table_name)
+            with span("checks.scan", table=table_name):
+                return table.scan().to_arrow()
+        return self.memo(table_name, "arrow", scan)
+
+    def summary(self) -> dict:
+        return {"tables": len(self._tables), "computed": self.misses, "reused": self.hits}
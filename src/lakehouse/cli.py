@@ -1,21 +1,56 @@
 """CLI for Iceberg Lakehouse."""
 
 import json
+import sys
+import time
 from pathlib import Path
 
 import click
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
+
+from ._lazy import deferred
+
+# Only commands that render tables/panels pay for importing them
+Table = deferred("rich.table", "Table")
+Panel = deferred("rich.panel", "Panel")
 
 console = Console()
 
 
 @click.group()
 @click.version_option(version="0.1.0")
-def main():
+@click.option("--profile", "profile_run", is_flag=True,
+              help="Trace the command and print a flame summary")
+@click.option("--profile-output", type=click.Path(path_type=Path), default=None,
+              help="Where to write the Chrome/Perfetto trace JSON (implies --profile)")
+@click.pass_context
+def main(ctx, profile_run: bool, profile_output: Path):
     """Iceberg Lakehouse - Local-first data lakehouse with LLM access."""
-    pass
+    if profile_run or profile_output:
+        from .tracing import clear, enable, span
+
+        clear()
+        enable()
+        ctx.call_on_close(lambda: _finish_profile(profile_output))
+        ctx.with_resource(span(f"cli.{ctx.invoked_subcommand}"))
+
+
+def _finish_profile(output: Path = None) -> None:
+    """Write the collected trace and print its flame summary to stderr."""
+    from .tracing import clear, disable, format_flame_summary, get_spans, write_trace
+
+    disable()
+    spans = get_spans()
+    clear()
+    err_console = Console(stderr=True)
+    try:
+        path = write_trace(output, spans)
+    except Exception as e:
+        err_console.print(f"[bold red]Error:[/bold red] Could not write trace: {e}")
+        return
+    err_console.print("\n[bold]Profile[/bold]")
+    err_console.print(format_flame_summary(spans), markup=False, highlight=False)
+    err_console.print(f"[dim]Trace written to {path} (open in https://ui.perfetto.dev)[/dim]")
 
 
 @main.command()
@@ -55,47 +90,117 @@ def init(with_sample_data: bool):
 
 @main.command()
 @click.argument("sql")
-@click.option("--max-rows", default=100, help="Maximum rows to return")
-@click.option("--format", "output_format", type=click.Choice(["table", "csv", "json"]), default="table")
+@click.option("--max-rows", type=int, default=None,
+              help="Maximum rows to return (default: 100 for table/json, no limit when streaming)")
+@click.option("--format", "output_format",
+              type=click.Choice(["table", "csv", "json", "ndjson", "parquet", "arrow"]), default=None,
+              help="Output format; csv/ndjson/parquet/arrow (Arrow IPC) stream batches "
+                   "(default: table, or from the --output extension)")
+@click.option("--output", "-o", type=click.Path(path_type=Path), default=None,
+              help="Write results to a file instead of stdout")
 @click.option("--as-of", default=None, help="Time travel: ISO timestamp or snapshot ID")
-@click.option("--table-name", default=None, help="Table name for time travel queries (required with --as-of)")
-def query(sql: str, max_rows: int, output_format: str, as_of: str, table_name: str):
-    """Execute a SQL query against the lakehouse."""
+@click.option("--table-name", default=None,
+              help="Only pin this table for --as-of (default: every table in the query)")
+@click.option("--explain", is_flag=True, help="Report whether a materialized view answered the query")
+def query(sql: str, max_rows: int, output_format: str, output: Path, as_of: str, table_name: str, explain: bool):
+    """Execute a SQL query against the lakehouse.
+
+    Streaming formats write Arrow batches as they are produced, so large
+    extracts can be piped or written to a file in bounded memory:
+
+        lakehouse query "SELECT * FROM expenses" --format ndjson | jq .
+
+        lakehouse query "SELECT * FROM expenses" -o expenses.parquet
+    """
     from .query import QueryEngine
+    from .streaming import STREAM_FORMATS, format_from_path, write_stream
 
+    if output_format is None:
+        output_format = format_from_path(output) if output is not None else "table"
+    if output is not None and output_format not in STREAM_FORMATS:
+        console.print(f"[bold red]Error:[/bold red] --output needs a streaming format: {', '.join(STREAM_FORMATS)}")
+        raise click.Abort()
     engine = QueryEngine()
+    err_console = Console(stderr=True)
+
+    def report_rewrite():
+        if not explain:
+            return
+        rewrite = engine.last_rewrite
+        if rewrite is None:
+            err_console.print("[dim]Rewrite: none (query ran against the source tables)[/dim]")
+        else:
+            err_console.print(f"[dim]Rewrite: {rewrite['message']}[/dim]")
+            err_console.print(f"[dim]  {rewrite['sql']}[/dim]")
 
     try:
-        if as_of:
-            if not table_name:
-                console.print("[bold red]Error:[/bold red] --table-name is required with --as-of")
-                raise click.Abort()
-            result = engine.execute_as_of(sql, table_name, as_of, max_rows=max_rows)
+        if output_format in STREAM_FORMATS:
+            conn, reader = engine.execute_stream(sql, table_name=table_name, as_of=as_of)
+            try:
+                format_start = time.perf_counter()
+                sink = output if output is not None else sys.stdout.buffer
+                written = write_stream(reader, sink, output_format, max_rows=max_rows)
+                engine.record_phase("format_ms", (time.perf_counter() - format_start) * 1000)
+            finally:
+                conn.close()
+            # Keep stdout clean for pipes; the summary goes to stderr
+            label = f"{written['rows']} rows" + (f", as of {as_of}" if as_of else "")
+            target = f" to {output}" if output is not None else ""
+            err_console.print(f"[dim]({label}{target})[/dim]")
+            report_rewrite()
+            return
+
+        max_rows = max_rows or 100
+        if output_format == "table":
+            # Render only the first page; the rest of the result is never fetched
+            conn, reader = engine.execute_stream(sql, batch_size=max_rows + 1, table_name=table_name, as_of=as_of)
+            try:
+                batches, rows = [], 0
+                for batch in reader:
+                    batches.append(batch)
+                    rows += batch.num_rows
+                    if rows > max_rows:
+                        break
+            finally:
+                conn.close()
+            import pyarrow as pa
+
+            result = pa.Table.from_batches(batches, schema=reader.schema)
+            more = result.num_rows > max_rows
+            result = result.slice(0, max_rows)
         else:
-            result = engine.execute(sql, max_rows=max_rows)
+            if as_of:
+                result = engine.execute_as_of(sql, table_name, as_of, max_rows=max_rows)
+            else:
+                result = engine.execute(sql, max_rows=max_rows)
+            more = False
 
-        if result.empty:
+        if len(result) == 0:
             console.print("[yellow]Query returned no results.[/yellow]")
+            report_rewrite()
             return
 
+        format_start = time.perf_counter()
         if output_format == "table":
             table = Table(show_header=True, header_style="bold magenta")
-            for col in result.columns:
+            for col in result.column_names:
                 table.add_column(str(col))
-            for _, row in result.iterrows():
+            columns = [result.column(i).to_pylist() for i in range(result.num_columns)]
+            for row in zip(*columns):
                 table.add_row(*[str(v) for v in row])
             console.print(table)
 
-        elif output_format == "csv":
-            print(result.to_csv(index=False))
-
         elif output_format == "json":
             print(result.to_json(orient="records", indent=2))
+        engine.record_phase("format_ms", (time.perf_counter() - format_start) * 1000)
 
         label = f"({len(result)} rows)"
         if as_of:
             label = f"({len(result)} rows, as of {as_of})"
+        if more:
+            label = f"(first {len(result)} rows; use --format csv/ndjson/parquet/arrow to stream all)"
         console.print(f"\n[dim]{label}[/dim]")
+        report_rewrite()
 
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -139,6 +244,57 @@ def snapshots(table_name: str):
         raise click.Abort()
 
 
+@main.command()
+@click.argument("table_name")
+@click.option("--select", "select_expr", default="COUNT(*) AS row_count", show_default=True,
+              help="Aggregate expressions evaluated per snapshot")
+@click.option("--where", default=None, help="SQL filter applied before aggregating")
+@click.option("--group-by", default=None, help="Extra grouping columns within each snapshot")
+@click.option("--last", type=int, default=None, help="Only the most recent N snapshots")
+@click.option("--since", default=None, help="Only snapshots committed at or after this ISO timestamp")
+@click.option("--until", default=None, help="Only snapshots committed at or before this ISO timestamp")
+@click.option("--format", "output_format", type=click.Choice(["table", "json"]), default="table", help="Output format")
+def series(table_name: str, select_expr: str, where: str, group_by: str, last: int, since: str, until: str,
+           output_format: str):
+    """Evaluate an aggregate across a table's snapshots, reading shared files once.
+
+    Examples:
+        lakehouse series expenses --last 50
+        lakehouse series expenses --select "SUM(amount) AS total" --group-by category
+        lakehouse series expenses --since 2026-01-01T00:00:00 --format json
+    """
+    from .catalog import get_catalog
+    from .series import query_snapshot_series
+
+    try:
+        result = query_snapshot_series(
+            get_catalog(), table_name, select=select_expr, where=where, group_by=group_by,
+            last=last, since=since, until=until,
+        )
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+    if output_format == "json":
+        console.print(json.dumps(result, indent=2, default=str))
+        return
+
+    if not result["rows"]:
+        console.print(f"[yellow]No snapshots of {table_name} in that range.[/yellow]")
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    for col in result["columns"]:
+        table.add_column(col)
+    for row in result["rows"]:
+        table.add_row(*["" if row[c] is None else str(row[c]) for c in result["columns"]])
+    console.print(table)
+    console.print(
+        f"\n[dim]{result['snapshots']} snapshots; read {result['files_read']} distinct files "
+        f"for {result['file_references']} file references in {result['duration_ms']}ms[/dim]"
+    )
+
+
 @main.command()
 @click.argument("table_name")
 @click.option("--from", "from_snapshot", required=True, help="Snapshot ID or ISO timestamp (older)")
@@ -348,12 +504,22 @@ def describe(table_name: str):
 @main.command()
 @click.option("--host", default="localhost", help="Host to bind to")
 @click.option("--port", default=8765, help="Port for SSE transport (not used for stdio)")
-def serve(host: str, port: int):
+@click.option("--metrics-port", type=int, default=None,
+              help="Expose Prometheus/OpenMetrics metrics on 127.0.0.1:<port>/metrics")
+def serve(host: str, port: int, metrics_port: int):
     """Start the MCP server for LLM access."""
+    import os
+
+    from .metrics import METRICS_PORT_ENV_VAR
     from .server import main as server_main
 
+    if metrics_port is not None:
+        os.environ[METRICS_PORT_ENV_VAR] = str(metrics_port)
+
     console.print("[bold blue]Starting MCP Server...[/bold blue]")
     console.print("Transport: stdio (for Claude Desktop)")
+    if metrics_port is not None:
+        console.print(f"Metrics: http://127.0.0.1:{metrics_port}/metrics")
     console.print("\nAdd to Claude Desktop config:")
     console.print(Panel('''{
   "mcpServers": {
@@ -462,7 +628,8 @@ def expire(table_name: str, older_than: str, retain_last: int):
 
 @main.command()
 @click.argument("json_operations")
-def batch(json_operations: str):
+@click.option("--wap", is_flag=True, help="Stage on branches, audit, and publish only if every table passes")
+def batch(json_operations: str, wap: bool):
     """Execute multiple operations as a batch.
 
     JSON_OPERATIONS is a JSON array of operation objects. Each needs:
@@ -470,6 +637,7 @@ def batch(json_operations: str):
 
     Example:
         lakehouse batch '[{"action":"insert","table_name":"expenses","rows":[{"id":10,"amount":50}]},{"action":"delete","table_name":"expenses","filter":"id = 3"}]'
+        lakehouse batch --wap '[{"action":"insert","table_name":"expenses","rows":[{"id":11,"amount":5}]}]'
     """
     import json
     from .catalog import get_catalog, execute_batch
@@ -487,11 +655,11 @@ def batch(json_operations: str):
     catalog = get_catalog()
 
     try:
-        results = execute_batch(catalog, operations)
+        results = execute_batch(catalog, operations, wap=wap)
 
         ok_count = sum(1 for r in results if r["status"] == "ok")
         err_count = sum(1 for r in results if r["status"] == "error")
-        skip_count = sum(1 for r in results if r["status"] == "skipped")
+        skip_count = sum(1 for r in results if r["status"] in ("skipped", "rolled_back"))
 
         console.print(f"\n[bold]Batch: {ok_count} succeeded, {err_count} failed, {skip_count} skipped[/bold]\n")
 
@@ -750,6 +918,7 @@ def query_vortex(vortex_path: str, sql: str, max_rows: int, table_name: str, out
             console.print("[yellow]Query returned no results.[/yellow]")
             return
 
+        format_start = time.perf_counter()
         if output_format == "table":
             table = Table(show_header=True, header_style="bold magenta")
             for col in result.columns:
@@ -763,6 +932,7 @@ def query_vortex(vortex_path: str, sql: str, max_rows: int, table_name: str, out
 
         elif output_format == "json":
             print(result.to_json(orient="records", indent=2))
+        engine.record_phase("format_ms", (time.perf_counter() - format_start) * 1000)
 
         console.print(f"\n[dim]({len(result)} rows)[/dim]")
 
@@ -822,6 +992,12 @@ def config_show():
     else:
         console.print("\n  [dim]No per-table format overrides.[/dim]")
 
+    from .config import get_query_limits
+
+    console.print("\n  [bold]Query limits:[/bold]")
+    for limit_name, value in get_query_limits().items():
+        console.print(f"    {limit_name}: [cyan]{value:,}[/cyan]")
+
 
 @config.command("set-format")
 @click.argument("format_name", type=click.Choice(["parquet", "vortex"]))
@@ -866,6 +1042,25 @@ def config_get_format(table: str):
         console.print(f"Default format: [cyan]{fmt}[/cyan]")
 
 
+@config.command("set-limit")
+@click.argument("limit_name", type=click.Choice(["max_bytes_scanned", "max_rows_scanned", "max_output_rows"]))
+@click.argument("value", type=int)
+def config_set_limit(limit_name: str, value: int):
+    """Set a query admission limit used to reject huge queries before they run.
+
+    Examples:
+        lakehouse config set-limit max_bytes_scanned 5000000000
+    """
+    from .config import set_query_limit
+
+    try:
+        set_query_limit(limit_name, value)
+        console.print(f"[bold green]✓ Set {limit_name} to {value:,}[/bold green]")
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+
 @alter.command("set-property")
 @click.argument("key")
 @click.argument("value")
@@ -943,12 +1138,14 @@ def alter_remove_property(ctx, key: str):
               help="File format (auto-detected from extension)")
 @click.option("--delimiter", default=",", help="CSV delimiter (default: ',')")
 @click.option("--header/--no-header", default=True, help="Whether CSV has headers (default: --header)")
-def import_file(file_path: str, table_name: str, if_exists: str, file_format: str, delimiter: str, header: bool):
+@click.option("--wap", is_flag=True, help="Stage on a branch, audit, and publish only if the audit passes")
+def import_file(file_path: str, table_name: str, if_exists: str, file_format: str, delimiter: str, header: bool, wap: bool):
     """Import data from a CSV or JSON file into a table.
 
     Examples:
         lakehouse import data.csv --table expenses
         lakehouse import data.csv --table expenses --if-exists append
+        lakehouse import data.csv --table expenses --if-exists append --wap
         lakehouse import data.json --table events
         lakehouse import data.ndjson --table events --if-exists replace
     """
@@ -963,12 +1160,15 @@ def import_file(file_path: str, table_name: str, if_exists: str, file_format: st
             if_exists=if_exists,
             delimiter=delimiter,
             has_header=header,
+            wap=wap,
         )
         console.print(
             f"[bold green]✓ Imported {result['rows_imported']:,} rows "
             f"from {file_path} into {result['table']}[/bold green]"
         )
         console.print(f"  Format: {result['format']}")
+        if result.get("audit"):
+            console.print(f"  {result['audit']}")
     except FileNotFoundError as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
         raise click.Abort()
@@ -1753,6 +1953,7 @@ def query_run(name: str, max_rows: int, output_format: str):
             console.print("[yellow]Query returned no results.[/yellow]")
             return
 
+        format_start = time.perf_counter()
         if output_format == "table":
             table = Table(show_header=True, header_style="bold magenta")
             for col in result.columns:
@@ -1766,6 +1967,7 @@ def query_run(name: str, max_rows: int, output_format: str):
 
         elif output_format == "json":
             print(result.to_json(orient="records", indent=2))
+        engine.record_phase("format_ms", (time.perf_counter() - format_start) * 1000)
 
         console.print(f"\n[dim]({len(result)} rows)[/dim]")
 
@@ -1795,21 +1997,37 @@ def query_delete(name: str):
 @main.command("query-history")
 @click.option("--limit", default=20, help="Number of history entries to show")
 @click.option("--clear", "clear_flag", is_flag=True, help="Clear all history")
-def query_history(limit: int, clear_flag: bool):
+@click.option("--sql", "history_sql", default=None, help="Run SQL over the execution history (view 'query_history')")
+def query_history(limit: int, clear_flag: bool, history_sql: str):
     """Show recent query history or clear it.
 
     Examples:
         lakehouse query-history
         lakehouse query-history --limit 50
         lakehouse query-history --clear
+        lakehouse query-history --sql "SELECT method, avg(duration_ms) FROM query_history GROUP BY 1"
     """
-    from .queries import get_history, clear_history
+    from .queries import get_history, clear_history, query_execution_history
 
     if clear_flag:
         result = clear_history()
         console.print(f"[bold green]✓ {result['message']}[/bold green]")
         return
 
+    if history_sql:
+        try:
+            result = query_execution_history(history_sql)
+        except Exception as e:
+            console.print(f"[bold red]Error:[/bold red] {e}")
+            raise click.Abort()
+        table = Table(show_header=True, header_style="bold cyan")
+        for col in result.columns:
+            table.add_column(str(col))
+        for _, row in result.head(limit).iterrows():
+            table.add_row(*[str(v) for v in row])
+        console.print(table)
+        return
+
     history = get_history(limit=limit)
 
     if not history:
@@ -1919,6 +2137,12 @@ def dashboard(as_json: bool):
         # Queries info
         console.print(f"\n  Saved Queries: {data['saved_queries_count']}")
         console.print(f"  Query History: {data['history_entries_count']} entries")
+        costs = data.get("query_costs")
+        if costs and costs["executions"]:
+            console.print(
+                f"  Executions: {costs['executions']} (avg {costs['avg_duration_ms']}ms, "
+                f"p95 {costs['p95_duration_ms']}ms, cache hit {costs['cache_hit_ratio']:.0%})"
+            )
 
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -2376,8 +2600,10 @@ def clone_group():
     Examples:
         lakehouse clone create expenses expenses_experiment
         lakehouse clone create expenses expenses_backup --as-of 2026-01-15
+        lakehouse clone create expenses experiment --branch
         lakehouse clone list
         lakehouse clone promote expenses_experiment expenses
+        lakehouse clone promote expenses@experiment expenses
         lakehouse clone discard expenses_experiment
     """
     pass
@@ -2387,7 +2613,8 @@ def clone_group():
 @click.argument("source_table")
 @click.argument("target_table")
 @click.option("--as-of", default=None, help="Snapshot ID or ISO timestamp for point-in-time clone")
-def clone_create(source_table: str, target_table: str, as_of: str):
+@click.option("--branch", "as_branch", is_flag=True, help="Create a branch on the source table (source@target)")
+def clone_create(source_table: str, target_table: str, as_of: str, as_branch: bool):
     """Clone a table (zero-copy)."""
     from .catalog import get_catalog
     from .cloning import clone_table
@@ -2395,7 +2622,9 @@ def clone_create(source_table: str, target_table: str, as_of: str):
     catalog = get_catalog()
 
     try:
-        result = clone_table(catalog, source_table, target_table, as_of=as_of)
+        result = clone_table(
+            catalog, source_table, target_table, as_of=as_of, mode="branch" if as_branch else "table",
+        )
         console.print(f"[bold green]✓ {result['message']}[/bold green]")
         if result["as_of"]:
             console.print(f"  Point-in-time: {result['as_of']}")
@@ -2420,6 +2649,7 @@ def clone_list():
     table.add_column("Clone")
     table.add_column("Source")
     table.add_column("Rows", justify="right")
+    table.add_column("Mode")
     table.add_column("Cloned At")
     table.add_column("As Of")
 
@@ -2428,6 +2658,7 @@ def clone_list():
             c["clone"],
             c["source_table"],
             str(c["row_count"]),
+            c["mode"],
             c["cloned_at"][:19],
             c.get("as_of") or "",
         )
@@ -2469,6 +2700,112 @@ def clone_discard(clone_table: str):
         raise click.Abort()
 
 
+@main.group("wap")
+def wap_group():
+    """Inspect and resolve write-audit-publish staging branches.
+
+    Examples:
+        lakehouse wap list expenses
+        lakehouse wap audit expenses wap_3f2a9c1b7d04
+        lakehouse wap publish expenses wap_3f2a9c1b7d04
+        lakehouse wap discard expenses wap_3f2a9c1b7d04
+    """
+    pass
+
+
+@wap_group.command("list")
+@click.argument("table_name")
+def wap_list(table_name: str):
+    """List staging branches open on a table."""
+    from .catalog import get_catalog
+    from .wap import list_staged
+
+    try:
+        staged = list_staged(get_catalog(), table_name)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+    if not staged:
+        console.print(f"[yellow]No staging branches on {table_name}.[/yellow]")
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Branch")
+    table.add_column("Snapshot", justify="right")
+    table.add_column("Files", justify="right")
+    table.add_column("Rows", justify="right")
+    table.add_column("Main Moved")
+    for s in staged:
+        table.add_row(s["branch"], str(s["snapshot_id"]), str(s["files"]), str(s["rows"]), "yes" if s["main_moved"] else "no")
+    console.print(table)
+
+
+@wap_group.command("audit")
+@click.argument("table_name")
+@click.argument("branch")
+@click.option("--min-quality", type=float, default=None, help="Minimum batch quality score (default: the contract's)")
+def wap_audit(table_name: str, branch: str, min_quality: float):
+    """Audit the files a staging branch added, without publishing."""
+    from .catalog import get_catalog
+    from .wap import audit_staged
+
+    try:
+        result = audit_staged(get_catalog(), table_name, branch, min_quality=min_quality)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+    if result["passed"]:
+        console.print(f"[bold green]✓ {result['message']}[/bold green]")
+    else:
+        console.print(f"[bold red]✗ {result['message']}[/bold red]")
+        for f in result["failures"]:
+            console.print(f"  [red]•[/red] [{f['check']}] {f['message']}")
+
+
+@wap_group.command("publish")
+@click.argument("table_name")
+@click.argument("branch")
+@click.option("--skip-audit", is_flag=True, help="Publish without auditing the staged files")
+def wap_publish(table_name: str, branch: str, skip_audit: bool):
+    """Audit a staging branch and publish it to main."""
+    from .catalog import get_catalog
+    from .wap import audit_staged, publish_staged
+
+    catalog = get_catalog()
+
+    try:
+        if not skip_audit:
+            audit = audit_staged(catalog, table_name, branch)
+            if not audit["passed"]:
+                console.print(f"[bold red]✗ {audit['message']}; not published[/bold red]")
+                for f in audit["failures"]:
+                    console.print(f"  [red]•[/red] [{f['check']}] {f['message']}")
+                raise click.Abort()
+        result = publish_staged(catalog, table_name, branch)
+        console.print(f"[bold green]✓ {result['message']}[/bold green]")
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+
+@wap_group.command("discard")
+@click.argument("table_name")
+@click.argument("branch")
+def wap_discard(table_name: str, branch: str):
+    """Drop a staging branch without publishing it."""
+    from .catalog import get_catalog
+    from .wap import discard_staged
+
+    try:
+        result = discard_staged(get_catalog(), table_name, branch)
+        console.print(f"[bold green]✓ {result['message']}[/bold green]")
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+
 @main.group("matview")
 def matview_group():
     """Manage materialized views (cached query results).
@@ -2577,8 +2914,13 @@ def matview_query(name: str, max_rows: int, output_format: str):
 
 @matview_group.command("refresh")
 @click.argument("name")
-def matview_refresh(name: str):
-    """Refresh a materialized view (re-execute SQL)."""
+@click.option("--full", is_flag=True, help="Re-execute the SQL even if only appended rows need merging")
+def matview_refresh(name: str, full: bool):
+    """Refresh a materialized view.
+
+    Aggregate views over one table merge only rows appended since the last
+    refresh; deletes, overwrites and other view shapes re-execute the SQL.
+    """
     from .catalog import get_catalog
     from .query import QueryEngine
     from .matviews import refresh_materialized_view
@@ -2587,7 +2929,7 @@ def matview_refresh(name: str):
     engine = QueryEngine(catalog=catalog)
 
     try:
-        result = refresh_materialized_view(name, engine, catalog)
+        result = refresh_materialized_view(name, engine, catalog, incremental=not full)
         console.print(f"[bold green]✓ {result['message']}[/bold green]")
     except ValueError as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -2937,15 +3279,22 @@ def pipeline_show(name: str):
 @pipeline_group.command("run")
 @click.argument("name")
 @click.option("--dry-run", is_flag=True, help="Validate SQL without executing")
-def pipeline_run(name: str, dry_run: bool):
-    """Run a pipeline."""
+@click.option("--workers", type=int, default=None, help="Steps to run concurrently (default: 4; 1 runs them in order)")
+@click.option("--wap", is_flag=True, help="Stage targets on branches, audit, and publish only if all pass")
+def pipeline_run(name: str, dry_run: bool, workers: int, wap: bool):
+    """Run a pipeline.
+
+    Independent steps run concurrently; targets are committed only after every step succeeds.
+    """
     try:
-        from lakehouse.pipelines import run_pipeline
+        from lakehouse.pipelines import DEFAULT_MAX_WORKERS, run_pipeline
         from lakehouse.catalog import get_catalog
         from lakehouse.query import QueryEngine
         catalog = get_catalog()
         engine = QueryEngine(catalog=catalog)
-        result = run_pipeline(name, catalog, engine, dry_run=dry_run)
+        result = run_pipeline(
+            name, catalog, engine, dry_run=dry_run, max_workers=workers or DEFAULT_MAX_WORKERS, wap=wap,
+        )
 
         if result["steps_failed"] > 0:
             console.print(f"[bold red]✗ {result['message']}[/bold red]")
@@ -2957,8 +3306,11 @@ def pipeline_run(name: str, dry_run: bool):
         table.add_column("SQL")
         table.add_column("Target")
         table.add_column("Rows", justify="right")
+        table.add_column("After")
         table.add_column("Status")
+        table.add_column("Start", justify="right")
         table.add_column("Time", justify="right")
+        table.add_column("Memory", justify="right")
         for r in result["step_results"]:
             rows = str(r.get("rows_affected", "-"))
             status_style = "green" if r["status"] in ("completed", "validated") else "red"
@@ -2967,10 +3319,18 @@ def pipeline_run(name: str, dry_run: bool):
                 r["sql"][:60],
                 r.get("target_table") or "-",
                 rows,
+                ", ".join(str(d) for d in r.get("depends_on", [])) or "-",
                 f"[{status_style}]{r['status']}[/{status_style}]",
+                f"{r['started_ms']}ms" if "started_ms" in r else "-",
                 f"{r['duration_ms']}ms",
+                f"{r['output_bytes'] / 1024:.1f} KB" if "output_bytes" in r else "-",
             )
         console.print(table)
+        if not dry_run:
+            committed = ", ".join(result["tables_committed"]) or "none"
+            console.print(
+                f"Loaded sources in {result['load_ms']}ms; committed {committed} in {result['commit_ms']}ms"
+            )
 
         if result["steps_failed"] > 0:
             for r in result["step_results"]:
@@ -3107,6 +3467,67 @@ def quality_report(json_out: bool):
         raise click.Abort()
 
 
+@quality_group.command("drift")
+@click.argument("table_name", required=False)
+@click.option("--metric", default=None, help="Only this metric (e.g. row_count, null_pct)")
+@click.option("--since", default=None, help="Score every point since this ISO timestamp (default: latest only)")
+@click.option("--window", default=30, help="Prior points each point is compared with")
+@click.option("--threshold", default=3.5, help="Robust z-score above which a point is flagged")
+@click.option("--seasonality", type=click.Choice(["hour_of_day", "day_of_week"]), default=None)
+def quality_drift(table_name: str, metric: str, since: str, window: int, threshold: float, seasonality: str):
+    """Find outliers in recorded metrics history across all tables.
+
+    Examples:
+        lakehouse quality drift
+        lakehouse quality drift orders --metric row_count --seasonality day_of_week
+    """
+    try:
+        from lakehouse.metrics_history import detect_metric_anomalies
+        anomalies = detect_metric_anomalies(
+            table_name=table_name, metric=metric, since=since,
+            window=window, threshold=threshold, seasonality=seasonality,
+        )
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+    if not anomalies:
+        console.print("[bold green]✓ No metric outliers.[/bold green]")
+        return
+
+    table = Table(title=f"Metric Outliers ({len(anomalies)})")
+    table.add_column("Table", style="cyan")
+    table.add_column("Column")
+    table.add_column("Metric")
+    table.add_column("Value", justify="right")
+    table.add_column("Typical", justify="right")
+    table.add_column("Score", justify="right")
+    table.add_column("Recorded")
+    for a in anomalies:
+        sev_style = "red" if a["severity"] == "critical" else "yellow"
+        table.add_row(
+            a["table"],
+            a.get("column") or "-",
+            a["metric"],
+            f"{a['value']:g}",
+            f"{a['expected']:g}",
+            f"[{sev_style}]{a['score'] if a['score'] is not None else 'inf'}[/{sev_style}]",
+            a["recorded_at"][:19],
+        )
+    console.print(table)
+
+
+@quality_group.command("compact-history")
+@click.option("--raw-days", default=30, help="Keep individual points this many days")
+@click.option("--keep-days", default=730, help="Drop metrics older than this many days")
+def quality_compact_history(raw_days: int, keep_days: int):
+    """Downsample and compact the metrics history."""
+    from lakehouse.metrics_history import compact_metrics_history
+
+    result = compact_metrics_history(raw_days=raw_days, keep_days=keep_days)
+    console.print(f"[green]{result['message']}[/green]")
+
+
 @quality_group.command("history")
 @click.argument("table_name")
 def quality_history(table_name: str):
@@ -3946,23 +4367,27 @@ def sla_remove(table_name: str):
 
 @sla.command("check")
 @click.argument("table_name", required=False)
-def sla_check(table_name: str):
+@click.option("--workers", default=4, help="Tables checked in parallel")
+@click.option("--full", is_flag=True, help="Rescan tables even if unchanged since their last pass")
+def sla_check(table_name: str, workers: int, full: bool):
     """Check SLA compliance.
 
     Examples:
         lakehouse sla check
         lakehouse sla check expenses
+        lakehouse sla check --full
     """
     from .sla import check_sla
 
     from .catalog import get_catalog
     catalog = get_catalog()
-    result = check_sla(catalog, table_name=table_name)
+    result = check_sla(catalog, table_name=table_name, max_workers=workers, skip_unchanged=not full)
 
     console.print(f"\n[bold]SLA Check: {result['message']}[/bold]\n")
     for t in result["tables"]:
         if t["status"] == "passing":
-            console.print(f"  [green]{t['table']}: PASSING[/green]")
+            unchanged = " [dim](unchanged)[/dim]" if t.get("skipped") else ""
+            console.print(f"  [green]{t['table']}: PASSING[/green]{unchanged}")
         elif t["status"] == "warning":
             console.print(f"  [yellow]{t['table']}: WARNING[/yellow]")
             for w in t["warnings"]:
@@ -4093,6 +4518,66 @@ def optimize_partitions(table_name: str):
     console.print(table)
 
 
+@optimize.command("simulate")
+@click.argument("table_name")
+@click.option("--partition", "-p", "partitions", multiple=True, help="Candidate partition spec, e.g. 'month(date)' or 'month(date)+category' (repeatable)")
+@click.option("--sort", "-s", "sorts", multiple=True, help="Candidate sort order, comma-separated columns (repeatable)")
+@click.option("--limit", "-n", default=100, help="Max history entries to replay")
+def optimize_simulate(table_name: str, partitions: tuple, sorts: tuple, limit: int):
+    """Simulate recorded queries against candidate partition specs and sort orders.
+
+    Without --partition/--sort, candidates are derived from frequently filtered columns.
+
+    Examples:
+        lakehouse optimize simulate expenses
+        lakehouse optimize simulate expenses -p "identity(category)" -s amount
+    """
+    from .catalog import get_catalog
+    from .optimizer import simulate_layouts
+
+    catalog = get_catalog()
+    partition_candidates = [[f.strip() for f in p.split("+") if f.strip()] for p in partitions] or None
+    sort_candidates = [[c.strip() for c in s.split(",") if c.strip()] for s in sorts] or None
+    if partition_candidates is not None and sort_candidates is None:
+        sort_candidates = []
+    if sort_candidates is not None and partition_candidates is None:
+        partition_candidates = []
+
+    try:
+        result = simulate_layouts(
+            catalog, table_name,
+            partition_candidates=partition_candidates,
+            sort_candidates=sort_candidates,
+            limit=limit,
+        )
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+
+    console.print(f"[bold]{result['message']}[/bold]\n")
+
+    table = Table(title=f"Layout Simulation for '{result['table']}'")
+    table.add_column("Layout", style="cyan")
+    table.add_column("Files", style="green")
+    table.add_column("Files Scanned", style="yellow")
+    table.add_column("Bytes Scanned", style="yellow")
+    table.add_column("Reduction", style="bold")
+    table.add_column("Rewrite (bytes)", style="magenta")
+    for layout in result["layouts"]:
+        reduction = layout["scan_reduction_pct"]
+        style = "green" if reduction > 0 else "red" if reduction < 0 else "white"
+        name = f"{layout['name']} (current)" if layout["is_current"] else layout["name"]
+        table.add_row(
+            name,
+            str(layout["file_count"]),
+            f"{layout['files_scanned']:,}",
+            f"{layout['bytes_scanned']:,}",
+            f"[{style}]{reduction}%[/{style}]",
+            f"{layout['rewrite_cost']['bytes_written']:,}",
+        )
+    console.print(table)
+
+
 @optimize.command("materializations")
 @click.option("--limit", "-n", default=100, help="Max history entries to analyze")
 def optimize_materializations(limit: int):
@@ -4184,7 +4669,12 @@ def optimize_cost(sql: str):
     table.add_column("Value", style="green")
     table.add_row("Complexity", result["complexity"])
     table.add_row("Estimated Rows Scanned", f"{result['estimated_rows_scanned']:,}")
+    table.add_row("Estimated Output Rows", f"{result['estimated_output_rows']:,}")
     table.add_row("Total Source Rows", f"{result['total_source_rows']:,}")
+    table.add_row("Files Scanned", f"{result['files_scanned']:,} / {result['files_planned']:,}")
+    table.add_row("Bytes Scanned", f"{result['bytes_scanned']:,}")
+    if result["join_fan_out"] is not None:
+        table.add_row("Join Fan-out", f"{result['join_fan_out']}x")
     table.add_row("Has Filter", "Yes" if result["has_filter"] else "No")
     table.add_row("Has Join", "Yes" if result["has_join"] else "No")
     table.add_row("Has Aggregation", "Yes" if result["has_aggregation"] else "No")
@@ -4193,10 +4683,18 @@ def optimize_cost(sql: str):
     if result["tables_involved"]:
         t2 = Table(title="Tables Involved")
         t2.add_column("Table", style="cyan")
-        t2.add_column("Estimated Rows", style="green")
-        t2.add_column("Size (bytes)", style="yellow")
+        t2.add_column("Rows", style="green")
+        t2.add_column("After Filter", style="green")
+        t2.add_column("Files Scanned", style="yellow")
+        t2.add_column("Bytes Scanned", style="yellow")
         for td in result["tables_involved"]:
-            t2.add_row(td["table"], f"{td['estimated_rows']:,}", f"{td['size_bytes']:,}")
+            t2.add_row(
+                td["table"],
+                f"{td['estimated_rows']:,}",
+                f"{td['estimated_rows_after_filter']:,}",
+                f"{td['files_scanned']} / {td['files_total']}",
+                f"{td['bytes_scanned']:,}",
+            )
         console.print(t2)
 
 
@@ -4209,12 +4707,15 @@ def backup():
 @backup.command("create")
 @click.argument("table_name")
 @click.option("--output", "-o", default=None, help="Output directory")
-def backup_create(table_name: str, output: str):
+@click.option("--incremental", is_flag=True, help="Copy Iceberg files into the content-addressed store")
+@click.option("--workers", default=4, type=int, help="Files copied concurrently (incremental only)")
+def backup_create(table_name: str, output: str, incremental: bool, workers: int):
     """Backup a table to a compressed archive.
 
     Examples:
         lakehouse backup create expenses
         lakehouse backup create expenses --output /tmp/backups
+        lakehouse backup create expenses --incremental
     """
     from pathlib import Path
     from .catalog import get_catalog
@@ -4222,18 +4723,27 @@ def backup_create(table_name: str, output: str):
 
     catalog = get_catalog()
     output_dir = Path(output) if output else None
-    result = backup_table(catalog, table_name, output_dir=output_dir)
+    try:
+        result = backup_table(
+            catalog, table_name, output_dir=output_dir, incremental=incremental, max_workers=workers,
+        )
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
     console.print(f"[green]{result['message']}[/green]")
 
 
 @backup.command("create-ns")
 @click.argument("namespace")
 @click.option("--output", "-o", default=None, help="Output directory")
-def backup_create_ns(namespace: str, output: str):
+@click.option("--incremental", is_flag=True, help="Copy Iceberg files into the content-addressed store")
+@click.option("--workers", default=4, type=int, help="Files copied concurrently (incremental only)")
+def backup_create_ns(namespace: str, output: str, incremental: bool, workers: int):
     """Backup all tables in a namespace.
 
     Examples:
         lakehouse backup create-ns default
+        lakehouse backup create-ns default --incremental --workers 8
     """
     from pathlib import Path
     from .catalog import get_catalog
@@ -4241,7 +4751,9 @@ def backup_create_ns(namespace: str, output: str):
 
     catalog = get_catalog()
     output_dir = Path(output) if output else None
-    result = backup_namespace(catalog, namespace, output_dir=output_dir)
+    result = backup_namespace(
+        catalog, namespace, output_dir=output_dir, incremental=incremental, max_workers=workers,
+    )
     console.print(f"[green]{result['message']}[/green]")
     for tbl in result.get("tables", []):
         console.print(f"  • {tbl}")
@@ -4251,21 +4763,87 @@ def backup_create_ns(namespace: str, output: str):
 @click.argument("archive")
 @click.option("--name", default=None, help="Rename table on restore")
 @click.option("--overwrite", is_flag=True, help="Overwrite existing table")
-def backup_restore(archive: str, name: str, overwrite: bool):
+@click.option("--snapshot-id", default=None, type=int, help="Backed-up snapshot to restore (incremental backups)")
+def backup_restore(archive: str, name: str, overwrite: bool, snapshot_id: int):
     """Restore a table from a backup archive.
 
     Examples:
         lakehouse backup restore ~/.lakehouse/backups/expenses_20260215.tar.gz
         lakehouse backup restore archive.tar.gz --name new_expenses --overwrite
+        lakehouse backup restore expenses_20260215_020000_000000.backup.json --snapshot-id 123
     """
     from .catalog import get_catalog
     from .backup import restore_table
 
     catalog = get_catalog()
-    result = restore_table(catalog, archive, table_name=name, overwrite=overwrite)
+    try:
+        result = restore_table(catalog, archive, table_name=name, overwrite=overwrite, snapshot_id=snapshot_id)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
     console.print(f"[green]{result['message']}[/green]")
 
 
+@backup.command("restore-ns")
+@click.argument("archive")
+@click.option("--overwrite", is_flag=True, help="Overwrite existing tables")
+@click.option("--workers", default=4, type=int, help="Tables restored concurrently")
+def backup_restore_ns(archive: str, overwrite: bool, workers: int):
+    """Restore every table in a namespace backup.
+
+    Examples:
+        lakehouse backup restore-ns ~/.lakehouse/backups/ns_default_20260215.tar.gz --overwrite
+    """
+    from .catalog import get_catalog
+    from .backup import restore_namespace
+
+    catalog = get_catalog()
+    try:
+        result = restore_namespace(catalog, archive, overwrite=overwrite, max_workers=workers)
+    except (FileNotFoundError, ValueError) as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
+    console.print(f"[green]{result['message']}[/green]")
+    for entry in result["restored"]:
+        console.print(f"  ✓ {entry['table']} ({entry['rows']} rows)")
+    for error in result["errors"]:
+        console.print(f"  ✗ {error}")
+
+
+@backup.command("snapshots")
+@click.argument("table_name")
+@click.option("--dir", "backup_dir", default=None, help="Backup directory")
+def backup_snapshots(table_name: str, backup_dir: str):
+    """List snapshots of a table restorable from incremental backups.
+
+    Examples:
+        lakehouse backup snapshots expenses
+    """
+    from pathlib import Path
+    from .backup import list_backup_snapshots
+
+    snapshots = list_backup_snapshots(table_name, Path(backup_dir) if backup_dir else None)
+    if not snapshots:
+        console.print("[dim]No backed-up snapshots found.[/dim]")
+        return
+
+    table = Table(title=f"Backed-up Snapshots: {table_name}")
+    table.add_column("Snapshot", style="cyan")
+    table.add_column("Timestamp", style="dim")
+    table.add_column("Operation", style="green")
+    table.add_column("Rows", style="yellow")
+    table.add_column("Backup", style="bold")
+    for snap in snapshots:
+        table.add_row(
+            str(snap["snapshot_id"]),
+            snap["timestamp"][:19],
+            snap.get("operation") or "",
+            str(snap["row_count"]),
+            Path(snap["archive"]).name,
+        )
+    console.print(table)
+
+
 @backup.command("list")
 @click.option("--dir", "backup_dir", default=None, help="Backup directory")
 def backup_list(backup_dir: str):
@@ -4612,7 +5190,13 @@ main.add_command(notify)
 @click.option("--url", default=None, help="Webhook URL (for webhook type)")
 @click.option("--command", default=None, help="Shell command (for shell type)")
 @click.option("--file", "log_file", default=None, help="Log file path (for log type)")
-def notify_add(table_name: str, event: str, handler_type: str, url: str, command: str, log_file: str):
+@click.option("--batch-size", default=None, type=int, help="Deliver up to N queued events per call")
+@click.option("--concurrency", default=None, type=int, help="Max deliveries in flight for this handler")
+@click.option("--max-attempts", default=None, type=int, help="Attempts before a delivery is dead-lettered")
+def notify_add(
+    table_name: str, event: str, handler_type: str, url: str, command: str, log_file: str,
+    batch_size: int, concurrency: int, max_attempts: int,
+):
     """Register a notification handler for table events."""
     from .notifications import register_handler
 
@@ -4629,8 +5213,15 @@ def notify_add(table_name: str, event: str, handler_type: str, url: str, command
         if not log_file:
             raise click.UsageError("--file required for log handler")
         config["file"] = log_file
+    for key, value in (("batch_size", batch_size), ("max_concurrency", concurrency), ("max_attempts", max_attempts)):
+        if value is not None:
+            config[key] = value
 
-    result = register_handler(table_name, event, handler_type, config)
+    try:
+        result = register_handler(table_name, event, handler_type, config)
+    except ValueError as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        raise click.Abort()
     console.print(f"[green]{result['message']}[/green]")
     console.print(f"Handler ID: [bold]{result['handler_id']}[/bold]")
 
@@ -4695,13 +5286,65 @@ def notify_history(table: str, event: str, limit: int):
     table_obj.add_column("Table")
     table_obj.add_column("Event")
     table_obj.add_column("Handlers")
+    table_obj.add_column("Delivered")
 
     for entry in history:
+        results = entry.get("results", [])
+        delivered = sum(1 for r in results if r.get("status") in ("delivered", "success"))
         table_obj.add_row(
             entry.get("fired_at", "")[:19],
             entry["table"],
             entry["event_type"],
             str(entry["handlers_triggered"]),
+            f"{delivered}/{len(results)}",
+        )
+    console.print(table_obj)
+
+
+@notify.command("flush")
+@click.option("--timeout", default=30.0, help="Seconds to wait for queued deliveries")
+def notify_flush(timeout: float):
+    """Deliver queued notifications and wait for them to finish."""
+    from .notifications import flush_notifications
+
+    result = flush_notifications(timeout=timeout)
+    color = "green" if not (result["pending"] or result["in_flight"] or result["dead"]) else "yellow"
+    console.print(f"[{color}]{result['message']}[/{color}]")
+
+
+@notify.command("dead-letters")
+@click.option("--handler", "handler_id", default=None, help="Only this handler's deliveries")
+@click.option("--retry", is_flag=True, help="Queue the dead-lettered deliveries again")
+def notify_dead_letters(handler_id: str, retry: bool):
+    """List (or retry) deliveries that failed every attempt."""
+    from .notifications import list_dead_letters, retry_dead_letters
+
+    if retry:
+        result = retry_dead_letters(handler_id=handler_id)
+        console.print(f"[green]{result['message']}[/green]")
+        return
+
+    dead = list_dead_letters(handler_id=handler_id)
+    if not dead:
+        console.print("[green]No dead-lettered deliveries[/green]")
+        return
+
+    table_obj = Table(title="Dead Letters")
+    table_obj.add_column("Handler", style="cyan")
+    table_obj.add_column("Table")
+    table_obj.add_column("Event")
+    table_obj.add_column("Fired")
+    table_obj.add_column("Attempts", justify="right")
+    table_obj.add_column("Error")
+
+    for d in dead:
+        table_obj.add_row(
+            d["handler_id"],
+            d["event"]["table"],
+            d["event"]["event_type"],
+            d["event"]["timestamp"][:19],
+            str(d["attempts"]),
+            (d["error"] or "")[:60],
         )
     console.print(table_obj)
 
@@ -4894,7 +5537,8 @@ main.add_command(auto_refresh)
 @click.option("--matviews/--no-matviews", default=True, help="Refresh materialized views")
 @click.option("--pipelines/--no-pipelines", default=True, help="Re-run pipelines")
 @click.option("--caches/--no-caches", default=True, help="Invalidate caches")
-def auto_refresh_enable(table_name: str, depth: int, matviews: bool, pipelines: bool, caches: bool):
+@click.option("--debounce", default=1.0, help="Seconds to coalesce refresh requests for the table")
+def auto_refresh_enable(table_name: str, depth: int, matviews: bool, pipelines: bool, caches: bool, debounce: float):
     """Enable auto-refresh for a table."""
     from .auto_refresh import set_auto_refresh
     result = set_auto_refresh(table_name, enabled=True, config={
@@ -4902,6 +5546,7 @@ def auto_refresh_enable(table_name: str, depth: int, matviews: bool, pipelines:
         "refresh_matviews": matviews,
         "rerun_pipelines": pipelines,
         "invalidate_caches": caches,
+        "debounce_seconds": debounce,
     })
     console.print(f"[green]{result['message']}[/green]")
 
@@ -4931,6 +5576,7 @@ def auto_refresh_list():
     table.add_column("Matviews")
     table.add_column("Pipelines")
     table.add_column("Caches")
+    table.add_column("Debounce")
 
     for c in configs:
         table.add_row(
@@ -4940,6 +5586,7 @@ def auto_refresh_list():
             "Yes" if c.get("refresh_matviews", True) else "No",
             "Yes" if c.get("rerun_pipelines", True) else "No",
             "Yes" if c.get("invalidate_caches", True) else "No",
+            f"{c.get('debounce_seconds', 1.0)}s",
         )
     console.print(table)
 
@@ -4965,15 +5612,28 @@ def auto_refresh_plan(table_name: str):
 
 
 @auto_refresh.command("trigger")
-@click.argument("table_name")
-def auto_refresh_trigger(table_name: str):
-    """Manually trigger cascade refresh."""
+@click.argument("table_names", nargs=-1, required=True)
+@click.option("--workers", default=4, help="Refresh actions to run at once within a lineage level")
+def auto_refresh_trigger(table_names: tuple, workers: int):
+    """Manually trigger cascade refresh (several tables share one cascade)."""
     from .catalog import get_catalog
-    from .auto_refresh import trigger_refresh
+    from .auto_refresh import run_refresh
     catalog = get_catalog()
-    result = trigger_refresh(catalog, table_name)
+    result = run_refresh(catalog, list(table_names), max_workers=workers)
     console.print(f"[bold]{result['message']}[/bold]")
 
+    if result["results"]:
+        table = Table(title="Refresh Actions")
+        table.add_column("Level", justify="right")
+        table.add_column("Table", style="cyan")
+        table.add_column("Action")
+        table.add_column("Status")
+        table.add_column("Time", justify="right")
+        for r in result["results"]:
+            status = r["status"] if not r.get("reason") else f"{r['status']} ({r['reason']})"
+            table.add_row(str(r["level"]), r["table"], r["action"], status, f"{r['duration_ms']}ms")
+        console.print(table)
+
 
 @auto_refresh.command("history")
 @click.option("--table", default=None, help="Filter by table")
@@ -5545,25 +6205,35 @@ def contract_trends_cmd(table_name: str, days: int):
 @main.command()
 @click.option("--rows", default="100,1000,10000", help="Comma-separated row counts to benchmark")
 @click.option("--output", "-o", default=None, help="Output markdown file (default: print to stdout)")
-def benchmark(rows: str, output: str):
+@click.option("--startup", is_flag=True, help="Measure CLI/MCP cold start (import time, time-to-first-response) instead")
+def benchmark(rows: str, output: str, startup: bool):
     """Run Parquet vs Vortex performance benchmarks.
 
     Examples:
         lakehouse benchmark
         lakehouse benchmark --rows 1000,10000,100000
         lakehouse benchmark -o docs/benchmarks.md
+        lakehouse benchmark --startup
     """
-    from benchmarks.format_comparison import run_benchmarks, generate_report
+    if startup:
+        from benchmarks.startup import run_startup_benchmarks, generate_report as generate_startup_report
+
+        console.print("[bold blue]Measuring cold start...[/bold blue]\n")
+    else:
+        from benchmarks.format_comparison import run_benchmarks, generate_report
 
-    row_counts = [int(x.strip()) for x in rows.split(",")]
+        row_counts = [int(x.strip()) for x in rows.split(",")]
 
-    console.print(f"[bold blue]Running benchmarks...[/bold blue]")
-    console.print(f"  Row counts: {', '.join(f'{n:,}' for n in row_counts)}")
-    console.print(f"  Data types: numeric, string, mixed\n")
+        console.print(f"[bold blue]Running benchmarks...[/bold blue]")
+        console.print(f"  Row counts: {', '.join(f'{n:,}' for n in row_counts)}")
+        console.print(f"  Data types: numeric, string, mixed\n")
 
     try:
-        results = run_benchmarks(row_counts=row_counts)
-        report = generate_report(results, row_counts)
+        if startup:
+            report = generate_startup_report(run_startup_benchmarks())
+        else:
+            results = run_benchmarks(row_counts=row_counts)
+            report = generate_report(results, row_counts)
 
         if output:
             from pathlib import Path
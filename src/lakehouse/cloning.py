@@ -1,15 +1,31 @@
-"""Table cloning and branching — zero-copy snapshots for safe experimentation."""
+"""Table cloning and branching — zero-copy snapshots for safe experimentation.
+
+Clones never copy data. A table clone is a new table whose metadata is a
+copy of the source's and whose first snapshot references the source's
+existing data files; a branch clone is an Iceberg branch ref on the source
+table itself. Either way a clone costs O(metadata) to create, and writes
+to it are copy-on-write: new and rewritten files land in the clone's own
+location (or on its branch) while the shared files stay untouched.
+
+Because tables may now reference files in another table's directory,
+orphan cleanup consults ``shared_file_references`` so a file is only
+deleted once no linked table uses it.
+"""
 
 import datetime
 import json
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
-import pyarrow as pa
+from .tracing import span, traced
+
+BRANCH_SEPARATOR = "@"
 
 DEFAULT_CLONES_PATH = Path.home() / ".lakehouse" / "clones.json"
 
 
+@traced("store.cloning.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_CLONES_PATH
     if not path.exists():
@@ -20,6 +36,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.cloning.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_CLONES_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -32,27 +49,64 @@ def _normalize_name(table_name: str) -> str:
     return table_name
 
 
+def _split_branch(clone_name: str) -> tuple[str, Optional[str]]:
+    """Split ``ns.table@branch`` into (``ns.table``, ``branch``)."""
+    if BRANCH_SEPARATOR in clone_name:
+        table_name, branch = clone_name.split(BRANCH_SEPARATOR, 1)
+        return _normalize_name(table_name), branch
+    return _normalize_name(clone_name), None
+
+
+def _resolve_source_snapshot(src_tbl, as_of: Optional[str]):
+    """The source snapshot a clone starts from (None for an empty table)."""
+    if not as_of:
+        return src_tbl.current_snapshot()
+    from .catalog import _resolve_snapshot_id
+    return src_tbl.snapshot_by_id(_resolve_snapshot_id(src_tbl, str(as_of)))
+
+
+def _snapshot_data_files(table, snapshot) -> list:
+    """DataFile entries live in ``snapshot``, as recorded in its manifests."""
+    if snapshot is None:
+        return []
+    files = []
+    for task in table.scan(snapshot_id=snapshot.snapshot_id).plan_files():
+        if task.delete_files:
+            raise ValueError(
+                f"Snapshot {snapshot.snapshot_id} has delete files; compact the table before cloning it"
+            )
+        files.append(task.file)
+    return files
+
+
 def clone_table(
     catalog,
     source_table: str,
     target_table: str,
     as_of: Optional[str] = None,
     store_path: Optional[Path] = None,
+    mode: str = "table",
 ) -> dict:
-    """Clone a table (copies data from source to new target table).
+    """Clone a table without copying its data.
 
     Args:
         catalog: Iceberg catalog
         source_table: Source table name
-        target_table: Target table name (must not exist)
+        target_table: Target table name (must not exist); in branch mode the
+            name of the branch to create on the source table
         as_of: Optional snapshot ID or timestamp for point-in-time clone
         store_path: Optional path to clones metadata store
+        mode: "table" registers a new table that references the source's
+            data files; "branch" creates an Iceberg branch on the source
+            table, addressed afterwards as ``source@branch``
 
     Returns:
         Dict with clone details.
     """
+    if mode not in ("table", "branch"):
+        raise ValueError(f"Unsupported clone mode '{mode}'. Use 'table' or 'branch'")
+
     source = _normalize_name(source_table)
-    target = _normalize_name(target_table)
 
     # Load source table
     try:
@@ -60,46 +114,49 @@ def clone_table(
     except Exception as e:
         raise ValueError(f"Source table '{source}' not found: {e}")
 
-    # Verify target doesn't exist
-    try:
-        catalog.load_table(target)
-        raise ValueError(f"Target table '{target}' already exists")
-    except ValueError:
-        raise
-    except Exception:
-        pass  # Table doesn't exist, good
-
-    # Read source data (optionally at a specific point in time)
-    source_snapshot_id = None
-    if as_of:
-        from .catalog import scan_as_of
-        arrow_data = scan_as_of(catalog, source, as_of)
-        # Determine which snapshot was used
-        try:
-            source_snapshot_id = int(as_of)
-        except (ValueError, TypeError):
-            # It was a timestamp — get the snapshot that was used
-            ts = datetime.datetime.fromisoformat(as_of)
-            if ts.tzinfo is None:
-                ts = ts.replace(tzinfo=datetime.timezone.utc)
-            timestamp_ms = int(ts.timestamp() * 1000)
-            snapshot = src_tbl.snapshot_as_of_timestamp(timestamp_ms)
-            source_snapshot_id = snapshot.snapshot_id if snapshot else None
+    snapshot = _resolve_source_snapshot(src_tbl, as_of)
+    source_snapshot_id = snapshot.snapshot_id if snapshot else None
+
+    if mode == "branch":
+        branch = target_table.split(".")[-1]
+        target = f"{source}{BRANCH_SEPARATOR}{branch}"
+        if branch in src_tbl.metadata.refs:
+            raise ValueError(f"Branch '{branch}' already exists on '{source}'")
+        if snapshot is None:
+            raise ValueError(f"Cannot branch '{source}': table has no snapshots")
+        with span("cloning.create_branch", table=source, branch=branch):
+            src_tbl.manage_snapshots().create_branch(snapshot.snapshot_id, branch).commit()
+        files_shared = None
     else:
-        arrow_data = src_tbl.scan().to_arrow()
-        current_snapshot = src_tbl.current_snapshot()
-        source_snapshot_id = current_snapshot.snapshot_id if current_snapshot else None
-
-    # Create target table with same schema
-    schema = src_tbl.schema()
-    catalog.create_table(identifier=target, schema=schema)
+        target = _normalize_name(target_table)
 
-    # Write data to target
-    target_tbl = catalog.load_table(target)
-    if len(arrow_data) > 0:
-        target_tbl.append(arrow_data)
-
-    row_count = len(arrow_data)
+        # Verify target doesn't exist
+        try:
+            catalog.load_table(target)
+            raise ValueError(f"Target table '{target}' already exists")
+        except ValueError:
+            raise
+        except Exception:
+            pass  # Table doesn't exist, good
+
+        from .catalog import _register_metadata_copy
+
+        data_files = _snapshot_data_files(src_tbl, snapshot)
+        with span("cloning.register", source=source, target=target, files=len(data_files)):
+            target_tbl = _register_metadata_copy(
+                catalog, target, src_tbl.metadata,
+                schema_id=snapshot.schema_id if snapshot is not None else None,
+            )
+            if data_files:
+                with target_tbl.transaction() as tx:
+                    with tx.update_snapshot(
+                        snapshot_properties={"lakehouse.clone-source": source}
+                    ).fast_append() as append:
+                        for data_file in data_files:
+                            append.append_data_file(data_file)
+        files_shared = len(data_files)
+
+    row_count = int(snapshot.summary.additional_properties.get("total-records", 0)) if snapshot and snapshot.summary else 0
 
     # Record clone metadata
     store = _load_store(store_path)
@@ -109,16 +166,19 @@ def clone_table(
         "cloned_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
         "row_count": row_count,
         "as_of": as_of,
+        "mode": mode,
     }
     _save_store(store, store_path)
 
     return {
         "source": source,
         "target": target,
+        "mode": mode,
         "row_count": row_count,
+        "files_shared": files_shared,
         "source_snapshot_id": source_snapshot_id,
         "as_of": as_of,
-        "message": f"Cloned {source} → {target} ({row_count} rows)",
+        "message": f"Cloned {source} → {target} ({row_count} rows, zero-copy {mode})",
     }
 
 
@@ -129,16 +189,68 @@ def list_clones(
     store = _load_store(store_path)
     result = []
     for name, meta in sorted(store.items()):
+        if meta.get("promoted_into"):
+            continue  # kept only as a file-sharing link
         result.append({
             "clone": name,
             "source_table": meta["source_table"],
             "cloned_at": meta["cloned_at"],
             "row_count": meta["row_count"],
             "as_of": meta.get("as_of"),
+            "mode": meta.get("mode", "table"),
         })
     return result
 
 
+def shared_file_references(
+    catalog,
+    table_name: str,
+    store_path: Optional[Path] = None,
+) -> set[str]:
+    """Files referenced by tables that may share data files with ``table_name``.
+
+    Follows clone links in both directions (source ↔ clone, clone → table it
+    was promoted into), transitively, and returns every data file path those
+    other tables reference. Branch clones live on the table itself, so their
+    files are already covered by the table's own snapshots.
+
+    Only tables that no longer exist are skipped; any other failure to read a
+    linked table propagates, so orphan cleanup stops rather than deleting
+    files that table may still use.
+    """
+    from pyiceberg.exceptions import NoSuchTableError
+    from .catalog import _referenced_files
+
+    table_name = _normalize_name(table_name)
+    store = _load_store(store_path)
+    neighbours: dict[str, set[str]] = {}
+    for name, meta in store.items():
+        clone, branch = _split_branch(name)
+        if branch is not None:
+            continue
+        for other in (meta.get("source_table"), meta.get("promoted_into")):
+            if other:
+                neighbours.setdefault(clone, set()).add(other)
+                neighbours.setdefault(other, set()).add(clone)
+
+    linked = set()
+    queue = deque([table_name])
+    while queue:
+        current = queue.popleft()
+        for other in neighbours.get(current, ()):
+            if other != table_name and other not in linked:
+                linked.add(other)
+                queue.append(other)
+
+    referenced = set()
+    for other in linked:
+        try:
+            referenced |= _referenced_files(catalog.load_table(other))
+        except NoSuchTableError:
+            continue  # dropped tables reference nothing
+    return referenced
+
+
 def promote_clone(
     catalog,
     clone_table_name: str,
@@ -147,14 +259,17 @@ def promote_clone(
 ) -> dict:
     """Replace the original table's data with the clone's data.
 
-    Reads all data from the clone and overwrites the original table.
+    Metadata-only: a branch clone fast-forwards the original's main branch
+    to the branch head; a table clone commits one overwrite snapshot that
+    swaps the original's data files for the clone's, without reading rows.
     """
-    clone_name = _normalize_name(clone_table_name)
+    clone_base, branch = _split_branch(clone_table_name)
+    clone_name = f"{clone_base}{BRANCH_SEPARATOR}{branch}" if branch is not None else clone_base
     original = _normalize_name(original_table)
 
     # Load clone table
     try:
-        clone_tbl = catalog.load_table(clone_name)
+        clone_tbl = catalog.load_table(clone_base)
     except Exception as e:
         raise ValueError(f"Clone table '{clone_name}' not found: {e}")
 
@@ -164,32 +279,74 @@ def promote_clone(
     except Exception as e:
         raise ValueError(f"Original table '{original}' not found: {e}")
 
-    # Read clone data
-    clone_data = clone_tbl.scan().to_arrow()
-
-    # Overwrite original: delete all then append
-    from .catalog import delete_rows
-    try:
-        delete_rows(catalog, original, "1=1")
-    except Exception:
-        pass  # May fail if table is empty, that's ok
-
-    if len(clone_data) > 0:
-        orig_tbl = catalog.load_table(original)  # reload after delete
-        orig_tbl.append(clone_data)
+    store = _load_store(store_path)
 
-    row_count = len(clone_data)
+    if branch is not None:
+        if clone_base != original:
+            raise ValueError(f"Branch clone '{clone_name}' can only be promoted into '{clone_base}'")
+        head = orig_tbl.metadata.snapshot_by_name(branch)
+        if head is None:
+            raise ValueError(f"Clone table '{clone_name}' not found: no branch '{branch}'")
+        current = orig_tbl.current_snapshot()
+        ancestors = set()
+        parent = head
+        while parent is not None:
+            ancestors.add(parent.snapshot_id)
+            parent = orig_tbl.snapshot_by_id(parent.parent_snapshot_id) if parent.parent_snapshot_id else None
+        fast_forward = current is None or current.snapshot_id in ancestors
+
+        orig_tbl.manage_snapshots().set_current_snapshot(ref_name=branch).remove_branch(branch).commit()
+        row_count = int(head.summary.additional_properties.get("total-records", 0)) if head.summary else 0
+        store.pop(clone_name, None)
+        method = "fast-forward" if fast_forward else "replaced main"
+    else:
+        clone_snapshot = clone_tbl.current_snapshot()
+        clone_files = _snapshot_data_files(clone_tbl, clone_snapshot)
+        if clone_tbl.schema().as_struct() != orig_tbl.schema().as_struct():
+            raise ValueError(
+                f"Cannot promote '{clone_name}': its schema differs from '{original}'"
+            )
+        orig_files = _snapshot_data_files(orig_tbl, orig_tbl.current_snapshot())
+
+        if orig_files or clone_files:
+            with orig_tbl.transaction() as tx:
+                with tx.update_snapshot(
+                    snapshot_properties={"lakehouse.promoted-from": clone_name}
+                ).overwrite() as overwrite:
+                    for data_file in orig_files:
+                        overwrite.delete_data_file(data_file)
+                    for data_file in clone_files:
+                        overwrite.append_data_file(data_file)
+        row_count = sum(f.record_count for f in clone_files)
+
+        # The original now references the clone's files: keep the link so
+        # orphan cleanup on either table leaves them alone
+        if clone_files:
+            meta = store.get(clone_name, {
+                "source_table": original,
+                "cloned_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                "row_count": row_count,
+            })
+            meta["promoted_into"] = original
+            store[clone_name] = meta
+        else:
+            store.pop(clone_name, None)
+        method = "file swap"
 
-    # Remove clone metadata
-    store = _load_store(store_path)
-    store.pop(clone_name, None)
     _save_store(store, store_path)
 
+    try:
+        from .catalog import clear_snapshot_cache
+        clear_snapshot_cache()
+    except Exception:
+        pass  # cache invalidation is best-effort
+
     return {
         "clone": clone_name,
         "original": original,
         "row_count": row_count,
-        "message": f"Promoted {clone_name} → {original} ({row_count} rows)",
+        "method": method,
+        "message": f"Promoted {clone_name} → {original} ({row_count} rows, {method})",
     }
 
 
@@ -198,18 +355,31 @@ def discard_clone(
     clone_table_name: str,
     store_path: Optional[Path] = None,
 ) -> dict:
-    """Drop a cloned table and clean up metadata."""
-    clone_name = _normalize_name(clone_table_name)
+    """Drop a clone and clean up metadata.
 
-    # Try to drop the table
-    try:
-        catalog.drop_table(clone_name)
-    except Exception as e:
-        raise ValueError(f"Failed to drop clone '{clone_name}': {e}")
+    Only the clone's metadata goes away: a table clone is dropped from the
+    catalog without purging files, a branch clone's ref is removed.
+    """
+    clone_base, branch = _split_branch(clone_table_name)
+    clone_name = f"{clone_base}{BRANCH_SEPARATOR}{branch}" if branch is not None else clone_base
+
+    if branch is not None:
+        try:
+            tbl = catalog.load_table(clone_base)
+            tbl.manage_snapshots().remove_branch(branch).commit()
+        except Exception as e:
+            raise ValueError(f"Failed to drop clone '{clone_name}': {e}")
+    else:
+        # Try to drop the table
+        try:
+            catalog.drop_table(clone_name)
+        except Exception as e:
+            raise ValueError(f"Failed to drop clone '{clone_name}': {e}")
 
-    # Remove from metadata
+    # Remove from metadata; a promoted clone's link stays while the original uses its files
     store = _load_store(store_path)
-    store.pop(clone_name, None)
+    if not store.get(clone_name, {}).get("promoted_into"):
+        store.pop(clone_name, None)
     _save_store(store, store_path)
 
     return {
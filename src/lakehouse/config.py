@@ -19,6 +19,13 @@ DEFAULT_CONFIG_PATH = Path.home() / ".lakehouse" / "config.toml"
 
 VALID_FORMATS = {"parquet", "vortex"}
 
+# Admission limits applied to estimated query cost before execution
+DEFAULT_QUERY_LIMITS = {
+    "max_bytes_scanned": 10 * 1024 ** 3,
+    "max_rows_scanned": 100_000_000,
+    "max_output_rows": 10_000_000,
+}
+
 
 def _load_config(config_path: Optional[Path] = None) -> dict:
     """Load config from TOML file."""
@@ -216,3 +223,44 @@ def resolve_format_with_table(
             return prop_fmt.lower()
 
     return get_table_format(table_name, config_path)
+
+
+def get_query_limits(config_path: Optional[Path] = None) -> dict:
+    """Get the query admission limits, falling back to DEFAULT_QUERY_LIMITS.
+
+    Returns:
+        Dict with max_bytes_scanned, max_rows_scanned and max_output_rows
+    """
+    config = _load_config(config_path)
+    limits = dict(DEFAULT_QUERY_LIMITS)
+    for key, value in config.get("limits", {}).items():
+        if key in limits:
+            limits[key] = int(value)
+    return limits
+
+
+def set_query_limit(
+    name: str,
+    value: int,
+    config_path: Optional[Path] = None,
+) -> None:
+    """Set one query admission limit.
+
+    Args:
+        name: One of max_bytes_scanned, max_rows_scanned, max_output_rows
+        value: Limit value (must be positive)
+        config_path: Optional config file path
+
+    Raises:
+        ValueError: If the limit name or value is not valid
+    """
+    if name not in DEFAULT_QUERY_LIMITS:
+        raise ValueError(f"Invalid limit '{name}'. Must be one of: {', '.join(sorted(DEFAULT_QUERY_LIMITS))}")
+    if value <= 0:
+        raise ValueError(f"Limit '{name}' must be positive, got {value}")
+
+    config = _load_config(config_path)
+    if "limits" not in config:
+        config["limits"] = {}
+    config["limits"][name] = value
+    _save_config(config, config_path)
@@ -6,6 +6,8 @@ import json
 from pathlib import Path
 from typing import Optional
 
+from .tracing import traced
+
 DEFAULT_CONTRACTS_PATH = Path.home() / ".lakehouse" / "contracts.json"
 MAX_HISTORY = 50
 
@@ -22,6 +24,7 @@ TYPE_MAP = {
 }
 
 
+@traced("store.contracts.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_CONTRACTS_PATH
     if not path.exists():
@@ -32,6 +35,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.contracts.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_CONTRACTS_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -184,8 +188,15 @@ def get_contract_summary(
     catalog,
     table_name: str,
     store_path: Optional[Path] = None,
+    context=None,
 ) -> dict:
-    """Summary: contract terms vs current table state."""
+    """Summary: contract terms vs current table state.
+
+    Pass a CheckContext to reuse stats, quality scores and scans already
+    computed for this snapshot in the same run.
+    """
+    from .checks import CheckContext
+
     table_name = _normalize(table_name)
     store = _load_store(store_path)
     entry = store.get(table_name)
@@ -193,8 +204,10 @@ def get_contract_summary(
     if entry is None:
         return {"table": table_name, "has_contract": False, "message": f"No contract for '{table_name}'"}
 
+    context = context or CheckContext(catalog)
+
     # Schema comparison
-    table = catalog.load_table(table_name)
+    table = context.table(table_name)
     actual_schema = {}
     for field in table.schema().fields:
         type_name = type(field.field_type).__name__
@@ -229,7 +242,7 @@ def get_contract_summary(
     if quality_terms.get("min_score") is not None:
         try:
             from .quality import compute_quality_score
-            score_result = compute_quality_score(catalog, table_name)
+            score_result = compute_quality_score(catalog, table_name, context=context)
             current_score = score_result.get("overall_score", 0)
             quality_check = {
                 "min_score": quality_terms["min_score"],
@@ -245,7 +258,7 @@ def get_contract_summary(
     if freshness_terms.get("max_age_hours") is not None:
         try:
             from .stats import compute_table_stats
-            stats = compute_table_stats(catalog, table_name)
+            stats = compute_table_stats(catalog, table_name, context=context)
             last_modified = stats.get("last_modified")
             if last_modified:
                 age_hours = (datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(str(last_modified))).total_seconds() / 3600
@@ -276,8 +289,17 @@ def validate_contract(
     catalog,
     table_name: str,
     store_path: Optional[Path] = None,
+    context=None,
+    data=None,
 ) -> dict:
-    """Validate current table state against its contract."""
+    """Validate current table state against its contract.
+
+    Pass a CheckContext to reuse a scan of this snapshot from the same run,
+    or ``data`` (Arrow) to check constraints on those rows instead of the
+    table's current snapshot, e.g. files staged on a branch.
+    """
+    from .checks import CheckContext
+
     table_name = _normalize(table_name)
     store = _load_store(store_path)
     entry = store.get(table_name)
@@ -285,10 +307,11 @@ def validate_contract(
     if entry is None:
         return {"table": table_name, "valid": True, "violations": [], "message": f"No contract for '{table_name}' — skipping"}
 
+    context = context or CheckContext(catalog)
     violations = []
 
     # Schema validation
-    table = catalog.load_table(table_name)
+    table = context.table(table_name)
     actual_schema = {}
     for field in table.schema().fields:
         type_name = type(field.field_type).__name__
@@ -311,7 +334,7 @@ def validate_contract(
                 })
 
     # Constraint validation on actual data
-    arrow = table.scan().to_arrow()
+    arrow = data if data is not None else context.arrow(table_name)
     if arrow.num_rows > 0:
         import duckdb
         conn = duckdb.connect()
@@ -431,8 +454,11 @@ def get_contract_violations(
     store_path: Optional[Path] = None,
 ) -> dict:
     """Get current violations for a table."""
-    result = validate_contract(catalog, table_name, store_path=store_path)
-    summary = get_contract_summary(catalog, table_name, store_path=store_path)
+    from .checks import CheckContext
+
+    context = CheckContext(catalog)
+    result = validate_contract(catalog, table_name, store_path=store_path, context=context)
+    summary = get_contract_summary(catalog, table_name, store_path=store_path, context=context)
 
     violations = list(result.get("violations", []))
 
@@ -673,8 +699,15 @@ def monitor_contract(
     table_name: str,
     store_path: Optional[Path] = None,
     notification_store_path: Optional[Path] = None,
+    context=None,
 ) -> dict:
-    """Run a full compliance check and record the result."""
+    """Run a full compliance check and record the result.
+
+    Validation, quality and freshness checks share one CheckContext (the
+    caller's, if given), so the table is scanned once.
+    """
+    from .checks import CheckContext
+
     table_name = _normalize(table_name)
     store = _load_store(store_path)
     entry = store.get(table_name)
@@ -683,8 +716,9 @@ def monitor_contract(
         return {"table": table_name, "checked": False, "message": f"No contract for '{table_name}'"}
 
     # Run full validation
-    validation = validate_contract(catalog, table_name, store_path=store_path)
-    summary = get_contract_summary(catalog, table_name, store_path=store_path)
+    context = context or CheckContext(catalog)
+    validation = validate_contract(catalog, table_name, store_path=store_path, context=context)
+    summary = get_contract_summary(catalog, table_name, store_path=store_path, context=context)
 
     violations = list(validation.get("violations", []))
 
@@ -721,6 +755,15 @@ def monitor_contract(
     entry["_compliance_history"] = entry["_compliance_history"][-MAX_COMPLIANCE_HISTORY:]
     _save_store(store, store_path)
 
+    try:
+        from .metrics_history import record_metrics
+        record_metrics(
+            table_name, {"violations": len(violations)}, "contract",
+            snapshot_id=context.snapshot_id(table_name),
+        )
+    except Exception:
+        pass  # History is best-effort
+
     # Fire notification event on violations
     if not passed:
         try:
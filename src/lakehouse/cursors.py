@@ -0,0 +1,256 @@
+"""Server-side result cursors: page through a query result without re-running it.
+
+A cursor holds an open DuckDB connection and the Arrow ``RecordBatchReader``
+streaming its result. Cursors expire after ``CURSOR_IDLE_SECONDS`` without a
+fetch, and the least recently used ones are closed when the memory they hold
+(DuckDB buffers plus unread Arrow rows) exceeds ``MAX_CURSOR_BYTES``.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Optional
+
+import pyarrow as pa
+
+from .tracing import span
+
+DEFAULT_PAGE_SIZE = 1000
+CURSOR_IDLE_SECONDS = 300
+MAX_CURSOR_BYTES = 512 * 1024 * 1024
+MAX_OPEN_CURSORS = 32
+
+# Cursor id -> state dict, least recently used first
+_cursors: "OrderedDict[str, dict]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _close(cursor: dict) -> None:
+    try:
+        cursor["conn"].close()
+    except Exception:
+        pass
+
+
+def _memory_bytes(cursor: dict) -> int:
+    """Bytes a cursor holds: its DuckDB database plus buffered Arrow rows."""
+    held = cursor["buffer"].nbytes if cursor["buffer"] is not None else 0
+    try:
+        # A second connection to the same database leaves the pending result intact
+        with cursor["conn"].cursor() as probe:
+            row = probe.execute(
+                "SELECT COALESCE(SUM(memory_usage_bytes), 0) FROM duckdb_memory()"
+            ).fetchone()
+        held += int(row[0]) if row else 0
+    except Exception:
+        pass
+    return held
+
+
+def _evict(keep: Optional[str] = None, now: Optional[float] = None) -> list[str]:
+    """Close idle cursors, then LRU cursors over the count or memory cap. Caller holds the lock."""
+    now = time.monotonic() if now is None else now
+    closed = []
+    for cursor_id, cursor in list(_cursors.items()):
+        if cursor_id != keep and now - cursor["last_used"] > CURSOR_IDLE_SECONDS:
+            _close(_cursors.pop(cursor_id))
+            closed.append(cursor_id)
+
+    total = sum(_memory_bytes(c) for c in _cursors.values())
+    for cursor_id in list(_cursors):
+        if len(_cursors) <= MAX_OPEN_CURSORS and total <= MAX_CURSOR_BYTES:
+            break
+        if cursor_id == keep:
+            continue
+        cursor = _cursors.pop(cursor_id)
+        total -= _memory_bytes(cursor)
+        _close(cursor)
+        closed.append(cursor_id)
+    return closed
+
+
+def _read_page(cursor: dict, page_size: int) -> pa.Table:
+    """Read up to ``page_size`` rows, keeping the rest of the last batch buffered."""
+    batches = []
+    needed = page_size
+    if cursor["buffer"] is not None:
+        take = cursor["buffer"].slice(0, needed)
+        rest = cursor["buffer"].slice(take.num_rows)
+        cursor["buffer"] = rest if rest.num_rows else None
+        batches.append(take)
+        needed -= take.num_rows
+    while needed > 0 and not cursor["exhausted"]:
+        try:
+            batch = cursor["reader"].read_next_batch()
+        except StopIteration:
+            cursor["exhausted"] = True
+            break
+        if batch.num_rows > needed:
+            cursor["buffer"] = batch.slice(needed)
+            batch = batch.slice(0, needed)
+        batches.append(batch)
+        needed -= batch.num_rows
+    if not cursor["exhausted"] and cursor["buffer"] is None:
+        # Peek one batch so the caller knows whether more rows exist
+        try:
+            cursor["buffer"] = cursor["reader"].read_next_batch()
+        except StopIteration:
+            cursor["exhausted"] = True
+    return pa.Table.from_batches(batches, schema=cursor["reader"].schema)
+
+
+def _page(cursor_id: str, cursor: dict, page_size: int) -> dict:
+    """Fetch the next page and close the cursor if the result is drained. Caller holds the lock."""
+    with span("cursor.fetch", rows=page_size):
+        page = _read_page(cursor, page_size)
+    offset = cursor["rows_fetched"]
+    cursor["rows_fetched"] += page.num_rows
+    cursor["last_used"] = time.monotonic()
+    _cursors.move_to_end(cursor_id)
+
+    done = cursor["exhausted"] and cursor["buffer"] is None
+    if done:
+        _close(_cursors.pop(cursor_id))
+    else:
+        held = _memory_bytes(cursor)
+        if held > MAX_CURSOR_BYTES:
+            _close(_cursors.pop(cursor_id))
+            return {
+                "cursor_id": None,
+                "page": page,
+                "offset": offset,
+                "rows_fetched": cursor["rows_fetched"],
+                "has_more": False,
+                "truncated": True,
+                "message": (
+                    f"Cursor closed after {cursor['rows_fetched']} rows: it holds {held} bytes, "
+                    f"over the {MAX_CURSOR_BYTES}-byte cursor memory cap"
+                ),
+            }
+        _evict(keep=cursor_id)
+
+    return {
+        "cursor_id": None if done else cursor_id,
+        "page": page,
+        "offset": offset,
+        "rows_fetched": cursor["rows_fetched"],
+        "has_more": not done,
+        "truncated": False,
+        "message": (
+            f"Fetched rows {offset + 1}-{offset + page.num_rows}"
+            + ("" if done else f"; more rows available from cursor {cursor_id}")
+            if page.num_rows else "No more rows"
+        ),
+    }
+
+
+def open_cursor(
+    engine,
+    sql: str,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    table_name: Optional[str] = None,
+    as_of: Optional[str] = None,
+) -> dict:
+    """Run a query and return its first page, keeping the rest behind a cursor.
+
+    Args:
+        engine: QueryEngine to execute with
+        sql: SQL query (no row limit is added; rows are paged instead)
+        page_size: Rows in the first page
+        table_name: Table for a time travel query (with as_of)
+        as_of: ISO timestamp or snapshot ID for a time travel query
+
+    Returns:
+        Dict with cursor_id (None once the result is drained), page (Arrow
+        table), offset, rows_fetched, has_more, truncated and message
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    conn, reader = engine.execute_stream(sql, batch_size=page_size, table_name=table_name, as_of=as_of)
+    cursor_id = uuid.uuid4().hex[:12]
+    now = time.monotonic()
+    cursor = {
+        "sql": sql,
+        "conn": conn,
+        "reader": reader,
+        "buffer": None,
+        "exhausted": False,
+        "page_size": page_size,
+        "rows_fetched": 0,
+        "created_at": now,
+        "last_used": now,
+    }
+    with _lock:
+        _cursors[cursor_id] = cursor
+        try:
+            return _page(cursor_id, cursor, page_size)
+        except Exception:
+            _cursors.pop(cursor_id, None)
+            _close(cursor)
+            raise
+
+
+def fetch_more(cursor_id: str, page_size: Optional[int] = None) -> dict:
+    """Fetch the next page from an open cursor.
+
+    Args:
+        cursor_id: ID returned by open_cursor or a previous fetch_more
+        page_size: Rows to fetch (default: the cursor's page size)
+
+    Returns:
+        Same shape as open_cursor
+    """
+    with _lock:
+        _evict(keep=None)
+        cursor = _cursors.get(cursor_id)
+        if cursor is None:
+            raise ValueError(f"Cursor '{cursor_id}' not found or expired")
+        try:
+            return _page(cursor_id, cursor, page_size or cursor["page_size"])
+        except Exception:
+            _cursors.pop(cursor_id, None)
+            _close(cursor)
+            raise
+
+
+def close_cursor(cursor_id: str) -> bool:
+    """Close a cursor early. Returns False if it was not open."""
+    with _lock:
+        cursor = _cursors.pop(cursor_id, None)
+    if cursor is None:
+        return False
+    _close(cursor)
+    return True
+
+
+def expire_cursors() -> list[str]:
+    """Close idle cursors and enforce the caps now. Returns the closed cursor IDs."""
+    with _lock:
+        return _evict()
+
+
+def close_all_cursors() -> int:
+    """Close every open cursor. Returns how many were closed."""
+    with _lock:
+        cursors = list(_cursors.values())
+        _cursors.clear()
+    for cursor in cursors:
+        _close(cursor)
+    return len(cursors)
+
+
+def list_cursors() -> list[dict]:
+    """Open cursors with their SQL, rows fetched, idle seconds and memory held."""
+    now = time.monotonic()
+    with _lock:
+        return [
+            {
+                "cursor_id": cursor_id,
+                "sql": cursor["sql"],
+                "rows_fetched": cursor["rows_fetched"],
+                "idle_seconds": round(now - cursor["last_used"], 1),
+                "memory_bytes": _memory_bytes(cursor),
+            }
+            for cursor_id, cursor in _cursors.items()
+        ]
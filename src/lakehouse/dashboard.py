@@ -51,12 +51,12 @@ def get_dashboard(
     Returns:
         Dict with storage_path, namespaces, total_tables, total_size_bytes,
         tables (list), recent_activity, saved_queries_count,
-        history_entries_count.
+        history_entries_count, query_costs.
     """
     from .catalog import list_tables, list_namespaces, maintenance_status, DEFAULT_WAREHOUSE
     from .stats import get_cached_stats, is_stats_stale
     from .audit import get_audit_log
-    from .queries import list_saved_queries, get_history
+    from .queries import list_saved_queries, get_history, get_execution_summary
 
     storage_path = str(warehouse_path or DEFAULT_WAREHOUSE)
 
@@ -135,6 +135,12 @@ def get_dashboard(
     history = get_history(limit=10000, store_path=queries_store_path)
     history_entries_count = len(history)
 
+    # Per-query cost summary from the columnar execution history
+    try:
+        query_costs = get_execution_summary(store_path=queries_store_path)
+    except Exception:
+        query_costs = None
+
     return {
         "storage_path": storage_path,
         "namespaces": namespaces,
@@ -145,4 +151,5 @@ def get_dashboard(
         "recent_activity": recent_activity,
         "saved_queries_count": saved_queries_count,
         "history_entries_count": history_entries_count,
+        "query_costs": query_costs,
     }
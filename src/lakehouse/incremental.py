@@ -2,12 +2,21 @@
 
 import datetime
 import json
+import time
 from pathlib import Path
 from typing import Optional
 
+from .tracing import span, traced
+
 DEFAULT_WATERMARK_PATH = Path.home() / ".lakehouse" / "watermarks.json"
+# Step SQL names the source's new rows with this placeholder
+DELTA_PLACEHOLDER = "{{delta}}"
+DELTA_RELATION = "__delta"
+# Snapshot summary key prefix recording the source snapshot a target commit consumed
+WATERMARK_PROPERTY = "lakehouse.watermark"
 
 
+@traced("store.incremental.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_WATERMARK_PATH
     if not path.exists():
@@ -18,6 +27,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.incremental.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_WATERMARK_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -70,13 +80,16 @@ def get_watermark(
     pipeline_data = store.get(pipeline_name, {})
     watermark = pipeline_data.get(table_name)
 
-    if watermark is None:
-        return {
+    if watermark is None or watermark.get("snapshot_id") is None:
+        result = {
             "pipeline": pipeline_name,
             "table": table_name,
             "snapshot_id": None,
             "message": f"No watermark for '{pipeline_name}/{table_name}'",
         }
+        if watermark is not None:
+            result["reset_at"] = watermark.get("reset_at")
+        return result
 
     return {
         "pipeline": pipeline_name,
@@ -102,6 +115,8 @@ def list_watermarks(
 
     for pname, tables in pipelines.items():
         for tbl, wm in tables.items():
+            if wm.get("snapshot_id") is None:
+                continue  # Reset
             results.append({
                 "pipeline": pname,
                 "table": tbl,
@@ -118,27 +133,116 @@ def reset_watermark(
     table_name: Optional[str] = None,
     store_path: Optional[Path] = None,
 ) -> dict:
-    """Reset watermark to force full reprocessing."""
+    """Reset watermark to force full reprocessing.
+
+    The reset is recorded (rather than the entry deleted) so that source
+    snapshots recorded by earlier target commits are not resumed from.
+    """
     store = _load_store(store_path)
+    live = {t: wm for t, wm in store.get(pipeline_name, {}).items() if wm.get("snapshot_id") is not None}
 
-    if pipeline_name not in store:
+    if not live and not table_name:
         return {"pipeline": pipeline_name, "message": f"No watermarks found for pipeline '{pipeline_name}'"}
 
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat()
     if table_name:
         table_name = _normalize(table_name)
-        if table_name in store[pipeline_name]:
-            del store[pipeline_name][table_name]
-            if not store[pipeline_name]:
-                del store[pipeline_name]
+        if table_name in live:
+            store[pipeline_name][table_name] = {"snapshot_id": None, "reset_at": now}
             _save_store(store, store_path)
             return {"pipeline": pipeline_name, "table": table_name, "message": f"Watermark reset for '{pipeline_name}/{table_name}'"}
         return {"pipeline": pipeline_name, "table": table_name, "message": f"No watermark found for '{pipeline_name}/{table_name}'"}
     else:
-        del store[pipeline_name]
+        for tbl in live:
+            store[pipeline_name][tbl] = {"snapshot_id": None, "reset_at": now}
         _save_store(store, store_path)
         return {"pipeline": pipeline_name, "message": f"All watermarks reset for pipeline '{pipeline_name}'"}
 
 
+def _read_delta(table, from_snapshot_id: Optional[int]):
+    """Rows added to a table since ``from_snapshot_id`` (every row if None), as (arrow, is_full).
+
+    Append-only history is read with an incremental append scan; anything
+    else (deletes, overwrites) falls back to diffing the two snapshots.
+    """
+    import pyarrow as pa
+
+    if from_snapshot_id is None:
+        return table.scan().to_arrow(), True
+    current = table.current_snapshot()
+    if current is None or current.snapshot_id == from_snapshot_id:
+        return table.schema().as_arrow().empty_table(), False
+
+    from .matviews import _appended_since
+
+    appended, _ = _appended_since(table, from_snapshot_id)
+    if appended is not None:
+        return appended, False
+
+    import duckdb
+
+    if table.snapshot_by_id(from_snapshot_id) is None:
+        raise ValueError(f"Snapshot {from_snapshot_id} not found in '{'.'.join(table.name())}'")
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.register("old_data", table.scan(snapshot_id=from_snapshot_id).to_arrow())
+        conn.register("new_data", table.scan().to_arrow())
+        # Rows in new that are not in old (added rows)
+        col_list = ", ".join(f'"{f.name}"' for f in table.schema().fields)
+        delta = conn.execute(
+            f"SELECT {col_list} FROM new_data EXCEPT ALL SELECT {col_list} FROM old_data"
+        ).fetch_arrow_table()
+    finally:
+        conn.close()
+    return delta.cast(table.schema().as_arrow()), False
+
+
+def _mark_key(pipeline_name: str, step: int, source_table: str) -> str:
+    return f"{WATERMARK_PROPERTY}.{pipeline_name}.{step}.{source_table}"
+
+
+def _committed_mark(catalog, target_table: str, key: str) -> Optional[tuple[int, int]]:
+    """(source snapshot, commit time in ms) from the newest target commit recording ``key``."""
+    from pyiceberg.table.snapshots import ancestors_of
+
+    try:
+        table = catalog.load_table(target_table)
+    except Exception:
+        return None
+    current = table.current_snapshot()
+    if current is None:
+        return None
+    for snapshot in ancestors_of(current, table.metadata):
+        value = snapshot.summary.get(key) if snapshot.summary else None
+        if value is not None:
+            return int(value), snapshot.timestamp_ms
+    return None
+
+
+def _resume_point(catalog, source, target_table: Optional[str], key: str, watermark: dict) -> Optional[int]:
+    """Source snapshot a step continues from: its watermark, or a newer one its target already committed.
+
+    The watermark store is written after a run; the target commit records
+    the source snapshot it consumed in the same commit as the data, so a run
+    interrupted between the two does not process those rows again.
+    """
+    mark = _committed_mark(catalog, target_table, key) if target_table else None
+    if mark is None:
+        return watermark["snapshot_id"]
+    mark_snapshot, committed_ms = mark
+    if watermark.get("reset_at"):
+        reset_ms = datetime.datetime.fromisoformat(watermark["reset_at"]).timestamp() * 1000
+        if committed_ms <= reset_ms:
+            return None
+    if watermark["snapshot_id"] is None:
+        return mark_snapshot
+    marked = source.snapshot_by_id(mark_snapshot)
+    recorded = source.snapshot_by_id(watermark["snapshot_id"])
+    if marked is not None and recorded is not None and (marked.sequence_number or 0) > (recorded.sequence_number or 0):
+        return mark_snapshot
+    return watermark["snapshot_id"]
+
+
 def get_incremental_data(
     catalog,
     table_name: str,
@@ -151,10 +255,8 @@ def get_incremental_data(
     the watermarked snapshot and the current snapshot.
 
     Returns:
-        Dict with dataframe, row_count, from_snapshot, to_snapshot.
+        Dict with arrow, dataframe, row_count, from_snapshot, to_snapshot.
     """
-    from .catalog import scan_as_of
-
     table_name = _normalize(table_name)
 
     try:
@@ -163,79 +265,32 @@ def get_incremental_data(
         raise ValueError(f"Table '{table_name}' not found: {e}")
 
     current_snap = table.current_snapshot()
-    if current_snap is None:
-        import pandas as pd
-        return {
-            "table": table_name,
-            "pipeline": pipeline_name,
-            "dataframe": pd.DataFrame(),
-            "row_count": 0,
-            "from_snapshot": None,
-            "to_snapshot": None,
-            "is_full": True,
-            "message": f"No snapshots in '{table_name}' — nothing to process",
-        }
+    current_id = current_snap.snapshot_id if current_snap is not None else None
+    last_snapshot_id = get_watermark(pipeline_name, table_name, store_path=store_path)["snapshot_id"]
 
-    current_id = current_snap.snapshot_id
-    watermark = get_watermark(pipeline_name, table_name, store_path=store_path)
-    last_snapshot_id = watermark["snapshot_id"]
+    with span("incremental.read_delta", table=table_name):
+        delta, is_full = _read_delta(table, last_snapshot_id)
+    rows = delta.num_rows
 
-    if last_snapshot_id is not None and last_snapshot_id == current_id:
-        import pandas as pd
-        return {
-            "table": table_name,
-            "pipeline": pipeline_name,
-            "dataframe": pd.DataFrame(),
-            "row_count": 0,
-            "from_snapshot": last_snapshot_id,
-            "to_snapshot": current_id,
-            "is_full": False,
-            "message": f"No new data in '{table_name}' since snapshot {last_snapshot_id}",
-        }
-
-    if last_snapshot_id is None:
-        # No watermark — full scan
-        arrow = table.scan().to_arrow()
-        df = arrow.to_pandas()
-        return {
-            "table": table_name,
-            "pipeline": pipeline_name,
-            "dataframe": df,
-            "row_count": len(df),
-            "from_snapshot": None,
-            "to_snapshot": current_id,
-            "is_full": True,
-            "message": f"Full scan of '{table_name}': {len(df)} rows (no prior watermark)",
-        }
-
-    # Incremental: get data added between watermark snapshot and current
-    # Read both snapshots and diff
-    old_arrow = scan_as_of(catalog, table_name, str(last_snapshot_id))
-    new_arrow = table.scan().to_arrow()
-
-    import duckdb
-    conn = duckdb.connect(":memory:")
-    conn.register("old_data", old_arrow)
-    conn.register("new_data", new_arrow)
-
-    # Find rows in new that are not in old (added rows)
-    columns = [f.name for f in table.schema().fields]
-    col_list = ", ".join(columns)
-
-    result = conn.execute(
-        f"SELECT {col_list} FROM new_data EXCEPT SELECT {col_list} FROM old_data"
-    ).fetchdf()
-    conn.close()
+    if current_snap is None:
+        message = f"No snapshots in '{table_name}' — nothing to process"
+    elif last_snapshot_id == current_id:
+        message = f"No new data in '{table_name}' since snapshot {last_snapshot_id}"
+    elif is_full:
+        message = f"Full scan of '{table_name}': {rows} rows (no prior watermark)"
+    else:
+        message = f"Incremental data for '{table_name}': {rows} new rows (snapshot {last_snapshot_id} → {current_id})"
 
     return {
         "table": table_name,
         "pipeline": pipeline_name,
-        "dataframe": result,
-        "row_count": len(result),
+        "arrow": delta,
+        "dataframe": delta.to_pandas(),
+        "row_count": rows,
         "from_snapshot": last_snapshot_id,
         "to_snapshot": current_id,
-        "is_full": False,
-        "message": f"Incremental data for '{table_name}': {len(result)} new rows (snapshot {last_snapshot_id} → {current_id})",
+        "is_full": is_full,
+        "message": message,
     }
 
 
@@ -248,19 +303,30 @@ def run_pipeline_incremental(
 ) -> dict:
     """Run a pipeline in incremental mode.
 
-    For each step with a source table, reads only new data since the last watermark.
-    Updates watermarks after successful completion.
+    Steps with a ``source_table`` see only the source's rows added since the
+    watermark, bound as the Arrow relation ``{{delta}}`` beside the engine's
+    full tables, so the delta can be joined with dimension tables (SQL without
+    ``{{delta}}`` sees the delta under the source's own name). Each result is
+    written as Arrow in one commit, appended or upserted on the step's
+    ``merge_keys``; new targets take the result's types. That commit also
+    records the source snapshot consumed, so an interrupted run resumes from
+    it. Watermarks are updated after successful completion.
     """
-    from .pipelines import get_pipeline
-    from .catalog import insert_rows, create_table
+    from .pipelines import _commit_target, get_pipeline
+    from .query import internal_queries
 
     pipeline = get_pipeline(name, store_path=store_path)
     if pipeline is None:
         raise ValueError(f"Pipeline '{name}' not found")
+    if engine is None:
+        from .query import QueryEngine
+        engine = QueryEngine(catalog=catalog)
 
     steps = pipeline["steps"]
     step_results = []
     source_snapshots = {}  # Track current snapshot per source table
+    sources = {}  # Source tables, loaded once per run
+    deltas = {}  # (source, from snapshot) -> (arrow, is_full)
 
     for i, step in enumerate(steps):
         source = step.get("source_table")
@@ -268,61 +334,94 @@ def run_pipeline_incremental(
 
         if source:
             source_tbl = _normalize(source)
-
-            # Get incremental data
-            inc = get_incremental_data(catalog, source_tbl, name, store_path=watermark_path)
-
-            if inc["row_count"] == 0:
+            target_tbl = _normalize(target) if target else None
+            step_start = time.perf_counter()
+            try:
+                if source_tbl not in sources:
+                    try:
+                        sources[source_tbl] = catalog.load_table(source_tbl)
+                    except Exception as e:
+                        raise ValueError(f"Table '{source_tbl}' not found: {e}")
+                table = sources[source_tbl]
+                current = table.current_snapshot()
+                to_snapshot = current.snapshot_id if current is not None else None
+
+                watermark = get_watermark(name, source_tbl, store_path=watermark_path)
+                mark_key = _mark_key(name, i, source_tbl)
+                from_snapshot = _resume_point(catalog, table, target_tbl, mark_key, watermark)
+                if (source_tbl, from_snapshot) not in deltas:
+                    with span("incremental.read_delta", table=source_tbl):
+                        deltas[(source_tbl, from_snapshot)] = _read_delta(table, from_snapshot)
+                delta, is_full = deltas[(source_tbl, from_snapshot)]
+
+                if delta.num_rows == 0:
+                    step_results.append({
+                        "step": i + 1,
+                        "source": source_tbl,
+                        "target": target,
+                        "status": "skipped",
+                        "rows": 0,
+                        "message": "No new data to process",
+                    })
+                    continue
+
+                # Track the snapshot for watermark update
+                source_snapshots[source_tbl] = to_snapshot
+
+                sql = step.get("sql") or f"SELECT * FROM {DELTA_PLACEHOLDER}"
+                if DELTA_PLACEHOLDER in sql:
+                    relations = {DELTA_RELATION: delta}
+                    sql = sql.replace(DELTA_PLACEHOLDER, DELTA_RELATION)
+                else:
+                    relations = {source_tbl.split(".")[-1]: delta}
+                with span("incremental.step", pipeline=name, step=i + 1), internal_queries():
+                    result = engine.execute_arrow(sql, relations=relations)
+
+                mode = "merge" if step.get("merge_keys") else "append"
+                if target_tbl and result.num_rows:
+                    _commit_target(
+                        catalog, target_tbl, mode, result,
+                        merge_keys=step.get("merge_keys"),
+                        snapshot_properties={mark_key: str(to_snapshot)},
+                    )
+                    # Later steps (and the caller) see the new target data
+                    engine.refresh_table(target_tbl)
+            except Exception as e:
                 step_results.append({
                     "step": i + 1,
                     "source": source_tbl,
                     "target": target,
-                    "status": "skipped",
-                    "rows": 0,
-                    "message": "No new data to process",
+                    "status": "failed",
+                    "message": str(e),
                 })
-                continue
-
-            # Track the snapshot for watermark update
-            source_snapshots[source_tbl] = inc["to_snapshot"]
-
-            # Register incremental data and run the SQL against it
-            import duckdb
-            conn = duckdb.connect(":memory:")
-            short_name = source.split(".")[-1] if "." in source else source
-            conn.register(short_name, inc["dataframe"])
-
-            sql = step.get("sql", f"SELECT * FROM {short_name}")
-            result_df = conn.execute(sql).fetchdf()
-            conn.close()
-
-            if target:
-                target_tbl = _normalize(target)
-                rows = result_df.to_dict(orient="records")
-                if rows:
-                    try:
-                        catalog.load_table(target_tbl)
-                    except Exception:
-                        # Create target if it doesn't exist
-                        columns = {col: "string" for col in result_df.columns}
-                        create_table(catalog, target, columns=columns)
-                    insert_rows(catalog, target_tbl, rows)
+                return {
+                    "pipeline": name,
+                    "status": "failed",
+                    "steps": step_results,
+                    "message": f"Pipeline '{name}' failed at step {i + 1}: {e}",
+                }
 
             step_results.append({
                 "step": i + 1,
                 "source": source_tbl,
                 "target": target,
                 "status": "success",
-                "rows": len(result_df),
-                "is_full": inc["is_full"],
-                "message": f"Processed {len(result_df)} rows",
+                "rows": result.num_rows,
+                "rows_read": delta.num_rows,
+                "mode": mode if target else None,
+                "is_full": is_full,
+                "from_snapshot": from_snapshot,
+                "to_snapshot": to_snapshot,
+                "duration_ms": int((time.perf_counter() - step_start) * 1000),
+                "message": f"Processed {result.num_rows} rows from {delta.num_rows} new source rows",
             })
         else:
             # Non-source steps run as-is
             try:
                 sql = step.get("sql", "")
                 if sql:
-                    engine.execute(sql)
+                    with internal_queries():
+                        engine.execute(sql)
                 step_results.append({
                     "step": i + 1,
                     "status": "success",
@@ -8,6 +8,10 @@ import pandas as pd
 import pyarrow as pa
 
 from .catalog import list_tables, get_table_schema, list_namespaces
+from .tracing import span
+
+# Build-side key sets up to this size are pushed as IN-lists, larger ones as min/max ranges
+MAX_IN_LIST_KEYS = 1000
 
 
 def _register_all_tables(catalog, conn: duckdb.DuckDBPyConnection) -> list[str]:
@@ -41,12 +45,189 @@ def _register_all_tables(catalog, conn: duckdb.DuckDBPyConnection) -> list[str]:
     return registered
 
 
-def _resolve_namespace_refs(sql: str, catalog) -> str:
+def _to_row_filter(tree: Optional[dict]):
+    """Convert a pruning predicate tree into a PyIceberg row filter (None if nothing converts)."""
+    from pyiceberg.expressions import (
+        And, Or, EqualTo, NotEqualTo, LessThan, LessThanOrEqual, GreaterThan,
+        GreaterThanOrEqual, In, NotIn, IsNull, NotNull, StartsWith,
+    )
+
+    if tree is None:
+        return None
+    if "and" in tree:
+        children = [c for c in (_to_row_filter(ch) for ch in tree["and"]) if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else And(*children)
+    if "or" in tree:
+        children = [_to_row_filter(ch) for ch in tree["or"]]
+        if any(c is None for c in children):
+            return None
+        return Or(*children)
+
+    col, op, value = tree["column"], tree["op"], tree["value"]
+    try:
+        if op == "is_null":
+            return IsNull(col)
+        if op == "not_null":
+            return NotNull(col)
+        if value is None:
+            return None
+        if op == "between":
+            return And(GreaterThanOrEqual(col, value[0]), LessThanOrEqual(col, value[1]))
+        if op in ("in", "not_in"):
+            values = [v for v in value if v is not None]
+            if not values or len(values) != len(value):
+                return None
+            return In(col, values) if op == "in" else NotIn(col, values)
+        comparisons = {
+            "=": EqualTo, "!=": NotEqualTo, "<": LessThan, "<=": LessThanOrEqual,
+            ">": GreaterThan, ">=": GreaterThanOrEqual, "prefix": StartsWith,
+        }
+        return comparisons[op](col, value) if op in comparisons else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _key_filter(column: str, keys: pa.ChunkedArray):
+    """Row filter restricting ``column`` to build-side ``keys``: an IN-list, or min/max for large sets."""
+    import pyarrow.compute as pc
+    from pyiceberg.expressions import AlwaysFalse, And, GreaterThanOrEqual, In, LessThanOrEqual
+
+    distinct = pc.unique(keys.drop_null())
+    if len(distinct) == 0:
+        return AlwaysFalse(), {"kind": "empty", "keys": 0}
+    if len(distinct) <= MAX_IN_LIST_KEYS:
+        return In(column, distinct.to_pylist()), {"kind": "in", "keys": len(distinct)}
+    bounds = pc.min_max(distinct)
+    low, high = bounds["min"].as_py(), bounds["max"].as_py()
+    return (
+        And(GreaterThanOrEqual(column, low), LessThanOrEqual(column, high)),
+        {"kind": "range", "keys": len(distinct), "min": low, "max": high},
+    )
+
+
+def _column(arrow_table: pa.Table, name: str) -> Optional[pa.ChunkedArray]:
+    for field in arrow_table.column_names:
+        if field.lower() == name:
+            return arrow_table.column(field)
+    return None
+
+
+def _scan_filtered(table, filters: list) -> pa.Table:
+    """Scan a table with the given row filters ANDed, skipping filters that do not bind to its schema."""
+    from pyiceberg.expressions import And
+    from pyiceberg.expressions.visitors import bind
+
+    if table.current_snapshot() is None:
+        return table.schema().as_arrow().empty_table()
+    usable = []
+    for row_filter in filters:
+        try:
+            bind(table.schema(), row_filter, case_sensitive=False)
+            usable.append(row_filter)
+        except Exception:
+            pass
+    if not usable:
+        return table.scan().to_arrow()
+    row_filter = usable[0] if len(usable) == 1 else And(*usable)
+    return table.scan(row_filter=row_filter, case_sensitive=False).to_arrow()
+
+
+def _register_filtered_tables(catalog, conn: duckdb.DuckDBPyConnection, graph: dict) -> tuple[list[str], list[dict]]:
+    """Register the tables a join reads, scanning the smaller sides first.
+
+    Each table's own WHERE predicates become its scan's row filter (unless
+    the table is on the NULL-padded side of an outer join), and the join keys
+    read from already-scanned build sides filter the probe sides, so manifest
+    and row-group pruning skip data that cannot join.
+
+    Returns:
+        (registered qualified table names, applied join filters)
+    """
+    from .pruning import get_file_bounds, prune_files
+
+    def qualified(name):
+        return name if "." in name else f"default.{name}"
+
+    scans = graph["scans"]
+    uses: dict[str, int] = {}
+    for scan in scans:
+        uses[qualified(scan["table"])] = uses.get(qualified(scan["table"]), 0) + 1
+
+    # One entry per table; only tables scanned once can take scan-specific filters
+    entries: dict[str, dict] = {}
+    for i, scan in enumerate(scans):
+        full_name = qualified(scan["table"])
+        if full_name in entries:
+            continue
+        try:
+            table = catalog.load_table(full_name)
+        except Exception:
+            continue  # Not a catalog table; DuckDB reports it if it is really missing
+        single = uses[full_name] == 1
+        static = scan["filter"] if single and not scan["null_supplying"] else None
+        try:
+            if static is None:
+                # The snapshot summary already counts rows; planning is only worth it to prune
+                summary = table.current_snapshot().summary if table.current_snapshot() else None
+                estimate = int(summary["total-records"]) if summary is not None else 0
+            else:
+                estimate = sum(f["record_count"] for f in prune_files(get_file_bounds(table), static))
+        except Exception:
+            estimate = float("inf")
+        entries[full_name] = {
+            "scan_index": i if single else None,
+            "table": table,
+            "static": static,
+            "estimate": estimate,
+        }
+
+    order = sorted(entries, key=lambda name: entries[name]["estimate"])
+    by_scan = {e["scan_index"]: name for name, e in entries.items() if e["scan_index"] is not None}
+    scanned: dict[str, pa.Table] = {}
+    applied = []
+    registered = []
+    for full_name in order:
+        entry = entries[full_name]
+        filters = []
+        static_filter = _to_row_filter(entry["static"])
+        if static_filter is not None:
+            filters.append(static_filter)
+        for edge in graph["edges"]:
+            build = by_scan.get(edge["build"])
+            if by_scan.get(edge["probe"]) != full_name or build not in scanned:
+                continue
+            keys = _column(scanned[build], edge["build_column"])
+            if keys is None:
+                continue
+            key_filter, info = _key_filter(edge["probe_column"], keys)
+            filters.append(key_filter)
+            applied.append({"table": full_name, "column": edge["probe_column"], "from": build, **info})
+
+        with span("join.scan", table=full_name, filters=len(filters)) as sp:
+            arrow_table = _scan_filtered(entry["table"], filters)
+            sp.set(rows=arrow_table.num_rows)
+        scanned[full_name] = arrow_table
+        entry["rows"] = arrow_table.num_rows
+
+        ns_name, table_name = full_name.split(".", 1)
+        conn.register(table_name, arrow_table)
+        conn.register(f"{ns_name}__{table_name}", arrow_table)
+        registered.append(full_name)
+
+    for item in applied:
+        item["rows_after"] = entries[item["table"]]["rows"]
+    return registered, applied
+
+
+def _resolve_namespace_refs(sql: str, catalog, tables: Optional[list[str]] = None) -> str:
     """Replace namespace.table references with underscore-separated aliases.
 
     Converts 'default.expenses' → 'default__expenses' in SQL so DuckDB can resolve them.
+    ``tables`` overrides the qualified names to resolve (default: every catalog table).
     """
-    all_tables = list_tables(catalog, namespace="*")
+    all_tables = tables if tables is not None else list_tables(catalog, namespace="*")
     for full_name in sorted(all_tables, key=len, reverse=True):
         # Replace namespace.table with namespace__table
         ns, tbl = full_name.split(".", 1)
@@ -63,6 +244,11 @@ def execute_join(
 ) -> dict:
     """Execute a cross-table join query with namespace-aware table resolution.
 
+    Only the tables the query reads are scanned. The smaller (filtered) side
+    of each equi-join is scanned first and its key values (an IN-list, or the
+    min/max range for large key sets) become a row filter on the other
+    side's Iceberg scan, so files and row groups that cannot join are skipped.
+
     Args:
         catalog: Iceberg catalog
         sql: SQL with optional namespace-qualified table references
@@ -70,14 +256,33 @@ def execute_join(
         max_rows: Maximum rows to return
 
     Returns:
-        Dict with columns, rows, row_count, and dataframe.
+        Dict with columns, rows, row_count, dataframe, registered_tables and
+        join_filters (the dynamic filters applied, with the rows each probe
+        side was reduced to).
     """
+    from .pruning import extract_join_graph
+
     conn = duckdb.connect(":memory:")
     try:
-        registered = _register_all_tables(catalog, conn)
+        graph = extract_join_graph(sql)
+        join_filters = []
+        if graph is not None and graph["edges"]:
+            registered, join_filters = _register_filtered_tables(catalog, conn, graph)
+        else:
+            registered = _register_all_tables(catalog, conn)
         resolved_sql = _resolve_namespace_refs(sql, catalog)
 
-        result = conn.execute(resolved_sql).fetchdf()
+        try:
+            result = conn.execute(resolved_sql).fetchdf()
+        except duckdb.CatalogException:
+            if graph is None or not graph["edges"]:
+                raise
+            # The query reads a table the parser did not see; fall back to everything
+            conn.close()
+            conn = duckdb.connect(":memory:")
+            registered = _register_all_tables(catalog, conn)
+            join_filters = []
+            result = conn.execute(resolved_sql).fetchdf()
         if len(result) > max_rows:
             result = result.head(max_rows)
 
@@ -86,6 +291,7 @@ def execute_join(
             "row_count": len(result),
             "dataframe": result,
             "registered_tables": registered,
+            "join_filters": join_filters,
         }
     except Exception as e:
         raise ValueError(f"Join query failed: {e}")
@@ -1,13 +1,29 @@
-"""Data lineage tracking — table-level dependency graph."""
+"""Data lineage tracking — table-level dependency graph.
+
+Lookups go through an in-memory adjacency index built once per store file
+and kept until the file changes (by record_lineage/remove_lineage here, or
+by another process, detected from the file's mtime and size). Transitive
+closures are memoized per table; recording or removing an edge forgets
+only the closures that could reach across it.
+"""
 
 import datetime
 import json
+import threading
+from collections import deque
 from pathlib import Path
 from typing import Optional
 
+from .tracing import traced
+
 DEFAULT_LINEAGE_PATH = Path.home() / ".lakehouse" / "lineage.json"
 
+# Store path -> {"signature", "edges", "upstream", "downstream", "closures"}
+_indexes: dict[str, dict] = {}
+_index_lock = threading.RLock()
 
+
+@traced("store.lineage.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_LINEAGE_PATH
     if not path.exists():
@@ -21,6 +37,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {"edges": []}
 
 
+@traced("store.lineage.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_LINEAGE_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -33,6 +50,89 @@ def _normalize_name(table_name: str) -> str:
     return table_name
 
 
+def _signature(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _build_index(edges: list[dict]) -> dict:
+    # Adjacency lists keep store order, so traversal order matches a scan of the edges
+    upstream: dict[str, list] = {}
+    downstream: dict[str, list] = {}
+    for edge in edges:
+        for src in edge["sources"]:
+            upstream.setdefault(edge["target"], []).append((src, edge["operation"]))
+            downstream.setdefault(src, []).append((edge["target"], edge["operation"]))
+    return {"edges": edges, "upstream": upstream, "downstream": downstream, "closures": {}}
+
+
+def _index(store_path: Optional[Path] = None) -> dict:
+    """The adjacency index for a store, rebuilt only when the file has changed."""
+    path = store_path or DEFAULT_LINEAGE_PATH
+    signature = _signature(path)
+    with _index_lock:
+        index = _indexes.get(str(path))
+        if index is None or index["signature"] != signature:
+            index = _build_index(_load_store(store_path)["edges"])
+            index["signature"] = signature
+            _indexes[str(path)] = index
+        return index
+
+
+def _closure(index: dict, table_name: str, direction: str) -> list[dict]:
+    """BFS over one direction of the index, memoized per (direction, table)."""
+    key = (direction, table_name)
+    cached = index["closures"].get(key)
+    if cached is not None:
+        return cached
+
+    adjacency = index[direction]
+    visited = set()
+    queue = deque([(table_name, 0)])
+    results = []
+    while queue:
+        current, depth = queue.popleft()
+        for neighbor, operation in adjacency.get(current, ()):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                results.append({"table": neighbor, "operation": operation, "depth": depth + 1})
+                queue.append((neighbor, depth + 1))
+
+    results.sort(key=lambda r: (r["depth"], r["table"]))
+    index["closures"][key] = results
+    return results
+
+
+def _save_and_reindex(store: dict, store_path: Optional[Path], sources: list[str], target: str) -> None:
+    """Save the store and update the cached index for a changed edge ``sources -> target``.
+
+    Only closures that can reach across the edge change: downstream closures
+    of the sources and everything upstream of them, and upstream closures of
+    the target and everything downstream of it.
+    """
+    path = store_path or DEFAULT_LINEAGE_PATH
+    with _index_lock:
+        index = _indexes.get(str(path))
+        current = index is not None and index["signature"] == _signature(path)
+        if current:
+            stale = {("upstream", target)}
+            stale.update(("upstream", d["table"]) for d in _closure(index, target, "downstream"))
+            for src in sources:
+                stale.add(("downstream", src))
+                stale.update(("downstream", u["table"]) for u in _closure(index, src, "upstream"))
+
+        _save_store(store, store_path)
+
+        closures = {k: v for k, v in index["closures"].items() if k not in stale} if current else {}
+        index = _build_index(store["edges"])
+        index["closures"] = closures
+        index["signature"] = _signature(path)
+        _indexes[str(path)] = index
+
+
 def record_lineage(
     source_tables: list[str],
     target_table: str,
@@ -70,7 +170,7 @@ def record_lineage(
             edge["operation"] = operation
             edge["sql"] = sql
             edge["recorded_at"] = datetime.datetime.now(datetime.timezone.utc).isoformat()
-            _save_store(store, store_path)
+            _save_and_reindex(store, store_path, sources, target)
             return {
                 "sources": sources,
                 "target": target,
@@ -88,7 +188,7 @@ def record_lineage(
         "recorded_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
     }
     store["edges"].append(edge)
-    _save_store(store, store_path)
+    _save_and_reindex(store, store_path, sources, target)
 
     return {
         "sources": sources,
@@ -114,41 +214,7 @@ def get_upstream(
     Returns:
         List of dicts with source info and depth.
     """
-    table_name = _normalize_name(table_name)
-    store = _load_store(store_path)
-
-    if not transitive:
-        results = []
-        for edge in store["edges"]:
-            if edge["target"] == table_name:
-                for src in edge["sources"]:
-                    results.append({
-                        "table": src,
-                        "operation": edge["operation"],
-                        "depth": 1,
-                    })
-        return sorted(results, key=lambda r: r["table"])
-
-    # BFS for transitive closure with cycle detection
-    visited = set()
-    queue = [(table_name, 0)]
-    results = []
-
-    while queue:
-        current, depth = queue.pop(0)
-        for edge in store["edges"]:
-            if edge["target"] == current:
-                for src in edge["sources"]:
-                    if src not in visited:
-                        visited.add(src)
-                        results.append({
-                            "table": src,
-                            "operation": edge["operation"],
-                            "depth": depth + 1,
-                        })
-                        queue.append((src, depth + 1))
-
-    return sorted(results, key=lambda r: (r["depth"], r["table"]))
+    return get_upstream_many([table_name], store_path=store_path, transitive=transitive)[_normalize_name(table_name)]
 
 
 def get_downstream(
@@ -165,40 +231,51 @@ def get_downstream(
     Returns:
         List of dicts with target info and depth.
     """
-    table_name = _normalize_name(table_name)
-    store = _load_store(store_path)
+    return get_downstream_many([table_name], store_path=store_path, transitive=transitive)[_normalize_name(table_name)]
+
+
+def _lookup_many(table_names: list[str], direction: str, store_path: Optional[Path], transitive: bool) -> dict:
+    with _index_lock:
+        index = _index(store_path)
+        results = {}
+        for table_name in table_names:
+            table_name = _normalize_name(table_name)
+            if transitive:
+                found = _closure(index, table_name, direction)
+            else:
+                found = sorted(
+                    ({"table": t, "operation": op, "depth": 1} for t, op in index[direction].get(table_name, ())),
+                    key=lambda r: r["table"],
+                )
+            # Callers get their own copies; the memoized closures stay intact
+            results[table_name] = [dict(r) for r in found]
+    return results
+
+
+def get_upstream_many(
+    table_names: list[str],
+    store_path: Optional[Path] = None,
+    transitive: bool = True,
+) -> dict[str, list[dict]]:
+    """Upstream dependencies of many tables from one index lookup.
 
-    if not transitive:
-        results = []
-        for edge in store["edges"]:
-            if table_name in edge["sources"]:
-                results.append({
-                    "table": edge["target"],
-                    "operation": edge["operation"],
-                    "depth": 1,
-                })
-        return sorted(results, key=lambda r: r["table"])
-
-    # BFS for transitive closure with cycle detection
-    visited = set()
-    queue = [(table_name, 0)]
-    results = []
+    Returns:
+        Dict mapping each (normalized) table name to its get_upstream result
+    """
+    return _lookup_many(table_names, "upstream", store_path, transitive)
 
-    while queue:
-        current, depth = queue.pop(0)
-        for edge in store["edges"]:
-            if current in edge["sources"]:
-                target = edge["target"]
-                if target not in visited:
-                    visited.add(target)
-                    results.append({
-                        "table": target,
-                        "operation": edge["operation"],
-                        "depth": depth + 1,
-                    })
-                    queue.append((target, depth + 1))
-
-    return sorted(results, key=lambda r: (r["depth"], r["table"]))
+
+def get_downstream_many(
+    table_names: list[str],
+    store_path: Optional[Path] = None,
+    transitive: bool = True,
+) -> dict[str, list[dict]]:
+    """Downstream dependents of many tables from one index lookup.
+
+    Returns:
+        Dict mapping each (normalized) table name to its get_downstream result
+    """
+    return _lookup_many(table_names, "downstream", store_path, transitive)
 
 
 def get_lineage_graph(
@@ -209,11 +286,10 @@ def get_lineage_graph(
     Returns:
         Dict with nodes (set of all tables) and edges list.
     """
-    store = _load_store(store_path)
     nodes = set()
     edges = []
 
-    for edge in store["edges"]:
+    for edge in _index(store_path)["edges"]:
         for src in edge["sources"]:
             nodes.add(src)
         nodes.add(edge["target"])
@@ -245,14 +321,12 @@ def remove_lineage(
     target = _normalize_name(target_table)
     store = _load_store(store_path)
 
-    original_count = len(store["edges"])
-    store["edges"] = [
-        e for e in store["edges"]
-        if not (source in e["sources"] and e["target"] == target)
-    ]
-    removed = original_count - len(store["edges"])
+    matches = [e for e in store["edges"] if source in e["sources"] and e["target"] == target]
+    store["edges"] = [e for e in store["edges"] if e not in matches]
+    removed = len(matches)
 
-    _save_store(store, store_path)
+    # A removed edge takes its other sources' links to the target with it
+    _save_and_reindex(store, store_path, sorted({s for e in matches for s in e["sources"]} | {source}), target)
 
     if removed == 0:
         return {"message": f"No lineage edge found from {source} to {target}", "removed": 0}
@@ -267,9 +341,23 @@ def get_impact_analysis(
 
     Returns downstream dependencies and their depths.
     """
-    table_name = _normalize_name(table_name)
-    downstream = get_downstream(table_name, store_path=store_path, transitive=True)
+    return get_impact_analysis_many([table_name], store_path=store_path)[_normalize_name(table_name)]
+
+
+def get_impact_analysis_many(
+    table_names: list[str],
+    store_path: Optional[Path] = None,
+) -> dict[str, dict]:
+    """Impact analysis for many tables from one index lookup.
+
+    Returns:
+        Dict mapping each (normalized) table name to its get_impact_analysis result
+    """
+    downstream = get_downstream_many(table_names, store_path=store_path, transitive=True)
+    return {table_name: _impact(table_name, found) for table_name, found in downstream.items()}
+
 
+def _impact(table_name: str, downstream: list[dict]) -> dict:
     affected = [d["table"] for d in downstream]
 
     return {
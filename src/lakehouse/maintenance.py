@@ -7,6 +7,8 @@ from typing import Optional
 
 from pyiceberg.catalog import Catalog
 
+from .tracing import traced
+
 DEFAULT_MAINTENANCE_PATH = Path.home() / ".lakehouse" / "maintenance.json"
 
 DEFAULT_POLICY = {
@@ -17,6 +19,7 @@ DEFAULT_POLICY = {
 }
 
 
+@traced("store.maintenance.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_MAINTENANCE_PATH
     if not path.exists():
@@ -27,6 +30,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.maintenance.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_MAINTENANCE_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -8,11 +8,14 @@ from typing import Optional
 
 import pandas as pd
 
+from .tracing import traced
+
 DEFAULT_MASKING_PATH = Path.home() / ".lakehouse" / "masking.json"
 
 VALID_STRATEGIES = {"hash", "redact", "nullify", "truncate", "expression"}
 
 
+@traced("store.masking.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_MASKING_PATH
     if not path.exists():
@@ -23,6 +26,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.masking.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_MASKING_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
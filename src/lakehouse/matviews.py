@@ -2,16 +2,23 @@
 
 import datetime
 import json
+import threading
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 import pandas as pd
 
+from .tracing import span, traced
+
 DEFAULT_MATVIEW_PATH = Path.home() / ".lakehouse" / "materialized_views.json"
 MV_PREFIX = "mv_"
+# Rows materialized per view; a view holding this many may be truncated and is never used for rewrites
+MAX_MATERIALIZED_ROWS = 1_000_000
 
 
+@traced("store.matviews.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_MATVIEW_PATH
     if not path.exists():
@@ -22,12 +29,25 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.matviews.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_MATVIEW_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(data, indent=2, default=str))
 
 
+_store_lock = threading.Lock()
+
+
+def _save_entry(name: str, entry: dict, store_path: Optional[Path] = None) -> None:
+    """Write one view's entry, re-reading the store so concurrent refreshes of other views are kept."""
+    with _store_lock:
+        store = _load_store(store_path)
+        if name in store:
+            store[name] = entry
+            _save_store(store, store_path)
+
+
 def _backing_table_name(name: str, namespace: str = "default") -> str:
     return f"{namespace}.{MV_PREFIX}{name}"
 
@@ -51,6 +71,33 @@ def _get_source_snapshot_ids(catalog, sql: str) -> dict:
     return snapshots
 
 
+def _scanned_snapshot_ids(engine, catalog, sql: str) -> dict:
+    """Snapshot IDs of a view's source tables as registered on ``engine``.
+
+    These are the snapshots a materialization through ``engine`` actually
+    read, which lag the catalog's current ones if the tables changed since
+    the engine registered them.
+    """
+    scanned = {}
+    for full_name in _get_source_snapshot_ids(catalog, sql):
+        info = engine._table_info.get(full_name.split(".")[-1])
+        if info is not None and info.get("snapshot_id") is not None:
+            scanned[full_name] = info["snapshot_id"]
+    return scanned
+
+
+def _materialize(sql: str, engine):
+    """Run a view's query (up to MAX_MATERIALIZED_ROWS rows) and return the result as storable Arrow."""
+    from .pipelines import _arrow_result_types
+    from .query import internal_queries
+
+    sql_upper = sql.strip().upper()
+    if sql_upper.startswith("SELECT") and "LIMIT" not in sql_upper:
+        sql = f"{sql.rstrip(';')} LIMIT {MAX_MATERIALIZED_ROWS}"
+    with internal_queries():
+        return _arrow_result_types(engine.execute_raw(sql).fetch_arrow_table())
+
+
 def create_materialized_view(
     name: str,
     sql: str,
@@ -81,32 +128,18 @@ def create_materialized_view(
     if name in store:
         raise ValueError(f"Materialized view '{name}' already exists")
 
-    # Execute SQL to get results
-    df = engine.execute(sql, max_rows=1_000_000)
+    data = _materialize(sql, engine)
     backing_table = _backing_table_name(name)
 
-    # Infer column types and create backing table
-    from .catalog import create_table, insert_rows
-    type_map = {
-        "int64": "long",
-        "float64": "double",
-        "object": "string",
-        "bool": "boolean",
-    }
-    columns = {}
-    for col in df.columns:
-        dtype = str(df[col].dtype)
-        columns[col] = type_map.get(dtype, "string")
-
-    create_table(catalog, backing_table, columns)
+    # Create the backing table with the result's own types
+    from .catalog import _arrow_schema_to_iceberg
+    from .pipelines import _conform
+    backing = catalog.create_table(backing_table, schema=_arrow_schema_to_iceberg(data.schema))
+    if data.num_rows:
+        backing.append(_conform(data, backing))
 
-    # Insert data
-    if not df.empty:
-        rows = df.to_dict(orient="records")
-        insert_rows(catalog, backing_table, rows)
-
-    # Get source snapshot IDs for freshness tracking
-    source_snapshots = _get_source_snapshot_ids(catalog, sql)
+    # Snapshots the data was computed from, for freshness tracking
+    source_snapshots = _scanned_snapshot_ids(engine, catalog, sql)
 
     now = datetime.datetime.now(datetime.timezone.utc).isoformat()
     store[name] = {
@@ -115,9 +148,10 @@ def create_materialized_view(
         "backing_table": backing_table,
         "created_at": now,
         "last_refreshed": now,
-        "row_count": len(df),
+        "row_count": data.num_rows,
         "source_snapshot_ids": source_snapshots,
     }
+    _record_state(name, store[name], engine, store_path)
     _save_store(store, store_path)
 
     return {
@@ -125,9 +159,286 @@ def create_materialized_view(
         "sql": sql,
         "description": description,
         "backing_table": backing_table,
-        "row_count": len(df),
+        "row_count": data.num_rows,
         "created_at": now,
-        "message": f"Created materialized view '{name}' ({len(df)} rows)",
+        "message": f"Created materialized view '{name}' ({data.num_rows} rows)",
+    }
+
+
+# --- incremental maintenance ---
+
+
+# Aggregates whose partial results over appended rows merge into the stored result
+_MERGEABLE_AGGREGATES = {"sum", "count", "count_star", "min", "max", "avg"}
+
+
+def _state_path(name: str, store_path: Optional[Path] = None) -> Path:
+    """Partial-aggregate state for a view's AVG columns (sums and counts per group)."""
+    return (store_path or DEFAULT_MATVIEW_PATH).parent / "matview_state" / f"{name}.parquet"
+
+
+def _aggregate_plan(sql: str) -> tuple[Optional[dict], str]:
+    """Work out how a view can be maintained from appended rows.
+
+    Supported: one source table, optional WHERE, GROUP BY expressions (or
+    positions) that are all selected, and select items that are either group columns or
+    SUM/COUNT/MIN/MAX/AVG (without DISTINCT).
+
+    Returns:
+        (plan with source, node and the kind of each select item, or None;
+        reason when None)
+    """
+    from .pruning import parse_sql
+
+    statements = parse_sql(sql)
+    if not statements or len(statements) != 1 or "node" not in statements[0]:
+        return None, "view SQL is not a single query"
+    node = statements[0]["node"]
+    if node.get("type") != "SELECT_NODE" or node.get("modifiers") or (node.get("cte_map") or {}).get("map"):
+        return None, "view is not a plain SELECT ... GROUP BY"
+    if node.get("having") or node.get("qualify") or node.get("sample"):
+        return None, "view uses HAVING, QUALIFY or SAMPLE"
+    if node.get("aggregate_handling") != "STANDARD_HANDLING" or len(node.get("group_sets") or [[]]) > 1:
+        return None, "view uses grouping sets"
+    source = node.get("from_table") or {}
+    if source.get("type") != "BASE_TABLE":
+        return None, "view does not read exactly one table"
+
+    select_list = node.get("select_list") or []
+    groups = set()
+    for expression in node.get("group_expressions") or []:
+        value = (expression.get("value") or {}) if expression.get("class") == "CONSTANT" else {}
+        if isinstance(value.get("value"), int) and not value.get("is_null"):
+            # GROUP BY 1: the first select item
+            if not 1 <= value["value"] <= len(select_list):
+                return None, f"GROUP BY position {value['value']} is out of range"
+            expression = select_list[value["value"] - 1]
+        groups.add(_ast_key({**expression, "alias": ""}))
+    kinds = []
+    found = set()
+    for item in select_list:
+        key = _ast_key({**item, "alias": ""})
+        if key in groups:
+            kinds.append("key")
+            found.add(key)
+            continue
+        function = item.get("function_name", "").lower() if item.get("class") == "FUNCTION" else ""
+        if function not in _MERGEABLE_AGGREGATES or item.get("distinct") or (item.get("order_bys") or {}).get("orders"):
+            return None, f"select item '{item.get('alias') or function or item.get('class')}' is not a mergeable aggregate"
+        kinds.append("count" if function == "count_star" else function)
+    if found != groups:
+        return None, "not every GROUP BY expression is selected"
+    if "key" not in kinds and not any(k != "key" for k in kinds):
+        return None, "view has no aggregates"
+
+    schema = (source.get("schema_name") or "default").lower()
+    return {"source": f"{schema}.{source['table_name'].lower()}", "node": node, "kinds": kinds}, ""
+
+
+def _partial_sql(plan: dict, from_name: str) -> str:
+    """The view's query over ``from_name`` with positional aliases, AVG split into SUM and COUNT."""
+    import copy
+    import duckdb
+
+    node = copy.deepcopy(plan["node"])
+    node["from_table"] = {**node["from_table"], "schema_name": "", "catalog_name": "", "table_name": from_name, "alias": ""}
+    select = []
+    extra = []
+    for i, (item, kind) in enumerate(zip(node["select_list"], plan["kinds"])):
+        item["alias"] = f"__c{i}"
+        if kind == "avg":
+            item["function_name"] = "sum"
+            extra.append({**copy.deepcopy(item), "function_name": "count", "alias": f"__n{i}"})
+        select.append(item)
+    node["select_list"] = select + extra
+    statement = {"error": False, "statements": [{"node": node, "named_param_map": []}]}
+    conn = duckdb.connect()
+    try:
+        return conn.execute("SELECT json_deserialize_sql(?)", [json.dumps(statement)]).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _appended_since(table, snapshot_id: Optional[int]):
+    """Rows appended to a table since ``snapshot_id``, or (None, reason) if anything else changed it."""
+    from pyiceberg.table.snapshots import ancestors_between_ids
+
+    current = table.current_snapshot()
+    if snapshot_id is None or current is None:
+        return None, "no recorded source snapshot"
+    if table.snapshot_by_id(snapshot_id) is None:
+        return None, f"recorded snapshot {snapshot_id} has expired"
+    # Newest first; stops just after the recorded snapshot if it is an ancestor
+    between = list(ancestors_between_ids(snapshot_id, current.snapshot_id, table.metadata))
+    if not between or between[-1].parent_snapshot_id != snapshot_id:
+        return None, "recorded snapshot is not an ancestor of the current snapshot (rollback?)"
+    for snapshot in between:
+        operation = snapshot.summary.operation.value if snapshot.summary else "unknown"
+        if operation != "append":
+            return None, f"snapshot {snapshot.snapshot_id} is a {operation}"
+    return table.incremental_append_scan(
+        from_snapshot_id_exclusive=snapshot_id, to_snapshot_id_inclusive=current.snapshot_id,
+    ).to_arrow(), ""
+
+
+def _merge_sql(kinds: list[str], has_state: bool) -> str:
+    """SQL merging the stored result (``__old``, with AVG state) and partial aggregates (``__delta``)."""
+    keys = [i for i, k in enumerate(kinds) if k == "key"]
+    on = " AND ".join(f"o.__c{i} IS NOT DISTINCT FROM d.__c{i}" for i in keys) or "TRUE"
+
+    def added(old, new):
+        # SUM over no non-NULL values is NULL, not 0
+        return f"CASE WHEN {old} IS NULL THEN {new} WHEN {new} IS NULL THEN {old} ELSE {old} + {new} END"
+
+    columns = []
+    for i, kind in enumerate(kinds):
+        if kind == "key":
+            columns.append(f"COALESCE(o.__c{i}, d.__c{i}) AS __c{i}")
+        elif kind == "sum":
+            columns.append(f"{added(f'o.__c{i}', f'd.__c{i}')} AS __c{i}")
+        elif kind == "count":
+            columns.append(f"COALESCE(o.__c{i}, 0) + COALESCE(d.__c{i}, 0) AS __c{i}")
+        elif kind in ("min", "max"):
+            columns.append(f"{'LEAST' if kind == 'min' else 'GREATEST'}(o.__c{i}, d.__c{i}) AS __c{i}")
+        else:
+            # AVG: merge the stored sum and count (the partial's SUM is in __c{i})
+            total = added(f"o.__s{i}", f"d.__c{i}")
+            count = f"COALESCE(o.__n{i}, 0) + COALESCE(d.__n{i}, 0)"
+            columns.append(f"({total}) / NULLIF({count}, 0) AS __c{i}")
+            columns.append(f"{total} AS __s{i}")
+            columns.append(f"{count} AS __n{i}")
+    old = "__old"
+    if has_state:
+        state_cols = ", ".join(f"s.__s{i}, s.__n{i}" for i, k in enumerate(kinds) if k == "avg")
+        state_on = " AND ".join(f"b.__c{i} IS NOT DISTINCT FROM s.__c{i}" for i in keys) or "TRUE"
+        old = f"(SELECT b.*, {state_cols} FROM __old b LEFT JOIN __state s ON {state_on})"
+    return f"SELECT {', '.join(columns)} FROM {old} o FULL OUTER JOIN __delta d ON {on}"
+
+
+def _save_state(name: str, plan: dict, engine, store_path: Optional[Path] = None) -> bool:
+    """Store per-group sums and counts for a view's AVG columns. Returns False if it has none."""
+    import pyarrow.parquet as pq
+
+    path = _state_path(name, store_path)
+    if "avg" not in plan["kinds"]:
+        path.unlink(missing_ok=True)
+        return False
+    sql = _partial_sql(plan, plan["source"].split(".")[-1])
+    from .query import internal_queries
+    with internal_queries():
+        partial = engine.execute_raw(sql).fetch_arrow_table()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(_state_table(partial, plan["kinds"]), path)
+    return True
+
+
+def _record_state(name: str, entry: dict, engine, store_path: Optional[Path] = None) -> None:
+    """After a full materialization, save AVG state so the next refresh can be incremental.
+
+    The state is computed through ``engine`` like the view itself, so it is
+    tagged with the source snapshot registered there.
+    """
+    entry.pop("state_snapshot_id", None)
+    plan, _ = _aggregate_plan(entry["sql"])
+    if plan is None:
+        return
+    try:
+        if _save_state(name, plan, engine, store_path):
+            info = engine._table_info.get(plan["source"].split(".")[-1]) or {}
+            entry["state_snapshot_id"] = info.get("snapshot_id")
+    except Exception:
+        pass  # Without state the next refresh is simply a full one
+
+
+def _state_table(partial, kinds: list[str]):
+    """Keys plus __s{i}/__n{i} columns for each AVG item, from partial or merged aggregates."""
+    import pyarrow as pa
+
+    columns = {}
+    for i, kind in enumerate(kinds):
+        if kind == "key":
+            columns[f"__c{i}"] = partial.column(f"__c{i}")
+        elif kind == "avg":
+            source = f"__s{i}" if f"__s{i}" in partial.column_names else f"__c{i}"
+            columns[f"__s{i}"] = partial.column(source)
+            columns[f"__n{i}"] = partial.column(f"__n{i}")
+    return pa.table(columns)
+
+
+def _refresh_incremental(name: str, entry: dict, catalog, store_path: Optional[Path] = None) -> dict:
+    """Merge partial aggregates over rows appended since the last refresh into the backing table.
+
+    Returns:
+        Dict with rows_before, rows_after, rows_read, source, to_snapshot and
+        has_state on success, or fallback with the reason a full refresh is needed
+    """
+    import duckdb
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    plan, reason = _aggregate_plan(entry["sql"])
+    if plan is None:
+        return {"fallback": reason}
+    source = plan["source"]
+    try:
+        table = catalog.load_table(source)
+        backing = catalog.load_table(entry["backing_table"])
+    except Exception as e:
+        return {"fallback": f"cannot load tables: {e}"}
+
+    recorded = entry.get("source_snapshot_ids", {}).get(source)
+    current = table.current_snapshot()
+    state_path = _state_path(name, store_path)
+    has_state = "avg" in plan["kinds"]
+    if has_state and (entry.get("state_snapshot_id") != recorded or not state_path.exists()):
+        return {"fallback": "no partial state for AVG columns"}
+    if current is not None and recorded == current.snapshot_id:
+        rows = entry.get("row_count", 0)
+        return {
+            "rows_before": rows, "rows_after": rows, "rows_read": 0,
+            "source": source, "to_snapshot": recorded, "has_state": has_state,
+        }
+
+    with span("matview.delta", view=name, table=source) as sp:
+        delta, reason = _appended_since(table, recorded)
+        if delta is None:
+            return {"fallback": reason}
+        sp.set(rows=delta.num_rows)
+
+    old = backing.scan().to_arrow()
+    backing_schema = backing.schema().as_arrow()
+    old = old.rename_columns([f"__c{i}" for i in range(old.num_columns)])
+
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.register("__mv_delta", delta)
+        conn.execute(f"CREATE TABLE __delta AS {_partial_sql(plan, '__mv_delta')}")
+        conn.register("__old", old)
+        if has_state:
+            conn.register("__state", pq.read_table(state_path))
+        with span("matview.merge", view=name):
+            merged = conn.execute(_merge_sql(plan["kinds"], has_state)).fetch_arrow_table()
+    except duckdb.Error as e:
+        return {"fallback": f"merge failed: {e}"}
+    finally:
+        conn.close()
+
+    result = pa.table(
+        [merged.column(f"__c{i}") for i in range(len(plan["kinds"]))],
+        names=backing_schema.names,
+    ).cast(backing_schema)
+    with span("matview.write", view=name, rows=result.num_rows):
+        backing.overwrite(result)
+    if has_state:
+        pq.write_table(_state_table(merged, plan["kinds"]), state_path)
+
+    return {
+        "rows_before": old.num_rows,
+        "rows_after": result.num_rows,
+        "rows_read": delta.num_rows,
+        "source": source,
+        "to_snapshot": current.snapshot_id,
+        "has_state": has_state,
     }
 
 
@@ -136,8 +447,28 @@ def refresh_materialized_view(
     engine,
     catalog,
     store_path: Optional[Path] = None,
+    incremental: bool = True,
 ) -> dict:
-    """Re-execute the view SQL and replace the backing table data."""
+    """Bring a materialized view up to date with its source tables.
+
+    Aggregate views (SUM/COUNT/MIN/MAX/AVG grouped over one table) whose
+    source has only had appends since the last refresh are maintained
+    incrementally: only the appended rows are read, aggregated, and merged
+    into the backing table by group key. Anything else (deletes, overwrites,
+    other view shapes) re-executes the view SQL in full.
+
+    Args:
+        name: View name
+        engine: QueryEngine used for full refreshes
+        catalog: Iceberg catalog
+        store_path: Optional path to metadata store
+        incremental: Try incremental maintenance first (default True)
+
+    Returns:
+        Dict with rows_before, rows_after, mode ('incremental' or 'full'),
+        rows_read (appended rows merged; None for a full refresh),
+        fallback_reason, duration_ms and last_refreshed.
+    """
     store = _load_store(store_path)
     if name not in store:
         raise ValueError(f"Materialized view '{name}' not found")
@@ -149,37 +480,61 @@ def refresh_materialized_view(
     start = time.time()
     rows_before = entry.get("row_count", 0)
 
-    # Re-execute SQL
-    df = engine.execute(sql, max_rows=1_000_000)
-
-    # Overwrite backing table
-    from .catalog import delete_rows, insert_rows
-    try:
-        delete_rows(catalog, backing_table, "1=1")
-    except Exception:
-        pass
-
-    if not df.empty:
-        rows = df.to_dict(orient="records")
-        insert_rows(catalog, backing_table, rows)
+    outcome = {"fallback": "incremental refresh disabled"}
+    if incremental:
+        with span("matview.refresh_incremental", view=name):
+            try:
+                outcome = _refresh_incremental(name, entry, catalog, store_path)
+            except Exception as e:
+                outcome = {"fallback": f"incremental refresh failed: {e}"}
+
+    if "fallback" not in outcome:
+        mode = "incremental"
+        row_count = outcome["rows_after"]
+        source_snapshots = dict(entry.get("source_snapshot_ids", {}))
+        source_snapshots[outcome["source"]] = outcome["to_snapshot"]
+        if outcome["has_state"]:
+            entry["state_snapshot_id"] = outcome["to_snapshot"]
+    else:
+        mode = "full"
+        data = _materialize(sql, engine)
+        row_count = data.num_rows
+
+        # Replace the backing table's contents in one typed commit
+        from .pipelines import _conform
+        try:
+            backing = catalog.load_table(backing_table)
+        except Exception as e:
+            raise ValueError(f"Table '{backing_table}' not found: {e}")
+        with span("matview.write", view=name, rows=row_count):
+            backing.overwrite(_conform(data, backing))
+
+        source_snapshots = _scanned_snapshot_ids(engine, catalog, sql)
+        _record_state(name, entry, engine, store_path)
 
     duration_ms = int((time.time() - start) * 1000)
 
     # Update metadata
-    source_snapshots = _get_source_snapshot_ids(catalog, sql)
     now = datetime.datetime.now(datetime.timezone.utc).isoformat()
     entry["last_refreshed"] = now
-    entry["row_count"] = len(df)
+    entry["row_count"] = row_count
     entry["source_snapshot_ids"] = source_snapshots
-    _save_store(store, store_path)
+    _save_entry(name, entry, store_path)
 
+    detail = (
+        f"merged {outcome['rows_read']} appended rows" if mode == "incremental"
+        else f"full refresh: {outcome['fallback']}"
+    )
     return {
         "name": name,
         "rows_before": rows_before,
-        "rows_after": len(df),
+        "rows_after": row_count,
+        "mode": mode,
+        "rows_read": outcome.get("rows_read"),
+        "fallback_reason": outcome.get("fallback"),
         "duration_ms": duration_ms,
         "last_refreshed": now,
-        "message": f"Refreshed '{name}': {rows_before} → {len(df)} rows ({duration_ms}ms)",
+        "message": f"Refreshed '{name}': {rows_before} → {row_count} rows ({duration_ms}ms, {detail})",
     }
 
 
@@ -222,6 +577,7 @@ def drop_materialized_view(
 
     del store[name]
     _save_store(store, store_path)
+    _state_path(name, store_path).unlink(missing_ok=True)
 
     return {
         "name": name,
@@ -278,3 +634,223 @@ def check_materialized_view_freshness(
             else f"'{name}' is fresh"
         ),
     }
+
+
+# --- query rewriting ---
+
+
+# AST keys naming case-insensitive identifiers
+_IDENTIFIER_KEYS = {"column_names", "table_name", "schema_name", "catalog_name", "function_name", "relation_name"}
+
+
+def _normalize_ast(obj):
+    """Drop source positions and case-fold identifiers so equivalent SQL compares equal."""
+    if isinstance(obj, dict):
+        out = {}
+        for key, value in obj.items():
+            if key == "query_location":
+                continue
+            if key in _IDENTIFIER_KEYS:
+                value = [v.lower() for v in value] if isinstance(value, list) else str(value).lower()
+            out[key] = _normalize_ast(value)
+        if out.get("type") == "BASE_TABLE" and out.get("schema_name") == "default":
+            out["schema_name"] = ""
+        return out
+    if isinstance(obj, list):
+        return [_normalize_ast(item) for item in obj]
+    return obj
+
+
+def _ast_key(node: dict) -> str:
+    return json.dumps(_normalize_ast(node), sort_keys=True, default=str)
+
+
+@lru_cache(maxsize=256)
+def _view_key(sql: str) -> Optional[str]:
+    """Normalized AST of a view's query, or None if it is not a single query."""
+    from .pruning import parse_sql
+
+    statements = parse_sql(sql)
+    if not statements or len(statements) != 1 or "node" not in statements[0]:
+        return None
+    return _ast_key(statements[0]["node"])
+
+
+def _portable_modifiers(node: dict) -> Optional[list]:
+    """ORDER BY/LIMIT modifiers that still bind over the view's output columns, or None."""
+    for modifier in node.get("modifiers") or []:
+        if modifier.get("type") == "LIMIT_MODIFIER":
+            continue
+        if modifier.get("type") != "ORDER_MODIFIER":
+            return None
+        for order in modifier.get("orders", []):
+            expression = order.get("expression") or {}
+            if expression.get("class") == "CONSTANT":
+                continue
+            if expression.get("class") != "COLUMN_REF" or len(expression.get("column_names", [])) != 1:
+                return None
+    return node.get("modifiers") or []
+
+
+def _is_stored_integer_sum(produced: str, stored: str) -> bool:
+    """Whether a query type is an integral SUM result that materialization stored as a long."""
+    return stored == "BIGINT" and (
+        produced == "HUGEINT" or (produced.startswith("DECIMAL(") and produced.endswith(",0)"))
+    )
+
+
+def _replacement_sql(conn, view_sql: str, backing: str) -> Optional[str]:
+    """SELECT over a backing table producing its view's column names and types on ``conn``.
+
+    Integer SUMs (HUGEINT, stored as long) are cast back to the query's
+    type; any other difference means the view can't stand in (None).
+    """
+    import duckdb
+
+    try:
+        produced = conn.execute(f"DESCRIBE {view_sql}").fetchall()
+        stored = conn.execute(f"DESCRIBE SELECT * FROM {backing}").fetchall()
+    except duckdb.Error:
+        return None
+    if [row[0] for row in produced] != [row[0] for row in stored]:
+        return None
+    columns = []
+    casts = False
+    for (name, produced_type, *_), (_, stored_type, *_) in zip(produced, stored):
+        quoted = '"' + name.replace('"', '""') + '"'
+        if produced_type == stored_type:
+            columns.append(quoted)
+        elif _is_stored_integer_sum(produced_type, stored_type):
+            columns.append(f"CAST({quoted} AS {produced_type}) AS {quoted}")
+            casts = True
+        else:
+            return None
+    return f"SELECT {', '.join(columns)} FROM {backing}" if casts else f"SELECT * FROM {backing}"
+
+
+def _is_fresh(entry: dict, snapshot_ids: dict) -> bool:
+    """Whether the snapshots a view was computed from are the ones the caller sees, and its backing table is visible."""
+    from .pruning import extract_scans
+
+    if entry.get("row_count", 0) >= MAX_MATERIALIZED_ROWS:
+        return False
+    if entry["backing_table"].split(".")[-1] not in snapshot_ids:
+        return False
+    scans = extract_scans(entry["sql"])
+    if not scans:
+        return False
+    recorded = entry.get("source_snapshot_ids", {})
+    for scan in scans:
+        full_name = scan["table"] if "." in scan["table"] else f"default.{scan['table']}"
+        short = full_name.split(".")[-1]
+        if short not in snapshot_ids or recorded.get(full_name) != snapshot_ids[short]:
+            return False
+    return True
+
+
+def rewrite_query(
+    sql: str,
+    snapshot_ids: dict,
+    store_path: Optional[Path] = None,
+    conn=None,
+) -> dict:
+    """Rewrite a query to read fresh materialized views in place of matching subqueries.
+
+    The query and every subquery, CTE and set-operation branch in it are
+    compared with each view's SQL after parsing (identifier case, the
+    ``default`` namespace and formatting are ignored; ORDER BY/LIMIT on
+    view output columns may be added on top). A matching subtree becomes a
+    scan of the view's backing table, provided every table the view reads is
+    still at the snapshot recorded when it was materialized and (given
+    ``conn``) the backing table has the column names and types the view's
+    query produces there, so the rewrite cannot change result types (integer
+    SUMs, stored as longs, are cast back to HUGEINT).
+
+    Args:
+        sql: SQL query
+        snapshot_ids: Snapshot ID of each table the caller reads, keyed by
+            short table name (None for a table with no snapshot)
+        store_path: Optional path to metadata store
+        conn: DuckDB connection with the caller's tables (and the views'
+            backing tables) registered, used to compare output types
+
+    Returns:
+        Dict with sql (rewritten, or unchanged), views (names used) and message
+    """
+    import duckdb
+    from .pruning import parse_sql
+
+    unchanged = {"sql": sql, "views": [], "message": "No materialized view matches the query"}
+    store = _load_store(store_path)
+    views = {}
+    for name, entry in sorted(store.items()):
+        key = _view_key(entry["sql"])
+        if key is not None and key not in views and _is_fresh(entry, snapshot_ids):
+            views[key] = (name, entry["backing_table"].split(".")[-1])
+    if not views:
+        return unchanged
+    statements = parse_sql(sql)
+    if not statements:
+        return unchanged
+
+    used = []
+    replacements = {}
+
+    def replacement(name, backing):
+        if conn is None:
+            return f"SELECT * FROM {backing}"
+        if name not in replacements:
+            replacements[name] = _replacement_sql(conn, store[name]["sql"], backing)
+        return replacements[name]
+
+    def visit(obj):
+        if isinstance(obj, list):
+            for item in obj:
+                visit(item)
+            return
+        if not isinstance(obj, dict):
+            return
+        if "modifiers" in obj and "cte_map" in obj:
+            # A view's own ORDER BY/LIMIT is kept, as is one added on top of it
+            modifiers = _portable_modifiers(obj)
+            match = views.get(_ast_key(obj))
+            if match is None and modifiers:
+                match = views.get(_ast_key({**obj, "modifiers": []}))
+            select = replacement(*match) if match is not None and modifiers is not None else None
+            if select is not None:
+                node = parse_sql(select)[0]["node"]
+                node["modifiers"] = modifiers
+                obj.clear()
+                obj.update(node)
+                used.append(match[0])
+                return
+        for value in obj.values():
+            visit(value)
+
+    visit(statements)
+    if not used:
+        return unchanged
+
+    conn = duckdb.connect()
+    try:
+        rewritten = conn.execute(
+            "SELECT json_deserialize_sql(?)",
+            [json.dumps({"error": False, "statements": statements})],
+        ).fetchone()[0]
+    except duckdb.Error:
+        return unchanged
+    finally:
+        conn.close()
+
+    names = ", ".join(f"'{n}'" for n in dict.fromkeys(used))
+    return {
+        "sql": rewritten,
+        "views": list(dict.fromkeys(used)),
+        "message": f"Answered from materialized view {names}",
+    }
+
+
+def has_materialized_views(store_path: Optional[Path] = None) -> bool:
+    """Whether any materialized view is defined (cheap check before rewriting)."""
+    path = store_path or DEFAULT_MATVIEW_PATH
+    return path.exists() and bool(_load_store(store_path))
@@ -0,0 +1,291 @@
+"""In-process metrics registry with an OpenMetrics/Prometheus exporter."""
+
+import bisect
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+
+
+METRICS_PORT_ENV_VAR = "LAKEHOUSE_METRICS_PORT"
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9464
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# name -> (type, help)
+METRICS = {
+    "lakehouse_tool_requests": ("counter", "MCP tool calls"),
+    "lakehouse_tool_errors": ("counter", "MCP tool calls that returned an error"),
+    "lakehouse_tool_duration_seconds": ("histogram", "MCP tool call latency"),
+    "lakehouse_queries": ("counter", "SQL queries run by the query engine"),
+    "lakehouse_query_duration_seconds": ("histogram", "Query engine latency"),
+    "lakehouse_rows_read": ("counter", "Rows read from Iceberg tables by queries"),
+    "lakehouse_bytes_read": ("counter", "Data file bytes read by queries"),
+    "lakehouse_rows_returned": ("counter", "Rows returned by queries"),
+    "lakehouse_rows_written": ("counter", "Rows affected by write operations"),
+    "lakehouse_commits": ("counter", "Table commits by operation"),
+    "lakehouse_cache_requests": ("counter", "Cache lookups by cache and result"),
+    "lakehouse_arrow_allocated_bytes": ("gauge", "Bytes currently allocated by the Arrow memory pool"),
+    "lakehouse_duckdb_memory_bytes": ("gauge", "Memory held by the query engine's DuckDB connection"),
+    "lakehouse_process_max_rss_bytes": ("gauge", "Peak resident set size of this process"),
+}
+
+_lock = threading.Lock()
+_counters: dict[tuple, float] = {}
+_gauges: dict[tuple, float] = {}
+_histograms: dict[tuple, dict] = {}
+_collectors: list[Callable[[], None]] = []
+
+
+def _key(name: str, labels: dict) -> tuple:
+    return (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+
+
+def inc(name: str, value: float = 1.0, **labels) -> None:
+    """Increase a counter."""
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0.0) + value
+
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    """Set a gauge to its current value."""
+    with _lock:
+        _gauges[_key(name, labels)] = float(value)
+
+
+def observe(name: str, value: float, **labels) -> None:
+    """Record one observation in a histogram."""
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"buckets": [0] * len(DEFAULT_BUCKETS), "count": 0, "sum": 0.0}
+        index = bisect.bisect_left(DEFAULT_BUCKETS, value)
+        if index < len(DEFAULT_BUCKETS):
+            hist["buckets"][index] += 1
+        hist["count"] += 1
+        hist["sum"] += value
+
+
+def get_counter(name: str, **labels) -> float:
+    """Current value of one counter series (0 if never incremented)."""
+    with _lock:
+        return _counters.get(_key(name, labels), 0.0)
+
+
+def register_collector(collector: Callable[[], None]) -> None:
+    """Register a callback that refreshes gauges right before metrics are read."""
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def reset(name: Optional[str] = None, **labels) -> None:
+    """Clear all series, or those of one metric (optionally only matching labels)."""
+    wanted = {(k, str(v)) for k, v in labels.items()}
+    with _lock:
+        for store in (_counters, _gauges, _histograms):
+            for key in [k for k in store if (name is None or k[0] == name) and wanted <= set(k[1])]:
+                del store[key]
+
+
+def _collect_process() -> None:
+    """Arrow pool and peak RSS gauges."""
+    try:
+        import pyarrow as pa
+        set_gauge("lakehouse_arrow_allocated_bytes", pa.total_allocated_bytes())
+    except Exception:
+        pass
+    try:
+        import resource
+        # ru_maxrss is reported in kilobytes on Linux
+        set_gauge("lakehouse_process_max_rss_bytes", resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+    except Exception:
+        pass
+
+
+register_collector(_collect_process)
+
+
+def get_metrics() -> list[dict]:
+    """Snapshot of every metric family with its series.
+
+    Returns:
+        List of dicts with name, type, help and samples. Counter and gauge
+        samples have ``labels`` and ``value``; histogram samples have
+        ``labels``, ``count``, ``sum`` and cumulative ``buckets`` as
+        (upper bound, count) pairs.
+    """
+    for collector in list(_collectors):
+        try:
+            collector()
+        except Exception:
+            pass  # A broken collector must not break scraping
+
+    families = {}
+    with _lock:
+        for store in (_counters, _gauges):
+            for (name, labels), value in store.items():
+                families.setdefault(name, []).append({"labels": dict(labels), "value": value})
+        for (name, labels), hist in _histograms.items():
+            cumulative, running = [], 0
+            for bound, count in zip(DEFAULT_BUCKETS, hist["buckets"]):
+                running += count
+                cumulative.append((bound, running))
+            families.setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": hist["count"],
+                "sum": hist["sum"],
+                "buckets": cumulative,
+            })
+
+    result = []
+    for name in sorted(families):
+        metric_type, help_text = METRICS.get(name, ("unknown", ""))
+        samples = sorted(families[name], key=lambda s: sorted(s["labels"].items()))
+        result.append({"name": name, "type": metric_type, "help": help_text, "samples": samples})
+    return result
+
+
+def get_metrics_summary() -> dict:
+    """Condensed view of the registry for humans and MCP clients.
+
+    Returns:
+        Dict with per-tool calls/errors/average latency, query, row, commit
+        and cache totals (with hit ratios per cache) and current memory gauges.
+    """
+    families = {f["name"]: f["samples"] for f in get_metrics()}
+
+    def total(name: str, **labels) -> float:
+        return sum(
+            s["value"] for s in families.get(name, [])
+            if all(s["labels"].get(k) == str(v) for k, v in labels.items())
+        )
+
+    tools = {}
+    for sample in families.get("lakehouse_tool_duration_seconds", []):
+        tool = sample["labels"].get("tool", "")
+        tools[tool] = {
+            "tool": tool,
+            "calls": sample["count"],
+            "errors": int(total("lakehouse_tool_errors", tool=tool)),
+            "avg_ms": round(sample["sum"] / sample["count"] * 1000, 3) if sample["count"] else 0.0,
+        }
+
+    commits = {}
+    for sample in families.get("lakehouse_commits", []):
+        op = sample["labels"].get("operation", "")
+        commits[op] = int(sample["value"])
+
+    caches = {}
+    for sample in families.get("lakehouse_cache_requests", []):
+        entry = caches.setdefault(sample["labels"].get("cache", ""), {"hits": 0, "misses": 0})
+        entry["hits" if sample["labels"].get("result") == "hit" else "misses"] += int(sample["value"])
+    for entry in caches.values():
+        lookups = entry["hits"] + entry["misses"]
+        entry["hit_ratio"] = round(entry["hits"] / lookups, 4) if lookups else 0.0
+
+    gauges = {
+        name: int(total(name))
+        for name in ("lakehouse_arrow_allocated_bytes", "lakehouse_duckdb_memory_bytes", "lakehouse_process_max_rss_bytes")
+    }
+
+    return {
+        "tools": sorted(tools.values(), key=lambda t: -t["calls"]),
+        "queries": int(total("lakehouse_queries")),
+        "query_errors": int(total("lakehouse_queries", status="error")),
+        "rows_read": int(total("lakehouse_rows_read")),
+        "bytes_read": int(total("lakehouse_bytes_read")),
+        "rows_returned": int(total("lakehouse_rows_returned")),
+        "rows_written": int(total("lakehouse_rows_written")),
+        "commits": commits,
+        "caches": caches,
+        "arrow_allocated_bytes": gauges["lakehouse_arrow_allocated_bytes"],
+        "duckdb_memory_bytes": gauges["lakehouse_duckdb_memory_bytes"],
+        "max_rss_bytes": gauges["lakehouse_process_max_rss_bytes"],
+    }
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: dict, extra: Optional[tuple] = None) -> str:
+    items = list(labels.items())
+    if extra:
+        items.append(extra)
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def render_openmetrics() -> str:
+    """Render all metrics in the OpenMetrics text exposition format."""
+    lines = []
+    for family in get_metrics():
+        name, metric_type = family["name"], family["type"]
+        lines.append(f"# TYPE {name} {metric_type}")
+        if family["help"]:
+            lines.append(f"# HELP {name} {family['help']}")
+        for sample in family["samples"]:
+            labels = sample["labels"]
+            if metric_type == "histogram":
+                for bound, count in sample["buckets"]:
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_number(bound)))} {count}")
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {sample['count']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {sample['count']}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_number(sample['sum'])}")
+            elif metric_type == "counter":
+                lines.append(f"{name}_total{_format_labels(labels)} {_format_number(sample['value'])}")
+            else:
+                lines.append(f"{name}{_format_labels(labels)} {_format_number(sample['value'])}")
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = render_openmetrics().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep scrapes out of stderr (the MCP stdio transport shares it)
+
+
+def serve_metrics(host: str = DEFAULT_METRICS_HOST, port: int = DEFAULT_METRICS_PORT) -> ThreadingHTTPServer:
+    """Serve ``/metrics`` over HTTP from a background daemon thread.
+
+    Args:
+        host: Interface to bind (local only by default)
+        port: TCP port (0 picks a free one)
+
+    Returns:
+        The running server; call ``shutdown()`` to stop it
+    """
+    httpd = ThreadingHTTPServer((host, port), _MetricsHandler)
+    httpd.daemon_threads = True
+    thread = threading.Thread(target=httpd.serve_forever, name="lakehouse-metrics", daemon=True)
+    thread.start()
+    return httpd
+
+
+def serve_metrics_from_env() -> Optional[ThreadingHTTPServer]:
+    """Start the endpoint if LAKEHOUSE_METRICS_PORT is set, else do nothing."""
+    port = os.environ.get(METRICS_PORT_ENV_VAR)
+    if not port:
+        return None
+    return serve_metrics(port=int(port))
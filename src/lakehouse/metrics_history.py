@@ -0,0 +1,427 @@
+"""Columnar history of table metrics (stats, quality, SLA and contract checks).
+
+Every stats computation, quality score and SLA/contract check appends its
+numbers as long-format rows (table, column, metric, value) to immutable
+Parquet segments. Segments are compacted as they accumulate: recent rows are
+kept as recorded, older rows are downsampled to one row per series per day,
+and rows past the retention horizon are dropped — so months of history stay
+small enough to scan in one pass.
+
+Anomaly detection runs over every series at once in DuckDB: each point is
+scored against a rolling window of its own series (optionally only the
+points at the same hour of day or day of week) by robust z-score (median
+and MAD), falling back to the ordinary z-score when the window has no
+spread.
+"""
+
+import datetime
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from .tracing import span
+
+DEFAULT_METRICS_HISTORY_DIR = Path.home() / ".lakehouse" / "metrics_history"
+HISTORY_COMPACT_SEGMENTS = 64
+RAW_RETENTION_DAYS = 30
+MAX_RETENTION_DAYS = 730
+
+DEFAULT_WINDOW = 30
+DEFAULT_MIN_POINTS = 8
+DEFAULT_THRESHOLD = 3.5
+SEASONALITIES = {
+    "hour_of_day": "hour(recorded_at)",
+    "day_of_week": "dayofweek(recorded_at)",
+}
+
+# Scales MAD to the standard deviation of a normal distribution
+MAD_SCALE = 1.4826
+
+_NUMERIC_TYPES = ("long", "double", "int", "float")
+
+
+def _metrics_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("recorded_at", pa.timestamp("us", tz="UTC")),
+        ("table", pa.string()),
+        ("column", pa.string()),
+        ("metric", pa.string()),
+        ("value", pa.float64()),
+        ("source", pa.string()),
+        ("snapshot_id", pa.int64()),
+        # 'raw' for recorded points, 'day' for downsampled ones
+        ("granularity", pa.string()),
+        ("samples", pa.int64()),
+        ("min_value", pa.float64()),
+        ("max_value", pa.float64()),
+    ])
+
+
+def _segments(history_dir: Path) -> list[Path]:
+    if not history_dir.exists():
+        return []
+    return sorted(history_dir.glob("*.parquet"))
+
+
+def _write_segment(table, history_dir: Path, prefix: str = "seg") -> Path:
+    """Write rows as one immutable Parquet segment (temp file + rename, never rewritten)."""
+    import pyarrow.parquet as pq
+
+    history_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    path = history_dir / f"{prefix}-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp = path.with_suffix(".tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    tmp.replace(path)
+    return path
+
+
+def record_metrics(
+    table_name: str,
+    metrics: dict,
+    source: str,
+    snapshot_id: Optional[int] = None,
+    recorded_at: Optional[datetime.datetime] = None,
+    history_dir: Optional[Path] = None,
+) -> int:
+    """Append one observation of a table's metrics.
+
+    Args:
+        table_name: Fully qualified table name
+        metrics: {metric: value} for table-level metrics, or
+            {(column, metric): value} for column-level ones; None values are skipped
+        source: What produced the numbers ('stats', 'quality', 'sla', 'contract')
+        snapshot_id: Table snapshot the metrics describe
+        recorded_at: Observation time (default: now)
+        history_dir: Optional history directory
+
+    Returns:
+        Number of rows written
+    """
+    import pyarrow as pa
+
+    history_dir = Path(history_dir or DEFAULT_METRICS_HISTORY_DIR)
+    recorded_at = recorded_at or datetime.datetime.now(datetime.timezone.utc)
+    rows = []
+    for key, value in metrics.items():
+        if value is None:
+            continue
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        column, metric = key if isinstance(key, tuple) else (None, key)
+        rows.append({
+            "recorded_at": recorded_at,
+            "table": table_name,
+            "column": column,
+            "metric": metric,
+            "value": value,
+            "source": source,
+            "snapshot_id": snapshot_id,
+            "granularity": "raw",
+            "samples": 1,
+            "min_value": value,
+            "max_value": value,
+        })
+    if not rows:
+        return 0
+
+    _write_segment(pa.Table.from_pylist(rows, schema=_metrics_schema()), history_dir)
+    if len(_segments(history_dir)) > HISTORY_COMPACT_SEGMENTS:
+        compact_metrics_history(history_dir)
+    return len(rows)
+
+
+def record_table_stats(table_name: str, stats: dict, history_dir: Optional[Path] = None) -> int:
+    """Record the numbers from a compute_table_stats result."""
+    row_count = stats.get("row_count") or 0
+    metrics = {
+        "row_count": row_count,
+        "size_bytes": stats.get("size_bytes"),
+        "data_files": stats.get("data_files"),
+    }
+    for name, info in stats.get("columns", {}).items():
+        metrics[(name, "null_pct")] = info.get("nulls", 0) / row_count * 100 if row_count else None
+        metrics[(name, "distinct")] = info.get("unique")
+        if info.get("type") in _NUMERIC_TYPES:
+            for metric in ("min", "max", "mean"):
+                metrics[(name, metric)] = info.get(metric)
+    return record_metrics(
+        table_name, metrics, "stats", snapshot_id=stats.get("snapshot_id_at_cache"), history_dir=history_dir,
+    )
+
+
+def compact_metrics_history(
+    history_dir: Optional[Path] = None,
+    raw_days: int = RAW_RETENTION_DAYS,
+    keep_days: int = MAX_RETENTION_DAYS,
+) -> dict:
+    """Merge segments into one, downsampling old rows and dropping expired ones.
+
+    Rows newer than ``raw_days`` are kept as recorded. Older rows become one
+    row per (table, column, metric, source) per day holding the mean, the
+    min/max and the number of samples; rows older than ``keep_days`` are
+    dropped. Compacting again is idempotent.
+
+    Returns:
+        Dict with segments_merged, rows_before, rows and message
+    """
+    import duckdb
+    import pyarrow.parquet as pq
+
+    history_dir = Path(history_dir or DEFAULT_METRICS_HISTORY_DIR)
+    segments = _segments(history_dir)
+    if not segments:
+        return {"segments_merged": 0, "rows_before": 0, "rows": 0, "message": "Metrics history is empty"}
+
+    now = datetime.datetime.now(datetime.timezone.utc)
+    raw_cutoff = now - datetime.timedelta(days=raw_days)
+    keep_cutoff = now - datetime.timedelta(days=keep_days)
+    history = pq.ParquetDataset(segments, schema=_metrics_schema()).read()
+
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute("SET TimeZone = 'UTC'")
+        conn.register("history", history)
+        with span("metrics_history.compact", segments=len(segments), rows=history.num_rows):
+            compacted = conn.execute(
+                """
+                SELECT * FROM history WHERE recorded_at >= $raw_cutoff
+                UNION ALL
+                SELECT date_trunc('day', recorded_at) AS recorded_at, "table", "column", metric,
+                       sum(value * samples) / sum(samples) AS value, source,
+                       arg_max(snapshot_id, recorded_at) AS snapshot_id, 'day' AS granularity,
+                       sum(samples)::BIGINT AS samples, min(min_value) AS min_value, max(max_value) AS max_value
+                FROM history
+                WHERE recorded_at < $raw_cutoff AND recorded_at >= $keep_cutoff
+                GROUP BY ALL
+                ORDER BY recorded_at
+                """,
+                {"raw_cutoff": raw_cutoff, "keep_cutoff": keep_cutoff},
+            ).fetch_arrow_table()
+    finally:
+        conn.close()
+
+    _write_segment(compacted.cast(_metrics_schema()), history_dir, prefix="base")
+    for segment in segments:
+        segment.unlink(missing_ok=True)
+
+    return {
+        "segments_merged": len(segments),
+        "rows_before": history.num_rows,
+        "rows": compacted.num_rows,
+        "message": f"Compacted {len(segments)} metrics segments: {history.num_rows} rows -> {compacted.num_rows}",
+    }
+
+
+def read_metrics_history(history_dir: Optional[Path] = None):
+    """Return the full metrics history as a PyArrow table."""
+    import pyarrow.parquet as pq
+
+    history_dir = Path(history_dir or DEFAULT_METRICS_HISTORY_DIR)
+    segments = _segments(history_dir)
+    if not segments:
+        return _metrics_schema().empty_table()
+    return pq.ParquetDataset(segments, schema=_metrics_schema()).read()
+
+
+def query_metrics_history(
+    sql: str,
+    history_dir: Optional[Path] = None,
+):
+    """Run SQL against the metrics history, exposed as the ``metrics_history`` view.
+
+    Example:
+        query_metrics_history(
+            "SELECT recorded_at, value FROM metrics_history "
+            "WHERE \\"table\\" = 'default.orders' AND metric = 'row_count' ORDER BY 1"
+        )
+
+    Returns:
+        pandas DataFrame with the result
+    """
+    import duckdb
+
+    history = read_metrics_history(history_dir)
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute("SET TimeZone = 'UTC'")
+        conn.register("metrics_history", history)
+        return conn.execute(sql).fetchdf()
+    finally:
+        conn.close()
+
+
+def get_metric_series(
+    table_name: str,
+    metric: str,
+    column: Optional[str] = None,
+    since: Optional[str] = None,
+    history_dir: Optional[Path] = None,
+) -> list[dict]:
+    """One metric's history for a table, oldest first (table-level unless ``column`` is given)."""
+    import duckdb
+
+    if "." not in table_name:
+        table_name = f"default.{table_name}"
+    params = {"table": table_name, "metric": metric}
+    filters = ['"table" = $table', "metric = $metric"]
+    if column is None:
+        filters.append('"column" IS NULL')
+    else:
+        filters.append('"column" = $column')
+        params["column"] = column
+    if since:
+        filters.append("recorded_at >= $since::TIMESTAMPTZ")
+        params["since"] = since
+
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute("SET TimeZone = 'UTC'")
+        conn.register("metrics_history", read_metrics_history(history_dir))
+        rows = conn.execute(
+            f"""
+            SELECT recorded_at, value, source, snapshot_id, granularity, samples, min_value, max_value
+            FROM metrics_history WHERE {' AND '.join(filters)} ORDER BY recorded_at
+            """,
+            params,
+        ).fetch_arrow_table().to_pylist()
+    finally:
+        conn.close()
+    for row in rows:
+        row["recorded_at"] = row["recorded_at"].isoformat()
+    return rows
+
+
+def detect_metric_anomalies(
+    table_name: Optional[str] = None,
+    metric: Optional[str] = None,
+    since: Optional[str] = None,
+    window: int = DEFAULT_WINDOW,
+    min_points: int = DEFAULT_MIN_POINTS,
+    threshold: float = DEFAULT_THRESHOLD,
+    seasonality: Optional[str] = None,
+    history_dir: Optional[Path] = None,
+) -> list[dict]:
+    """Score every metric series against its own recent history in one pass.
+
+    Each point is compared with the ``window`` points before it in the same
+    series (table, column, metric, source), or — with a seasonality — only
+    the earlier points at the same hour of day / day of week. The score is
+    ``(value - median) / (1.4826 * MAD)``; when the window has no spread
+    around its median, the ordinary z-score is used, and a change from a
+    perfectly constant window always counts.
+
+    Args:
+        table_name: Only this table (default: all tables)
+        metric: Only this metric (e.g. 'row_count', 'null_pct')
+        since: Score every point recorded since this ISO timestamp
+            (default: only each series' latest point)
+        window: Points of history each point is compared with
+        min_points: Minimum history before a point is scored
+        threshold: Absolute score above which a point is anomalous
+            (critical at twice the threshold)
+        seasonality: None, 'hour_of_day' or 'day_of_week'
+        history_dir: Optional history directory
+
+    Returns:
+        List of anomaly dicts with type, table, column, metric, severity,
+        description, value, expected, score and recorded_at (largest score first)
+
+    Raises:
+        ValueError: If the seasonality is unknown
+    """
+    if seasonality is not None and seasonality not in SEASONALITIES:
+        raise ValueError(f"Unknown seasonality '{seasonality}'. Supported: {', '.join(SEASONALITIES)}")
+    if table_name and "." not in table_name:
+        table_name = f"default.{table_name}"
+
+    import duckdb
+
+    history = read_metrics_history(history_dir)
+    filters = []
+    params: dict = {"threshold": threshold, "min_points": min_points}
+    if table_name:
+        filters.append('"table" = $table')
+        params["table"] = table_name
+    if metric:
+        filters.append("metric = $metric")
+        params["metric"] = metric
+    if since:
+        params["since"] = since
+    season = SEASONALITIES[seasonality] if seasonality else "0"
+
+    sql = f"""
+        WITH series AS (
+            SELECT *, {season} AS season FROM metrics_history
+            {f"WHERE {' AND '.join(filters)}" if filters else ""}
+        ),
+        scored AS (
+            SELECT "table", "column", metric, source, recorded_at, value,
+                   count(value) OVER w AS points,
+                   median(value) OVER w AS expected,
+                   mad(value) OVER w AS mad,
+                   avg(value) OVER w AS mean,
+                   stddev_samp(value) OVER w AS std,
+                   row_number() OVER (
+                       PARTITION BY "table", "column", metric, source ORDER BY recorded_at DESC
+                   ) AS recency
+            FROM series
+            WINDOW w AS (
+                PARTITION BY "table", "column", metric, source, season
+                ORDER BY recorded_at ROWS BETWEEN {int(window)} PRECEDING AND 1 PRECEDING
+            )
+        ),
+        flagged AS (
+            SELECT *,
+                   CASE
+                       WHEN mad > 0 THEN (value - expected) / ({MAD_SCALE} * mad)
+                       WHEN std > 0 THEN (value - mean) / std
+                       WHEN value <> expected THEN sign(value - expected) * 'inf'::DOUBLE
+                       ELSE 0
+                   END AS score
+            FROM scored
+            WHERE points >= $min_points
+              AND {"recorded_at >= $since::TIMESTAMPTZ" if since else "recency = 1"}
+        )
+        SELECT "table", "column", metric, source, recorded_at, value, expected, score, points
+        FROM flagged
+        WHERE abs(score) > $threshold
+        ORDER BY abs(score) DESC, "table", "column", metric
+    """
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.execute("SET TimeZone = 'UTC'")
+        conn.register("metrics_history", history)
+        with span("metrics_history.detect", rows=history.num_rows):
+            rows = conn.execute(sql, params).fetch_arrow_table().to_pylist()
+    finally:
+        conn.close()
+
+    anomalies = []
+    for row in rows:
+        tbl, column, name, source, recorded_at, value, expected, score, points = row.values()
+        target = f"{name} of '{column}'" if column else name
+        direction = "above" if score > 0 else "below"
+        anomalies.append({
+            "type": "metric_outlier",
+            "table": tbl,
+            "column": column,
+            "metric": name,
+            "source": source,
+            "severity": "critical" if abs(score) >= 2 * threshold else "warning",
+            "description": (
+                f"{target} is {value:g}, {direction} its typical {expected:g} "
+                f"(score {score:+.1f} over {points} prior points)"
+            ),
+            "old_value": expected,
+            "new_value": value,
+            "expected": expected,
+            "value": value,
+            "score": None if abs(score) == float("inf") else round(score, 2),
+            "recorded_at": recorded_at.isoformat(),
+        })
+    return anomalies
@@ -1,19 +1,48 @@
-"""Event notifications — register handlers for table events."""
+"""Event notifications — register handlers for table events.
+
+Firing an event only records it: one delivery per matching handler is
+written to a durable SQLite queue next to the handler store, and a
+background worker pool delivers them. Each handler has its own concurrency
+limit and may take events in batches; failed deliveries are retried with
+exponential backoff and, after ``max_attempts``, kept as dead letters until
+retried by hand.
+"""
 
 import datetime
 import json
+import os
+import sqlite3
 import subprocess
+import threading
+import time
 import urllib.request
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+from .tracing import span, traced
+
 DEFAULT_NOTIFICATIONS_PATH = Path.home() / ".lakehouse" / "notifications.json"
 MAX_HISTORY = 200
 VALID_EVENT_TYPES = {"write", "schema_change", "sla_violation", "maintenance", "contract_violation", "all"}
 VALID_HANDLER_TYPES = {"webhook", "shell", "log"}
 
-
+QUEUE_FILE = "notification_queue.db"
+DELIVERY_WORKERS = 4
+# Per-handler defaults, overridable in the handler's config
+DEFAULT_MAX_CONCURRENCY = 1
+DEFAULT_BATCH_SIZE = 1
+DEFAULT_MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 300.0
+# A dispatcher with nothing queued stops after this long
+DISPATCHER_IDLE_SECONDS = 5.0
+# A claimed delivery is retried elsewhere if its dispatcher has not renewed the claim for this long
+DELIVERY_LEASE_SECONDS = 60.0
+
+
+@traced("store.notifications.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_NOTIFICATIONS_PATH
     if not path.exists():
@@ -24,6 +53,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {"handlers": {}, "history": []}
 
 
+@traced("store.notifications.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_NOTIFICATIONS_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -61,6 +91,9 @@ def register_handler(
         raise ValueError("Shell handler requires 'command' in config")
     if handler_type == "log" and "file" not in config:
         raise ValueError("Log handler requires 'file' in config")
+    for key in ("max_concurrency", "batch_size", "max_attempts"):
+        if key in config and (not isinstance(config[key], int) or config[key] < 1):
+            raise ValueError(f"Handler '{key}' must be a positive integer")
 
     store = _load_store(store_path)
     handler_id = uuid.uuid4().hex[:12]
@@ -119,53 +152,444 @@ def remove_handler(
     return {"handler_id": handler_id, "message": f"Removed handler '{handler_id}'"}
 
 
+# --- delivery queue ---
+
+# Queue path -> dispatcher state (thread, pool, condition, per-handler in-flight counts)
+_dispatchers: dict[str, dict] = {}
+_dispatchers_lock = threading.Lock()
+_instance = uuid.uuid4().hex[:8]
+
+
+def _owner() -> str:
+    """Name this process's dispatchers put on the deliveries they claim."""
+    return f"{os.getpid()}-{_instance}"
+
+
+def _queue_path(store_path: Optional[Path] = None) -> Path:
+    return (store_path or DEFAULT_NOTIFICATIONS_PATH).parent / QUEUE_FILE
+
+
+def _connect(queue_path: Path) -> sqlite3.Connection:
+    queue_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(queue_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT UNIQUE,
+            table_name TEXT,
+            event_type TEXT,
+            fired_at TEXT,
+            handlers_triggered INTEGER
+        );
+        CREATE TABLE IF NOT EXISTS deliveries (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            event_id TEXT,
+            handler_id TEXT,
+            handler TEXT,
+            event TEXT,
+            status TEXT,
+            attempts INTEGER DEFAULT 0,
+            next_attempt_at REAL,
+            last_error TEXT,
+            result TEXT,
+            delivered_at TEXT,
+            claimed_by TEXT,
+            claimed_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS deliveries_due ON deliveries (status, next_attempt_at);
+        CREATE INDEX IF NOT EXISTS deliveries_event ON deliveries (event_id);
+    """)
+    # Queues created before deliveries carried a lease
+    columns = {row["name"] for row in conn.execute("PRAGMA table_info(deliveries)")}
+    for column, column_type in (("claimed_by", "TEXT"), ("claimed_at", "REAL")):
+        if column not in columns:
+            try:
+                conn.execute(f"ALTER TABLE deliveries ADD COLUMN {column} {column_type}")
+            except sqlite3.OperationalError:
+                pass  # Added by another process meanwhile
+    return conn
+
+
+@traced("notify.fire_event")
 def fire_event(
     table_name: str,
     event_type: str,
     payload: dict,
     store_path: Optional[Path] = None,
 ) -> dict:
-    """Fire an event, triggering all matching handlers."""
+    """Fire an event: queue a delivery for every matching handler and return.
+
+    Handlers run later on the background delivery pool; their outcomes show
+    up in get_event_history (and failures in list_dead_letters).
+    """
     table_name = _normalize(table_name)
-    store = _load_store(store_path)
-    handlers = store.get("handlers", {})
+    handlers = _load_store(store_path).get("handlers", {})
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    event_id = uuid.uuid4().hex[:16]
+    event = json.dumps({
+        "table": table_name,
+        "event_type": event_type,
+        "timestamp": now,
+        "payload": payload,
+    }, default=str)
 
     matched = []
-    results = []
-
     for hid, h in handlers.items():
         # Match on table (exact or wildcard "*")
         table_match = h["table"] == table_name or h["table"] == "default.*" or h["table"] == "*"
         # Match on event type
         event_match = h["event_type"] == event_type or h["event_type"] == "all"
-
         if table_match and event_match:
             matched.append(hid)
-            result = _execute_handler(h, table_name, event_type, payload)
-            results.append({"handler_id": hid, **result})
 
-    # Record in history
-    history_entry = {
+    queue_path = _queue_path(store_path)
+    conn = _connect(queue_path)
+    try:
+        with span("notify.enqueue", table=table_name, handlers=len(matched)):
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO events (event_id, table_name, event_type, fired_at, handlers_triggered) VALUES (?, ?, ?, ?, ?)",
+                (event_id, table_name, event_type, now, len(matched)),
+            )
+            conn.executemany(
+                "INSERT INTO deliveries (event_id, handler_id, handler, event, status, next_attempt_at) "
+                "VALUES (?, ?, ?, ?, 'pending', ?)",
+                [(event_id, hid, json.dumps(handlers[hid]), event, time.time()) for hid in matched],
+            )
+            # Keep the latest MAX_HISTORY events; their undelivered work stays queued
+            conn.execute(
+                "DELETE FROM deliveries WHERE status = 'delivered' AND event_id IN "
+                "(SELECT event_id FROM events WHERE seq <= (SELECT MAX(seq) FROM events) - ?)",
+                (MAX_HISTORY,),
+            )
+            conn.execute("DELETE FROM events WHERE seq <= (SELECT MAX(seq) FROM events) - ?", (MAX_HISTORY,))
+            conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    if matched:
+        _wake(queue_path)
+
+    return {
         "table": table_name,
         "event_type": event_type,
-        "fired_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "event_id": event_id,
         "handlers_triggered": len(matched),
-        "results": results,
+        "results": [{"handler_id": hid, "status": "queued"} for hid in matched],
+        "message": f"Fired '{event_type}' event for '{table_name}': {len(matched)} handlers queued",
     }
-    store.setdefault("history", []).append(history_entry)
-    store["history"] = store["history"][-MAX_HISTORY:]
-    _save_store(store, store_path)
 
+
+def _dispatcher(queue_path: Path) -> dict:
+    """Dispatcher state for a queue, starting its thread if it is not running."""
+    key = str(queue_path)
+    with _dispatchers_lock:
+        state = _dispatchers.get(key)
+        if state is None:
+            state = _dispatchers[key] = {
+                "cond": threading.Condition(),
+                "pool": ThreadPoolExecutor(max_workers=DELIVERY_WORKERS, thread_name_prefix="lakehouse-notify"),
+                "in_flight": {},
+                "thread": None,
+            }
+        if state["thread"] is None or not state["thread"].is_alive():
+            state["thread"] = threading.Thread(
+                target=_dispatch_loop, args=(queue_path, state), name="lakehouse-notify-dispatch", daemon=True,
+            )
+            state["thread"].start()
+    return state
+
+
+def _wake(queue_path: Path) -> None:
+    state = _dispatcher(queue_path)
+    with state["cond"]:
+        state["cond"].notify_all()
+
+
+def _claim(queue_path: Path, state: dict) -> tuple[list[tuple[dict, list]], Optional[float]]:
+    """Mark due deliveries in flight, batched per handler within its concurrency limit.
+
+    Claims are leases: each pass renews this process's leases and returns
+    deliveries whose lease has expired (their process stopped mid-delivery)
+    to the queue, leaving those another live process is delivering alone.
+
+    Returns:
+        ([(handler, delivery rows)], seconds until the next queued delivery is due or None)
+    """
+    now = time.time()
+    owner = _owner()
+    batches = []
+    conn = _connect(queue_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(
+            "UPDATE deliveries SET claimed_at = ? WHERE status = 'in_flight' AND claimed_by = ?", (now, owner),
+        )
+        conn.execute(
+            "UPDATE deliveries SET status = 'pending', claimed_by = NULL, claimed_at = NULL "
+            "WHERE status = 'in_flight' AND (claimed_at IS NULL OR claimed_at < ?)",
+            (now - DELIVERY_LEASE_SECONDS,),
+        )
+        rows = conn.execute(
+            "SELECT id, handler_id, handler, event, attempts FROM deliveries "
+            "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id",
+            (now,),
+        ).fetchall()
+        by_handler: dict[str, list] = {}
+        for row in rows:
+            by_handler.setdefault(row["handler_id"], []).append(row)
+        claimed = []
+        for hid, handler_rows in by_handler.items():
+            handler = json.loads(handler_rows[0]["handler"])
+            config = handler.get("config", {})
+            batch_size = config.get("batch_size", DEFAULT_BATCH_SIZE)
+            slots = config.get("max_concurrency", DEFAULT_MAX_CONCURRENCY) - state["in_flight"].get(hid, 0)
+            for start in range(0, len(handler_rows), batch_size):
+                if slots <= 0:
+                    break
+                batch = handler_rows[start:start + batch_size]
+                batches.append((hid, handler, batch))
+                claimed.extend(row["id"] for row in batch)
+                state["in_flight"][hid] = state["in_flight"].get(hid, 0) + 1
+                slots -= 1
+        conn.executemany(
+            "UPDATE deliveries SET status = 'in_flight', claimed_by = ?, claimed_at = ? WHERE id = ?",
+            [(owner, now, i) for i in claimed],
+        )
+        conn.execute("COMMIT")
+        next_due = conn.execute(
+            "SELECT MIN(next_attempt_at) FROM deliveries WHERE status = 'pending' AND next_attempt_at > ?", (now,),
+        ).fetchone()[0]
+    finally:
+        conn.close()
+    return batches, (max(0.0, next_due - now) if next_due is not None else None)
+
+
+def _dispatch_loop(queue_path: Path, state: dict) -> None:
+    idle_since = time.monotonic()
+    while True:
+        with state["cond"]:
+            batches, next_due = _claim(queue_path, state)
+            for hid, handler, rows in batches:
+                state["pool"].submit(_deliver, queue_path, state, hid, handler, rows)
+            if batches:
+                idle_since = time.monotonic()
+                continue
+            busy = any(state["in_flight"].values())
+            if not busy and next_due is None and time.monotonic() - idle_since > DISPATCHER_IDLE_SECONDS:
+                state["thread"] = None
+                return
+            if busy or next_due is not None:
+                idle_since = time.monotonic()
+            state["cond"].wait(min(next_due if next_due is not None else 1.0, 1.0))
+
+
+def _retry_delay(attempts: int) -> float:
+    return min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+
+
+def _deliver(queue_path: Path, state: dict, handler_id: str, handler: dict, rows: list) -> None:
+    """Run one handler for a batch of deliveries and record the outcome."""
+    events = [json.loads(row["event"]) for row in rows]
+    with span("notify.deliver", handler=handler_id, handler_type=handler["handler_type"], events=len(events)):
+        result = _execute_batch(handler, events)
+
+    now = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    max_attempts = handler.get("config", {}).get("max_attempts", DEFAULT_MAX_ATTEMPTS)
+    # A delivery whose lease expired meanwhile belongs to whoever reclaimed it
+    held = "id = ? AND status = 'in_flight' AND claimed_by = ?"
+    owner = _owner()
+    conn = _connect(queue_path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        for row in rows:
+            attempts = row["attempts"] + 1
+            if result["status"] == "success":
+                conn.execute(
+                    "UPDATE deliveries SET status = 'delivered', attempts = ?, result = ?, delivered_at = ?, "
+                    f"last_error = NULL, claimed_by = NULL WHERE {held}",
+                    (attempts, json.dumps(result, default=str), now, row["id"], owner),
+                )
+            elif attempts >= max_attempts:
+                conn.execute(
+                    f"UPDATE deliveries SET status = 'dead', attempts = ?, last_error = ?, result = ?, "
+                    f"claimed_by = NULL WHERE {held}",
+                    (attempts, result.get("error") or result.get("stderr") or "failed",
+                     json.dumps(result, default=str), row["id"], owner),
+                )
+            else:
+                conn.execute(
+                    "UPDATE deliveries SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ?, "
+                    f"claimed_by = NULL WHERE {held}",
+                    (attempts, result.get("error") or result.get("stderr") or "failed",
+                     time.time() + _retry_delay(attempts), row["id"], owner),
+                )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+        with state["cond"]:
+            state["in_flight"][handler_id] -= 1
+            state["cond"].notify_all()
+
+
+def _queue_counts(queue_path: Path) -> dict:
+    conn = _connect(queue_path)
+    try:
+        counts = dict(conn.execute("SELECT status, COUNT(*) FROM deliveries GROUP BY status").fetchall())
+    finally:
+        conn.close()
+    return {status: counts.get(status, 0) for status in ("pending", "in_flight", "delivered", "dead")}
+
+
+def flush_notifications(
+    store_path: Optional[Path] = None,
+    timeout: float = 30.0,
+) -> dict:
+    """Wait until every queued delivery has been delivered or dead-lettered.
+
+    Deliveries waiting out a retry backoff are waited for too, up to
+    ``timeout`` seconds.
+
+    Returns:
+        Dict with pending, in_flight, delivered and dead counts, and message
+    """
+    queue_path = _queue_path(store_path)
+    deadline = time.monotonic() + timeout
+    counts = _queue_counts(queue_path)
+    while counts["pending"] or counts["in_flight"]:
+        if time.monotonic() >= deadline:
+            break
+        state = _dispatcher(queue_path)
+        with state["cond"]:
+            state["cond"].notify_all()
+            state["cond"].wait(0.05)
+        counts = _queue_counts(queue_path)
+    waiting = counts["pending"] + counts["in_flight"]
     return {
-        "table": table_name,
-        "event_type": event_type,
-        "handlers_triggered": len(matched),
-        "results": results,
-        "message": f"Fired '{event_type}' event for '{table_name}': {len(matched)} handlers triggered",
+        **counts,
+        "message": (
+            f"{counts['delivered']} delivered, {counts['dead']} dead-lettered"
+            + (f", {waiting} still queued" if waiting else "")
+        ),
     }
 
 
-def _execute_handler(handler: dict, table_name: str, event_type: str, payload: dict) -> dict:
+def list_dead_letters(
+    handler_id: Optional[str] = None,
+    store_path: Optional[Path] = None,
+) -> list[dict]:
+    """Deliveries that failed every attempt."""
+    conn = _connect(_queue_path(store_path))
+    try:
+        sql = "SELECT id, event_id, handler_id, event, attempts, last_error FROM deliveries WHERE status = 'dead'"
+        params: tuple = ()
+        if handler_id:
+            sql += " AND handler_id = ?"
+            params = (handler_id,)
+        rows = conn.execute(sql + " ORDER BY id", params).fetchall()
+    finally:
+        conn.close()
+    return [
+        {
+            "delivery_id": row["id"],
+            "event_id": row["event_id"],
+            "handler_id": row["handler_id"],
+            "event": json.loads(row["event"]),
+            "attempts": row["attempts"],
+            "error": row["last_error"],
+        }
+        for row in rows
+    ]
+
+
+def retry_dead_letters(
+    handler_id: Optional[str] = None,
+    store_path: Optional[Path] = None,
+) -> dict:
+    """Queue dead-lettered deliveries again (with a fresh set of attempts)."""
+    queue_path = _queue_path(store_path)
+    conn = _connect(queue_path)
+    try:
+        sql = "UPDATE deliveries SET status = 'pending', attempts = 0, next_attempt_at = ? WHERE status = 'dead'"
+        params: tuple = (time.time(),)
+        if handler_id:
+            sql += " AND handler_id = ?"
+            params += (handler_id,)
+        requeued = conn.execute(sql, params).rowcount
+    finally:
+        conn.close()
+    if requeued:
+        _wake(queue_path)
+    return {"requeued": requeued, "message": f"Requeued {requeued} dead-lettered deliveries"}
+
+
+def _execute_batch(handler: dict, events: list[dict]) -> dict:
+    """Deliver events to a handler in one call.
+
+    Handlers with a batch_size above 1 always receive a batch: webhooks get
+    ``{"events": [...]}`` and shell commands LAKEHOUSE_EVENTS (a JSON array);
+    log handlers write one line per event either way.
+    """
+    config = handler["config"]
+    if config.get("batch_size", DEFAULT_BATCH_SIZE) == 1 and len(events) == 1:
+        event = events[0]
+        return _execute_handler(handler, event["table"], event["event_type"], event["payload"], event["timestamp"])
+
+    handler_type = handler["handler_type"]
+    try:
+        if handler_type == "webhook":
+            return _post_webhook(config, json.dumps({"events": events}, default=str))
+        elif handler_type == "shell":
+            return _run_shell(config, {"LAKEHOUSE_EVENTS": json.dumps(events, default=str)})
+        elif handler_type == "log":
+            return _append_log(config, [json.dumps(e, default=str) for e in events])
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+    return {"status": "error", "error": f"Unknown handler type: {handler_type}"}
+
+
+def _post_webhook(config: dict, body: str) -> dict:
+    req = urllib.request.Request(
+        config["url"],
+        data=body.encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method=config.get("method", "POST"),
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=5) as resp:
+            return {"status": "success", "http_status": resp.status}
+    except Exception as e:
+        return {"status": "error", "error": str(e)}
+
+
+def _run_shell(config: dict, env: dict) -> dict:
+    result = subprocess.run(config["command"], shell=True, capture_output=True, text=True, timeout=10, env=env)
+    return {
+        "status": "success" if result.returncode == 0 else "error",
+        "returncode": result.returncode,
+        "stdout": result.stdout[:500],
+        "stderr": result.stderr[:500],
+    }
+
+
+def _append_log(config: dict, lines: list[str]) -> dict:
+    log_file = Path(config["file"])
+    log_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(log_file, "a") as f:
+        f.write("".join(line + "\n" for line in lines))
+    return {"status": "success", "file": str(log_file)}
+
+
+@traced("notify.handler")
+def _execute_handler(
+    handler: dict,
+    table_name: str,
+    event_type: str,
+    payload: dict,
+    timestamp: Optional[str] = None,
+) -> dict:
     """Execute a single handler. Best-effort: errors don't propagate."""
     handler_type = handler["handler_type"]
     config = handler["config"]
@@ -173,46 +597,17 @@ def _execute_handler(handler: dict, table_name: str, event_type: str, payload: d
     event_data = json.dumps({
         "table": table_name,
         "event_type": event_type,
-        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "timestamp": timestamp or datetime.datetime.now(datetime.timezone.utc).isoformat(),
         "payload": payload,
     }, default=str)
 
     try:
         if handler_type == "webhook":
-            url = config["url"]
-            method = config.get("method", "POST")
-            req = urllib.request.Request(
-                url,
-                data=event_data.encode("utf-8"),
-                headers={"Content-Type": "application/json"},
-                method=method,
-            )
-            try:
-                with urllib.request.urlopen(req, timeout=5) as resp:
-                    return {"status": "success", "http_status": resp.status}
-            except Exception as e:
-                return {"status": "error", "error": str(e)}
-
+            return _post_webhook(config, event_data)
         elif handler_type == "shell":
-            command = config["command"]
-            result = subprocess.run(
-                command, shell=True, capture_output=True, text=True, timeout=10,
-                env={"LAKEHOUSE_EVENT": event_data},
-            )
-            return {
-                "status": "success" if result.returncode == 0 else "error",
-                "returncode": result.returncode,
-                "stdout": result.stdout[:500],
-                "stderr": result.stderr[:500],
-            }
-
+            return _run_shell(config, {"LAKEHOUSE_EVENT": event_data})
         elif handler_type == "log":
-            log_file = Path(config["file"])
-            log_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(log_file, "a") as f:
-                f.write(event_data + "\n")
-            return {"status": "success", "file": str(log_file)}
-
+            return _append_log(config, [event_data])
     except Exception as e:
         return {"status": "error", "error": str(e)}
 
@@ -225,9 +620,32 @@ def get_event_history(
     limit: int = 50,
     store_path: Optional[Path] = None,
 ) -> list[dict]:
-    """Get history of fired events."""
-    store = _load_store(store_path)
-    history = store.get("history", [])
+    """Get history of fired events, with the delivery status of each handler."""
+    # Events fired before deliveries were queued live in the handler store
+    history = _load_store(store_path).get("history", [])
+    conn = _connect(_queue_path(store_path))
+    try:
+        deliveries: dict[str, list] = {}
+        for row in conn.execute(
+            "SELECT event_id, handler_id, status, attempts, last_error, result FROM deliveries ORDER BY id"
+        ):
+            entry = {"handler_id": row["handler_id"], "status": row["status"], "attempts": row["attempts"]}
+            if row["status"] == "delivered" and row["result"]:
+                entry.update({k: v for k, v in json.loads(row["result"]).items() if k != "status"})
+            if row["last_error"]:
+                entry["error"] = row["last_error"]
+            deliveries.setdefault(row["event_id"], []).append(entry)
+        for row in conn.execute("SELECT * FROM events ORDER BY seq"):
+            history.append({
+                "event_id": row["event_id"],
+                "table": row["table_name"],
+                "event_type": row["event_type"],
+                "fired_at": row["fired_at"],
+                "handlers_triggered": row["handlers_triggered"],
+                "results": deliveries.get(row["event_id"], []),
+            })
+    finally:
+        conn.close()
 
     if table_name:
         table_name = _normalize(table_name)
@@ -1,6 +1,9 @@
 """Query optimization advisor — partition, materialization, and cost suggestions."""
 
+import datetime
+import json
 import re
+import threading
 from collections import Counter
 from pathlib import Path
 from typing import Optional
@@ -51,9 +54,11 @@ def analyze_query_patterns(
     store_path: Optional[Path] = None,
 ) -> dict:
     """Analyze recent query history to find patterns."""
+    from .pruning import extract_scans, predicate_columns
     from .queries import get_history
 
-    history = get_history(limit=limit, store_path=store_path)
+    # Only what users asked for: the library's own refresh queries are not usage patterns
+    history = get_history(limit=limit, store_path=store_path, include_internal=False)
 
     if not history:
         return {
@@ -76,11 +81,17 @@ def analyze_query_patterns(
         duration = entry.get("duration_ms", 0)
         durations.append(duration)
 
-        tables = _extract_tables_from_sql(sql)
+        scans = extract_scans(sql)
+        if scans is None:
+            # Unparseable SQL: fall back to the regex heuristics
+            tables = _extract_tables_from_sql(sql)
+            filters = _extract_filters_from_sql(sql)
+        else:
+            tables = [s["table"] for s in scans]
+            filters = sorted({c for s in scans for c in predicate_columns(s["filter"])})
+
         for t in tables:
             table_counter[t] += 1
-
-        filters = _extract_filters_from_sql(sql)
         for f in filters:
             filter_counter[f] += 1
 
@@ -130,22 +141,376 @@ def analyze_query_patterns(
     }
 
 
+DEFAULT_TARGET_FILE_SIZE = 512 * 1024 * 1024
+
+
+def _table_history_scans(
+    table_name: str,
+    limit: int = 100,
+    store_path: Optional[Path] = None,
+) -> list[dict]:
+    """Return recorded queries that read ``table_name`` with the predicates applied to it."""
+    from .pruning import scans_for_table
+    from .queries import get_history
+
+    queries = []
+    for entry in get_history(limit=limit, store_path=store_path, include_internal=False):
+        sql = entry.get("sql", "")
+        scans = scans_for_table(sql, table_name)
+        if scans:
+            queries.append({"sql": sql, "filters": [s["filter"] for s in scans]})
+    return queries
+
+
+def _is_partition_candidate(unique_count: int, row_count: int) -> bool:
+    """Identity partitioning needs 2-1000 distinct values, well below one value per row."""
+    return row_count > 0 and 2 <= unique_count <= 1000 and unique_count / row_count < 0.5
+
+
+def _transform_sql(transform, column: str, field_type) -> str:
+    """Translate an Iceberg partition transform into an equivalent DuckDB expression."""
+    from pyiceberg.transforms import (
+        BucketTransform, DayTransform, HourTransform, MonthTransform,
+        TruncateTransform, YearTransform,
+    )
+    from pyiceberg.types import StringType
+
+    col = f'"{column}"'
+    if isinstance(transform, YearTransform):
+        return f"year({col})"
+    if isinstance(transform, MonthTransform):
+        return f"date_trunc('month', {col})"
+    if isinstance(transform, DayTransform):
+        return f"date_trunc('day', {col})"
+    if isinstance(transform, HourTransform):
+        return f"date_trunc('hour', {col})"
+    if isinstance(transform, BucketTransform):
+        return f"hash({col}) % {transform.num_buckets}"
+    if isinstance(transform, TruncateTransform):
+        width = transform.width
+        if isinstance(field_type, StringType):
+            return f"left({col}, {width})"
+        return f"{col} - ((({col} % {width}) + {width}) % {width})"
+    return col
+
+
+def _parse_layout_fields(table, partition_by: list[str]) -> list[tuple[str, str, str]]:
+    """Parse partition strings into (label, source column, DuckDB expression) tuples."""
+    from .catalog import _parse_transform
+    from pyiceberg.transforms import IdentityTransform
+
+    schema = table.schema()
+    fields = []
+    for spec in partition_by:
+        if "(" in spec:
+            transform, column = _parse_transform(spec)
+        else:
+            transform, column = IdentityTransform(), spec.strip()
+        try:
+            field = schema.find_field(column)
+        except ValueError:
+            raise ValueError(f"Unknown partition column '{column}' in '{spec}'")
+        label = spec if "(" in spec else f"identity({column})"
+        fields.append((label, field.name, _transform_sql(transform, field.name, field.field_type)))
+    return fields
+
+
+def _current_layout(table) -> tuple[list[str], list[str]]:
+    """Describe the table's current partition spec and sort order as strings."""
+    schema = table.schema()
+    partition_by = []
+    for pf in table.spec().fields:
+        column = schema.find_column_name(pf.source_id)
+        transform = str(pf.transform)
+        if transform.startswith(("bucket[", "truncate[")):
+            name, arg = transform.rstrip("]").split("[")
+            partition_by.append(f"{name}({arg}, {column})")
+        else:
+            partition_by.append(f"{transform}({column})")
+    sort_by = [schema.find_column_name(sf.source_id) for sf in table.sort_order().fields]
+    return partition_by, sort_by
+
+
+def _simulate_files(
+    data,
+    layout_fields: list[tuple[str, str, str]],
+    sort_by: list[str],
+    columns: list[str],
+    rows_per_file: int,
+    bytes_per_row: float,
+) -> list[dict]:
+    """Lay rows out into files for a candidate layout and compute per-file column bounds."""
+    import duckdb
+    import pyarrow as pa
+
+    data = data.append_column("__pos", pa.array(range(data.num_rows), type=pa.int64()))
+    conn = duckdb.connect()
+    try:
+        conn.register("__sim_src", data)
+        keys = [f"{expr} AS __p{i}" for i, (_, _, expr) in enumerate(layout_fields)]
+        key_names = [f"__p{i}" for i in range(len(layout_fields))]
+        order = ", ".join([f'"{c}"' for c in sort_by] + ["__pos"])
+        partition_clause = f"PARTITION BY {', '.join(key_names)} " if key_names else ""
+        aggregates = []
+        for i, col in enumerate(columns):
+            aggregates.append(f'min("{col}") AS __min{i}, max("{col}") AS __max{i}, count(*) - count("{col}") AS __nulls{i}')
+        select_keys = ", ".join(key_names + ["__chunk"])
+        sql = f"""
+            WITH keyed AS (
+                SELECT *{''.join(', ' + k for k in keys)} FROM __sim_src
+            ), chunked AS (
+                SELECT *, (row_number() OVER ({partition_clause}ORDER BY {order}) - 1) // {rows_per_file} AS __chunk
+                FROM keyed
+            )
+            SELECT {select_keys}, count(*) AS __rows{''.join(', ' + a for a in aggregates)}
+            FROM chunked GROUP BY {select_keys}
+        """
+        rows = conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+    offset = len(key_names) + 1
+    files = []
+    for row in rows:
+        record_count = row[offset]
+        lower, upper, nulls = {}, {}, {}
+        for i, col in enumerate(columns):
+            base = offset + 1 + i * 3
+            if row[base] is not None:
+                lower[col], upper[col] = row[base], row[base + 1]
+            nulls[col] = row[base + 2]
+        files.append({
+            "file_path": None,
+            "record_count": record_count,
+            "file_size_in_bytes": int(record_count * bytes_per_row),
+            "lower_bounds": lower,
+            "upper_bounds": upper,
+            "null_value_counts": nulls,
+            "value_counts": {col: record_count for col in columns},
+        })
+    return files
+
+
+def _evaluate_layout(files: list[dict], queries: list[dict]) -> list[dict]:
+    """Count the files and bytes each query would scan after manifest pruning."""
+    from .pruning import prune_files
+
+    results = []
+    for q in queries:
+        scanned = []
+        for tree in q["filters"]:
+            scanned.extend(prune_files(files, tree))
+        results.append({
+            "sql": q["sql"],
+            "files_scanned": len(scanned),
+            "bytes_scanned": sum(f["file_size_in_bytes"] for f in scanned),
+        })
+    return results
+
+
+def _default_candidates(table, queries: list[dict], data) -> tuple[list[str], list[list[str]]]:
+    """Derive candidate partition specs and sort orders from the columns queries filter on."""
+    import duckdb
+    from pyiceberg.types import DateType, TimestampType, TimestamptzType
+
+    from .pruning import predicate_columns
+
+    schema = table.schema()
+    current_partition, _ = _current_layout(table)
+    column_counts = Counter()
+    range_columns = set()
+
+    def visit(tree):
+        if tree is None:
+            return
+        for child in tree.get("and", tree.get("or", [])):
+            visit(child)
+        if "op" in tree and tree["op"] in ("<", "<=", ">", ">=", "between"):
+            range_columns.add(tree["column"])
+
+    for q in queries:
+        for tree in q["filters"]:
+            column_counts.update(set(predicate_columns(tree)))
+            visit(tree)
+
+    partitions, sorts = [], []
+    conn = duckdb.connect()
+    try:
+        conn.register("__cand", data)
+        for column, _ in column_counts.most_common(5):
+            try:
+                field = schema.find_field(column)
+            except ValueError:
+                continue
+            if isinstance(field.field_type, (DateType, TimestampType, TimestamptzType)):
+                unit = "month" if isinstance(field.field_type, DateType) else "day"
+                candidate = f"{unit}({field.name})"
+            else:
+                unique = conn.execute(f'SELECT count(DISTINCT "{field.name}") FROM __cand').fetchone()[0]
+                if not _is_partition_candidate(unique, data.num_rows):
+                    if column in range_columns:
+                        sorts.append([field.name])
+                    continue
+                candidate = f"identity({field.name})"
+            if candidate not in current_partition:
+                partitions.append(candidate)
+            if column in range_columns and [field.name] not in sorts:
+                sorts.append([field.name])
+    finally:
+        conn.close()
+    return [[p] for p in partitions[:3]], sorts[:2]
+
+
+def simulate_layouts(
+    catalog,
+    table_name: str,
+    partition_candidates: Optional[list[list[str]]] = None,
+    sort_candidates: Optional[list[list[str]]] = None,
+    limit: int = 100,
+    target_file_size_bytes: Optional[int] = None,
+    store_path: Optional[Path] = None,
+) -> dict:
+    """Simulate how recorded queries would prune files under candidate partition specs and sort orders.
+
+    The current layout is evaluated against the real manifest bounds. Candidate layouts are
+    simulated by laying the table's rows out into files (one group per partition value, split
+    at the target file size in sort order) and computing the same per-file bounds.
+
+    Args:
+        catalog: PyIceberg catalog
+        table_name: Table to simulate
+        partition_candidates: Partition specs to try, each a list like ['month(date)', 'category'].
+            Derived from frequently filtered columns when omitted.
+        sort_candidates: Sort orders to try, each a list of column names
+        limit: Max history entries to replay
+        target_file_size_bytes: Simulated file size (defaults to the table's write target)
+        store_path: Query history store path
+
+    Returns:
+        Dict with layouts (ranked by bytes scanned), per-query results, and best layout
+    """
+    from .pruning import get_file_bounds, predicate_columns
+
+    table_name = _normalize(table_name)
+    try:
+        table = catalog.load_table(table_name)
+    except Exception as e:
+        raise ValueError(f"Table '{table_name}' not found: {e}")
+
+    queries = _table_history_scans(table_name, limit=limit, store_path=store_path)
+    current_files = get_file_bounds(table)
+    current_partition, current_sort = _current_layout(table)
+
+    total_rows = sum(f["record_count"] for f in current_files)
+    total_bytes = sum(f["file_size_in_bytes"] for f in current_files)
+
+    layouts = [{
+        "name": "current",
+        "partition_by": current_partition,
+        "sort_by": current_sort,
+        "is_current": True,
+        "file_count": len(current_files),
+        "queries": _evaluate_layout(current_files, queries),
+        "rewrite_cost": {"bytes_read": 0, "bytes_written": 0, "files_written": 0, "files_removed": 0},
+    }]
+
+    if total_rows > 0:
+        schema_columns = {f.name for f in table.schema().fields}
+        filter_columns = {c for q in queries for tree in q["filters"] for c in predicate_columns(tree)}
+        columns = sorted(c for c in filter_columns if c in schema_columns)
+
+        needed = set(columns)
+        for cand in (partition_candidates or []):
+            needed.update(col for _, col, _ in _parse_layout_fields(table, cand))
+        for cand in (sort_candidates or []):
+            needed.update(c for c in cand if c in schema_columns)
+        needed.update(col for _, col, _ in _parse_layout_fields(table, current_partition))
+        if not needed:
+            needed = {table.schema().fields[0].name}
+        data = table.scan(selected_fields=tuple(sorted(needed))).to_arrow()
+
+        if partition_candidates is None and sort_candidates is None:
+            partition_candidates, sort_candidates = _default_candidates(table, queries, data)
+            for cand in partition_candidates:
+                needed.update(col for _, col, _ in _parse_layout_fields(table, cand))
+            for cand in sort_candidates:
+                needed.update(cand)
+            if set(data.column_names) != needed:
+                data = table.scan(selected_fields=tuple(sorted(needed))).to_arrow()
+
+        target = target_file_size_bytes or int(
+            table.properties.get("write.target-file-size-bytes", DEFAULT_TARGET_FILE_SIZE)
+        )
+        bytes_per_row = total_bytes / total_rows
+        rows_per_file = max(1, int(target / bytes_per_row))
+
+        combos = [(p, []) for p in (partition_candidates or [])]
+        combos += [(current_partition, s) for s in (sort_candidates or [])]
+        combos += [(p, s) for p in (partition_candidates or []) for s in (sort_candidates or [])]
+
+        for partition_by, sort_by in combos:
+            fields = _parse_layout_fields(table, partition_by)
+            files = _simulate_files(data, fields, sort_by, columns, rows_per_file, bytes_per_row)
+            name = f"partition by {', '.join(label for label, _, _ in fields) or 'none'}"
+            if sort_by:
+                name += f", sort by {', '.join(sort_by)}"
+            layouts.append({
+                "name": name,
+                "partition_by": [label for label, _, _ in fields],
+                "sort_by": list(sort_by),
+                "is_current": False,
+                "file_count": len(files),
+                "queries": _evaluate_layout(files, queries),
+                "rewrite_cost": {
+                    "bytes_read": total_bytes,
+                    "bytes_written": sum(f["file_size_in_bytes"] for f in files),
+                    "files_written": len(files),
+                    "files_removed": len(current_files),
+                },
+            })
+
+    baseline = sum(q["bytes_scanned"] for q in layouts[0]["queries"])
+    for layout in layouts:
+        layout["files_scanned"] = sum(q["files_scanned"] for q in layout["queries"])
+        layout["bytes_scanned"] = sum(q["bytes_scanned"] for q in layout["queries"])
+        layout["scan_reduction_pct"] = (
+            round((1 - layout["bytes_scanned"] / baseline) * 100, 1) if baseline else 0.0
+        )
+
+    ranked = sorted(layouts, key=lambda l: (l["bytes_scanned"], l["rewrite_cost"]["bytes_written"]))
+    best = ranked[0] if queries else layouts[0]
+
+    return {
+        "table": table_name,
+        "queries_analyzed": len(queries),
+        "total_rows": total_rows,
+        "total_bytes": total_bytes,
+        "layouts": ranked,
+        "best_layout": best["name"],
+        "message": (
+            f"Simulated {len(layouts)} layout(s) for {table_name} against {len(queries)} recorded queries; "
+            f"best: {best['name']} ({best['scan_reduction_pct']}% less data scanned)"
+        ),
+    }
+
+
 def suggest_partitions(
     catalog,
     table_name: str,
     store_path: Optional[Path] = None,
 ) -> list[dict]:
-    """Suggest partitioning strategies based on query patterns and data distribution."""
+    """Suggest partitioning strategies, ranked by simulated pruning of recorded queries."""
+    from .pruning import predicate_columns
     from .stats import get_cached_stats
 
     table_name = _normalize(table_name)
-    patterns = analyze_query_patterns(store_path=store_path)
-
-    suggestions = []
+    queries = _table_history_scans(table_name, store_path=store_path)
+    if not queries:
+        return []
 
-    # Find frequently filtered columns for this table
-    short_name = table_name.split(".")[-1]
-    filter_cols = patterns.get("frequent_filters", [])
+    filter_counter = Counter()
+    for q in queries:
+        filter_counter.update({c for tree in q["filters"] for c in predicate_columns(tree)})
 
     # Get column stats for cardinality analysis
     stats = get_cached_stats(table_name, store_path=store_path)
@@ -164,12 +529,15 @@ def suggest_partitions(
     try:
         table = catalog.load_table(table_name)
         current_spec = table.spec()
-        current_partition_fields = [f.name for f in current_spec.fields] if current_spec and current_spec.fields else []
+        schema = table.schema()
+        current_partition_fields = [
+            schema.find_column_name(f.source_id) for f in current_spec.fields
+        ] if current_spec and current_spec.fields else []
     except Exception:
-        current_partition_fields = []
+        return []
 
-    for fc in filter_cols:
-        col_name = fc["column"]
+    candidates = []
+    for col_name, count in filter_counter.most_common(10):
         if col_name in current_partition_fields:
             continue  # Already partitioned on this column
 
@@ -178,20 +546,51 @@ def suggest_partitions(
 
         col_info = columns[col_name]
         unique_count = col_info.get("unique", 0)
+        col_type = col_info.get("type", "").lower()
 
-        # Good partition candidate: moderate cardinality (10-1000 unique values)
-        if row_count > 0 and 2 <= unique_count <= 1000:
-            ratio = unique_count / row_count
-            benefit = "high" if ratio < 0.1 else "medium" if ratio < 0.5 else "low"
-            suggestions.append({
-                "table": table_name,
-                "column": col_name,
-                "unique_values": unique_count,
-                "filter_frequency": fc["count"],
-                "benefit": benefit,
-                "rationale": f"Column '{col_name}' is filtered {fc['count']} times with {unique_count} unique values ({benefit} partition benefit)",
-            })
+        # Temporal columns partition by month; others need moderate cardinality
+        if col_type in ("date", "timestamp", "timestamptz"):
+            candidates.append((col_name, count, unique_count, f"month({col_name})"))
+        elif _is_partition_candidate(unique_count, row_count):
+            candidates.append((col_name, count, unique_count, f"identity({col_name})"))
+
+    if not candidates:
+        return []
+
+    simulation = simulate_layouts(
+        catalog, table_name,
+        partition_candidates=[[c[3]] for c in candidates],
+        sort_candidates=[],
+        store_path=store_path,
+    )
+    by_spec = {tuple(l["partition_by"]): l for l in simulation["layouts"] if not l["is_current"]}
+
+    suggestions = []
+    for col_name, count, unique_count, transform in candidates:
+        layout = by_spec.get((transform,))
+        if layout is None:
+            continue
+        reduction = layout["scan_reduction_pct"]
+        if reduction <= 0:
+            continue
+        benefit = "high" if reduction >= 50 else "medium" if reduction >= 20 else "low"
+        suggestions.append({
+            "table": table_name,
+            "column": col_name,
+            "transform": transform,
+            "unique_values": unique_count,
+            "filter_frequency": count,
+            "bytes_scanned": layout["bytes_scanned"],
+            "scan_reduction_pct": reduction,
+            "rewrite_bytes": layout["rewrite_cost"]["bytes_written"],
+            "benefit": benefit,
+            "rationale": (
+                f"Partitioning by {transform} cuts data scanned by {reduction}% across "
+                f"{count} recorded queries filtering on '{col_name}' ({benefit} partition benefit)"
+            ),
+        })
 
+    suggestions.sort(key=lambda s: s["scan_reduction_pct"], reverse=True)
     return suggestions
 
 
@@ -258,45 +657,366 @@ def get_optimization_report(
     }
 
 
+# Fallback selectivities when neither bounds nor statistics can be used
+DEFAULT_EQ_SELECTIVITY = 0.1
+DEFAULT_RANGE_SELECTIVITY = 0.3
+
+
+def _as_number(value) -> Optional[float]:
+    """Map numbers, dates and timestamps onto a line so they can be interpolated."""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    if isinstance(value, datetime.date):
+        return float(value.toordinal())
+    return None
+
+
+def _histogram_cdf(histogram: list, x: float) -> Optional[float]:
+    """Fraction of rows <= x according to equi-depth histogram boundaries."""
+    bounds = [_as_number(b) for b in histogram]
+    if len(bounds) < 2 or any(b is None for b in bounds):
+        return None
+    buckets = len(bounds) - 1
+    if x < bounds[0]:
+        return 0.0
+    if x >= bounds[-1]:
+        return 1.0
+    for i in range(buckets):
+        lo, hi = bounds[i], bounds[i + 1]
+        if lo <= x < hi:
+            return (i + (x - lo) / (hi - lo)) / buckets
+    return 1.0
+
+
+def _parse_histogram(col_stats: dict, reference) -> list:
+    """Decode a cached histogram into the Python type of the file bounds."""
+    from .pruning import _coerce
+
+    histogram = col_stats.get("histogram") or []
+    try:
+        return [_coerce(v, reference) for v in histogram]
+    except (TypeError, ValueError):
+        return []
+
+
+def _range_fraction(lower, upper, value, col_stats: dict) -> Optional[float]:
+    """Fraction of a file's rows (bounded by lower/upper) that are <= value."""
+    lo, hi, x = _as_number(lower), _as_number(upper), _as_number(value)
+    if lo is None or hi is None or x is None:
+        return None
+    if x < lo:
+        return 0.0
+    if x >= hi:
+        return 1.0
+
+    histogram = [_as_number(v) for v in _parse_histogram(col_stats, lower)]
+    if len(histogram) >= 2 and all(h is not None for h in histogram):
+        cdf_lo, cdf_hi = _histogram_cdf(histogram, lo), _histogram_cdf(histogram, hi)
+        if cdf_hi - cdf_lo > 0:
+            return (_histogram_cdf(histogram, x) - cdf_lo) / (cdf_hi - cdf_lo)
+    return (x - lo) / (hi - lo) if hi > lo else 1.0
+
+
+def _leaf_selectivity(file_info: dict, leaf: dict, stats_columns: dict) -> float:
+    """Estimate the fraction of a file's rows matching one predicate."""
+    from .pruning import _coerce
+
+    col, op, value = leaf["column"], leaf["op"], leaf["value"]
+    rows = file_info.get("record_count") or 0
+    nulls = file_info["null_value_counts"].get(col)
+    null_fraction = nulls / rows if rows and nulls is not None else 0.0
+    if op == "is_null":
+        return null_fraction if nulls is not None else DEFAULT_EQ_SELECTIVITY
+    if op == "not_null":
+        return 1.0 - null_fraction
+
+    lower = file_info["lower_bounds"].get(col)
+    upper = file_info["upper_bounds"].get(col)
+    col_stats = stats_columns.get(col, {})
+    ndv = col_stats.get("unique") or 0
+    eq = 1.0 / ndv if ndv else DEFAULT_EQ_SELECTIVITY
+    if lower is not None and lower == upper:
+        eq = 1.0
+
+    try:
+        if op == "=":
+            return eq * (1.0 - null_fraction)
+        if op == "!=":
+            return (1.0 - eq) * (1.0 - null_fraction)
+        if op == "in":
+            return min(1.0, eq * len(value)) * (1.0 - null_fraction)
+        if op == "not_in":
+            return max(0.0, 1.0 - eq * len(value)) * (1.0 - null_fraction)
+        if op in ("<", "<=", ">", ">=", "between"):
+            if lower is None or upper is None:
+                return DEFAULT_RANGE_SELECTIVITY
+            if op == "between":
+                lo_v, hi_v = (_coerce(v, lower) for v in value)
+                above = _range_fraction(lower, upper, hi_v, col_stats)
+                below = _range_fraction(lower, upper, lo_v, col_stats)
+                fraction = None if above is None or below is None else max(0.0, above - below)
+            else:
+                fraction = _range_fraction(lower, upper, _coerce(value, lower), col_stats)
+                if fraction is not None and op in (">", ">="):
+                    fraction = 1.0 - fraction
+            if fraction is None:
+                return DEFAULT_RANGE_SELECTIVITY
+            return fraction * (1.0 - null_fraction)
+    except (TypeError, ValueError):
+        pass
+    return DEFAULT_EQ_SELECTIVITY if op == "prefix" else DEFAULT_RANGE_SELECTIVITY
+
+
+def _selectivity(file_info: dict, tree: Optional[dict], stats_columns: dict) -> float:
+    """Estimate the fraction of a file's rows matching a predicate tree."""
+    if tree is None:
+        return 1.0
+    if "and" in tree:
+        result = 1.0
+        for child in tree["and"]:
+            result *= _selectivity(file_info, child, stats_columns)
+        return result
+    if "or" in tree:
+        miss = 1.0
+        for child in tree["or"]:
+            miss *= 1.0 - _selectivity(file_info, child, stats_columns)
+        return 1.0 - miss
+    return _leaf_selectivity(file_info, tree, stats_columns)
+
+
+_explain_lock = threading.Lock()
+_explain_conn = None  # shared connection with the iceberg extension loaded; False once it proved unavailable
+
+
+def _explain_connection():
+    """The DuckDB connection estimates run EXPLAIN on, or None without the iceberg extension.
+
+    The extension is loaded once per process rather than on every estimate.
+    """
+    global _explain_conn
+    import duckdb
+
+    if _explain_conn is None:
+        conn = duckdb.connect()
+        try:
+            conn.execute("LOAD iceberg")
+        except Exception:
+            try:
+                conn.execute("INSTALL iceberg; LOAD iceberg;")
+            except Exception:
+                conn.close()
+                _explain_conn = False
+                return None
+        _explain_conn = conn
+    return _explain_conn or None
+
+
+def _explain_estimates(catalog, sql: str, tables: dict) -> Optional[dict]:
+    """Run DuckDB EXPLAIN over iceberg_scan views of the query's tables (no data files are read).
+
+    Only the tables in ``tables`` (those the query references) get views,
+    and they are dropped again afterwards.
+    """
+    with _explain_lock:
+        conn = _explain_connection()
+        if conn is None:
+            return None
+        views = []
+        try:
+            for full_name, table in tables.items():
+                namespace, short = full_name.split(".", 1)
+                location = table.metadata_location.replace("'", "''")
+                conn.execute(f'CREATE SCHEMA IF NOT EXISTS "{namespace}"')
+                for view in (f'"{namespace}"."{short}"', f'"{short}"'):
+                    conn.execute(f"CREATE OR REPLACE VIEW {view} AS SELECT * FROM iceberg_scan('{location}')")
+                    views.append(view)
+            prepared = re.sub(r'(?<!["\w])default\.', '"default".', sql, flags=re.IGNORECASE)
+            plan = json.loads(conn.execute(f"EXPLAIN (FORMAT JSON) {prepared}").fetchall()[0][1])
+        except Exception:
+            return None
+        finally:
+            for view in views:
+                try:
+                    conn.execute(f"DROP VIEW IF EXISTS {view}")
+                except Exception:
+                    pass  # Replaced by the next estimate anyway
+
+    def cardinality(node) -> Optional[int]:
+        value = node.get("extra_info", {}).get("Estimated Cardinality")
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    joins = []
+    stack = list(plan)
+    while stack:
+        node = stack.pop()
+        if "JOIN" in node.get("name", ""):
+            joins.append({
+                "operator": node["name"],
+                "conditions": node.get("extra_info", {}).get("Conditions"),
+                "estimated_rows": cardinality(node),
+            })
+        stack.extend(node.get("children", []))
+
+    return {
+        "output_rows": cardinality(plan[0]) if plan else None,
+        "root_operator": plan[0].get("name") if plan else None,
+        "joins": joins,
+    }
+
+
+def _estimate_join_rows(scans: list[dict], join_keys: list[dict]) -> Optional[int]:
+    """System R style join cardinality: |L| * |R| / max(ndv(L.key), ndv(R.key))."""
+    if len(scans) < 2:
+        return None
+
+    def locate(ref):
+        qualifier, column = ref
+        for i, scan in enumerate(scans):
+            names = {scan["table"].split(".")[-1], scan.get("alias")}
+            if qualifier is not None and qualifier not in names:
+                continue
+            if column in scan["columns"]:
+                return i
+        return None
+
+    def ndv(i, column):
+        scan = scans[i]
+        unique = scan["stats_columns"].get(column, {}).get("unique")
+        if not unique:
+            # Unknown NDV: assume the key is unique on that side
+            return max(scan["estimated_rows"], 1)
+        return max(min(unique, scan["estimated_rows"]), 1)
+
+    joined = {0}
+    rows = float(scans[0]["estimated_rows"])
+    for key in join_keys:
+        left, right = locate(key["left"]), locate(key["right"])
+        if left is None or right is None or left == right:
+            continue
+        if left in joined and right not in joined:
+            new = right
+        elif right in joined and left not in joined:
+            new = left
+        else:
+            continue
+        rows = rows * scans[new]["estimated_rows"] / max(ndv(left, key["left"][1]), ndv(right, key["right"][1]))
+        joined.add(new)
+
+    for i, scan in enumerate(scans):
+        if i not in joined:
+            rows *= scan["estimated_rows"]  # no equi-join key found: cross product
+    return int(round(rows))
+
+
 def estimate_query_cost(
     catalog,
     sql: str,
     store_path: Optional[Path] = None,
 ) -> dict:
-    """Estimate the cost of a query based on table sizes."""
-    from .stats import get_cached_stats, compute_table_stats
+    """Estimate the cost of a query from metadata alone — no table data is read.
+
+    Files and bytes come from manifest pruning, row counts from per-file bounds,
+    null counts and cached histograms/NDVs, join output from key NDVs, and DuckDB's
+    own EXPLAIN over iceberg_scan of the current metadata when it can bind the query.
+    ``estimated_rows_scanned`` is the number of rows expected to pass the scan filters.
+    """
+    from .pruning import (
+        extract_join_keys, extract_scans, get_file_bounds, prune_files, referenced_columns,
+    )
+    from .stats import get_cached_stats
 
-    tables = _extract_tables_from_sql(sql)
-    has_filter = bool(_extract_filters_from_sql(sql))
+    scans = extract_scans(sql)
+    if scans is None:
+        tables = _extract_tables_from_sql(sql)
+        scans = [{"table": t, "alias": None, "filter": None} for t in tables]
+        has_filter = bool(_extract_filters_from_sql(sql))
+    else:
+        tables = [s["table"] for s in scans]
+        has_filter = bool(re.search(r'\bWHERE\b', sql, re.IGNORECASE))
     has_join_flag = _has_join(sql)
     has_agg = _has_aggregation(sql)
+    projected = referenced_columns(sql)
 
-    total_rows = 0
+    loaded = {}
+    file_cache = {}
     table_details = []
+    scan_details = []
+    total_rows = 0
+    seen_tables = set()
 
-    for tbl in tables:
-        tbl_name = _normalize(tbl)
-        stats = get_cached_stats(tbl_name, store_path=store_path)
-        if stats is None:
+    for scan in scans:
+        tbl_name = _normalize(scan["table"])
+        if tbl_name not in loaded:
             try:
-                stats = compute_table_stats(catalog, tbl_name)
+                loaded[tbl_name] = catalog.load_table(tbl_name)
+                file_cache[tbl_name] = get_file_bounds(loaded[tbl_name])
             except Exception:
-                stats = None
+                loaded[tbl_name] = None
+                file_cache[tbl_name] = []
+        table = loaded[tbl_name]
+        files = file_cache[tbl_name]
+        stats = get_cached_stats(tbl_name, store_path=store_path) or {}
+        stats_columns = stats.get("columns", {})
 
-        rows = stats.get("row_count", 0) if stats else 0
-        size = stats.get("total_size_bytes", 0) if stats else 0
-        total_rows += rows
+        table_rows = sum(f["record_count"] for f in files)
+        table_bytes = sum(f["file_size_in_bytes"] for f in files)
+        matched = prune_files(files, scan["filter"])
+        estimated = sum(f["record_count"] * _selectivity(f, scan["filter"], stats_columns) for f in matched)
+
+        if projected is None:
+            bytes_scanned = sum(f["file_size_in_bytes"] for f in matched)
+        else:
+            bytes_scanned = sum(
+                sum(size for col, size in f.get("column_sizes", {}).items() if col in projected)
+                or f["file_size_in_bytes"]
+                for f in matched
+            )
+
+        scan_details.append({
+            "table": tbl_name,
+            "alias": scan.get("alias"),
+            "columns": {f.name for f in table.schema().fields} if table is not None else set(),
+            "stats_columns": stats_columns,
+            "estimated_rows": int(round(estimated)),
+        })
+        if tbl_name not in seen_tables:
+            total_rows += table_rows
+            seen_tables.add(tbl_name)
         table_details.append({
             "table": tbl_name,
-            "estimated_rows": rows,
-            "size_bytes": size,
+            "estimated_rows": table_rows,
+            "size_bytes": table_bytes,
+            "files_total": len(files),
+            "files_scanned": len(matched),
+            "bytes_scanned": bytes_scanned,
+            "rows_in_scanned_files": sum(f["record_count"] for f in matched),
+            "estimated_rows_after_filter": int(round(estimated)),
         })
 
-    # Estimate rows scanned (filters reduce, joins may increase)
-    if has_filter:
-        estimated_scan = int(total_rows * 0.3)  # Assume filter reduces to ~30%
+    estimated_scan = sum(s["estimated_rows"] for s in scan_details)
+    files_total = sum(t["files_total"] for t in table_details)
+    files_scanned = sum(t["files_scanned"] for t in table_details)
+    bytes_scanned = sum(t["bytes_scanned"] for t in table_details)
+
+    join_rows = _estimate_join_rows(scan_details, extract_join_keys(sql) or []) if has_join_flag else None
+    largest_input = max((s["estimated_rows"] for s in scan_details), default=0)
+    join_fan_out = round(join_rows / largest_input, 3) if join_rows is not None and largest_input else None
+
+    existing = {name: t for name, t in loaded.items() if t is not None}
+    explain = _explain_estimates(catalog, sql, existing) if existing else None
+    if explain and explain["output_rows"] is not None and (explain["output_rows"] > 0 or estimated_scan == 0):
+        estimated_output = explain["output_rows"]
+    elif join_rows is not None:
+        estimated_output = join_rows
     else:
-        estimated_scan = total_rows
+        estimated_output = estimated_scan
 
     complexity = "simple"
     if has_join_flag and has_agg:
@@ -309,9 +1029,39 @@ def estimate_query_cost(
         "tables_involved": table_details,
         "estimated_rows_scanned": estimated_scan,
         "total_source_rows": total_rows,
+        "files_planned": files_total,
+        "files_scanned": files_scanned,
+        "bytes_scanned": bytes_scanned,
+        "estimated_output_rows": estimated_output,
+        "join_rows": join_rows,
+        "join_fan_out": join_fan_out,
+        "explain": explain,
         "has_filter": has_filter,
         "has_join": has_join_flag,
         "has_aggregation": has_agg,
         "complexity": complexity,
-        "message": f"Query cost estimate: ~{estimated_scan:,} rows scanned across {len(tables)} table(s) ({complexity})",
+        "message": (
+            f"Query cost estimate: ~{estimated_scan:,} rows from {files_scanned}/{files_total} files "
+            f"({bytes_scanned:,} bytes) across {len(table_details)} table(s) ({complexity})"
+        ),
     }
+
+
+def check_admission(
+    estimate: dict,
+    config_path: Optional[Path] = None,
+) -> Optional[str]:
+    """Return a warning if an estimated query exceeds the configured scan limits, else None."""
+    from .config import get_query_limits
+
+    limits = get_query_limits(config_path)
+    reasons = []
+    if estimate["bytes_scanned"] > limits["max_bytes_scanned"]:
+        reasons.append(f"~{estimate['bytes_scanned']:,} bytes scanned (limit {limits['max_bytes_scanned']:,})")
+    if estimate["estimated_rows_scanned"] > limits["max_rows_scanned"]:
+        reasons.append(f"~{estimate['estimated_rows_scanned']:,} rows scanned (limit {limits['max_rows_scanned']:,})")
+    if estimate["estimated_output_rows"] > limits["max_output_rows"]:
+        reasons.append(f"~{estimate['estimated_output_rows']:,} output rows (limit {limits['max_output_rows']:,})")
+    if not reasons:
+        return None
+    return "Query exceeds admission limits: " + "; ".join(reasons)
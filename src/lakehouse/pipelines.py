@@ -2,13 +2,19 @@
 
 import datetime
 import json
+import threading
 import time
 from pathlib import Path
 from typing import Optional
 
+from .tracing import span, traced
+
 DEFAULT_PIPELINE_PATH = Path.home() / ".lakehouse" / "pipelines.json"
+# Steps run concurrently when their dependencies allow
+DEFAULT_MAX_WORKERS = 4
 
 
+@traced("store.pipelines.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_PIPELINE_PATH
     if not path.exists():
@@ -19,12 +25,25 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.pipelines.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_PIPELINE_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(data, indent=2, default=str))
 
 
+_store_lock = threading.Lock()
+
+
+def _save_entry(name: str, entry: dict, store_path: Optional[Path] = None) -> None:
+    """Write one pipeline's entry, re-reading the store so concurrent runs of other pipelines are kept."""
+    with _store_lock:
+        store = _load_store(store_path)
+        if name in store:
+            store[name] = entry
+            _save_store(store, store_path)
+
+
 def create_pipeline(
     name: str,
     steps: list[dict],
@@ -36,7 +55,10 @@ def create_pipeline(
     Args:
         name: Pipeline name
         steps: List of dicts with 'sql' (required), 'target_table' (optional),
-               'mode' (optional, 'overwrite' or 'append', default 'overwrite')
+               'mode' (optional, 'overwrite' or 'append', default 'overwrite');
+               for incremental runs also 'source_table' (its new rows are bound
+               as {{delta}}) and 'merge_keys' (upsert on these columns instead
+               of appending)
         description: Optional description
         store_path: Optional path to metadata store
 
@@ -54,6 +76,9 @@ def create_pipeline(
         mode = step.get("mode", "overwrite")
         if mode not in ("overwrite", "append"):
             raise ValueError(f"Step {i} has invalid mode '{mode}' (must be 'overwrite' or 'append')")
+        merge_keys = step.get("merge_keys")
+        if merge_keys is not None and (not isinstance(merge_keys, list) or not merge_keys):
+            raise ValueError(f"Step {i} merge_keys must be a non-empty list of column names")
 
     store = _load_store(store_path)
     if name in store:
@@ -116,176 +141,466 @@ def list_pipelines(
     return result
 
 
+def _qualify(table_name: str) -> str:
+    return table_name if "." in table_name else f"default.{table_name}"
+
+
+def _step_reads(sql: str, known_tables: list[str]) -> set[str]:
+    """Qualified names of the known tables a step's SQL reads."""
+    from .pruning import extract_scans
+
+    scans = extract_scans(sql)
+    if scans is None:
+        # Unparseable: fall back to matching table names in the text
+        lowered = sql.lower()
+        return {t for t in known_tables if t.split(".")[-1].lower() in lowered or t.lower() in lowered}
+    known = set(known_tables)
+    return {_qualify(scan["table"]) for scan in scans if _qualify(scan["table"]) in known}
+
+
+def _build_dag(steps: list[dict], catalog_tables: list[str]) -> list[dict]:
+    """Dependencies between steps from the tables each one reads and writes.
+
+    A step depends on an earlier step when it reads that step's target, writes
+    a table the earlier step reads, or writes the same target; steps are
+    otherwise independent and may run concurrently.
+
+    Returns:
+        One dict per step with reads, write (qualified target or None),
+        depends_on (step indexes) and inputs (table -> producing step index,
+        or None to read the catalog table)
+    """
+    known = sorted(set(catalog_tables) | {_qualify(s["target_table"]) for s in steps if s.get("target_table")})
+    nodes = []
+    for i, step in enumerate(steps):
+        write = _qualify(step["target_table"]) if step.get("target_table") else None
+        reads = _step_reads(step["sql"], known)
+        # An append builds on the target's current contents
+        reads_self = {write} if write and step.get("mode", "overwrite") == "append" else set()
+        depends = set()
+        inputs = {}
+        for table in reads | reads_self:
+            writers = [n["step"] for n in nodes if n["write"] == table]
+            inputs[table] = writers[-1] if writers else None
+            depends.update(writers[-1:])
+        if write:
+            # Write-after-read and write-after-write on the same table keep their order
+            depends.update(n["step"] for n in nodes if write in n["reads"] or n["write"] == write)
+        nodes.append({
+            "step": i,
+            "reads": reads,
+            "write": write,
+            "depends_on": sorted(depends),
+            "inputs": inputs,
+        })
+    return nodes
+
+
+def _arrow_result_types(result):
+    """Make DuckDB result types storable: HUGEINT (SUM of integers) to long, other decimals to double."""
+    import pyarrow as pa
+
+    fields = []
+    for field in result.schema:
+        if pa.types.is_decimal(field.type):
+            field = field.with_type(pa.int64() if field.type.scale == 0 else pa.float64())
+        fields.append(field)
+    return result.cast(pa.schema(fields))
+
+
+def _conform(data, table):
+    """Arrange Arrow data to an Iceberg table's schema (by column name; missing columns are NULL).
+
+    Raises:
+        ValueError: If the data has columns the table lacks (the schema is
+            never evolved implicitly, so they would otherwise be lost)
+    """
+    import pyarrow as pa
+
+    schema = table.schema().as_arrow()
+    extra = [name for name in data.column_names if name not in schema.names]
+    if extra:
+        raise ValueError(
+            f"Schema mismatch for table '{'.'.join(table.name())}': "
+            f"columns {', '.join(extra)} not in the table"
+        )
+    columns = []
+    for field in schema:
+        if field.name in data.column_names:
+            columns.append(data.column(field.name).cast(field.type))
+        else:
+            columns.append(pa.nulls(data.num_rows, field.type))
+    return pa.Table.from_arrays(columns, schema=schema)
+
+
+def _commit_target(
+    catalog,
+    target: str,
+    mode: str,
+    data,
+    merge_keys: Optional[list[str]] = None,
+    snapshot_properties: Optional[dict] = None,
+    branch: Optional[str] = None,
+) -> int:
+    """Write Arrow data to a target in one Iceberg commit (creating the table if needed).
+
+    Args:
+        catalog: Iceberg catalog
+        target: Qualified target table
+        mode: 'overwrite', 'append' or 'merge' (upsert on ``merge_keys``)
+        data: Arrow table; missing targets get its (storable) types
+        merge_keys: Key columns for 'merge'
+        snapshot_properties: Extra entries for the commit's snapshot summary
+        branch: Staging branch to commit to instead of main (created at
+            main's head if missing); staged rows are audited before publish
+            rather than validated row by row here
+
+    Returns:
+        Rows written
+    """
+    from pyiceberg.table.refs import MAIN_BRANCH
+    from .catalog import _arrow_schema_to_iceberg
+    from .validation import ValidationError, list_validation_rules, validate_rows
+
+    data = _arrow_result_types(data)
+    try:
+        table = catalog.load_table(target)
+    except Exception:
+        table = catalog.create_table(target, schema=_arrow_schema_to_iceberg(data.schema))
+    data = _conform(data, table)
+    if branch is not None and branch not in table.metadata.refs:
+        from .wap import stage_branch
+        stage_branch(catalog, target, branch)
+        table = catalog.load_table(target)
+
+    rules = list_validation_rules(target) if branch is None else []
+    if rules:
+        existing = None
+        if mode == "append" and any(r["type"] == "unique" for r in rules):
+            existing = table.scan().to_arrow().to_pylist()
+        checked = validate_rows(data.to_pylist(), rules, existing)
+        if not checked["valid"]:
+            raise ValidationError(checked["failures"])
+
+    properties = snapshot_properties or {}
+    branch = branch or MAIN_BRANCH
+    with span("catalog.commit", table=target, op=mode, rows=data.num_rows):
+        if mode == "overwrite":
+            table.overwrite(data, snapshot_properties=properties, branch=branch)
+        elif mode == "merge":
+            if data.num_rows:
+                table.upsert(data, join_cols=merge_keys, snapshot_properties=properties, branch=branch)
+        elif data.num_rows:
+            table.append(data, snapshot_properties=properties, branch=branch)
+    if branch == MAIN_BRANCH:
+        from .auto_refresh import notify_commit
+        notify_commit(catalog, target)
+    return data.num_rows
+
+
+def _run_dag(
+    name: str,
+    catalog,
+    steps: list[dict],
+    nodes: list[dict],
+    catalog_tables: list[str],
+    max_workers: int,
+    wap: bool = False,
+) -> dict:
+    """Execute steps on one in-memory DuckDB database, committing targets only if every step succeeds.
+
+    With ``wap`` targets are committed to staging branches and published
+    together only if every staged target passes its audit.
+    """
+    import concurrent.futures
+    from .wap import audit_and_publish, discard_all, staging_branch_name
+
+    import duckdb
+    import pyarrow as pa
+
+    from .joins import _resolve_namespace_refs
+
+    run_start = time.perf_counter()
+    aliases = sorted(set(catalog_tables) | {n["write"] for n in nodes if n["write"]})
+
+    # Catalog tables the pipeline reads (before any step rewrites them), scanned once each
+    sources = sorted({t for n in nodes for t, producer in n["inputs"].items() if producer is None and t in catalog_tables})
+    loaded: dict[str, pa.Table] = {}
+    with span("pipeline.load", pipeline=name, tables=len(sources)):
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for table_name, data in zip(sources, pool.map(lambda t: catalog.load_table(t).scan().to_arrow(), sources)):
+                loaded[table_name] = data
+    load_ms = int((time.perf_counter() - run_start) * 1000)
+
+    database = duckdb.connect(":memory:")
+    outputs: dict[int, pa.Table] = {}   # each step's result
+    visible: dict[int, pa.Table] = {}   # a target's contents after the step (append steps include prior data)
+    results: dict[int, dict] = {}
+    lock = threading.Lock()
+
+    def input_data(table_name: str, producer):
+        if producer is not None:
+            return visible[producer]
+        if table_name in loaded:
+            return loaded[table_name]
+        return None  # A new table no step has produced yet; DuckDB reports it
+
+    def run_step(i: int) -> dict:
+        node, step = nodes[i], steps[i]
+        started = time.perf_counter()
+        cursor = database.cursor()
+        try:
+            for table_name, producer in node["inputs"].items():
+                data = input_data(table_name, producer)
+                if data is None:
+                    continue
+                ns_name, short = table_name.split(".", 1)
+                cursor.register(short, data)
+                cursor.register(f"{ns_name}__{short}", data)
+            sql = _resolve_namespace_refs(step["sql"], catalog, tables=aliases)
+            with span("pipeline.step", pipeline=name, step=i):
+                result = _arrow_result_types(cursor.execute(sql).fetch_arrow_table())
+        finally:
+            cursor.close()
+
+        if node["write"] and step.get("mode", "overwrite") == "append":
+            prior = input_data(node["write"], node["inputs"].get(node["write"]))
+            if prior is None and node["write"] in catalog_tables:
+                prior = catalog.load_table(node["write"]).scan().to_arrow()
+            with lock:
+                visible[i] = pa.concat_tables([prior, result], promote_options="permissive") if prior is not None else result
+        else:
+            with lock:
+                visible[i] = result
+        with lock:
+            outputs[i] = result
+        return {
+            "step": i,
+            "sql": step["sql"],
+            "target_table": node["write"],
+            "depends_on": node["depends_on"],
+            "rows_affected": result.num_rows,
+            "output_bytes": result.nbytes,
+            "status": "completed",
+            "started_ms": int((started - run_start) * 1000),
+            "duration_ms": int((time.perf_counter() - started) * 1000),
+        }
+
+    failed = False
+    pending = {n["step"] for n in nodes}
+    running: dict = {}
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            if not failed:
+                done = set(results)
+                for i in sorted(pending):
+                    if len(running) >= max_workers:
+                        break
+                    if all(d in done and results[d]["status"] == "completed" for d in nodes[i]["depends_on"]):
+                        running[pool.submit(run_step, i)] = (i, time.perf_counter())
+                        pending.discard(i)
+            if not running:
+                break
+            finished, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in finished:
+                i, submitted = running.pop(future)
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    failed = True
+                    results[i] = {
+                        "step": i,
+                        "sql": steps[i]["sql"],
+                        "target_table": nodes[i]["write"],
+                        "depends_on": nodes[i]["depends_on"],
+                        "status": "error",
+                        "error": str(e),
+                        "started_ms": int((submitted - run_start) * 1000),
+                        "duration_ms": int((time.perf_counter() - submitted) * 1000),
+                    }
+    database.close()
+
+    # Commit each target once, in step order: overwrite replaces, append accumulates
+    commits: dict[str, dict] = {}
+    done: list[str] = []  # targets whose commit reached main
+    commit_start = time.perf_counter()
+    committed = False
+    if not failed:
+        for node in nodes:
+            target = node["write"]
+            if not target:
+                continue
+            if steps[node["step"]].get("mode", "overwrite") == "overwrite" or target not in commits:
+                overwrite = steps[node["step"]].get("mode", "overwrite") == "overwrite"
+                commits[target] = {"overwrite": overwrite, "parts": [outputs[node["step"]]], "steps": [node["step"]]}
+            else:
+                commits[target]["parts"].append(outputs[node["step"]])
+                commits[target]["steps"].append(node["step"])
+        staged: dict[str, str] = {}
+        written: dict[str, int] = {}
+        try:
+            for target, commit in commits.items():
+                data = pa.concat_tables(commit["parts"], promote_options="permissive")
+                if wap:
+                    staged[target] = staging_branch_name()
+                rows = _commit_target(
+                    catalog, target, "overwrite" if commit["overwrite"] else "append", data,
+                    branch=staged.get(target),
+                )
+                if wap:
+                    written[target] = rows
+                else:
+                    done.append(target)
+                    _record_step_effects(name, target, commit, rows, nodes, steps)
+            committed = True
+        except Exception as e:
+            failed = True
+            error = f"Commit to {target} failed: {e}"
+            if done:
+                error += f" (already committed: {', '.join(done)})"
+            results[max(commits[target]["steps"])].update({"status": "error", "error": error})
+            discard_all(catalog, staged)
+
+        if committed and staged:
+            try:
+                audit = audit_and_publish(catalog, staged)
+            except Exception as e:
+                last = max(max(commit["steps"]) for commit in commits.values())
+                results[last].update({"status": "error", "error": f"Publish failed: {e}"})
+                audit = {"published": False, "publishes": {}, "failures": []}
+            # Normally all targets or none; a publish commit failing part-way leaves the earlier ones
+            done = list(audit["publishes"])
+            for target in done:
+                _record_step_effects(name, target, commits[target], written[target], nodes, steps)
+            if not audit["published"]:
+                failed, committed = True, False
+                for f in audit["failures"]:
+                    step = results[max(commits[f["table"]]["steps"])]
+                    if step["status"] != "error":
+                        what = "Publish" if f["check"] == "publish" else "Audit"
+                        step.update({"status": "error", "error": f"{what} of {f['table']} failed: {f['message']}"})
+
+    return {
+        "step_results": [results[i] for i in sorted(results)],
+        "failed": failed,
+        "committed": committed,
+        "tables_committed": sorted(done),
+        "load_ms": load_ms,
+        "commit_ms": int((time.perf_counter() - commit_start) * 1000),
+    }
+
+
+def _record_step_effects(name: str, target: str, commit: dict, rows: int, nodes: list[dict], steps: list[dict]) -> None:
+    """Audit and lineage entries for a committed target (best-effort)."""
+    mode = "overwrite" if commit["overwrite"] else "append"
+    try:
+        from .audit import log_operation
+        log_operation(
+            target, "pipeline_step",
+            rows_affected=rows,
+            source="pipeline",
+            details={"pipeline": name, "steps": commit["steps"], "mode": mode},
+        )
+    except Exception:
+        pass
+    try:
+        from .lineage import record_lineage
+        for i in commit["steps"]:
+            sources = sorted(nodes[i]["reads"] - {target})
+            if sources:
+                record_lineage(sources, target, operation="pipeline", sql=steps[i]["sql"])
+    except Exception:
+        pass
+
+
 def run_pipeline(
     name: str,
     catalog,
     engine,
     dry_run: bool = False,
     store_path: Optional[Path] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    wap: bool = False,
 ) -> dict:
-    """Execute all steps in a pipeline sequentially.
+    """Execute a pipeline, running independent steps concurrently.
+
+    Step dependencies come from the tables each step reads (parsed from its
+    SQL) and writes. Every step runs on one in-memory DuckDB database; step
+    results stay in memory as Arrow tables that later steps read directly,
+    and each target table is committed once, after every step succeeded, as
+    a single Iceberg overwrite or append. A failed step stops new steps from
+    starting and nothing is committed; if a target's commit fails, the
+    targets committed before it stay committed and are reported.
+
+    With ``wap`` (write-audit-publish) those commits go to staging branches;
+    the staged files are audited and every target is published only if all
+    of them pass, so readers never see a partially or badly written run.
 
     Args:
         name: Pipeline name
         catalog: Iceberg catalog
-        engine: QueryEngine instance
+        engine: QueryEngine instance (refreshed after the targets are committed)
         dry_run: If True, validate SQL without executing
         store_path: Optional path to metadata store
+        max_workers: Steps run at once (1 runs them in order)
+        wap: Stage, audit and publish targets instead of committing to main
 
     Returns:
-        Dict with per-step results.
+        Dict with per-step results (rows_affected, output_bytes held in
+        memory, started_ms, duration_ms, depends_on), load_ms, commit_ms and
+        tables_committed (the targets actually committed, also on failure).
     """
+    from .catalog import list_tables
+
     store = _load_store(store_path)
     if name not in store:
         raise ValueError(f"Pipeline '{name}' not found")
 
     entry = store[name]
     steps = entry["steps"]
-    step_results = []
     overall_start = time.time()
-
-    for i, step in enumerate(steps):
-        sql = step["sql"]
-        target_table = step.get("target_table")
-        mode = step.get("mode", "overwrite")
-
-        step_start = time.time()
-
-        if dry_run:
-            # Validate SQL syntax by preparing (not executing)
-            try:
-                # Use DuckDB explain to validate without executing
-                import duckdb
-                conn = duckdb.connect(":memory:")
-                # Register tables for validation
-                from .joins import _register_all_tables
-                _register_all_tables(catalog, conn)
-                # Resolve namespace references
-                from .joins import _resolve_namespace_refs
-                resolved_sql = _resolve_namespace_refs(sql, catalog)
-                conn.execute(f"EXPLAIN {resolved_sql}")
-                conn.close()
-                step_results.append({
-                    "step": i,
-                    "sql": sql,
-                    "target_table": target_table,
-                    "status": "validated",
-                    "duration_ms": int((time.time() - step_start) * 1000),
-                })
-            except Exception as e:
-                conn.close()
-                step_results.append({
+    catalog_tables = list_tables(catalog, namespace="*")
+    nodes = _build_dag(steps, catalog_tables)
+    run = {"load_ms": 0, "commit_ms": 0, "committed": False, "tables_committed": []}
+
+    if dry_run:
+        import duckdb
+        from .joins import _register_all_tables, _resolve_namespace_refs
+
+        step_results = []
+        conn = duckdb.connect(":memory:")
+        try:
+            # Register tables once for every step's validation
+            _register_all_tables(catalog, conn)
+            for i, step in enumerate(steps):
+                step_start = time.time()
+                result = {
                     "step": i,
-                    "sql": sql,
-                    "target_table": target_table,
-                    "status": "error",
-                    "error": str(e),
-                    "duration_ms": int((time.time() - step_start) * 1000),
-                })
-                break
-        else:
+                    "sql": step["sql"],
+                    "target_table": step.get("target_table"),
+                    "depends_on": nodes[i]["depends_on"],
+                }
+                try:
+                    # Use DuckDB explain to validate without executing
+                    conn.execute(f"EXPLAIN {_resolve_namespace_refs(step['sql'], catalog, tables=catalog_tables)}")
+                    result["status"] = "validated"
+                except Exception as e:
+                    result.update({"status": "error", "error": str(e)})
+                result["duration_ms"] = int((time.time() - step_start) * 1000)
+                step_results.append(result)
+                if result["status"] == "error":
+                    break
+        finally:
+            conn.close()
+    else:
+        with span("pipeline.run", pipeline=name, steps=len(steps)):
+            run = _run_dag(name, catalog, steps, nodes, catalog_tables, max(1, max_workers), wap=wap)
+        step_results = run["step_results"]
+        if run["tables_committed"] and engine is not None:
             try:
-                if target_table:
-                    # Execute and write results to target table
-                    from .joins import execute_join
-                    from .catalog import create_table, insert_rows, delete_rows, list_tables
-
-                    result = execute_join(catalog, sql)
-                    df = result["dataframe"]
-
-                    if "." not in target_table:
-                        target_table = f"default.{target_table}"
-
-                    # Check if table exists
-                    try:
-                        catalog.load_table(target_table)
-                        table_exists = True
-                    except Exception:
-                        table_exists = False
-
-                    if not table_exists:
-                        # Infer types and create
-                        type_map = {
-                            "int64": "long",
-                            "float64": "double",
-                            "object": "string",
-                            "bool": "boolean",
-                        }
-                        columns = {}
-                        for col in df.columns:
-                            dtype = str(df[col].dtype)
-                            columns[col] = type_map.get(dtype, "string")
-                        create_table(catalog, target_table, columns)
-                    elif mode == "overwrite":
-                        try:
-                            delete_rows(catalog, target_table, "1=1")
-                        except Exception:
-                            pass
-
-                    rows_written = 0
-                    if not df.empty:
-                        rows = df.to_dict(orient="records")
-                        insert_rows(catalog, target_table, rows)
-                        rows_written = len(rows)
-
-                    # Log to audit
-                    try:
-                        from .audit import log_operation
-                        log_operation(
-                            target_table, "pipeline_step",
-                            rows_affected=rows_written,
-                            source="pipeline",
-                            details={"pipeline": name, "step": i, "mode": mode},
-                        )
-                    except Exception:
-                        pass
-
-                    # Record lineage
-                    try:
-                        from .lineage import record_lineage
-                        all_tables = list_tables(catalog, namespace="*")
-                        sources = []
-                        sql_lower = sql.lower()
-                        for tbl in all_tables:
-                            short = tbl.split(".")[-1]
-                            if short.lower() in sql_lower or tbl.lower() in sql_lower:
-                                if tbl != target_table:
-                                    sources.append(tbl)
-                        if sources:
-                            record_lineage(sources, target_table, operation="pipeline", sql=sql)
-                    except Exception:
-                        pass
-
-                    step_results.append({
-                        "step": i,
-                        "sql": sql,
-                        "target_table": target_table,
-                        "rows_affected": rows_written,
-                        "status": "completed",
-                        "duration_ms": int((time.time() - step_start) * 1000),
-                    })
-                else:
-                    # Execute SQL directly (no target table)
-                    df = engine.execute(sql, max_rows=1_000_000)
-                    step_results.append({
-                        "step": i,
-                        "sql": sql,
-                        "target_table": None,
-                        "rows_affected": len(df),
-                        "status": "completed",
-                        "duration_ms": int((time.time() - step_start) * 1000),
-                    })
-            except Exception as e:
-                step_results.append({
-                    "step": i,
-                    "sql": sql,
-                    "target_table": target_table,
-                    "status": "error",
-                    "error": str(e),
-                    "duration_ms": int((time.time() - step_start) * 1000),
-                })
-                # Failure stops the pipeline
-                break
+                engine.refresh()
+            except Exception:
+                pass
 
     total_ms = int((time.time() - overall_start) * 1000)
 
@@ -295,11 +610,17 @@ def run_pipeline(
         has_error = any(r["status"] == "error" for r in step_results)
         entry["last_run"] = now
         entry["last_run_status"] = "failed" if has_error else "completed"
-        _save_store(store, store_path)
+        _save_entry(name, entry, store_path)
 
     completed = sum(1 for r in step_results if r["status"] in ("completed", "validated"))
     failed = sum(1 for r in step_results if r["status"] == "error")
     mode_str = " (dry run)" if dry_run else ""
+    message = f"Pipeline '{name}'{mode_str}: {completed}/{len(steps)} steps completed ({total_ms}ms)"
+    if not dry_run and failed:
+        if run["tables_committed"]:
+            message += f"; only {', '.join(run['tables_committed'])} committed"
+        else:
+            message += "; nothing committed"
 
     return {
         "name": name,
@@ -308,8 +629,11 @@ def run_pipeline(
         "steps_failed": failed,
         "step_results": step_results,
         "duration_ms": total_ms,
+        "load_ms": run["load_ms"],
+        "commit_ms": run["commit_ms"],
+        "tables_committed": run["tables_committed"],
         "dry_run": dry_run,
-        "message": f"Pipeline '{name}'{mode_str}: {completed}/{len(steps)} steps completed ({total_ms}ms)",
+        "message": message,
     }
 
 
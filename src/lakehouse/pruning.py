@@ -0,0 +1,621 @@
+"""Predicate extraction from SQL and manifest-based data file pruning."""
+
+import datetime
+import json
+import re
+from decimal import Decimal
+from functools import lru_cache
+from typing import Optional
+
+# DuckDB comparison node types -> normalized operators
+_COMPARE_OPS = {
+    "COMPARE_EQUAL": "=",
+    "COMPARE_NOTEQUAL": "!=",
+    "COMPARE_LESSTHAN": "<",
+    "COMPARE_GREATERTHAN": ">",
+    "COMPARE_LESSTHANOREQUALTO": "<=",
+    "COMPARE_GREATERTHANOREQUALTO": ">=",
+}
+
+# Operator to use when the constant is on the left-hand side
+_FLIPPED_OPS = {"=": "=", "!=": "!=", "<": ">", ">": "<", "<=": ">=", ">=": "<="}
+
+
+def _normalize(table_name: str) -> str:
+    if "." not in table_name:
+        return f"default.{table_name}"
+    return table_name
+
+
+# --- SQL parsing ---
+
+
+@lru_cache(maxsize=1024)
+def _serialize_sql(sql: str) -> Optional[str]:
+    import duckdb
+
+    # "default" is a reserved word in DuckDB's grammar; quote it when used as a namespace
+    prepared = re.sub(r'(?<!["\w])default\.', '"default".', sql, flags=re.IGNORECASE)
+    try:
+        conn = duckdb.connect()
+        try:
+            return conn.execute("SELECT json_serialize_sql(?)", [prepared]).fetchone()[0]
+        finally:
+            conn.close()
+    except Exception:
+        return None
+
+
+def parse_sql(sql: str) -> Optional[list[dict]]:
+    """Parse SQL into DuckDB's JSON AST. Returns the statement list, or None if unparseable."""
+    raw = _serialize_sql(sql)
+    if raw is None:
+        return None
+
+    parsed = json.loads(raw)
+    if parsed.get("error"):
+        return None
+    return parsed.get("statements", [])
+
+
+def _walk_select_nodes(obj):
+    """Yield every SELECT_NODE in an AST (CTEs, subqueries, and set operations included)."""
+    if isinstance(obj, dict):
+        if obj.get("type") == "SELECT_NODE":
+            yield obj
+        for value in obj.values():
+            yield from _walk_select_nodes(value)
+    elif isinstance(obj, list):
+        for item in obj:
+            yield from _walk_select_nodes(item)
+
+
+def _cte_names(statements: list[dict]) -> set[str]:
+    names = set()
+
+    def visit(obj):
+        if isinstance(obj, dict):
+            for entry in (obj.get("cte_map") or {}).get("map", []) or []:
+                names.add(entry.get("key", "").lower())
+            for value in obj.values():
+                visit(value)
+        elif isinstance(obj, list):
+            for item in obj:
+                visit(item)
+
+    visit(statements)
+    return names
+
+
+def _base_tables(from_table: Optional[dict]) -> list[dict]:
+    """Collect BASE_TABLE refs from a FROM clause, descending through joins but not subqueries."""
+    if not from_table:
+        return []
+    kind = from_table.get("type")
+    if kind == "BASE_TABLE":
+        return [from_table]
+    if kind == "JOIN":
+        return _base_tables(from_table.get("left")) + _base_tables(from_table.get("right"))
+    return []
+
+
+def _join_conditions(from_table: Optional[dict]) -> list[dict]:
+    """Collect JOIN condition ASTs from a FROM clause."""
+    if not from_table or from_table.get("type") != "JOIN":
+        return []
+    conditions = []
+    if from_table.get("condition"):
+        conditions.append(from_table)
+    conditions.extend(_join_conditions(from_table.get("left")))
+    conditions.extend(_join_conditions(from_table.get("right")))
+    return conditions
+
+
+def _constant_value(node: dict):
+    """Extract a Python literal from a CONSTANT/CAST AST node. Raises ValueError if not constant."""
+    cls = node.get("class")
+    if cls == "CONSTANT":
+        value = node.get("value", {})
+        if value.get("is_null"):
+            return None
+        type_info = value.get("type", {})
+        raw = value.get("value")
+        if type_info.get("id") == "DECIMAL":
+            scale = (type_info.get("type_info") or {}).get("scale", 0)
+            return float(Decimal(raw) / (Decimal(10) ** scale))
+        return raw
+    if cls == "CAST":
+        inner = _constant_value(node.get("child", {}))
+        target = node.get("cast_type", {}).get("id")
+        if inner is None:
+            return None
+        try:
+            if target == "DATE":
+                return datetime.date.fromisoformat(str(inner)[:10])
+            if target in ("TIMESTAMP", "TIMESTAMP WITH TIME ZONE", "TIMESTAMP_TZ"):
+                return datetime.datetime.fromisoformat(str(inner))
+            if target == "BOOLEAN":
+                return str(inner).lower() in ("t", "true", "1")
+            if target in ("DOUBLE", "FLOAT", "DECIMAL"):
+                return float(inner)
+            if target in ("INTEGER", "BIGINT", "SMALLINT", "TINYINT", "HUGEINT"):
+                return int(inner)
+        except (TypeError, ValueError):
+            raise ValueError("Unsupported constant cast")
+        return inner
+    raise ValueError("Not a constant")
+
+
+def _column_ref(node: dict) -> Optional[tuple[Optional[str], str]]:
+    """Return (qualifier, column) for a COLUMN_REF node, else None."""
+    if node.get("class") != "COLUMN_REF":
+        return None
+    names = node.get("column_names", [])
+    if not names:
+        return None
+    qualifier = names[-2].lower() if len(names) >= 2 else None
+    return qualifier, names[-1].lower()
+
+
+def _leaf(ref: tuple, op: str, value) -> dict:
+    return {"qualifier": ref[0], "column": ref[1], "op": op, "value": value}
+
+
+def _convert_expr(node: Optional[dict]) -> Optional[dict]:
+    """Convert a WHERE AST into a predicate tree. Unsupported expressions become None (unknown)."""
+    if not node:
+        return None
+    kind = node.get("type")
+
+    if kind == "CONJUNCTION_AND":
+        children = [c for c in (_convert_expr(ch) for ch in node.get("children", [])) if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else {"and": children}
+
+    if kind == "CONJUNCTION_OR":
+        children = [_convert_expr(ch) for ch in node.get("children", [])]
+        if any(c is None for c in children):
+            return None
+        return {"or": children}
+
+    try:
+        if kind in _COMPARE_OPS:
+            op = _COMPARE_OPS[kind]
+            left, right = node.get("left", {}), node.get("right", {})
+            ref = _column_ref(left)
+            if ref is not None:
+                return _leaf(ref, op, _constant_value(right))
+            ref = _column_ref(right)
+            if ref is not None:
+                return _leaf(ref, _FLIPPED_OPS[op], _constant_value(left))
+            return None
+
+        if kind in ("COMPARE_IN", "COMPARE_NOT_IN"):
+            children = node.get("children", [])
+            ref = _column_ref(children[0]) if children else None
+            if ref is None:
+                return None
+            values = [_constant_value(c) for c in children[1:]]
+            return _leaf(ref, "in" if kind == "COMPARE_IN" else "not_in", values)
+
+        if kind == "COMPARE_BETWEEN":
+            ref = _column_ref(node.get("input", {}))
+            if ref is None:
+                return None
+            return _leaf(ref, "between", (_constant_value(node["lower"]), _constant_value(node["upper"])))
+
+        if kind in ("OPERATOR_IS_NULL", "OPERATOR_IS_NOT_NULL"):
+            children = node.get("children", [])
+            ref = _column_ref(children[0]) if children else None
+            if ref is None:
+                return None
+            return _leaf(ref, "is_null" if kind == "OPERATOR_IS_NULL" else "not_null", None)
+
+        if kind == "FUNCTION" and node.get("function_name") in ("~~", "like", "prefix", "starts_with"):
+            children = node.get("children", [])
+            ref = _column_ref(children[0]) if children else None
+            pattern = _constant_value(children[1]) if len(children) > 1 else None
+            if ref is None or not isinstance(pattern, str):
+                return None
+            if node.get("function_name") in ("~~", "like"):
+                prefix = re.split(r"[%_]", pattern, maxsplit=1)[0]
+                if not prefix:
+                    return None
+                if prefix == pattern:
+                    return _leaf(ref, "=", pattern)
+                return _leaf(ref, "prefix", prefix)
+            return _leaf(ref, "prefix", pattern)
+    except (ValueError, KeyError, IndexError):
+        return None
+
+    return None
+
+
+def _restrict(tree: Optional[dict], names: set[str], qualified_only: bool = False) -> Optional[dict]:
+    """Keep only predicate leaves that can refer to a table known by any of ``names``.
+
+    With ``qualified_only``, unqualified leaves are dropped too (they may
+    belong to another table in the same FROM clause).
+    """
+    if tree is None:
+        return None
+    if "and" in tree:
+        children = [c for c in (_restrict(ch, names, qualified_only) for ch in tree["and"]) if c is not None]
+        if not children:
+            return None
+        return children[0] if len(children) == 1 else {"and": children}
+    if "or" in tree:
+        children = [_restrict(ch, names, qualified_only) for ch in tree["or"]]
+        if any(c is None for c in children):
+            return None
+        return {"or": children}
+    qualifier = tree.get("qualifier")
+    if qualifier is None and qualified_only:
+        return None
+    if qualifier is not None and qualifier not in names:
+        return None
+    return tree
+
+
+def extract_scans(sql: str) -> Optional[list[dict]]:
+    """Extract every base-table scan in a query along with the predicates applying to it.
+
+    Returns:
+        List of dicts with keys: table (as written, lower-cased), alias, filter
+        (predicate tree or None), or None if the SQL cannot be parsed.
+    """
+    statements = parse_sql(sql)
+    if statements is None:
+        return None
+
+    ctes = _cte_names(statements)
+    scans = []
+    for node in _walk_select_nodes(statements):
+        where = _convert_expr(node.get("where_clause"))
+        for ref in _base_tables(node.get("from_table")):
+            short = ref.get("table_name", "").lower()
+            schema = ref.get("schema_name", "").lower()
+            if not schema and short in ctes:
+                continue
+            table = f"{schema}.{short}" if schema else short
+            alias = (ref.get("alias") or "").lower() or None
+            names = {short, alias} if alias else {short}
+            scans.append({
+                "table": table,
+                "alias": alias,
+                "filter": _restrict(where, names),
+            })
+    return scans
+
+
+def extract_join_keys(sql: str) -> Optional[list[dict]]:
+    """Extract equi-join key pairs as ``{"left": (qualifier, col), "right": (qualifier, col)}``."""
+    statements = parse_sql(sql)
+    if statements is None:
+        return None
+
+    keys = []
+    for node in _walk_select_nodes(statements):
+        for join in _join_conditions(node.get("from_table")):
+            stack = [join["condition"]]
+            while stack:
+                cond = stack.pop()
+                if cond.get("type") == "CONJUNCTION_AND":
+                    stack.extend(cond.get("children", []))
+                elif cond.get("type") == "COMPARE_EQUAL":
+                    left = _column_ref(cond.get("left", {}))
+                    right = _column_ref(cond.get("right", {}))
+                    if left and right:
+                        keys.append({"left": left, "right": right})
+            for col in join.get("using_columns", []) or []:
+                keys.append({"left": (None, col.lower()), "right": (None, col.lower())})
+    return keys
+
+
+# Which side of a join may be filtered by the other side's keys: a side can be
+# reduced to rows that have a match only if unmatched rows would be dropped.
+_FILTERABLE_SIDES = {
+    "INNER": ("left", "right"),
+    "SEMI": ("left", "right"),
+    "LEFT": ("right",),
+    "ANTI": ("right",),
+    "RIGHT": ("left",),
+}
+# Sides whose rows are padded with NULLs (WHERE predicates must not be pushed below the join)
+_NULL_SUPPLYING_SIDES = {
+    "LEFT": ("right",),
+    "ANTI": ("right",),
+    "RIGHT": ("left",),
+    "OUTER": ("left", "right"),
+    "FULL": ("left", "right"),
+}
+
+
+def extract_join_graph(sql: str) -> Optional[dict]:
+    """Extract base-table scans and equi-join edges for join filter pushdown.
+
+    Returns:
+        Dict with ``scans`` (table, alias, filter, null_supplying) and ``edges``
+        (build and probe scan indexes plus key columns; one edge per direction
+        in which the build side's keys may filter the probe side), or None if
+        the SQL cannot be parsed.
+    """
+    statements = parse_sql(sql)
+    if statements is None:
+        return None
+
+    ctes = _cte_names(statements)
+    scans = []
+    edges = []
+    for node in _walk_select_nodes(statements):
+        from_table = node.get("from_table")
+        refs = _base_tables(from_table)
+        where = _convert_expr(node.get("where_clause"))
+        index = {}
+        for ref in refs:
+            short = ref.get("table_name", "").lower()
+            schema = ref.get("schema_name", "").lower()
+            if not schema and short in ctes:
+                continue
+            alias = (ref.get("alias") or "").lower() or None
+            names = {alias} if alias else {short}
+            index[id(ref)] = len(scans)
+            scans.append({
+                "table": f"{schema}.{short}" if schema else short,
+                "alias": alias,
+                "filter": _restrict(where, names, qualified_only=len(refs) > 1),
+                "null_supplying": False,
+            })
+
+        def visit(join):
+            if not join or join.get("type") != "JOIN":
+                return
+            visit(join.get("left"))
+            visit(join.get("right"))
+            sides = {
+                "left": [r for r in _base_tables(join.get("left")) if id(r) in index],
+                "right": [r for r in _base_tables(join.get("right")) if id(r) in index],
+            }
+            join_type = join.get("join_type", "")
+            for side in _NULL_SUPPLYING_SIDES.get(join_type, ()):
+                for ref in sides[side]:
+                    scans[index[id(ref)]]["null_supplying"] = True
+            if join.get("ref_type", "REGULAR") != "REGULAR" or join_type not in _FILTERABLE_SIDES:
+                return
+
+            def resolve(side, qualifier, column):
+                if qualifier is None:
+                    return sides[side][0] if len(sides[side]) == 1 else None
+                for ref in sides[side]:
+                    scan = scans[index[id(ref)]]
+                    if qualifier == (scan["alias"] or scan["table"].split(".")[-1]):
+                        return ref
+                return None
+
+            pairs = [((None, c.lower()), (None, c.lower())) for c in join.get("using_columns", []) or []]
+            stack = [join["condition"]] if join.get("condition") else []
+            while stack:
+                cond = stack.pop()
+                if cond.get("type") == "CONJUNCTION_AND":
+                    stack.extend(cond.get("children", []))
+                elif cond.get("type") == "COMPARE_EQUAL":
+                    a, b = _column_ref(cond.get("left", {})), _column_ref(cond.get("right", {}))
+                    if a and b:
+                        pairs.append((a, b))
+
+            for a, b in pairs:
+                # Either operand may name the left side
+                for (lq, lc), (rq, rc) in ((a, b), (b, a)):
+                    left, right = resolve("left", lq, lc), resolve("right", rq, rc)
+                    if left is not None and right is not None:
+                        break
+                else:
+                    continue
+                ends = {"left": (index[id(left)], lc), "right": (index[id(right)], rc)}
+                for probe in _FILTERABLE_SIDES[join_type]:
+                    build = "right" if probe == "left" else "left"
+                    edges.append({
+                        "build": ends[build][0],
+                        "build_column": ends[build][1],
+                        "probe": ends[probe][0],
+                        "probe_column": ends[probe][1],
+                        "join_type": join_type,
+                    })
+
+        visit(from_table)
+    return {"scans": scans, "edges": edges}
+
+
+def referenced_columns(sql: str) -> Optional[set[str]]:
+    """Return every column name a query references, or None if it selects * or cannot be parsed."""
+    statements = parse_sql(sql)
+    if statements is None:
+        return None
+
+    columns = set()
+    stack = [statements]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, dict):
+            if obj.get("class") == "STAR":
+                return None
+            ref = _column_ref(obj)
+            if ref is not None:
+                columns.add(ref[1])
+            stack.extend(obj.values())
+        elif isinstance(obj, list):
+            stack.extend(obj)
+    return columns
+
+
+def predicate_columns(tree: Optional[dict]) -> list[str]:
+    """List the columns referenced by a predicate tree (with repeats)."""
+    if tree is None:
+        return []
+    if "and" in tree or "or" in tree:
+        cols = []
+        for child in tree.get("and", tree.get("or", [])):
+            cols.extend(predicate_columns(child))
+        return cols
+    return [tree["column"]]
+
+
+def scans_for_table(sql: str, table_name: str) -> list[dict]:
+    """Return the scans in ``sql`` that read ``table_name`` (short or qualified name)."""
+    scans = extract_scans(sql) or []
+    target = _normalize(table_name.lower())
+    return [s for s in scans if _normalize(s["table"]) == target]
+
+
+# --- Manifest bounds ---
+
+
+def _decode_bound(field_type, raw: bytes):
+    """Decode an Iceberg single-value serialized bound into a comparable Python value."""
+    from pyiceberg.conversions import from_bytes
+    from pyiceberg.types import DateType, TimestampType, TimestamptzType
+
+    value = from_bytes(field_type, raw)
+    if isinstance(field_type, DateType):
+        return datetime.date(1970, 1, 1) + datetime.timedelta(days=value)
+    if isinstance(field_type, TimestampType):
+        return datetime.datetime(1970, 1, 1) + datetime.timedelta(microseconds=value)
+    if isinstance(field_type, TimestamptzType):
+        return datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc) + datetime.timedelta(microseconds=value)
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def file_bounds(table, data_file) -> dict:
+    """Describe one data file: path, size, row count and per-column bounds keyed by column name."""
+    schema = table.schema()
+    fields = {f.field_id: f for f in schema.fields}
+
+    def by_name(mapping, decode=False):
+        out = {}
+        for field_id, value in (mapping or {}).items():
+            field = fields.get(field_id)
+            if field is None or not field.field_type.is_primitive:
+                continue
+            if decode:
+                try:
+                    value = _decode_bound(field.field_type, value)
+                except Exception:
+                    continue
+            out[field.name] = value
+        return out
+
+    return {
+        "file_path": data_file.file_path,
+        "record_count": data_file.record_count,
+        "file_size_in_bytes": data_file.file_size_in_bytes,
+        "lower_bounds": by_name(data_file.lower_bounds, decode=True),
+        "upper_bounds": by_name(data_file.upper_bounds, decode=True),
+        "null_value_counts": by_name(data_file.null_value_counts),
+        "value_counts": by_name(data_file.value_counts),
+        "column_sizes": by_name(data_file.column_sizes),
+    }
+
+
+def get_file_bounds(table, snapshot_id: Optional[int] = None) -> list[dict]:
+    """Read per-file column bounds for a table snapshot from its manifests (no data is read)."""
+    if table.current_snapshot() is None:
+        return []
+    scan = table.scan(snapshot_id=snapshot_id) if snapshot_id is not None else table.scan()
+    return [file_bounds(table, task.file) for task in scan.plan_files()]
+
+
+# --- Pruning ---
+
+
+def _coerce(value, reference):
+    """Coerce a SQL literal to the Python type of a bound so they can be compared."""
+    if value is None or reference is None:
+        return value
+    if isinstance(reference, datetime.datetime):
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value)
+        elif isinstance(value, datetime.date) and not isinstance(value, datetime.datetime):
+            value = datetime.datetime.combine(value, datetime.time())
+        if reference.tzinfo is not None and value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        elif reference.tzinfo is None and value.tzinfo is not None:
+            value = value.replace(tzinfo=None)
+        return value
+    if isinstance(reference, datetime.date):
+        if isinstance(value, datetime.datetime):
+            return value.date()
+        if isinstance(value, str):
+            return datetime.date.fromisoformat(value[:10])
+        return value
+    if isinstance(reference, bool):
+        return value if isinstance(value, bool) else str(value).lower() in ("t", "true", "1")
+    if isinstance(reference, (int, float)) and not isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(reference, str) and not isinstance(value, str):
+        return str(value)
+    return value
+
+
+def _leaf_may_match(file_info: dict, leaf: dict) -> bool:
+    col, op, value = leaf["column"], leaf["op"], leaf["value"]
+    lower = file_info["lower_bounds"].get(col)
+    upper = file_info["upper_bounds"].get(col)
+    nulls = file_info["null_value_counts"].get(col)
+    count = file_info.get("value_counts", {}).get(col, file_info.get("record_count"))
+
+    if op == "is_null":
+        return nulls is None or nulls > 0
+    if op == "not_null":
+        return nulls is None or count is None or nulls < count
+    if lower is None or upper is None:
+        # No bounds: only an all-null column can be ruled out
+        return not (nulls is not None and count is not None and nulls == count and count > 0)
+
+    try:
+        if op == "=":
+            v = _coerce(value, lower)
+            return lower <= v <= upper
+        if op == "!=":
+            v = _coerce(value, lower)
+            return not (lower == upper == v)
+        if op == "<":
+            return lower < _coerce(value, lower)
+        if op == "<=":
+            return lower <= _coerce(value, lower)
+        if op == ">":
+            return upper > _coerce(value, upper)
+        if op == ">=":
+            return upper >= _coerce(value, upper)
+        if op == "in":
+            return any(v is not None and lower <= _coerce(v, lower) <= upper for v in value)
+        if op == "not_in":
+            return not (lower == upper and any(_coerce(v, lower) == lower for v in value if v is not None))
+        if op == "between":
+            lo, hi = (_coerce(v, lower) for v in value)
+            return upper >= lo and lower <= hi
+        if op == "prefix":
+            if not isinstance(lower, str):
+                return True
+            return lower[: len(value)] <= value <= upper[: len(value)]
+    except (TypeError, ValueError):
+        return True
+    return True
+
+
+def file_may_match(file_info: dict, tree: Optional[dict]) -> bool:
+    """Return False only if the file's bounds prove no row can satisfy the predicate tree."""
+    if tree is None:
+        return True
+    if "and" in tree:
+        return all(file_may_match(file_info, child) for child in tree["and"])
+    if "or" in tree:
+        return any(file_may_match(file_info, child) for child in tree["or"])
+    return _leaf_may_match(file_info, tree)
+
+
+def prune_files(files: list[dict], tree: Optional[dict]) -> list[dict]:
+    """Return the subset of files that may contain rows matching the predicate tree."""
+    return [f for f in files if file_may_match(f, tree)]
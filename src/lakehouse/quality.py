@@ -2,13 +2,21 @@
 
 import datetime
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+from .checks import DEFAULT_CHECK_WORKERS
+from .tracing import traced
+
 DEFAULT_QUALITY_PATH = Path.home() / ".lakehouse" / "quality.json"
 MAX_HISTORY = 50
 
+_store_lock = threading.Lock()
+
 
+@traced("store.quality.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_QUALITY_PATH
     if not path.exists():
@@ -19,18 +27,48 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.quality.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_QUALITY_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text(json.dumps(data, indent=2, default=str))
 
 
+def _freshness_score(last_modified: Optional[str]) -> float:
+    """100 within an hour of the last write, decaying to 50 at a day and 0 a week later."""
+    if not last_modified:
+        return 0.0
+    try:
+        mod_time = datetime.datetime.fromisoformat(last_modified)
+        now = datetime.datetime.now(datetime.timezone.utc)
+        age_hours = (now - mod_time).total_seconds() / 3600
+        if age_hours <= 1:
+            return 100.0
+        elif age_hours <= 24:
+            return round(max(0, 100 - (age_hours - 1) * (50 / 23)), 1)
+        else:
+            return round(max(0, 50 - (age_hours - 24) * (50 / 168)), 1)
+    except (ValueError, TypeError):
+        return 50.0
+
+
+def _overall_score(completeness: float, uniqueness: float, freshness: float, rule_compliance: float) -> float:
+    return round(
+        completeness * 0.30
+        + uniqueness * 0.25
+        + freshness * 0.20
+        + rule_compliance * 0.25,
+        1,
+    )
+
+
 def compute_quality_score(
     catalog,
     table_name: str,
     stats_path: Optional[Path] = None,
     validation_path: Optional[Path] = None,
     store_path: Optional[Path] = None,
+    context=None,
 ) -> dict:
     """Compute a data quality score for a table.
 
@@ -40,17 +78,72 @@ def compute_quality_score(
         - freshness (20%): penalized if last modified > 1 hour ago
         - rule_compliance (25%): % of validation rules passing
 
+    With a CheckContext the score is computed (and recorded in history) once
+    per snapshot for the run, from the run's shared stats and table scan.
+
     Returns:
         Dict with overall_score (0-100), component scores, and details.
     """
-    from .stats import compute_table_stats
-    from .validation import list_validation_rules, validate_rows
-
     if "." not in table_name:
         table_name = f"default.{table_name}"
 
+    if context is not None:
+        return context.memo(
+            table_name, ("quality", str(stats_path), str(validation_path), str(store_path)),
+            lambda: _compute_quality_score(catalog, table_name, stats_path, validation_path, store_path, context),
+        )
+    return _compute_quality_score(catalog, table_name, stats_path, validation_path, store_path, None)
+
+
+def compute_batch_quality(data, rules: Optional[list[dict]] = None) -> dict:
+    """Score a batch of rows (Arrow) before it becomes visible.
+
+    Uses the same weights as compute_quality_score, computed column-wise on
+    the batch alone: freshness counts as 100 (the rows were just written)
+    and rule compliance comes from validate_arrow's violation counts.
+    Nothing is recorded in the quality history.
+
+    Returns:
+        Dict with overall_score (0-100) and component scores.
+    """
+    import pyarrow.compute as pc
+    from .validation import validate_arrow
+
+    row_count = data.num_rows
+    columns = data.column_names
+    if row_count and columns:
+        null_cells = sum(data.column(c).null_count for c in columns)
+        completeness = round((1 - null_cells / (row_count * len(columns))) * 100, 1)
+        ratios = [pc.count_distinct(data.column(c)).as_py() / row_count for c in columns]
+        uniqueness = round(sum(ratios) / len(ratios) * 100, 1)
+    else:
+        completeness = 100.0 if row_count == 0 else 0.0
+        uniqueness = 100.0
+
+    rule_compliance = 100.0
+    if rules and row_count:
+        failures = validate_arrow(data, rules)["failures"]
+        total_checks = len(rules) * row_count
+        failing = sum(f.get("violation_count", 1) for f in failures)
+        rule_compliance = round(max(0.0, (total_checks - failing) / total_checks) * 100, 1)
+
+    return {
+        "overall_score": _overall_score(completeness, uniqueness, 100.0, rule_compliance),
+        "completeness": completeness,
+        "uniqueness": uniqueness,
+        "freshness": 100.0,
+        "rule_compliance": rule_compliance,
+        "row_count": row_count,
+        "column_count": len(columns),
+    }
+
+
+def _compute_quality_score(catalog, table_name, stats_path, validation_path, store_path, context) -> dict:
+    from .stats import compute_table_stats
+    from .validation import list_validation_rules, validate_rows
+
     # Compute fresh stats
-    stats = compute_table_stats(catalog, table_name, store_path=stats_path)
+    stats = compute_table_stats(catalog, table_name, store_path=stats_path, context=context)
     row_count = stats["row_count"]
     columns = stats.get("columns", {})
 
@@ -74,30 +167,14 @@ def compute_quality_score(
         uniqueness = 100.0
 
     # --- Freshness (20%) ---
-    last_modified = stats.get("last_modified")
-    if last_modified:
-        try:
-            mod_time = datetime.datetime.fromisoformat(last_modified)
-            now = datetime.datetime.now(datetime.timezone.utc)
-            age_hours = (now - mod_time).total_seconds() / 3600
-            if age_hours <= 1:
-                freshness = 100.0
-            elif age_hours <= 24:
-                freshness = round(max(0, 100 - (age_hours - 1) * (50 / 23)), 1)
-            else:
-                freshness = round(max(0, 50 - (age_hours - 24) * (50 / 168)), 1)
-        except (ValueError, TypeError):
-            freshness = 50.0
-    else:
-        freshness = 0.0
+    freshness = _freshness_score(stats.get("last_modified"))
 
     # --- Rule compliance (25%) ---
     rules = list_validation_rules(table_name, store_path=validation_path)
     if rules and row_count > 0:
         # Load table data for validation
         try:
-            table = catalog.load_table(table_name)
-            arrow = table.scan().to_arrow()
+            arrow = context.arrow(table_name) if context is not None else catalog.load_table(table_name).scan().to_arrow()
             rows = arrow.to_pydict()
             row_list = [dict(zip(rows.keys(), vals)) for vals in zip(*rows.values())]
             result = validate_rows(row_list, rules)
@@ -110,13 +187,7 @@ def compute_quality_score(
         rule_compliance = 100.0  # No rules = compliant
 
     # --- Overall score ---
-    overall = round(
-        completeness * 0.30
-        + uniqueness * 0.25
-        + freshness * 0.20
-        + rule_compliance * 0.25,
-        1,
-    )
+    overall = _overall_score(completeness, uniqueness, freshness, rule_compliance)
 
     # --- Recommendations ---
     recommendations = []
@@ -139,18 +210,30 @@ def compute_quality_score(
         "rule_compliance": rule_compliance,
         "row_count": row_count,
         "column_count": len(columns),
+        "snapshot_id": stats.get("snapshot_id_at_cache"),
         "recommendations": recommendations,
         "computed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
     }
 
     # Save to history
-    store = _load_store(store_path)
-    if table_name not in store:
-        store[table_name] = {"history": []}
-    store[table_name]["history"].append(score_entry)
-    # Keep only last N entries
-    store[table_name]["history"] = store[table_name]["history"][-MAX_HISTORY:]
-    _save_store(store, store_path)
+    with _store_lock:
+        store = _load_store(store_path)
+        if table_name not in store:
+            store[table_name] = {"history": []}
+        store[table_name]["history"].append(score_entry)
+        # Keep only last N entries
+        store[table_name]["history"] = store[table_name]["history"][-MAX_HISTORY:]
+        _save_store(store, store_path)
+
+    try:
+        from .metrics_history import record_metrics
+        record_metrics(
+            table_name,
+            {k: score_entry[k] for k in ("overall_score", "completeness", "uniqueness", "freshness", "rule_compliance")},
+            "quality", snapshot_id=score_entry["snapshot_id"],
+        )
+    except Exception:
+        pass  # History is best-effort
 
     return {
         "table": table_name,
@@ -164,6 +247,7 @@ def detect_anomalies(
     table_name: str,
     stats_path: Optional[Path] = None,
     store_path: Optional[Path] = None,
+    context=None,
 ) -> list[dict]:
     """Detect anomalies by comparing current data with cached stats.
 
@@ -171,6 +255,12 @@ def detect_anomalies(
         - Row count change > 50%
         - NULL count spike in any column
         - Numeric column min/max drift
+        - Outliers of any recorded metric against the table's metrics history
+          (see metrics_history.detect_metric_anomalies)
+
+    With a CheckContext, the baseline is the cache as it was before the run
+    first computed this table's stats, so other checks sharing the context
+    do not hide a change.
 
     Returns:
         List of anomaly dicts with column, type, severity, description.
@@ -180,13 +270,20 @@ def detect_anomalies(
     if "." not in table_name:
         table_name = f"default.{table_name}"
 
-    # Get cached (old) stats
-    old_stats = get_cached_stats(table_name, store_path=stats_path)
-
-    # Compute fresh stats
-    new_stats = compute_table_stats(catalog, table_name, store_path=stats_path)
+    # Compute fresh stats; the cached (old) stats are read first
+    if context is not None:
+        new_stats = compute_table_stats(catalog, table_name, store_path=stats_path, context=context)
+        old_stats = context.memo(table_name, ("stats_baseline", str(stats_path)), lambda: None)
+    else:
+        old_stats = get_cached_stats(table_name, store_path=stats_path)
+        new_stats = compute_table_stats(catalog, table_name, store_path=stats_path)
 
-    anomalies = []
+    # Outliers against the table's longer metrics history (needs enough recorded points)
+    try:
+        from .metrics_history import detect_metric_anomalies
+        anomalies = detect_metric_anomalies(table_name=table_name)
+    except Exception:
+        anomalies = []
 
     if old_stats is None:
         return anomalies  # No baseline to compare
@@ -279,9 +376,16 @@ def get_quality_report(
     stats_path: Optional[Path] = None,
     validation_path: Optional[Path] = None,
     store_path: Optional[Path] = None,
+    context=None,
+    max_workers: int = DEFAULT_CHECK_WORKERS,
 ) -> dict:
-    """Generate a quality report for one or all tables."""
+    """Generate a quality report for one or all tables.
+
+    Tables are scored in parallel, sharing one CheckContext so each table is
+    scanned once for its stats, rule compliance and anomaly checks.
+    """
     from .catalog import list_tables
+    from .checks import CheckContext
 
     if table_name:
         tables = [table_name if "." in table_name else f"default.{table_name}"]
@@ -294,17 +398,18 @@ def get_quality_report(
         "average_score": 0,
     }
 
-    scores = []
-    for tbl in tables:
+    def score_table(tbl):
         try:
+            # Anomalies first: the baseline must be read before this run caches new stats
+            anomalies = detect_anomalies(catalog, tbl, stats_path=stats_path, context=context)
             score = compute_quality_score(
                 catalog, tbl,
                 stats_path=stats_path,
                 validation_path=validation_path,
                 store_path=store_path,
+                context=context,
             )
-            anomalies = detect_anomalies(catalog, tbl, stats_path=stats_path)
-            report["tables"].append({
+            return {
                 "table": tbl,
                 "overall_score": score["overall_score"],
                 "completeness": score["completeness"],
@@ -314,14 +419,18 @@ def get_quality_report(
                 "anomalies": len(anomalies),
                 "anomaly_details": anomalies,
                 "recommendations": score["recommendations"],
-            })
-            scores.append(score["overall_score"])
+            }
         except Exception:
-            report["tables"].append({
+            return {
                 "table": tbl,
                 "overall_score": None,
                 "error": "Could not compute score",
-            })
+            }
+
+    context = context or CheckContext(catalog)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tables) or 1))) as pool:
+        report["tables"] = list(pool.map(score_table, tables))
+    scores = [t["overall_score"] for t in report["tables"] if t["overall_score"] is not None]
 
     report["average_score"] = round(sum(scores) / len(scores), 1) if scores else 0
 
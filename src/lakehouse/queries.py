@@ -1,15 +1,41 @@
 """Saved queries and query history management."""
 
+import atexit
+import contextlib
 import datetime
 import json
+import threading
+import time
+import uuid
 from pathlib import Path
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+from .tracing import traced
+
 
 DEFAULT_QUERIES_PATH = Path.home() / ".lakehouse" / "queries.json"
 MAX_HISTORY_ENTRIES = 1000
 
+# Columnar execution history written automatically by QueryEngine
+DEFAULT_HISTORY_DIR = Path.home() / ".lakehouse" / "query_history"
+HISTORY_FLUSH_ROWS = 32
+HISTORY_FLUSH_SECONDS = 5.0
+HISTORY_COMPACT_SEGMENTS = 64
+MAX_EXECUTION_RECORDS = 100_000
+
+EXECUTION_PHASES = ("catalog_load_ms", "planning_ms", "scan_ms", "execute_ms", "fetch_ms", "format_ms")
+
+_pending: dict[Path, list[dict]] = {}
+_pending_since: dict[Path, float] = {}
+_pending_lock = threading.Lock()
 
+
+@traced("store.queries.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     """Load the queries store from disk."""
     path = store_path or DEFAULT_QUERIES_PATH
@@ -21,6 +47,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {"saved": {}, "history": []}
 
 
+@traced("store.queries.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     """Save the queries store to disk."""
     path = store_path or DEFAULT_QUERIES_PATH
@@ -188,19 +215,32 @@ def add_history_entry(
 def get_history(
     limit: int = 20,
     store_path: Optional[Path] = None,
+    include_internal: bool = True,
 ) -> list[dict]:
     """Get recent query history.
 
+    Merges manually added entries with executions recorded by QueryEngine
+    in the columnar history next to the store.
+
     Args:
         limit: Maximum entries to return (most recent first)
+        include_internal: Include executions the library ran on its own
+            behalf (view refreshes, incremental pipelines, auto-refresh)
 
     Returns:
         List of history entry dicts (most recent first)
     """
     store = _load_store(store_path)
-    history = store.get("history", [])
-    # Return most recent first
-    return list(reversed(history[-limit:]))
+    history = store.get("history", [])[-limit:]
+
+    executions = _read_recent_executions(limit, _history_dir(store_path), include_internal)
+    if not executions:
+        # Return most recent first
+        return list(reversed(history))
+
+    merged = history + executions
+    merged.sort(key=lambda e: e.get("executed_at", ""))
+    return list(reversed(merged[-limit:]))
 
 
 def clear_history(
@@ -216,7 +256,311 @@ def clear_history(
     store["history"] = []
     _save_store(store, store_path)
 
+    history_dir = _history_dir(store_path)
+    with _pending_lock:
+        count += len(_pending.pop(history_dir, []))
+        _pending_since.pop(history_dir, None)
+    with _history_lock(history_dir, exclusive=True):
+        for segment in _segments(history_dir):
+            count += _segment_rows(segment)
+            segment.unlink(missing_ok=True)
+
     return {
         "cleared": count,
         "message": f"Cleared {count} history entries",
     }
+
+
+# --- Columnar execution history ---
+
+
+def _history_dir(store_path: Optional[Path] = None) -> Path:
+    """Execution history lives next to the queries store (DEFAULT_HISTORY_DIR by default)."""
+    if store_path is None:
+        return DEFAULT_HISTORY_DIR
+    return Path(store_path).with_name("query_history")
+
+
+def _execution_schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("executed_at", pa.timestamp("us", tz="UTC")),
+        ("sql", pa.string()),
+        ("method", pa.string()),
+        ("status", pa.string()),
+        ("error", pa.string()),
+        ("tables", pa.list_(pa.string())),
+        ("rows_returned", pa.int64()),
+        ("duration_ms", pa.float64()),
+        *[(phase, pa.float64()) for phase in EXECUTION_PHASES],
+        ("files_planned", pa.int64()),
+        ("files_scanned", pa.int64()),
+        ("bytes_read", pa.int64()),
+        ("rows_scanned", pa.int64()),
+        ("result_arrow_bytes", pa.int64()),
+        ("cache_hit", pa.bool_()),
+        ("source", pa.string()),
+    ])
+
+
+@contextlib.contextmanager
+def _history_lock(history_dir: Path, exclusive: bool = False):
+    """Cross-process lock on a history directory.
+
+    Compaction and clearing hold it exclusively while they replace or
+    unlink segments; readers hold it shared, so they never see a segment
+    vanish or a compacted base next to the segments it replaces. Without
+    fcntl (Windows) this is a no-op.
+    """
+    if fcntl is None:
+        yield
+        return
+    history_dir.mkdir(parents=True, exist_ok=True)
+    with open(history_dir / ".lock", "a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def _segments(history_dir: Path) -> list[Path]:
+    if not history_dir.exists():
+        return []
+    return sorted(history_dir.glob("*.parquet"))
+
+
+def _segment_rows(segment: Path) -> int:
+    import pyarrow.parquet as pq
+
+    try:
+        return pq.ParquetFile(segment).metadata.num_rows
+    except Exception:
+        return 0
+
+
+def _write_segment(records: list[dict], history_dir: Path, prefix: str = "seg") -> Path:
+    """Write records as one immutable Parquet segment (temp file + rename, never rewritten)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _execution_schema()
+    rows = []
+    for record in records:
+        row = {field.name: record.get(field.name) for field in schema}
+        if isinstance(row["executed_at"], str):
+            row["executed_at"] = datetime.datetime.fromisoformat(row["executed_at"])
+        rows.append(row)
+
+    history_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    path = history_dir / f"{prefix}-{stamp}-{uuid.uuid4().hex[:8]}.parquet"
+    tmp = path.with_suffix(".tmp")
+    pq.write_table(pa.Table.from_pylist(rows, schema=schema), tmp, compression="zstd")
+    tmp.replace(path)
+    return path
+
+
+def record_execution(
+    record: dict,
+    history_dir: Optional[Path] = None,
+) -> dict:
+    """Buffer one execution record for the columnar history.
+
+    Records are flushed as a Parquet segment once HISTORY_FLUSH_ROWS accumulate,
+    HISTORY_FLUSH_SECONDS pass, the history is read, or the process exits. The
+    newest record stays mutable until the next one arrives so callers can add
+    late phases (e.g. format_ms) to it.
+
+    Returns:
+        The buffered record dict
+    """
+    history_dir = Path(history_dir or DEFAULT_HISTORY_DIR)
+    record.setdefault("executed_at", datetime.datetime.now(datetime.timezone.utc).isoformat())
+
+    with _pending_lock:
+        pending = _pending.get(history_dir, [])
+        due = pending and (
+            len(pending) >= HISTORY_FLUSH_ROWS
+            or time.monotonic() - _pending_since.get(history_dir, 0.0) >= HISTORY_FLUSH_SECONDS
+        )
+    if due:
+        flush_executions(history_dir)
+
+    with _pending_lock:
+        if not _pending.get(history_dir):
+            _pending_since[history_dir] = time.monotonic()
+        _pending.setdefault(history_dir, []).append(record)
+    return record
+
+
+def flush_executions(history_dir: Optional[Path] = None) -> int:
+    """Write buffered execution records to a new segment. Returns the number written."""
+    history_dir = Path(history_dir or DEFAULT_HISTORY_DIR)
+    with _pending_lock:
+        records = _pending.pop(history_dir, [])
+        _pending_since.pop(history_dir, None)
+    if not records:
+        return 0
+
+    _write_segment(records, history_dir)
+    if len(_segments(history_dir)) > HISTORY_COMPACT_SEGMENTS:
+        compact_execution_history(history_dir)
+    return len(records)
+
+
+def _flush_all() -> None:
+    for history_dir in list(_pending):
+        try:
+            flush_executions(history_dir)
+        except Exception:
+            pass
+
+
+atexit.register(_flush_all)
+
+
+def compact_execution_history(
+    history_dir: Optional[Path] = None,
+    retain: int = MAX_EXECUTION_RECORDS,
+) -> dict:
+    """Merge history segments into one file, keeping the newest ``retain`` records.
+
+    Returns:
+        Dict with segments merged and records kept
+    """
+    import pyarrow.parquet as pq
+
+    history_dir = Path(history_dir or DEFAULT_HISTORY_DIR)
+    # Segments are listed under the lock: a compactor that waited for another
+    # one sees its result instead of merging (and duplicating) the same rows
+    with _history_lock(history_dir, exclusive=True):
+        segments = _segments(history_dir)
+        if len(segments) <= 1:
+            return {"segments_merged": 0, "records": sum(_segment_rows(s) for s in segments),
+                    "message": "Execution history already compact"}
+
+        table = pq.ParquetDataset(segments, schema=_execution_schema()).read()
+        table = table.sort_by("executed_at")
+        if table.num_rows > retain:
+            table = table.slice(table.num_rows - retain)
+
+        _write_segment(table.to_pylist(), history_dir, prefix="base")
+        for segment in segments:
+            segment.unlink(missing_ok=True)
+
+    return {
+        "segments_merged": len(segments),
+        "records": table.num_rows,
+        "message": f"Compacted {len(segments)} history segments into {table.num_rows} records",
+    }
+
+
+def read_execution_history(history_dir: Optional[Path] = None):
+    """Return the full execution history as a PyArrow table (flushing buffered records first)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    history_dir = Path(history_dir or DEFAULT_HISTORY_DIR)
+    flush_executions(history_dir)
+    with _history_lock(history_dir):
+        for _ in range(3):
+            segments = _segments(history_dir)
+            if not segments:
+                break
+            try:
+                return pq.ParquetDataset(segments, schema=_execution_schema()).read()
+            except FileNotFoundError:
+                continue  # Unlinked by a process that doesn't take the lock; list again
+    return pa.Table.from_pylist([], schema=_execution_schema())
+
+
+def query_execution_history(
+    sql: str,
+    history_dir: Optional[Path] = None,
+):
+    """Run SQL against the execution history, exposed as the ``query_history`` view.
+
+    Example:
+        query_execution_history("SELECT method, avg(duration_ms) FROM query_history GROUP BY 1")
+
+    Returns:
+        pandas DataFrame with the result
+    """
+    import duckdb
+
+    history = read_execution_history(history_dir)
+    conn = duckdb.connect(":memory:")
+    try:
+        conn.register("query_history", history)
+        return conn.execute(sql).fetchdf()
+    finally:
+        conn.close()
+
+
+def _read_recent_executions(limit: int, history_dir: Path, include_internal: bool = True) -> list[dict]:
+    """Return the newest execution records as history entry dicts (oldest first)."""
+    import pyarrow.compute as pc
+
+    with _pending_lock:
+        has_pending = bool(_pending.get(history_dir))
+    if not has_pending and not _segments(history_dir):
+        return []
+
+    table = read_execution_history(history_dir)
+    if not include_internal:
+        table = table.filter(pc.fill_null(pc.not_equal(table["source"], "internal"), True))
+    table = table.sort_by("executed_at")
+    if table.num_rows > limit:
+        table = table.slice(table.num_rows - limit)
+
+    entries = []
+    for row in table.to_pylist():
+        row["executed_at"] = row["executed_at"].isoformat()
+        entries.append(row)
+    return entries
+
+
+def get_execution_summary(
+    store_path: Optional[Path] = None,
+    top: int = 5,
+) -> dict:
+    """Summarize recorded executions: volume, latency, bytes read, cache hit ratio and costliest queries.
+
+    Returns:
+        Dict with executions, errors, avg/p95 duration, bytes_read, cache_hit_ratio, costliest
+    """
+    history_dir = _history_dir(store_path)
+    totals = query_execution_history(
+        """
+        SELECT count(*) AS executions,
+               count(*) FILTER (WHERE status = 'error') AS errors,
+               coalesce(avg(duration_ms), 0) AS avg_ms,
+               coalesce(quantile_cont(duration_ms, 0.95), 0) AS p95_ms,
+               coalesce(sum(bytes_read), 0) AS bytes_read,
+               coalesce(avg(CASE WHEN cache_hit THEN 1.0 ELSE 0.0 END), 0) AS cache_hit_ratio
+        FROM query_history
+        """,
+        history_dir,
+    ).iloc[0]
+    costliest = query_execution_history(
+        f"""
+        SELECT sql, count(*) AS runs, sum(duration_ms) AS total_ms, avg(duration_ms) AS avg_ms,
+               sum(bytes_read) AS bytes_read
+        FROM query_history GROUP BY sql ORDER BY total_ms DESC LIMIT {int(top)}
+        """,
+        history_dir,
+    )
+    return {
+        "executions": int(totals["executions"]),
+        "errors": int(totals["errors"]),
+        "avg_duration_ms": round(float(totals["avg_ms"]), 3),
+        "p95_duration_ms": round(float(totals["p95_ms"]), 3),
+        "bytes_read": int(totals["bytes_read"]),
+        "cache_hit_ratio": round(float(totals["cache_hit_ratio"]), 3),
+        "costliest": [
+            {k: (v.item() if hasattr(v, "item") else v) for k, v in row.items()}
+            for row in costliest.to_dict(orient="records")
+        ],
+    }
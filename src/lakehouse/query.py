@@ -1,13 +1,60 @@
 """DuckDB query execution with Iceberg integration."""
 
-from typing import Optional
+import contextlib
+import contextvars
+import re
+import time
+from typing import TYPE_CHECKING, Optional
 from pathlib import Path
 
 import duckdb
-import pandas as pd
 from pyiceberg.catalog import Catalog
 
 from .catalog import get_catalog, DEFAULT_WAREHOUSE
+from .tracing import span, traced
+from . import metrics
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+DEFAULT_STREAM_BATCH_ROWS = 10_000
+
+# DuckDB extensions are loaded on first use: tables are registered from Arrow,
+# so only SQL that calls the extensions' own functions needs them.
+_EXTENSION_FUNCTIONS = {
+    "iceberg": re.compile(r"\biceberg_\w+\s*\(", re.IGNORECASE),
+    "vortex": re.compile(r"\b(read_vortex|vortex_\w+)\s*\(", re.IGNORECASE),
+}
+
+
+# Who asked for a query: "user" for direct callers, "internal" while the library
+# runs queries on its own behalf (see internal_queries)
+_query_source = contextvars.ContextVar("lakehouse_query_source", default="user")
+
+
+@contextlib.contextmanager
+def internal_queries():
+    """Record queries run in this block as the library's own (history source "internal").
+
+    View refreshes, incremental pipelines and auto-refresh wrap their work
+    in this so usage analysis can tell it apart from what users asked for.
+    """
+    token = _query_source.set("internal")
+    try:
+        yield
+    finally:
+        _query_source.reset(token)
+
+
+def _publish_metrics(record: dict) -> None:
+    """Count one query execution in the process-wide metrics registry."""
+    metrics.inc("lakehouse_queries", method=record["method"], status=record["status"])
+    metrics.observe("lakehouse_query_duration_seconds", record["duration_ms"] / 1000, method=record["method"])
+    metrics.inc("lakehouse_rows_read", record["rows_scanned"])
+    metrics.inc("lakehouse_bytes_read", record["bytes_read"])
+    metrics.inc("lakehouse_rows_returned", record["rows_returned"] or 0)
+    metrics.inc("lakehouse_cache_requests", cache="engine", result="hit" if record["cache_hit"] else "miss")
 
 
 class QueryEngine:
@@ -17,18 +64,37 @@ class QueryEngine:
         self,
         catalog: Optional[Catalog] = None,
         warehouse_path: Optional[Path] = None,
+        history_dir: Optional[Path] = None,
+        record_history: bool = True,
+        as_of: Optional[str] = None,
+        rewrite_matviews: bool = True,
+        matview_store_path: Optional[Path] = None,
     ):
         self.catalog = catalog or get_catalog()
         self.warehouse = warehouse_path or DEFAULT_WAREHOUSE
+        self.history_dir = history_dir
+        self.record_history = record_history
+        # When set, every table is registered as it was at this timestamp or snapshot (see pin)
+        self.as_of = as_of
+        # Answer queries from fresh materialized views when one matches (see matviews.rewrite_query)
+        self.rewrite_matviews = rewrite_matviews
+        self.matview_store_path = matview_store_path
+        self.last_execution: Optional[dict] = None
+        # The rewrite applied to the last execute/execute_stream call, or None
+        self.last_rewrite: Optional[dict] = None
         self._conn: Optional[duckdb.DuckDBPyConnection] = None
         self._vortex_available: Optional[bool] = None
+        # Per-table scan info from registration, and load metrics not yet attributed to a query
+        self._table_info: dict[str, dict] = {}
+        # Arrow tables registered on the connection, so streams can open their own
+        self._arrow_tables: dict = {}
+        self._load_metrics: Optional[dict] = None
 
     def _get_connection(self) -> duckdb.DuckDBPyConnection:
-        """Get or create DuckDB connection with Iceberg extension."""
+        """Get or create the DuckDB connection with all catalog tables registered."""
         if self._conn is None:
             self._conn = duckdb.connect(":memory:")
-            self._conn.execute("INSTALL iceberg; LOAD iceberg;")
-            self._load_vortex_extension()
+            self._arrow_tables = {}
             self._register_tables()
         return self._conn
 
@@ -37,16 +103,27 @@ class QueryEngine:
         if self._vortex_available is not None:
             return
         try:
-            self._conn.execute("INSTALL vortex; LOAD vortex;")
+            self._get_connection().execute("INSTALL vortex; LOAD vortex;")
             self._vortex_available = True
         except Exception:
             self._vortex_available = False
 
+    def _load_extensions_for(self, conn: duckdb.DuckDBPyConnection, sql: str) -> None:
+        """Load the DuckDB extensions whose functions the SQL calls."""
+        for extension, pattern in _EXTENSION_FUNCTIONS.items():
+            if not pattern.search(sql):
+                continue
+            try:
+                with span("duckdb.load_extension", extension=extension):
+                    conn.execute(f"INSTALL {extension}; LOAD {extension};")
+            except Exception:
+                pass  # Let the query itself report the missing function
+
     @property
     def has_vortex(self) -> bool:
         """Whether the DuckDB Vortex extension is available."""
         if self._vortex_available is None:
-            self._get_connection()
+            self._load_vortex_extension()
         return self._vortex_available
 
     def _register_tables(self) -> None:
@@ -55,24 +132,266 @@ class QueryEngine:
         if conn is None or self.catalog is None:
             return
 
+        metrics = {"catalog_load_ms": 0.0, "planning_ms": 0.0, "scan_ms": 0.0, "files": 0, "bytes": 0}
+        self._table_info = {}
+
         # List all tables from catalog
+        start = time.perf_counter()
+        with span("catalog.list_tables"):
+            table_ids = self._list_table_ids()
+        metrics["catalog_load_ms"] += (time.perf_counter() - start) * 1000
+
+        tables = []
+        for ns_name, table_name in table_ids:
+            full_name = f"{ns_name}.{table_name}"
+            try:
+                # Load table via PyIceberg and register with DuckDB
+                start = time.perf_counter()
+                with span("catalog.load_table", table=full_name):
+                    tables.append((table_name, self.catalog.load_table(full_name)))
+                metrics["catalog_load_ms"] += (time.perf_counter() - start) * 1000
+            except Exception as e:
+                print(f"Warning: Could not register table {full_name}: {e}")
+
+        pin = self._pin_point(self.as_of, [t for _, t in tables]) if self.as_of is not None else None
+        for table_name, table in tables:
+            try:
+                if pin is not None:
+                    arrow_table, info = self._scan_pinned(table, pin, metrics)
+                else:
+                    arrow_table, info = self._scan_table(table, metrics)
+
+                # Register as view (use just table name for simpler queries)
+                conn.register(table_name, arrow_table)
+                self._table_info[table_name] = info
+                self._arrow_tables[table_name] = arrow_table
+
+            except Exception as e:
+                # Skip tables that can't be loaded (empty, etc.)
+                print(f"Warning: Could not register table {'.'.join(table.name())}: {e}")
+
+        self._load_metrics = metrics
+
+    def _list_table_ids(self) -> list[tuple[str, str]]:
+        """(namespace, table) pairs for every table in the catalog."""
+        table_ids = []
         for namespace in self.catalog.list_namespaces():
             ns_name = namespace[0] if isinstance(namespace, tuple) else namespace
             for table_id in self.catalog.list_tables(ns_name):
                 table_name = table_id[1] if isinstance(table_id, tuple) else str(table_id)
-                full_name = f"{ns_name}.{table_name}"
+                table_ids.append((ns_name, table_name))
+        return table_ids
+
+    @staticmethod
+    def _pin_point(as_of: str, tables: list) -> tuple[int, Optional[int]]:
+        """Resolve ``as_of`` to the (timestamp_ms, snapshot_id) every table is pinned to.
 
-                try:
-                    # Load table via PyIceberg and register with DuckDB
-                    table = self.catalog.load_table(full_name)
-                    arrow_table = table.scan().to_arrow()
+        A snapshot ID pins the table it belongs to exactly and every other
+        table as of that snapshot's commit time.
+        """
+        import datetime
+
+        try:
+            snapshot_id = int(as_of)
+        except (TypeError, ValueError):
+            try:
+                ts = datetime.datetime.fromisoformat(as_of)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid as_of value '{as_of}': must be ISO timestamp or snapshot ID")
+            if ts.tzinfo is None:
+                ts = ts.replace(tzinfo=datetime.timezone.utc)
+            return int(ts.timestamp() * 1000), None
+        for table in tables:
+            snapshot = table.snapshot_by_id(snapshot_id)
+            if snapshot is not None:
+                return snapshot.timestamp_ms, snapshot_id
+        raise ValueError(f"Snapshot ID {snapshot_id} not found in any queried table")
+
+    @staticmethod
+    def _scan_pinned(table, pin: tuple[int, Optional[int]], metrics: dict):
+        """Read a table as it was at a pin point, through the snapshot scan cache.
+
+        Tables with no snapshot at that point (created later, or still empty)
+        are registered empty with their current schema.
+        """
+        from .catalog import scan_snapshot
+
+        timestamp_ms, snapshot_id = pin
+        snapshot = table.snapshot_by_id(snapshot_id) if snapshot_id is not None else None
+        if snapshot is None:
+            snapshot = table.snapshot_as_of_timestamp(timestamp_ms)
+
+        start = time.perf_counter()
+        with span("scan.read", table=table.name()[-1], pinned=True) as s:
+            if snapshot is None:
+                arrow_table = table.schema().as_arrow().empty_table()
+            else:
+                arrow_table = scan_snapshot(table, snapshot.snapshot_id)
+            s.set(rows=arrow_table.num_rows)
+        metrics["scan_ms"] = metrics.get("scan_ms", 0.0) + (time.perf_counter() - start) * 1000
+        info = {
+            "files": 0,
+            "bytes": 0,
+            "rows": arrow_table.num_rows,
+            "snapshot_id": snapshot.snapshot_id if snapshot is not None else None,
+        }
+        return arrow_table, info
+
+    @staticmethod
+    def _scan_table(table, metrics: dict):
+        """Plan and read a table into Arrow, accumulating planning/scan timings and file counts."""
+        from pyiceberg.io.pyarrow import ArrowScan
+
+        start = time.perf_counter()
+        with span("scan.plan", table=table.name()[-1]) as s:
+            scan = table.scan()
+            tasks = list(scan.plan_files())
+            s.set(files=len(tasks))
+        metrics["planning_ms"] += (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        with span("scan.read", table=table.name()[-1]) as s:
+            arrow_table = ArrowScan(
+                table.metadata, table.io, scan.projection(), scan.row_filter, scan.case_sensitive
+            ).to_table(tasks)
+            s.set(rows=arrow_table.num_rows)
+        metrics["scan_ms"] += (time.perf_counter() - start) * 1000
+
+        snapshot = table.current_snapshot()
+        info = {
+            "files": len(tasks),
+            "bytes": sum(t.file.file_size_in_bytes for t in tasks),
+            "rows": arrow_table.num_rows,
+            "snapshot_id": snapshot.snapshot_id if snapshot is not None else None,
+        }
+        metrics["files"] += info["files"]
+        metrics["bytes"] += info["bytes"]
+        return arrow_table, info
+
+    def _referenced_tables(self, sql: str) -> list[str]:
+        """Registered tables a query reads (falls back to substring matching if unparseable)."""
+        from .pruning import extract_scans
+
+        scans = extract_scans(sql)
+        if scans is None:
+            lowered = sql.lower()
+            return [name for name in self._table_info if name.lower() in lowered]
+        names = []
+        for scan in scans:
+            short = scan["table"].split(".")[-1]
+            if short in self._table_info and short not in names:
+                names.append(short)
+        return names
+
+    def _record(
+        self,
+        sql: str,
+        method: str,
+        started: float,
+        phases: dict,
+        rows_returned: Optional[int] = None,
+        error: Optional[Exception] = None,
+        cache_hit: bool = True,
+        load_metrics: Optional[dict] = None,
+        table_info: Optional[dict] = None,
+        result_bytes: int = 0,
+    ) -> None:
+        """Publish one execution to the metrics registry and the columnar query history."""
+        from .queries import record_execution, EXECUTION_PHASES
+
+        try:
+            if table_info is None:
+                table_info = {t: self._table_info[t] for t in self._referenced_tables(sql)}
+            load = load_metrics or {}
+            record = {
+                "sql": sql,
+                "method": method,
+                "status": "error" if error is not None else "ok",
+                "error": str(error) if error is not None else None,
+                "tables": list(table_info),
+                "rows_returned": rows_returned,
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+                "files_planned": load.get("files", 0) if not cache_hit else sum(i["files"] for i in table_info.values()),
+                "files_scanned": 0 if cache_hit else load.get("files", 0),
+                "bytes_read": 0 if cache_hit else load.get("bytes", 0),
+                "rows_scanned": sum(i["rows"] for i in table_info.values()),
+                "result_arrow_bytes": max(result_bytes, 0),
+                "cache_hit": cache_hit,
+                "source": _query_source.get(),
+            }
+            for phase in EXECUTION_PHASES:
+                record[phase] = round(phases.get(phase, load.get(phase, 0.0)), 3)
+            _publish_metrics(record)
+            if self.record_history:
+                self.last_execution = record_execution(record, self.history_dir)
+        except Exception:
+            pass  # History is best-effort; never fail the query because of it
 
-                    # Register as view (use just table name for simpler queries)
-                    conn.register(table_name, arrow_table)
+    def _run(
+        self,
+        sql: str,
+        method: str,
+        connect=None,
+        fetch: bool = True,
+        close: bool = True,
+        record_errors: bool = True,
+    ):
+        """Execute SQL with per-phase timing and record it in the query history.
 
-                except Exception as e:
-                    # Skip tables that can't be loaded (empty, etc.)
-                    print(f"Warning: Could not register table {full_name}: {e}")
+        ``connect`` optionally supplies a temporary connection as
+        (conn, load_metrics, table_info); it is closed after the query
+        unless ``close`` is False (the caller then owns it). With
+        ``record_errors`` False a failure is not recorded (the caller retries
+        and records the attempt that serves the query).
+        """
+        import pyarrow as pa
+
+        started = time.perf_counter()
+        baseline = pa.total_allocated_bytes()
+        phases = {}
+        load_metrics = None
+        table_info = None
+        temp_conn = None
+        # Load metrics still pending belong to this query (e.g. tables registered for a rewrite check)
+        cache_hit = connect is None and self._conn is not None and self._load_metrics is None
+        try:
+            if connect is not None:
+                temp_conn, load_metrics, table_info = connect()
+                conn = temp_conn
+            else:
+                conn = self._get_connection()
+                if not cache_hit:
+                    load_metrics, self._load_metrics = self._load_metrics, None
+            self._load_extensions_for(conn, sql)
+
+            start = time.perf_counter()
+            with span("duckdb.execute", method=method):
+                result = conn.execute(sql)
+            phases["execute_ms"] = (time.perf_counter() - start) * 1000
+
+            rows = None
+            if fetch:
+                start = time.perf_counter()
+                with span("duckdb.fetch"):
+                    result = result.fetchdf()
+                phases["fetch_ms"] = (time.perf_counter() - start) * 1000
+                rows = len(result)
+        except Exception as e:
+            if record_errors:
+                self._record(sql, method, started, phases, None, e, cache_hit, load_metrics,
+                             table_info if table_info is not None else {}, pa.total_allocated_bytes() - baseline)
+            elif connect is None and not cache_hit:
+                self._load_metrics = load_metrics  # Still pending for the attempt that gets recorded
+            if temp_conn is not None and not close:
+                temp_conn.close()
+            raise
+        finally:
+            if temp_conn is not None and close:
+                temp_conn.close()
+
+        self._record(sql, method, started, phases, rows, None, cache_hit, load_metrics, table_info,
+                     pa.total_allocated_bytes() - baseline)
+        return result
 
     def register_vortex(self, name: str, path: str | Path) -> None:
         """Register a Vortex file as a queryable table.
@@ -91,6 +410,7 @@ class QueryEngine:
         if not path.exists():
             raise FileNotFoundError(f"Vortex file not found: {path}")
 
+        self._load_vortex_extension()
         if self._vortex_available:
             # Native DuckDB extension: create a view using read_vortex
             conn.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT * FROM read_vortex('{path}')")
@@ -99,6 +419,7 @@ class QueryEngine:
             from .vortex_io import read_vortex
             arrow_table = read_vortex(path)
             conn.register(name, arrow_table)
+            self._arrow_tables[name] = arrow_table
 
     def query_vortex(
         self,
@@ -106,7 +427,7 @@ class QueryEngine:
         vortex_path: str | Path,
         table_name: str = "data",
         max_rows: int = 1000,
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """Execute a SQL query against a Vortex file.
 
         Args:
@@ -150,58 +471,276 @@ class QueryEngine:
             self._conn.close()
         self._conn = None
 
+    def refresh_table(self, name: str) -> None:
+        """Re-register one table after it changed, leaving the others as they are.
+
+        Much cheaper than :meth:`refresh` when a single table was written,
+        since the rest of the catalog is not re-scanned. Falls back to a full
+        refresh while pinned or if the table cannot be read.
+
+        Args:
+            name: Qualified table name
+        """
+        if self._conn is None:
+            return  # Everything is registered on next use anyway
+        if self.as_of is not None or self.catalog is None:
+            self.refresh()
+            return
+        metrics = {"catalog_load_ms": 0.0, "planning_ms": 0.0, "scan_ms": 0.0, "files": 0, "bytes": 0}
+        short = name.split(".")[-1]
+        try:
+            start = time.perf_counter()
+            with span("catalog.load_table", table=name):
+                table = self.catalog.load_table(name)
+            metrics["catalog_load_ms"] += (time.perf_counter() - start) * 1000
+            arrow_table, info = self._scan_table(table, metrics)
+        except Exception:
+            self.refresh()
+            return
+        self._conn.register(short, arrow_table)
+        self._table_info[short] = info
+        self._arrow_tables[short] = arrow_table
+        # Attributed to the next query, like a full registration
+        if self._load_metrics is None:
+            self._load_metrics = metrics
+        else:
+            for key, value in metrics.items():
+                self._load_metrics[key] = self._load_metrics.get(key, 0) + value
+
+    def pin(self, as_of: Optional[str]) -> None:
+        """Pin every table to its state at ``as_of``; ``None`` returns to current data.
+
+        While pinned, execute, execute_stream and execute_raw all see the
+        historical tables, so joins across tables are consistent at one point
+        in time. Scans come from the snapshot scan cache, so returning to a
+        point queried before does not re-read its data files.
+
+        Args:
+            as_of: ISO timestamp, or a snapshot ID (its table is pinned to that
+                snapshot, other tables to the snapshot's commit time)
+        """
+        self.as_of = as_of
+        self.refresh()
+
+    def _rewrite(self, sql: str) -> str:
+        """Swap subqueries matching a fresh materialized view for its backing table.
+
+        Freshness is judged against the snapshots registered on this engine,
+        so a rewritten query sees exactly the data the original would have.
+        Sets ``last_rewrite`` (None when the query runs unchanged).
+        """
+        from . import matviews
+
+        self.last_rewrite = None
+        if not self.rewrite_matviews or self.as_of is not None:
+            return sql
+        try:
+            if not matviews.has_materialized_views(self.matview_store_path):
+                return sql
+            conn = self._get_connection()
+            snapshot_ids = {name: info.get("snapshot_id") for name, info in self._table_info.items()}
+            with span("matview.rewrite") as s:
+                rewrite = matviews.rewrite_query(sql, snapshot_ids, self.matview_store_path, conn)
+                s.set(views=len(rewrite["views"]))
+        except Exception:
+            return sql  # Rewriting is an optimization; run the query as written
+        if not rewrite["views"]:
+            return sql
+        for view in rewrite["views"]:
+            metrics.inc("lakehouse_matview_rewrites", view=view)
+        self.last_rewrite = {"original_sql": sql, **rewrite}
+        return rewrite["sql"]
+
+    def _run_rewritten(self, sql: str, method: str, **kwargs):
+        """``_run`` the query as rewritten by ``_rewrite``, and as written if the rewritten one fails.
+
+        Only the attempt that serves the query is recorded in the history.
+        """
+        rewritten = self._rewrite(sql)
+        if self.last_rewrite is None:
+            return self._run(rewritten, method, **kwargs)
+        try:
+            return self._run(rewritten, method, record_errors=False, **kwargs)
+        except Exception:
+            pass
+        self.last_rewrite = None  # Rewriting is an optimization; run the query as written
+        return self._run(sql, method, **kwargs)
+
+    @traced("query.execute")
     def execute(
         self,
         sql: str,
         max_rows: int = 1000,
-    ) -> pd.DataFrame:
-        """Execute SQL query and return results as DataFrame."""
-        conn = self._get_connection()
+    ) -> "pd.DataFrame":
+        """Execute SQL query and return results as DataFrame.
 
+        Queries (or subqueries) matching a fresh materialized view are answered
+        from the view (or as written, if the rewritten query fails);
+        ``last_rewrite`` records when that happened.
+        """
         # Add LIMIT if not present and query is a SELECT
         sql_upper = sql.strip().upper()
         if sql_upper.startswith("SELECT") and "LIMIT" not in sql_upper:
             sql = f"{sql.rstrip(';')} LIMIT {max_rows}"
 
-        result = conn.execute(sql)
-        return result.fetchdf()
+        return self._run_rewritten(sql, "execute")
 
+    @traced("query.execute_as_of")
     def execute_as_of(
         self,
         sql: str,
-        table_name: str,
+        table_name: Optional[str],
         as_of: str,
         max_rows: int = 1000,
-    ) -> pd.DataFrame:
+    ) -> "pd.DataFrame":
         """Execute SQL query against a historical snapshot of a table.
 
         Loads the table at the given snapshot/timestamp and registers it
-        temporarily for the query, then restores the current version.
+        temporarily for the query, then restores the current version. With
+        ``table_name=None`` every table the query references is pinned to
+        ``as_of`` instead, so historical joins see one consistent point in time.
         """
-        from .catalog import get_catalog, scan_as_of
+        sql_upper = sql.strip().upper()
+        if sql_upper.startswith("SELECT") and "LIMIT" not in sql_upper:
+            sql = f"{sql.rstrip(';')} LIMIT {max_rows}"
+
+        return self._run(sql, "execute_as_of", connect=lambda: self._connect_as_of(table_name, as_of, sql))
 
-        catalog = get_catalog()
-        arrow_table = scan_as_of(catalog, table_name, as_of)
+    def _connect_as_of(self, table_name: Optional[str], as_of: str, sql: str = ""):
+        """Open a temporary connection with historical tables registered at ``as_of``.
+
+        Registers only ``table_name`` if given, otherwise every table ``sql``
+        references (all tables if it cannot be parsed), pinned to one point.
+        """
+        from .catalog import scan_as_of
+        from .pruning import extract_scans
+
+        if table_name:
+            short_name = table_name.split(".")[-1] if "." in table_name else table_name
+            start = time.perf_counter()
+            arrow_table = scan_as_of(self.catalog, table_name, as_of)
+            metrics = {"scan_ms": (time.perf_counter() - start) * 1000}
+            tables = {short_name: (arrow_table, {"files": 0, "bytes": 0, "rows": arrow_table.num_rows})}
+        else:
+            metrics = {"catalog_load_ms": 0.0, "scan_ms": 0.0}
+            start = time.perf_counter()
+            scans = extract_scans(sql)
+            wanted = None if scans is None else {scan["table"].split(".")[-1] for scan in scans}
+            loaded = [
+                (name, self.catalog.load_table(f"{ns}.{name}"))
+                for ns, name in self._list_table_ids()
+                if wanted is None or name in wanted
+            ]
+            metrics["catalog_load_ms"] += (time.perf_counter() - start) * 1000
+            pin = self._pin_point(as_of, [table for _, table in loaded])
+            tables = {name: self._scan_pinned(table, pin, metrics) for name, table in loaded}
 
         # Use a temporary connection to avoid polluting the main one
         conn = duckdb.connect(":memory:")
-        short_name = table_name.split(".")[-1] if "." in table_name else table_name
-        conn.register(short_name, arrow_table)
+        for name, (arrow_table, _) in tables.items():
+            conn.register(name, arrow_table)
+        return conn, metrics, {name: info for name, (_, info) in tables.items()}
 
-        sql_upper = sql.strip().upper()
-        if sql_upper.startswith("SELECT") and "LIMIT" not in sql_upper:
-            sql = f"{sql.rstrip(';')} LIMIT {max_rows}"
+    def _connect_stream(self):
+        """Open a dedicated connection over the registered tables.
 
-        result = conn.execute(sql).fetchdf()
-        conn.close()
-        return result
+        DuckDB invalidates a pending result when its connection runs another
+        statement, and registered Arrow tables are per-connection, so a stream
+        gets its own connection with the same (zero-copy) registrations.
+        """
+        cache_hit = self._conn is not None and self._load_metrics is None
+        main = self._get_connection()
+        load_metrics = None
+        if not cache_hit:
+            load_metrics, self._load_metrics = self._load_metrics, None
+        views = main.execute("SELECT sql FROM duckdb_views() WHERE NOT internal AND NOT temporary").fetchall()
+        conn = duckdb.connect(":memory:")
+        try:
+            for name, arrow_table in self._arrow_tables.items():
+                conn.register(name, arrow_table)
+            for (view_sql,) in views:
+                # Views created on the main connection (e.g. native Vortex files)
+                self._load_extensions_for(conn, view_sql)
+                conn.execute(view_sql)
+        except Exception:
+            conn.close()
+            raise
+        return conn, load_metrics or {}, None
 
+    @traced("query.execute_stream")
+    def execute_stream(
+        self,
+        sql: str,
+        batch_size: int = DEFAULT_STREAM_BATCH_ROWS,
+        table_name: Optional[str] = None,
+        as_of: Optional[str] = None,
+    ) -> tuple[duckdb.DuckDBPyConnection, "pa.RecordBatchReader"]:
+        """Execute SQL without a row limit and stream the result as Arrow batches.
+
+        The query runs on its own connection so the engine stays usable while
+        the result is consumed; pass ``as_of`` (and optionally ``table_name``,
+        as for execute_as_of) to stream from historical snapshots instead of
+        the current tables.
+
+        Returns:
+            (connection, reader); the caller closes the connection when done
+        """
+        if as_of is not None:
+            self.last_rewrite = None
+            connect = lambda: self._connect_as_of(table_name, as_of, sql)  # noqa: E731
+            conn = self._run(sql, "execute_stream", connect=connect, fetch=False, close=False)
+        else:
+            conn = self._run_rewritten(sql, "execute_stream", connect=self._connect_stream, fetch=False, close=False)
+        try:
+            return conn, conn.to_arrow_reader(batch_size)
+        except Exception:
+            conn.close()
+            raise
+
+    @traced("query.execute_arrow")
+    def execute_arrow(self, sql: str, relations: Optional[dict] = None) -> "pa.Table":
+        """Execute SQL without a row limit and return the whole result as Arrow.
+
+        ``relations`` binds extra Arrow tables by name for this query only (a
+        pipeline's source delta, say); they sit beside the registered tables,
+        zero-copy on a dedicated connection, and shadow tables of the same
+        name. Queries binding relations are never answered from materialized
+        views, since a view would not see the bound data.
+        """
+        def connect():
+            conn, load_metrics, table_info = self._connect_stream()
+            for name, data in (relations or {}).items():
+                conn.register(name, data)
+            return conn, load_metrics, table_info
+
+        if relations:
+            self.last_rewrite = None
+            conn = self._run(sql, "execute_arrow", connect=connect, fetch=False, close=False)
+        else:
+            conn = self._run_rewritten(sql, "execute_arrow", connect=connect, fetch=False, close=False)
+        try:
+            return conn.fetch_arrow_table()
+        finally:
+            conn.close()
+
+    @traced("query.execute_raw")
     def execute_raw(self, sql: str) -> duckdb.DuckDBPyRelation:
         """Execute SQL and return raw DuckDB relation."""
-        conn = self._get_connection()
-        return conn.execute(sql)
+        return self._run(sql, "execute_raw", fetch=False)
+
+    def record_phase(self, phase: str, duration_ms: float) -> None:
+        """Attribute a caller-side phase (e.g. format_ms) to the most recent execution."""
+        if self.last_execution is not None:
+            self.last_execution[phase] = round(duration_ms, 3)
+
+    def memory_usage(self) -> int:
+        """Bytes DuckDB currently holds for this engine's connection (0 if not connected)."""
+        if self._conn is None:
+            return 0
+        row = self._conn.execute("SELECT COALESCE(SUM(memory_usage_bytes), 0) FROM duckdb_memory()").fetchone()
+        return int(row[0]) if row else 0
 
-    def get_schema(self, table_name: str) -> pd.DataFrame:
+    def get_schema(self, table_name: str) -> "pd.DataFrame":
         """Get schema for a table."""
         conn = self._get_connection()
         return conn.execute(f"DESCRIBE {table_name}").fetchdf()
@@ -217,7 +756,7 @@ def execute_query(
     sql: str,
     max_rows: int = 1000,
     catalog: Optional[Catalog] = None,
-) -> pd.DataFrame:
+) -> "pd.DataFrame":
     """Convenience function to execute a query."""
     engine = QueryEngine(catalog=catalog)
     return engine.execute(sql, max_rows=max_rows)
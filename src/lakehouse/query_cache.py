@@ -8,14 +8,20 @@ import time
 from pathlib import Path
 from typing import Optional
 
+from . import metrics
+
 DEFAULT_CACHE_META_PATH = Path.home() / ".lakehouse" / "query_cache.json"
 MAX_CACHE_ENTRIES = 100
 
 # In-memory result store
 _result_cache: dict[str, dict] = {}
 
-# Stats counters
-_stats = {"hits": 0, "misses": 0}
+# Hit/miss counters live in the process-wide metrics registry
+CACHE_METRIC = "lakehouse_cache_requests"
+
+
+def _count(result: str) -> None:
+    metrics.inc(CACHE_METRIC, cache="query", result=result)
 
 
 def _normalize_sql(sql: str) -> str:
@@ -117,13 +123,12 @@ def get_cached(
     meta_path: Optional[Path] = None,
 ) -> Optional[list[dict]]:
     """Get cached result if valid. Returns None on miss."""
-    global _stats
     key = _cache_key(sql)
 
     # Check in-memory cache
     entry = _result_cache.get(key)
     if entry is None:
-        _stats["misses"] += 1
+        _count("miss")
         return None
 
     now = time.time()
@@ -134,7 +139,7 @@ def get_cached(
         meta = _load_meta(meta_path)
         meta.get("entries", {}).pop(key, None)
         _save_meta(meta, meta_path)
-        _stats["misses"] += 1
+        _count("miss")
         return None
 
     # Check per-table cache policy
@@ -146,11 +151,11 @@ def get_cached(
         for table in tables:
             policy = policies.get(table, {})
             if not policy.get("enabled", True):
-                _stats["misses"] += 1
+                _count("miss")
                 return None
 
     # Cache hit
-    _stats["hits"] += 1
+    _count("hit")
 
     # Update hit count in metadata
     if meta_entry:
@@ -198,16 +203,18 @@ def get_cache_stats(meta_path: Optional[Path] = None) -> dict:
     """Get cache statistics."""
     meta = _load_meta(meta_path)
     entries = meta.get("entries", {})
-    total = _stats["hits"] + _stats["misses"]
-    hit_rate = (_stats["hits"] / total * 100) if total > 0 else 0.0
+    hits = int(metrics.get_counter(CACHE_METRIC, cache="query", result="hit"))
+    misses = int(metrics.get_counter(CACHE_METRIC, cache="query", result="miss"))
+    total = hits + misses
+    hit_rate = (hits / total * 100) if total > 0 else 0.0
 
     return {
         "total_entries": len(entries),
         "in_memory_entries": len(_result_cache),
-        "hits": _stats["hits"],
-        "misses": _stats["misses"],
+        "hits": hits,
+        "misses": misses,
         "hit_rate": round(hit_rate, 2),
-        "message": f"Cache: {len(entries)} entries, {_stats['hits']} hits, {_stats['misses']} misses ({hit_rate:.1f}% hit rate)",
+        "message": f"Cache: {len(entries)} entries, {hits} hits, {misses} misses ({hit_rate:.1f}% hit rate)",
     }
 
 
@@ -272,6 +279,5 @@ def set_cache_policy(
 
 def reset_stats():
     """Reset hit/miss counters (for testing)."""
-    global _stats
-    _stats = {"hits": 0, "misses": 0}
+    metrics.reset(CACHE_METRIC, cache="query")
     _result_cache.clear()
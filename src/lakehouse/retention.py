@@ -5,9 +5,12 @@ import json
 from pathlib import Path
 from typing import Optional
 
+from .tracing import traced
+
 DEFAULT_RETENTION_PATH = Path.home() / ".lakehouse" / "retention.json"
 
 
+@traced("store.retention.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_RETENTION_PATH
     if not path.exists():
@@ -18,6 +21,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.retention.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_RETENTION_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -2,6 +2,8 @@
 
 import asyncio
 import json
+import re
+import time
 from typing import Any
 
 from mcp.server import Server
@@ -13,30 +15,124 @@ from mcp.types import (
     INTERNAL_ERROR,
 )
 
-from .catalog import get_catalog, list_tables, get_table_schema, insert_rows, update_rows, delete_rows, upsert_rows, alter_table, get_snapshots, snapshot_diff, rollback_table, expire_snapshots, execute_batch, get_table_property, set_table_property, import_file, export_table, profile_table, compact_table, maintenance_status, cleanup_orphans, create_table, get_partitions, get_partition_stats, list_namespaces, create_namespace, drop_namespace, get_namespace_properties
-from .query import QueryEngine
-from .queries import save_query, list_saved_queries, get_saved_query, delete_saved_query, add_history_entry, get_history, clear_history
-from .validation import add_validation_rule, list_validation_rules, remove_validation_rule, validate_rows
-from .audit import get_audit_log, clear_audit_log
-from .stats import compute_table_stats, get_cached_stats, get_all_cached_stats, refresh_stats, is_stats_stale
-from .dashboard import get_dashboard
-from .maintenance import set_maintenance_policy, get_maintenance_policy, remove_maintenance_policy, run_maintenance, check_maintenance_needed
-from .views import create_view, list_views, get_view, drop_view, query_view
-from .tagging import tag_table, untag_table, get_tags, search_by_tag, set_table_description, get_table_description, bookmark_table, unbookmark_table, list_bookmarks, search_tables
-from .lineage import record_lineage, get_upstream, get_downstream, get_lineage_graph, remove_lineage, get_impact_analysis
-from .cloning import clone_table, list_clones, promote_clone, discard_clone
-from .joins import execute_join, join_to_table, suggest_joins
-from .matviews import create_materialized_view, refresh_materialized_view, list_materialized_views, drop_materialized_view, query_materialized_view, check_materialized_view_freshness
+from ._lazy import deferred
+
+# Tool implementations (and with them pyiceberg, pandas and DuckDB) are imported
+# on first call, so spawning the server and answering initialize/list_tools stays fast.
+(
+    get_catalog, list_tables, get_table_schema, insert_rows, update_rows, delete_rows,
+    upsert_rows, alter_table, get_snapshots, snapshot_diff, rollback_table, expire_snapshots,
+    execute_batch, get_table_property, set_table_property, import_file, export_table,
+    profile_table, compact_table, maintenance_status, cleanup_orphans, create_table,
+    get_partitions, get_partition_stats, list_namespaces, create_namespace, drop_namespace,
+    get_namespace_properties,
+) = deferred(
+    "lakehouse.catalog",
+    "get_catalog", "list_tables", "get_table_schema", "insert_rows", "update_rows",
+    "delete_rows", "upsert_rows", "alter_table", "get_snapshots", "snapshot_diff",
+    "rollback_table", "expire_snapshots", "execute_batch", "get_table_property",
+    "set_table_property", "import_file", "export_table", "profile_table", "compact_table",
+    "maintenance_status", "cleanup_orphans", "create_table", "get_partitions",
+    "get_partition_stats", "list_namespaces", "create_namespace", "drop_namespace",
+    "get_namespace_properties",
+)
+QueryEngine = deferred("lakehouse.query", "QueryEngine")
+query_snapshot_series = deferred("lakehouse.series", "query_snapshot_series")
+open_cursor, fetch_more, close_cursor = deferred("lakehouse.cursors", "open_cursor", "fetch_more", "close_cursor")
+(
+    save_query, list_saved_queries, get_saved_query, delete_saved_query, add_history_entry,
+    get_history, clear_history,
+) = deferred(
+    "lakehouse.queries",
+    "save_query", "list_saved_queries", "get_saved_query", "delete_saved_query",
+    "add_history_entry", "get_history", "clear_history",
+)
+(
+    add_validation_rule, list_validation_rules, remove_validation_rule, validate_rows,
+) = deferred(
+    "lakehouse.validation",
+    "add_validation_rule", "list_validation_rules", "remove_validation_rule", "validate_rows",
+)
+get_audit_log, clear_audit_log = deferred("lakehouse.audit", "get_audit_log", "clear_audit_log")
+(
+    compute_table_stats, get_cached_stats, get_all_cached_stats, refresh_stats, is_stats_stale,
+) = deferred(
+    "lakehouse.stats",
+    "compute_table_stats", "get_cached_stats", "get_all_cached_stats", "refresh_stats",
+    "is_stats_stale",
+)
+get_dashboard = deferred("lakehouse.dashboard", "get_dashboard")
+(
+    set_maintenance_policy, get_maintenance_policy, remove_maintenance_policy, run_maintenance,
+    check_maintenance_needed,
+) = deferred(
+    "lakehouse.maintenance",
+    "set_maintenance_policy", "get_maintenance_policy", "remove_maintenance_policy",
+    "run_maintenance", "check_maintenance_needed",
+)
+(
+    create_view, list_views, get_view, drop_view, query_view,
+) = deferred(
+    "lakehouse.views",
+    "create_view", "list_views", "get_view", "drop_view", "query_view",
+)
+(
+    tag_table, untag_table, get_tags, search_by_tag, set_table_description,
+    get_table_description, bookmark_table, unbookmark_table, list_bookmarks, search_tables,
+) = deferred(
+    "lakehouse.tagging",
+    "tag_table", "untag_table", "get_tags", "search_by_tag", "set_table_description",
+    "get_table_description", "bookmark_table", "unbookmark_table", "list_bookmarks",
+    "search_tables",
+)
+(
+    record_lineage, get_upstream, get_downstream, get_lineage_graph, remove_lineage,
+    get_impact_analysis,
+) = deferred(
+    "lakehouse.lineage",
+    "record_lineage", "get_upstream", "get_downstream", "get_lineage_graph", "remove_lineage",
+    "get_impact_analysis",
+)
+(
+    clone_table, list_clones, promote_clone, discard_clone,
+) = deferred(
+    "lakehouse.cloning",
+    "clone_table", "list_clones", "promote_clone", "discard_clone",
+)
+(
+    execute_join, join_to_table, suggest_joins,
+) = deferred(
+    "lakehouse.joins",
+    "execute_join", "join_to_table", "suggest_joins",
+)
+(
+    create_materialized_view, refresh_materialized_view, list_materialized_views,
+    drop_materialized_view, query_materialized_view, check_materialized_view_freshness,
+) = deferred(
+    "lakehouse.matviews",
+    "create_materialized_view", "refresh_materialized_view", "list_materialized_views",
+    "drop_materialized_view", "query_materialized_view", "check_materialized_view_freshness",
+)
 
 
 # Initialize server
 server = Server("lakehouse")
 
 # Global query engine (initialized on first use)
-_engine: QueryEngine | None = None
+_engine: "QueryEngine | None" = None
+
 
+# Tool results that report a failure ("Query failed: ...", "Internal error: ...")
+TOOL_ERROR_PATTERN = re.compile(r"^(Internal error|Unknown tool|Error|[A-Z][\w .'/-]* (failed|error)): ")
 
-def get_engine() -> QueryEngine:
+PROFILE_ARGUMENT = {
+    "type": "boolean",
+    "description": "Trace this call and append a flame summary plus a Chrome/Perfetto trace file",
+    "default": False,
+}
+
+
+def get_engine() -> "QueryEngine":
     """Get or create the query engine."""
     global _engine
     if _engine is None:
@@ -48,15 +144,19 @@ def get_engine() -> QueryEngine:
 @server.list_tools()
 async def list_tools() -> list[Tool]:
     """List available tools."""
-    return [
+    tools = [
         Tool(
             name="query",
             description=(
                 "Execute a SQL query against the lakehouse. "
                 "Available tables: expenses, health, notes. "
-                "Use standard SQL syntax. Results limited to 1000 rows by default. "
+                "Use standard SQL syntax. Returns the first max_rows rows (default 1000); "
+                "if more rows exist, the result stays open server-side and a cursor_id is "
+                "returned for fetch_more, so the query is not re-run to page through it. "
                 "Supports time travel: provide as_of with an ISO timestamp or snapshot ID "
-                "and table_name to query historical data."
+                "to query historical data; every table in the query is pinned to that point "
+                "(so historical joins are consistent) unless table_name limits it to one table. "
+                "Queries matching a fresh materialized view are answered from the view."
             ),
             inputSchema={
                 "type": "object",
@@ -67,7 +167,7 @@ async def list_tools() -> list[Tool]:
                     },
                     "max_rows": {
                         "type": "integer",
-                        "description": "Maximum rows to return (default: 1000)",
+                        "description": "Rows in the first page (default: 1000)",
                         "default": 1000,
                     },
                     "as_of": {
@@ -76,12 +176,49 @@ async def list_tools() -> list[Tool]:
                     },
                     "table_name": {
                         "type": "string",
-                        "description": "Table name for time travel queries (required when as_of is set)",
+                        "description": "Only pin this table for time travel queries (default: all tables in the query)",
+                    },
+                    "force": {
+                        "type": "boolean",
+                        "description": "Run even if the estimated cost exceeds the configured admission limits (default: false)",
+                        "default": False,
+                    },
+                    "explain": {
+                        "type": "boolean",
+                        "description": "Report whether a fresh materialized view answered the query, and the rewritten SQL (default: false)",
+                        "default": False,
                     },
                 },
                 "required": ["sql"],
             },
         ),
+        Tool(
+            name="fetch_more",
+            description=(
+                "Fetch the next page of a query result using the cursor_id returned by the "
+                "query tool. Cursors expire after 5 minutes idle; set close=true to release "
+                "one early."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "cursor_id": {
+                        "type": "string",
+                        "description": "Cursor ID returned by query or a previous fetch_more",
+                    },
+                    "max_rows": {
+                        "type": "integer",
+                        "description": "Rows to fetch (default: the query's page size)",
+                    },
+                    "close": {
+                        "type": "boolean",
+                        "description": "Close the cursor without fetching (default: false)",
+                        "default": False,
+                    },
+                },
+                "required": ["cursor_id"],
+            },
+        ),
         Tool(
             name="list_snapshots",
             description=(
@@ -126,6 +263,49 @@ async def list_tools() -> list[Tool]:
                 "required": ["table_name", "from_snapshot"],
             },
         ),
+        Tool(
+            name="snapshot_series",
+            description=(
+                "Evaluate an aggregate over many snapshots of a table in one pass, e.g. how a "
+                "row count or total evolved over the last 50 snapshots. Data files shared "
+                "between snapshots are read once. Returns one row per snapshot (per group "
+                "with group_by)."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "table_name": {
+                        "type": "string",
+                        "description": "Name of the table (e.g., 'expenses')",
+                    },
+                    "select": {
+                        "type": "string",
+                        "description": "Aggregate expressions (default: 'COUNT(*) AS row_count'), e.g. 'COUNT(*) AS n, SUM(amount) AS total'",
+                    },
+                    "where": {
+                        "type": "string",
+                        "description": "SQL filter applied before aggregating",
+                    },
+                    "group_by": {
+                        "type": "string",
+                        "description": "Extra grouping columns within each snapshot",
+                    },
+                    "last": {
+                        "type": "integer",
+                        "description": "Only the most recent N snapshots",
+                    },
+                    "since": {
+                        "type": "string",
+                        "description": "Only snapshots committed at or after this ISO timestamp",
+                    },
+                    "until": {
+                        "type": "string",
+                        "description": "Only snapshots committed at or before this ISO timestamp",
+                    },
+                },
+                "required": ["table_name"],
+            },
+        ),
         Tool(
             name="list_tables",
             description="List all available tables in the lakehouse.",
@@ -358,7 +538,8 @@ async def list_tools() -> list[Tool]:
                 "Operations run sequentially and stop on first failure. "
                 "Each operation needs: action (insert/update/delete), table_name, "
                 "and action-specific fields (rows for insert, filter+updates for update, "
-                "filter for delete). Note: cross-table atomicity is best-effort."
+                "filter for delete). Note: cross-table atomicity is best-effort, unless wap=true: "
+                "then writes are staged on branches, audited, and published only if every table passes."
             ),
             inputSchema={
                 "type": "object",
@@ -395,6 +576,11 @@ async def list_tools() -> list[Tool]:
                         },
                         "description": "Array of operations to execute",
                     },
+                    "wap": {
+                        "type": "boolean",
+                        "description": "Write-audit-publish: stage, audit, then publish all or nothing",
+                        "default": False,
+                    },
                 },
                 "required": ["operations"],
             },
@@ -532,7 +718,8 @@ async def list_tools() -> list[Tool]:
                 "Auto-detects format from file extension (.csv, .json, .ndjson, .jsonl). "
                 "Creates a new table if it doesn't exist. "
                 "Use if_exists to control behavior when the table already exists: "
-                "'fail' (default), 'append', or 'replace'."
+                "'fail' (default), 'append', or 'replace'. With wap=true the rows are staged "
+                "on a branch and published only if validation, contract and quality checks pass."
             ),
             inputSchema={
                 "type": "object",
@@ -566,6 +753,11 @@ async def list_tools() -> list[Tool]:
                         "description": "Whether CSV has a header row (default: true)",
                         "default": True,
                     },
+                    "wap": {
+                        "type": "boolean",
+                        "description": "Write-audit-publish: stage, audit, then publish",
+                        "default": False,
+                    },
                 },
                 "required": ["file_path", "table_name"],
             },
@@ -905,6 +1097,42 @@ async def list_tools() -> list[Tool]:
                 },
             },
         ),
+        Tool(
+            name="metrics",
+            description=(
+                "Show runtime metrics for this server process: per-tool calls, errors and latency, "
+                "rows read/written, commits, cache hit ratios and DuckDB/Arrow memory. "
+                "Set LAKEHOUSE_METRICS_PORT to also expose them for Prometheus at http://127.0.0.1:<port>/metrics."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "format": {
+                        "type": "string",
+                        "enum": ["summary", "openmetrics"],
+                        "description": "Markdown summary (default) or raw OpenMetrics text",
+                    },
+                },
+            },
+        ),
+        Tool(
+            name="query_execution_history",
+            description=(
+                "Run SQL over the automatically recorded query execution history (view 'query_history'). "
+                "Columns: executed_at, sql, method, status, error, tables, rows_returned, duration_ms, "
+                "catalog_load_ms, planning_ms, scan_ms, execute_ms, fetch_ms, format_ms, files_planned, "
+                "files_scanned, bytes_read, rows_scanned, result_arrow_bytes, cache_hit."
+            ),
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "sql": {
+                        "type": "string",
+                        "description": "SQL over query_history (default: the 20 slowest queries)",
+                    },
+                },
+            },
+        ),
         Tool(
             name="clear_query_history",
             description="Clear all query execution history.",
@@ -1307,7 +1535,11 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="run_pipeline_incremental",
-            description="Run a pipeline in incremental mode, processing only new data since last watermark.",
+            description=(
+                "Run a pipeline in incremental mode, processing only new data since last watermark. "
+                "Step SQL reads the source's new rows as {{delta}} and can join them with full tables; "
+                "results are appended (or upserted on the step's merge_keys) with their own column types."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -1341,11 +1573,12 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="check_sla",
-            description="Check SLA compliance for one or all tables. Returns violations and recommendations.",
+            description="Check SLA compliance for one or all tables. Returns violations and recommendations. Tables are checked in parallel; tables unchanged since their last passing check are not rescanned unless full=true.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "table_name": {"type": "string", "description": "Table name (optional, omit for all)"},
+                    "full": {"type": "boolean", "description": "Rescan every table even if unchanged (default: false)"},
                 },
             },
         ),
@@ -1369,6 +1602,28 @@ async def list_tools() -> list[Tool]:
                 },
             },
         ),
+        Tool(
+            name="simulate_layout",
+            description="Simulate recorded queries against candidate partition specs and sort orders using manifest column bounds. Reports files/bytes scanned per layout and the estimated rewrite cost.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "table_name": {"type": "string", "description": "Table to simulate"},
+                    "partitions": {
+                        "type": "array",
+                        "items": {"type": "array", "items": {"type": "string"}},
+                        "description": "Candidate partition specs, each a list of transforms like ['month(date)'] (optional, derived from query history if omitted)",
+                    },
+                    "sort_orders": {
+                        "type": "array",
+                        "items": {"type": "array", "items": {"type": "string"}},
+                        "description": "Candidate sort orders, each a list of column names (optional)",
+                    },
+                    "limit": {"type": "integer", "description": "Max history entries to replay (default: 100)"},
+                },
+                "required": ["table_name"],
+            },
+        ),
         Tool(
             name="optimization_report",
             description="Generate a comprehensive optimization report with score, partition suggestions, materialization suggestions, and slow queries.",
@@ -1379,7 +1634,7 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="estimate_query_cost",
-            description="Estimate the cost of a SQL query based on table sizes, filters, joins, and aggregations.",
+            description="Estimate the cost of a SQL query from table metadata only (manifest bounds, cached statistics, DuckDB EXPLAIN): files and bytes scanned, rows produced, and join fan-out.",
             inputSchema={
                 "type": "object",
                 "properties": {
@@ -1390,11 +1645,12 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="backup_table",
-            description="Backup a table's data and metadata to a compressed archive (.tar.gz).",
+            description="Backup a table's data and metadata to a compressed archive (.tar.gz), or incrementally into a content-addressed store that skips files already backed up.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "table_name": {"type": "string", "description": "Table name to backup"},
+                    "incremental": {"type": "boolean", "description": "Copy the table's Iceberg files into the incremental store (default: false)"},
                 },
                 "required": ["table_name"],
             },
@@ -1405,9 +1661,10 @@ async def list_tools() -> list[Tool]:
             inputSchema={
                 "type": "object",
                 "properties": {
-                    "archive_path": {"type": "string", "description": "Path to backup archive (.tar.gz)"},
+                    "archive_path": {"type": "string", "description": "Path to backup archive (.tar.gz) or incremental manifest (.backup.json)"},
                     "table_name": {"type": "string", "description": "Optional: rename table on restore"},
                     "overwrite": {"type": "boolean", "description": "Overwrite existing table (default: false)"},
+                    "snapshot_id": {"type": "integer", "description": "Optional: backed-up snapshot to restore (incremental backups only)"},
                 },
                 "required": ["archive_path"],
             },
@@ -1540,14 +1797,14 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="register_notification",
-            description="Register an event notification handler for a table. Handler types: webhook (sends HTTP POST), shell (runs command), log (appends to file). Event types: write, schema_change, sla_violation, maintenance, all.",
+            description="Register an event notification handler for a table. Handler types: webhook (sends HTTP POST), shell (runs command), log (appends to file). Event types: write, schema_change, sla_violation, maintenance, all. Events are delivered from a background queue with retries.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "table_name": {"type": "string", "description": "Table name (use '*' for all tables)"},
                     "event_type": {"type": "string", "enum": ["write", "schema_change", "sla_violation", "maintenance", "all"], "description": "Event type to listen for"},
                     "handler_type": {"type": "string", "enum": ["webhook", "shell", "log"], "description": "Handler type"},
-                    "config": {"type": "object", "description": "Handler config: {url} for webhook, {command} for shell, {file} for log"},
+                    "config": {"type": "object", "description": "Handler config: {url} for webhook, {command} for shell, {file} for log; optional batch_size, max_concurrency and max_attempts control queued delivery"},
                 },
                 "required": ["table_name", "event_type", "handler_type", "config"],
             },
@@ -1585,6 +1842,17 @@ async def list_tools() -> list[Tool]:
                 },
             },
         ),
+        Tool(
+            name="notification_dead_letters",
+            description="List notification deliveries that failed every retry attempt, or queue them again with retry=true.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "handler_id": {"type": "string", "description": "Only this handler's deliveries (optional)"},
+                    "retry": {"type": "boolean", "description": "Requeue the dead-lettered deliveries (default: false)"},
+                },
+            },
+        ),
         Tool(
             name="get_cache_stats",
             description="Get query result cache statistics: total entries, hits, misses, and hit rate.",
@@ -1695,6 +1963,7 @@ async def list_tools() -> list[Tool]:
                     "refresh_matviews": {"type": "boolean", "description": "Refresh materialized views (default: true)"},
                     "rerun_pipelines": {"type": "boolean", "description": "Re-run pipelines (default: true)"},
                     "invalidate_caches": {"type": "boolean", "description": "Invalidate query caches (default: true)"},
+                    "debounce_seconds": {"type": "number", "description": "Seconds to coalesce refresh requests (default: 1)"},
                 },
                 "required": ["table_name"],
             },
@@ -1712,11 +1981,17 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="trigger_refresh",
-            description="Trigger a cascade refresh from a source table. Walks the lineage graph and refreshes materialized views, re-runs pipelines, and invalidates caches.",
+            description=(
+                "Trigger a cascade refresh from a source table. Walks the lineage graph and refreshes materialized "
+                "views, re-runs pipelines, and invalidates caches, running each lineage level in parallel and "
+                "skipping refreshes whose inputs are unchanged. With debounce=true the request is coalesced with "
+                "others for the table over its debounce window and runs in the background."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "table_name": {"type": "string", "description": "Source table name"},
+                    "debounce": {"type": "boolean", "description": "Coalesce with other requests (default: false)"},
                 },
                 "required": ["table_name"],
             },
@@ -2136,13 +2411,14 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="clone_table",
-            description="Clone an Iceberg table for safe experimentation. Creates a new table with the same data.",
+            description="Clone an Iceberg table for safe experimentation without copying data. Creates a new table that shares the source's data files, or a branch on the source table.",
             inputSchema={
                 "type": "object",
                 "properties": {
                     "source_table": {"type": "string", "description": "Source table name to clone"},
-                    "target_table": {"type": "string", "description": "Target table name for the clone"},
+                    "target_table": {"type": "string", "description": "Target table name for the clone (branch name in branch mode)"},
                     "as_of": {"type": "string", "description": "Optional snapshot ID or ISO timestamp for point-in-time clone"},
+                    "mode": {"type": "string", "enum": ["table", "branch"], "description": "Clone as a new table (default) or as a branch on the source (addressed as source@branch)"},
                 },
                 "required": ["source_table", "target_table"],
             },
@@ -2246,11 +2522,15 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="refresh_materialized_view",
-            description="Refresh a materialized view by re-executing its SQL and updating the cached data.",
+            description=(
+                "Refresh a materialized view. Aggregate views over one append-only table merge "
+                "only the newly appended rows; otherwise the SQL is re-executed in full."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "name": {"type": "string", "description": "View name to refresh"},
+                    "full": {"type": "boolean", "description": "Force a full re-execution (default: false)"},
                 },
                 "required": ["name"],
             },
@@ -2298,12 +2578,19 @@ async def list_tools() -> list[Tool]:
         ),
         Tool(
             name="run_pipeline",
-            description="Execute a data pipeline — runs all steps sequentially. Use dry_run=true to validate without executing.",
+            description=(
+                "Execute a data pipeline — independent steps run concurrently, later steps read earlier "
+                "results in memory, and target tables are committed only if every step succeeds. "
+                "Use dry_run=true to validate without executing, or wap=true to stage targets on "
+                "branches and publish them only if their audits pass."
+            ),
             inputSchema={
                 "type": "object",
                 "properties": {
                     "name": {"type": "string", "description": "Pipeline name"},
                     "dry_run": {"type": "boolean", "description": "Validate SQL without executing", "default": False},
+                    "max_workers": {"type": "integer", "description": "Steps to run concurrently (default: 4)"},
+                    "wap": {"type": "boolean", "description": "Stage, audit, then publish targets", "default": False},
                 },
                 "required": ["name"],
             },
@@ -2341,17 +2628,102 @@ async def list_tools() -> list[Tool]:
                 "required": ["table_name"],
             },
         ),
+        Tool(
+            name="detect_metric_drift",
+            description="Find outliers across the recorded metrics history of all tables (row counts, null rates, value ranges, quality scores, check violations) using rolling robust z-scores, optionally seasonality-aware.",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "table_name": {"type": "string", "description": "Only this table (optional)"},
+                    "metric": {"type": "string", "description": "Only this metric, e.g. row_count or null_pct (optional)"},
+                    "since": {"type": "string", "description": "Score every point since this ISO timestamp (default: latest point per series)"},
+                    "window": {"type": "integer", "description": "Prior points each point is compared with (default: 30)"},
+                    "threshold": {"type": "number", "description": "Robust z-score threshold (default: 3.5)"},
+                    "seasonality": {"type": "string", "enum": ["hour_of_day", "day_of_week"], "description": "Compare only with points at the same hour or weekday"},
+                },
+            },
+        ),
         Tool(
             name="quality_report",
             description="Generate a quality report for all tables with scores, anomalies, and recommendations.",
             inputSchema={"type": "object", "properties": {}},
         ),
     ]
+    for tool in tools:
+        tool.inputSchema.setdefault("properties", {})["profile"] = PROFILE_ARGUMENT
+    return tools
 
 
 @server.call_tool()
 async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
-    """Handle tool calls."""
+    """Handle tool calls: trace, time and count each one, appending a profile when asked."""
+    from .tracing import span
+
+    arguments = dict(arguments or {})
+    spans = None
+    started = time.perf_counter()
+    if arguments.pop("profile", False):
+        from .tracing import profile
+
+        with profile() as spans:
+            with span(f"mcp.{name}"):
+                result = await _dispatch_tool(name, arguments)
+    else:
+        with span(f"mcp.{name}"):
+            result = await _dispatch_tool(name, arguments)
+    _record_tool_metrics(name, result, time.perf_counter() - started)
+
+    if spans is None:
+        return result
+
+    from .tracing import format_flame_summary, write_trace
+
+    lines = ["\n## Profile\n", "```", format_flame_summary(spans), "```"]
+    try:
+        lines.append(f"Trace: `{write_trace(spans=spans)}`")
+    except Exception as e:
+        lines.append(f"Trace not written: {str(e)}")
+    return result + [TextContent(type="text", text="\n".join(lines))]
+
+
+def _record_tool_metrics(name: str, result: list[TextContent], seconds: float) -> None:
+    """Count a tool call, its latency and whether it reported a failure."""
+    from . import metrics
+
+    first = result[0].text if result else ""
+    if first.startswith("Unknown tool"):
+        name = "unknown"
+    metrics.inc("lakehouse_tool_requests", tool=name)
+    metrics.observe("lakehouse_tool_duration_seconds", seconds, tool=name)
+    if TOOL_ERROR_PATTERN.match(first):
+        metrics.inc("lakehouse_tool_errors", tool=name)
+
+
+def _collect_engine_memory() -> None:
+    """Refresh the DuckDB memory gauge from the shared query engine."""
+    from . import metrics
+
+    metrics.set_gauge("lakehouse_duckdb_memory_bytes", _engine.memory_usage() if _engine is not None else 0)
+
+
+def _format_page(page: dict, as_of: str | None = None) -> str:
+    """Render one cursor page as a markdown table with a continuation hint."""
+    table = page["page"]
+    first, last = page["offset"] + 1, page["offset"] + table.num_rows
+    header = f"**Results (rows {first}-{last})" if page["offset"] else f"**Results ({table.num_rows} rows)"
+    if as_of:
+        header += f" as of {as_of}"
+    header += ":**"
+    lines = [header, "", table.to_pandas().to_markdown(index=False)]
+    if page["has_more"]:
+        lines += ["", f"More rows available: call `fetch_more` with cursor_id `{page['cursor_id']}`."]
+    elif page["truncated"]:
+        lines += ["", f"*{page['message']}*"]
+    return "\n".join(lines)
+
+
+async def _dispatch_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
+    """Run a tool by name."""
     try:
         if name == "query":
             sql = arguments.get("sql")
@@ -2366,39 +2738,66 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             table_name = arguments.get("table_name")
             engine = get_engine()
 
+            if not arguments.get("force") and not as_of:
+                from .optimizer import estimate_query_cost as _estimate_cost, check_admission as _check_admission
+                try:
+                    warning = _check_admission(_estimate_cost(get_catalog(), sql))
+                except Exception:
+                    warning = None  # Estimation is advisory; never block on its failure
+                if warning:
+                    return [TextContent(
+                        type="text",
+                        text=f"**Query not executed.** {warning}\n\nNarrow the query (filters, fewer columns, LIMIT) or re-run with force=true.",
+                    )]
+
             try:
-                if as_of:
-                    if not table_name:
-                        return [TextContent(
-                            type="text",
-                            text="Error: 'table_name' is required when using 'as_of' for time travel queries",
-                        )]
-                    result = engine.execute_as_of(sql, table_name, as_of, max_rows=max_rows)
-                else:
-                    result = engine.execute(sql, max_rows=max_rows)
+                page = open_cursor(engine, sql, page_size=max_rows, table_name=table_name, as_of=as_of)
+                rewrite_note = ""
+                if arguments.get("explain"):
+                    rewrite = engine.last_rewrite
+                    rewrite_note = (
+                        f"\n\n**Rewrite:** {rewrite['message']}\n\n```sql\n{rewrite['sql']}\n```"
+                        if rewrite is not None
+                        else "\n\n**Rewrite:** none (query ran against the source tables)"
+                    )
 
-                # Format as markdown table for readability
-                if result.empty:
-                    return [TextContent(type="text", text="Query returned no results.")]
+                if page["rows_fetched"] == 0:
+                    return [TextContent(type="text", text="Query returned no results." + rewrite_note)]
 
-                # Convert to markdown
-                markdown = result.to_markdown(index=False)
-                row_count = len(result)
+                format_start = time.perf_counter()
+                text = _format_page(page, as_of=as_of)
+                engine.record_phase("format_ms", (time.perf_counter() - format_start) * 1000)
+                return [TextContent(type="text", text=text + rewrite_note)]
 
-                header = f"**Results ({row_count} rows)"
-                if as_of:
-                    header += f" as of {as_of}"
-                header += ":**"
+            except Exception as e:
+                return [TextContent(
+                    type="text",
+                    text=f"Query error: {str(e)}",
+                )]
 
+        elif name == "fetch_more":
+            cursor_id = arguments.get("cursor_id")
+            if not cursor_id:
                 return [TextContent(
                     type="text",
-                    text=f"{header}\n\n{markdown}",
+                    text="Error: 'cursor_id' parameter is required",
                 )]
 
+            try:
+                if arguments.get("close"):
+                    closed = close_cursor(cursor_id)
+                    return [TextContent(
+                        type="text",
+                        text=f"Cursor `{cursor_id}` closed." if closed else f"Cursor `{cursor_id}` was not open.",
+                    )]
+                page = fetch_more(cursor_id, arguments.get("max_rows"))
+                if page["page"].num_rows == 0:
+                    return [TextContent(type="text", text=f"No more rows (cursor `{cursor_id}` closed).")]
+                return [TextContent(type="text", text=_format_page(page))]
             except Exception as e:
                 return [TextContent(
                     type="text",
-                    text=f"Query error: {str(e)}",
+                    text=f"Fetch failed: {str(e)}",
                 )]
 
         elif name == "list_snapshots":
@@ -2482,6 +2881,45 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(type="text", text=f"Diff failed: {str(e)}")]
 
+        elif name == "snapshot_series":
+            table_name = arguments.get("table_name")
+            if not table_name:
+                return [TextContent(type="text", text="Error: 'table_name' parameter is required")]
+
+            try:
+                result = query_snapshot_series(
+                    get_catalog(),
+                    table_name,
+                    select=arguments.get("select") or "COUNT(*) AS row_count",
+                    where=arguments.get("where"),
+                    group_by=arguments.get("group_by"),
+                    last=arguments.get("last"),
+                    since=arguments.get("since"),
+                    until=arguments.get("until"),
+                )
+                if not result["rows"]:
+                    return [TextContent(type="text", text=f"No snapshots of `{table_name}` in that range.")]
+
+                cols = result["columns"]
+                lines = [
+                    f"**Snapshot series for `{result['table']}` ({result['snapshots']} snapshots):**\n",
+                    "| " + " | ".join(cols) + " |",
+                    "| " + " | ".join("---" for _ in cols) + " |",
+                ]
+                for row in result["rows"]:
+                    lines.append("| " + " | ".join("" if row[c] is None else str(row[c]) for c in cols) + " |")
+                lines.append(
+                    f"\n*Read {result['files_read']} distinct files ({result['rows_read']} rows) "
+                    f"for {result['file_references']} file references in {result['duration_ms']}ms.*"
+                )
+                return [TextContent(type="text", text="\n".join(lines))]
+
+            except ValueError as e:
+                return [TextContent(type="text", text=f"Series error: {str(e)}")]
+
+            except Exception as e:
+                return [TextContent(type="text", text=f"Series failed: {str(e)}")]
+
         elif name == "list_tables":
             engine = get_engine()
             tables = engine.list_registered_tables()
@@ -2868,7 +3306,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
             try:
                 catalog = get_catalog()
-                results = execute_batch(catalog, operations)
+                results = execute_batch(catalog, operations, wap=arguments.get("wap", False))
 
                 engine = get_engine()
                 engine.refresh()
@@ -2876,7 +3314,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                 # Format results
                 ok_count = sum(1 for r in results if r["status"] == "ok")
                 err_count = sum(1 for r in results if r["status"] == "error")
-                skip_count = sum(1 for r in results if r["status"] == "skipped")
+                skip_count = sum(1 for r in results if r["status"] in ("skipped", "rolled_back"))
 
                 lines = [f"**Batch complete: {ok_count} succeeded, {err_count} failed, {skip_count} skipped**\n"]
                 for r in results:
@@ -3102,6 +3540,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                     if_exists=if_exists,
                     delimiter=delimiter,
                     has_header=has_header,
+                    wap=arguments.get("wap", False),
                 )
 
                 engine = get_engine()
@@ -3530,6 +3969,58 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(type="text", text=f"History failed: {str(e)}")]
 
+        elif name == "metrics":
+            from .metrics import get_metrics_summary as _get_metrics_summary, render_openmetrics as _render_openmetrics
+            try:
+                if arguments.get("format") == "openmetrics":
+                    return [TextContent(type="text", text=f"```\n{_render_openmetrics()}```")]
+
+                summary = _get_metrics_summary()
+                lines = ["# Server Metrics\n"]
+                lines.append(f"**Queries:** {summary['queries']} ({summary['query_errors']} errors)")
+                lines.append(
+                    f"**Rows:** {summary['rows_read']:,} read, {summary['rows_returned']:,} returned, "
+                    f"{summary['rows_written']:,} written"
+                )
+                lines.append(f"**Bytes Read:** {summary['bytes_read']:,}")
+                if summary["commits"]:
+                    commits = ", ".join(f"{op} {n}" for op, n in sorted(summary["commits"].items()))
+                    lines.append(f"**Commits:** {commits}")
+                for cache, stats in sorted(summary["caches"].items()):
+                    lines.append(
+                        f"**{cache.title()} Cache:** {stats['hits']} hits / {stats['misses']} misses "
+                        f"({stats['hit_ratio']:.0%})"
+                    )
+                lines.append(
+                    f"**Memory:** Arrow {summary['arrow_allocated_bytes']:,} B, "
+                    f"DuckDB {summary['duckdb_memory_bytes']:,} B, peak RSS {summary['max_rss_bytes']:,} B"
+                )
+                if summary["tools"]:
+                    lines.append("\n| Tool | Calls | Errors | Avg ms |")
+                    lines.append("|------|-------|--------|--------|")
+                    for t in summary["tools"]:
+                        lines.append(f"| {t['tool']} | {t['calls']} | {t['errors']} | {t['avg_ms']:.1f} |")
+                return [TextContent(type="text", text="\n".join(lines))]
+            except Exception as e:
+                return [TextContent(type="text", text=f"Metrics failed: {str(e)}")]
+
+        elif name == "query_execution_history":
+            from .queries import query_execution_history as _query_execution_history
+            sql = arguments.get("sql") or (
+                "SELECT executed_at, method, duration_ms, rows_returned, files_scanned, bytes_read, cache_hit, sql "
+                "FROM query_history ORDER BY duration_ms DESC LIMIT 20"
+            )
+            try:
+                result = _query_execution_history(sql)
+                if result.empty:
+                    return [TextContent(type="text", text="No execution history.")]
+                return [TextContent(
+                    type="text",
+                    text=f"**Execution History ({len(result)} rows):**\n\n{result.to_markdown(index=False)}",
+                )]
+            except Exception as e:
+                return [TextContent(type="text", text=f"Execution history query failed: {str(e)}")]
+
         elif name == "clear_query_history":
             try:
                 result = clear_history()
@@ -3953,7 +4444,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                     return [TextContent(type="text", text="Error: 'name' is required")]
                 catalog = get_catalog()
                 engine = get_engine()
-                result = refresh_materialized_view(mv_name, engine, catalog)
+                result = refresh_materialized_view(mv_name, engine, catalog, incremental=not arguments.get("full"))
                 return [TextContent(type="text", text=f"**{result['message']}**")]
             except Exception as e:
                 return [TextContent(type="text", text=f"Refresh materialized view failed: {str(e)}")]
@@ -4022,7 +4513,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                 if not src or not tgt:
                     return [TextContent(type="text", text="Error: 'source_table' and 'target_table' are required")]
                 catalog = get_catalog()
-                result = clone_table(catalog, src, tgt, as_of=as_of)
+                result = clone_table(catalog, src, tgt, as_of=as_of, mode=arguments.get("mode", "table"))
                 return [TextContent(type="text", text=f"**{result['message']}**\n\nSource snapshot: {result['source_snapshot_id']}")]
             except Exception as e:
                 return [TextContent(type="text", text=f"Clone failed: {str(e)}")]
@@ -4147,21 +4638,33 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
         elif name == "run_pipeline":
             try:
-                from .pipelines import run_pipeline
+                from .pipelines import DEFAULT_MAX_WORKERS, run_pipeline
                 pipe_name = arguments.get("name")
                 dry_run = arguments.get("dry_run", False)
                 if not pipe_name:
                     return [TextContent(type="text", text="Error: 'name' is required")]
                 catalog = get_catalog()
                 engine = get_engine()
-                result = run_pipeline(pipe_name, catalog, engine, dry_run=dry_run)
+                result = run_pipeline(
+                    pipe_name, catalog, engine, dry_run=dry_run,
+                    max_workers=arguments.get("max_workers") or DEFAULT_MAX_WORKERS,
+                    wap=arguments.get("wap", False),
+                )
                 lines = [f"**{result['message']}**\n"]
                 for r in result["step_results"]:
                     rows = r.get("rows_affected", "-")
+                    after = f", after {r['depends_on']}" if r.get("depends_on") else ""
                     if r["status"] == "error":
                         lines.append(f"- Step {r['step']}: **error** — {r['error']}")
+                    elif "output_bytes" in r:
+                        lines.append(
+                            f"- Step {r['step']}: {r['status']} ({rows} rows, {r['output_bytes']:,} bytes, "
+                            f"{r['duration_ms']}ms{after})"
+                        )
                     else:
-                        lines.append(f"- Step {r['step']}: {r['status']} ({rows} rows, {r['duration_ms']}ms)")
+                        lines.append(f"- Step {r['step']}: {r['status']} ({rows} rows, {r['duration_ms']}ms{after})")
+                if not dry_run and result["tables_committed"]:
+                    lines.append(f"\nCommitted: {', '.join(result['tables_committed'])} ({result['commit_ms']}ms)")
                 return [TextContent(type="text", text="\n".join(lines))]
             except Exception as e:
                 return [TextContent(type="text", text=f"Run pipeline failed: {str(e)}")]
@@ -4221,6 +4724,21 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(type="text", text=f"Detect anomalies failed: {str(e)}")]
 
+        elif name == "detect_metric_drift":
+            try:
+                from .metrics_history import detect_metric_anomalies
+                anomalies = detect_metric_anomalies(
+                    table_name=arguments.get("table_name"),
+                    metric=arguments.get("metric"),
+                    since=arguments.get("since"),
+                    window=arguments.get("window", 30),
+                    threshold=arguments.get("threshold", 3.5),
+                    seasonality=arguments.get("seasonality"),
+                )
+                return [TextContent(type="text", text=json.dumps(anomalies, indent=2, default=str))]
+            except Exception as e:
+                return [TextContent(type="text", text=f"Detect metric drift failed: {str(e)}")]
+
         elif name == "quality_report":
             try:
                 from .quality import get_quality_report
@@ -4557,7 +5075,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             from .sla import check_sla as _check_sla
             try:
                 catalog = get_catalog()
-                result = _check_sla(catalog, table_name=arguments.get("table_name"))
+                result = _check_sla(
+                    catalog, table_name=arguments.get("table_name"),
+                    skip_unchanged=not arguments.get("full", False),
+                )
                 lines = [f"## SLA Check: {result['message']}\n"]
                 for t in result["tables"]:
                     status = t["status"].upper()
@@ -4622,6 +5143,35 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(type="text", text=f"Optimization suggestions failed: {str(e)}")]
 
+        elif name == "simulate_layout":
+            from .optimizer import simulate_layouts as _simulate_layouts
+            try:
+                catalog = get_catalog()
+                partitions = arguments.get("partitions")
+                sort_orders = arguments.get("sort_orders")
+                if partitions is not None or sort_orders is not None:
+                    partitions, sort_orders = partitions or [], sort_orders or []
+                result = _simulate_layouts(
+                    catalog,
+                    arguments["table_name"],
+                    partition_candidates=partitions,
+                    sort_candidates=sort_orders,
+                    limit=arguments.get("limit", 100),
+                )
+                lines = [f"## Layout Simulation: {result['table']}\n", f"{result['message']}\n"]
+                lines.append("| Layout | Files | Files Scanned | Bytes Scanned | Reduction | Rewrite Bytes |")
+                lines.append("|---|---|---|---|---|---|")
+                for layout in result["layouts"]:
+                    label = f"{layout['name']} (current)" if layout["is_current"] else layout["name"]
+                    lines.append(
+                        f"| {label} | {layout['file_count']} | {layout['files_scanned']:,} | "
+                        f"{layout['bytes_scanned']:,} | {layout['scan_reduction_pct']}% | "
+                        f"{layout['rewrite_cost']['bytes_written']:,} |"
+                    )
+                return [TextContent(type="text", text="\n".join(lines))]
+            except Exception as e:
+                return [TextContent(type="text", text=f"Layout simulation failed: {str(e)}")]
+
         elif name == "optimization_report":
             from .optimizer import get_optimization_report as _get_report
             try:
@@ -4649,7 +5199,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                 return [TextContent(type="text", text=f"Optimization report failed: {str(e)}")]
 
         elif name == "estimate_query_cost":
-            from .optimizer import estimate_query_cost as _estimate_cost
+            from .optimizer import estimate_query_cost as _estimate_cost, check_admission as _check_admission
             try:
                 catalog = get_catalog()
                 sql = arguments.get("sql", "")
@@ -4659,15 +5209,26 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                     f"{result['message']}\n",
                     f"- **Complexity:** {result['complexity']}",
                     f"- **Estimated rows scanned:** {result['estimated_rows_scanned']:,}",
+                    f"- **Estimated output rows:** {result['estimated_output_rows']:,}",
                     f"- **Total source rows:** {result['total_source_rows']:,}",
+                    f"- **Files scanned:** {result['files_scanned']:,} of {result['files_planned']:,}",
+                    f"- **Bytes scanned:** {result['bytes_scanned']:,}",
                     f"- **Has filter:** {'Yes' if result['has_filter'] else 'No'}",
                     f"- **Has join:** {'Yes' if result['has_join'] else 'No'}",
                     f"- **Has aggregation:** {'Yes' if result['has_aggregation'] else 'No'}",
                 ]
+                if result["join_fan_out"] is not None:
+                    lines.append(f"- **Join fan-out:** {result['join_fan_out']}x (~{result['join_rows']:,} rows)")
                 if result["tables_involved"]:
                     lines.append("\n### Tables Involved")
                     for td in result["tables_involved"]:
-                        lines.append(f"- **{td['table']}**: ~{td['estimated_rows']:,} rows, {td['size_bytes']:,} bytes")
+                        lines.append(
+                            f"- **{td['table']}**: ~{td['estimated_rows']:,} rows, {td['size_bytes']:,} bytes; "
+                            f"{td['files_scanned']}/{td['files_total']} files, ~{td['estimated_rows_after_filter']:,} rows after filter"
+                        )
+                warning = _check_admission(result)
+                if warning:
+                    lines.append(f"\n**Warning:** {warning}")
                 return [TextContent(type="text", text="\n".join(lines))]
             except Exception as e:
                 return [TextContent(type="text", text=f"Cost estimation failed: {str(e)}")]
@@ -4676,7 +5237,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             from .backup import backup_table as _backup_table
             try:
                 catalog = get_catalog()
-                result = _backup_table(catalog, arguments["table_name"])
+                result = _backup_table(catalog, arguments["table_name"], incremental=arguments.get("incremental", False))
                 return [TextContent(type="text", text=f"## Backup Complete\n\n{result['message']}\n\n- **Archive:** {result['archive']}\n- **Rows:** {result['row_count']:,}\n- **Size:** {result['size_bytes']:,} bytes")]
             except Exception as e:
                 return [TextContent(type="text", text=f"Backup failed: {str(e)}")]
@@ -4690,6 +5251,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
                     arguments["archive_path"],
                     table_name=arguments.get("table_name"),
                     overwrite=arguments.get("overwrite", False),
+                    snapshot_id=arguments.get("snapshot_id"),
                 )
                 return [TextContent(type="text", text=f"## Restore Complete\n\n{result['message']}\n\n- **Table:** {result['table']}\n- **Rows restored:** {result['rows_restored']:,}")]
             except Exception as e:
@@ -4920,6 +5482,17 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             except Exception as e:
                 return [TextContent(type="text", text=f"Get notification history failed: {str(e)}")]
 
+        elif name == "notification_dead_letters":
+            try:
+                from .notifications import list_dead_letters, retry_dead_letters
+                if arguments.get("retry", False):
+                    result = retry_dead_letters(handler_id=arguments.get("handler_id"))
+                else:
+                    result = list_dead_letters(handler_id=arguments.get("handler_id"))
+                return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
+            except Exception as e:
+                return [TextContent(type="text", text=f"Notification dead letters failed: {str(e)}")]
+
         elif name == "get_cache_stats":
             try:
                 from .query_cache import get_cache_stats
@@ -5013,7 +5586,7 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
             try:
                 from .auto_refresh import set_auto_refresh
                 config = {}
-                for key in ("cascade_depth", "refresh_matviews", "rerun_pipelines", "invalidate_caches"):
+                for key in ("cascade_depth", "refresh_matviews", "rerun_pipelines", "invalidate_caches", "debounce_seconds"):
                     if key in arguments:
                         config[key] = arguments[key]
                 result = set_auto_refresh(
@@ -5036,9 +5609,12 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
         elif name == "trigger_refresh":
             try:
-                from .auto_refresh import trigger_refresh
+                from .auto_refresh import request_refresh, trigger_refresh
                 catalog = get_catalog()
-                result = trigger_refresh(catalog, arguments["table_name"])
+                if arguments.get("debounce"):
+                    result = request_refresh(catalog, arguments["table_name"])
+                else:
+                    result = trigger_refresh(catalog, arguments["table_name"])
                 return [TextContent(type="text", text=json.dumps(result, indent=2, default=str))]
             except Exception as e:
                 return [TextContent(type="text", text=f"Trigger refresh failed: {str(e)}")]
@@ -5262,6 +5838,12 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
                 lines.append(f"\n**Saved Queries:** {data['saved_queries_count']}")
                 lines.append(f"**Query History:** {data['history_entries_count']} entries")
+                costs = data.get("query_costs")
+                if costs and costs["executions"]:
+                    lines.append(
+                        f"**Executions:** {costs['executions']} (avg {costs['avg_duration_ms']}ms, "
+                        f"p95 {costs['p95_duration_ms']}ms, cache hit {costs['cache_hit_ratio']:.0%})"
+                    )
 
                 return [TextContent(type="text", text="\n".join(lines))]
             except Exception as e:
@@ -5282,6 +5864,10 @@ async def call_tool(name: str, arguments: dict[str, Any]) -> list[TextContent]:
 
 async def run_server():
     """Run the MCP server."""
+    from .metrics import register_collector, serve_metrics_from_env
+
+    register_collector(_collect_engine_memory)
+    serve_metrics_from_env()
     async with stdio_server() as (read_stream, write_stream):
         await server.run(
             read_stream,
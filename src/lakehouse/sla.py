@@ -2,13 +2,21 @@
 
 import datetime
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
+from .checks import DEFAULT_CHECK_WORKERS
+from .tracing import traced
+
 DEFAULT_SLA_PATH = Path.home() / ".lakehouse" / "slas.json"
 MAX_HISTORY = 50
 
+_store_lock = threading.Lock()
+
 
+@traced("store.sla.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_SLA_PATH
     if not path.exists():
@@ -19,6 +27,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.sla.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_SLA_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
@@ -115,161 +124,260 @@ def remove_sla(
     return {"table": table_name, "message": f"No SLA found for '{table_name}'"}
 
 
-def check_sla(
-    catalog,
-    table_name: Optional[str] = None,
-    store_path: Optional[Path] = None,
-    quality_path: Optional[Path] = None,
-    stats_path: Optional[Path] = None,
-    validation_path: Optional[Path] = None,
-) -> dict:
-    """Check SLA compliance for one or all tables."""
+def _check_table(context, tbl: str, sla: dict, paths: dict, skip_unchanged: bool) -> tuple[dict, dict]:
+    """Evaluate one table's SLA. Returns (result, history entry)."""
     from .stats import compute_table_stats
-    from .quality import compute_quality_score
+    from .quality import _freshness_score, _overall_score, compute_quality_score
 
-    store = _load_store(store_path)
+    violations = []
+    warnings = []
+    recommendations = []
+    thresholds = {k: sla.get(k) for k in ("max_staleness_hours", "min_quality_score", "min_row_count", "max_null_pct")}
 
-    if table_name:
-        table_name = _normalize(table_name)
-        tables = {table_name: store.get(table_name)} if table_name in store else {}
+    try:
+        table = context.table(tbl)
+    except Exception as e:
+        return {
+            "table": tbl,
+            "status": "violation",
+            "violations": [f"Cannot load table stats: {e}"],
+            "warnings": [],
+            "recommendations": ["Verify table exists and is accessible"],
+        }, None
+    current = table.current_snapshot()
+    snapshot_id = current.snapshot_id if current else None
+
+    # Row counts, nulls and the data-derived quality components cannot change without a
+    # new snapshot, so a table that passed at this snapshot (under the same thresholds)
+    # is not read again; only its time-dependent checks are re-evaluated.
+    last = (sla.get("check_history") or [None])[-1]
+    skipped = bool(
+        skip_unchanged and current is not None and last
+        and last.get("status") == "passing"
+        and last.get("snapshot_id") == snapshot_id
+        and last.get("thresholds") == thresholds
+    )
+
+    if skipped:
+        stats = {
+            "last_modified": datetime.datetime.fromtimestamp(
+                current.timestamp_ms / 1000, tz=datetime.timezone.utc
+            ).isoformat(),
+        }
     else:
-        tables = dict(store)
-
-    results = []
-
-    for tbl, sla in tables.items():
-        if sla is None:
-            continue
-
-        violations = []
-        warnings = []
-        recommendations = []
-
         try:
-            stats = compute_table_stats(catalog, tbl, store_path=stats_path)
+            stats = compute_table_stats(catalog=context.catalog, table_name=tbl, store_path=paths["stats"], context=context)
         except Exception as e:
-            results.append({
+            return {
                 "table": tbl,
                 "status": "violation",
                 "violations": [f"Cannot load table stats: {e}"],
                 "warnings": [],
                 "recommendations": ["Verify table exists and is accessible"],
-            })
-            continue
-
-        # Freshness check
-        max_stale = sla.get("max_staleness_hours")
-        if max_stale is not None:
-            last_modified = stats.get("last_modified")
-            if last_modified:
-                try:
-                    mod_time = datetime.datetime.fromisoformat(last_modified)
-                    now = datetime.datetime.now(datetime.timezone.utc)
-                    age_hours = (now - mod_time).total_seconds() / 3600
-                    if age_hours > max_stale:
-                        violations.append(
-                            f"Staleness: {age_hours:.1f}h exceeds max {max_stale}h"
-                        )
-                        recommendations.append("Refresh data or run ETL pipeline")
-                    elif age_hours > max_stale * 0.9:
-                        warnings.append(
-                            f"Staleness: {age_hours:.1f}h approaching max {max_stale}h"
-                        )
-                except (ValueError, TypeError):
-                    warnings.append("Could not parse last_modified timestamp")
-            else:
-                violations.append("No last_modified timestamp — table may never have been written to")
-                recommendations.append("Insert data into the table")
+            }, None
 
-        # Quality check
-        min_quality = sla.get("min_quality_score")
-        if min_quality is not None:
+    # Freshness check
+    max_stale = sla.get("max_staleness_hours")
+    if max_stale is not None:
+        last_modified = stats.get("last_modified")
+        if last_modified:
             try:
-                quality = compute_quality_score(
-                    catalog, tbl,
-                    stats_path=stats_path,
-                    validation_path=validation_path,
-                    store_path=quality_path,
-                )
-                score = quality["overall_score"]
-                if score < min_quality:
+                mod_time = datetime.datetime.fromisoformat(last_modified)
+                now = datetime.datetime.now(datetime.timezone.utc)
+                age_hours = (now - mod_time).total_seconds() / 3600
+                if age_hours > max_stale:
                     violations.append(
-                        f"Quality: {score}/100 below minimum {min_quality}"
+                        f"Staleness: {age_hours:.1f}h exceeds max {max_stale}h"
                     )
-                    recommendations.append("Review data quality and fix issues")
-                elif score < min_quality * 1.1:
+                    recommendations.append("Refresh data or run ETL pipeline")
+                elif age_hours > max_stale * 0.9:
                     warnings.append(
-                        f"Quality: {score}/100 approaching minimum {min_quality}"
+                        f"Staleness: {age_hours:.1f}h approaching max {max_stale}h"
                     )
-            except Exception:
-                warnings.append("Could not compute quality score")
-
-        # Row count check
-        min_rows = sla.get("min_row_count")
-        if min_rows is not None:
-            row_count = stats.get("row_count", 0)
-            if row_count < min_rows:
+            except (ValueError, TypeError):
+                warnings.append("Could not parse last_modified timestamp")
+        else:
+            violations.append("No last_modified timestamp — table may never have been written to")
+            recommendations.append("Insert data into the table")
+
+    # Quality check
+    min_quality = sla.get("min_quality_score")
+    quality_components = None
+    if min_quality is not None:
+        try:
+            if skipped and last.get("quality"):
+                quality_components = last["quality"]
+                score = _overall_score(
+                    quality_components["completeness"],
+                    quality_components["uniqueness"],
+                    _freshness_score(stats["last_modified"]),
+                    quality_components["rule_compliance"],
+                )
+            else:
+                quality = compute_quality_score(
+                    context.catalog, tbl,
+                    stats_path=paths["stats"],
+                    validation_path=paths["validation"],
+                    store_path=paths["quality"],
+                    context=context,
+                )
+                quality_components = {k: quality[k] for k in ("completeness", "uniqueness", "rule_compliance")}
+                score = quality["overall_score"]
+            if score < min_quality:
                 violations.append(
-                    f"Row count: {row_count} below minimum {min_rows}"
+                    f"Quality: {score}/100 below minimum {min_quality}"
                 )
-                recommendations.append("Check data ingestion pipeline")
-            elif row_count < min_rows * 1.1:
+                recommendations.append("Review data quality and fix issues")
+            elif score < min_quality * 1.1:
                 warnings.append(
-                    f"Row count: {row_count} approaching minimum {min_rows}"
+                    f"Quality: {score}/100 approaching minimum {min_quality}"
                 )
+        except Exception:
+            warnings.append("Could not compute quality score")
 
-        # Null percentage check
-        max_null = sla.get("max_null_pct")
-        if max_null is not None:
-            row_count = stats.get("row_count", 0)
-            columns = stats.get("columns", {})
-            if row_count > 0:
-                for col_name, col_info in columns.items():
-                    nulls = col_info.get("nulls", 0)
-                    null_pct = (nulls / row_count) * 100
-                    if null_pct > max_null:
-                        violations.append(
-                            f"Null %: column '{col_name}' has {null_pct:.1f}% nulls (max {max_null}%)"
-                        )
-                        recommendations.append(f"Fix null values in column '{col_name}'")
-                    elif null_pct > max_null * 0.9:
-                        warnings.append(
-                            f"Null %: column '{col_name}' at {null_pct:.1f}% approaching max {max_null}%"
-                        )
-
-        # Determine status
-        if violations:
-            status = "violation"
-        elif warnings:
-            status = "warning"
-        else:
-            status = "passing"
+    # Row count check
+    min_rows = sla.get("min_row_count")
+    if min_rows is not None and not skipped:
+        row_count = stats.get("row_count", 0)
+        if row_count < min_rows:
+            violations.append(
+                f"Row count: {row_count} below minimum {min_rows}"
+            )
+            recommendations.append("Check data ingestion pipeline")
+        elif row_count < min_rows * 1.1:
+            warnings.append(
+                f"Row count: {row_count} approaching minimum {min_rows}"
+            )
+
+    # Null percentage check
+    max_null = sla.get("max_null_pct")
+    if max_null is not None and not skipped:
+        row_count = stats.get("row_count", 0)
+        columns = stats.get("columns", {})
+        if row_count > 0:
+            for col_name, col_info in columns.items():
+                nulls = col_info.get("nulls", 0)
+                null_pct = (nulls / row_count) * 100
+                if null_pct > max_null:
+                    violations.append(
+                        f"Null %: column '{col_name}' has {null_pct:.1f}% nulls (max {max_null}%)"
+                    )
+                    recommendations.append(f"Fix null values in column '{col_name}'")
+                elif null_pct > max_null * 0.9:
+                    warnings.append(
+                        f"Null %: column '{col_name}' at {null_pct:.1f}% approaching max {max_null}%"
+                    )
 
-        check_entry = {
-            "checked_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
-            "status": status,
-            "violations": violations,
-            "warnings": warnings,
-        }
+    # Determine status
+    if violations:
+        status = "violation"
+    elif warnings:
+        status = "warning"
+    else:
+        status = "passing"
+
+    check_entry = {
+        "checked_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "status": status,
+        "violations": violations,
+        "warnings": warnings,
+        "snapshot_id": snapshot_id,
+        "thresholds": thresholds,
+        "quality": quality_components,
+        "skipped": skipped,
+    }
+
+    return {
+        "table": tbl,
+        "status": status,
+        "violations": violations,
+        "warnings": warnings,
+        "recommendations": list(set(recommendations)),
+        "skipped": skipped,
+    }, check_entry
+
+
+def check_sla(
+    catalog,
+    table_name: Optional[str] = None,
+    store_path: Optional[Path] = None,
+    quality_path: Optional[Path] = None,
+    stats_path: Optional[Path] = None,
+    validation_path: Optional[Path] = None,
+    context=None,
+    max_workers: int = DEFAULT_CHECK_WORKERS,
+    skip_unchanged: bool = True,
+) -> dict:
+    """Check SLA compliance for one or all tables.
+
+    Tables are checked in parallel and share one CheckContext, so each
+    snapshot is scanned once for its stats and quality score. A table whose
+    snapshot has not changed since its last passing check is not read at
+    all: only its staleness (and the freshness part of its quality score) is
+    re-evaluated from snapshot metadata.
+
+    Args:
+        catalog: The Iceberg catalog
+        table_name: Table to check (None = every table with an SLA)
+        store_path: Optional path to the SLA store
+        quality_path: Optional path to the quality history store
+        stats_path: Optional path to the stats cache
+        validation_path: Optional path to the validation rules store
+        context: Optional CheckContext to share with other checks in the same run
+        max_workers: Tables checked concurrently
+        skip_unchanged: Skip data checks for tables unchanged since their last pass
+
+    Returns:
+        Dict with tables (per-table status, violations, warnings,
+        recommendations, skipped), counts and message
+    """
+    from .checks import CheckContext
+
+    store = _load_store(store_path)
 
-        # Save to history
-        sla.setdefault("check_history", [])
-        sla["check_history"].append(check_entry)
-        sla["check_history"] = sla["check_history"][-MAX_HISTORY:]
-        store[tbl] = sla
+    if table_name:
+        table_name = _normalize(table_name)
+        tables = {table_name: store.get(table_name)} if table_name in store else {}
+    else:
+        tables = dict(store)
+    tables = {tbl: sla for tbl, sla in tables.items() if sla is not None}
+
+    context = context or CheckContext(catalog)
+    paths = {"stats": stats_path, "quality": quality_path, "validation": validation_path}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tables) or 1))) as pool:
+        checked = list(pool.map(
+            lambda item: _check_table(context, item[0], item[1], paths, skip_unchanged), tables.items(),
+        ))
+
+    # Save to history, merging into the store as it is now
+    with _store_lock:
+        store = _load_store(store_path)
+        for result, check_entry in checked:
+            if check_entry is None or result["table"] not in store:
+                continue
+            sla = store[result["table"]]
+            sla.setdefault("check_history", [])
+            sla["check_history"].append(check_entry)
+            sla["check_history"] = sla["check_history"][-MAX_HISTORY:]
         _save_store(store, store_path)
 
-        results.append({
-            "table": tbl,
-            "status": status,
-            "violations": violations,
-            "warnings": warnings,
-            "recommendations": list(set(recommendations)),
-        })
+    try:
+        from .metrics_history import record_metrics
+        for result, check_entry in checked:
+            if check_entry is not None:
+                record_metrics(
+                    result["table"],
+                    {"violations": len(result["violations"]), "warnings": len(result["warnings"])},
+                    "sla", snapshot_id=check_entry["snapshot_id"],
+                )
+    except Exception:
+        pass  # History is best-effort
 
+    results = [result for result, _ in checked]
     passing = sum(1 for r in results if r["status"] == "passing")
     violating = sum(1 for r in results if r["status"] == "violation")
     warning_count = sum(1 for r in results if r["status"] == "warning")
+    skipped = sum(1 for r in results if r.get("skipped"))
 
     return {
         "tables": results,
@@ -277,7 +385,11 @@ def check_sla(
         "passing": passing,
         "warnings": warning_count,
         "violations": violating,
-        "message": f"SLA check: {passing} passing, {warning_count} warnings, {violating} violations",
+        "skipped": skipped,
+        "message": (
+            f"SLA check: {passing} passing, {warning_count} warnings, {violating} violations"
+            + (f" ({skipped} unchanged tables not rescanned)" if skipped else "")
+        ),
     }
 
 
@@ -2,6 +2,7 @@
 
 import datetime
 import json
+import threading
 from pathlib import Path
 from typing import Optional
 
@@ -9,6 +10,12 @@ from pyiceberg.catalog import Catalog
 
 DEFAULT_STATS_PATH = Path.home() / ".lakehouse" / "stats_cache.json"
 
+# Equi-depth histogram resolution for numeric and temporal columns
+HISTOGRAM_BUCKETS = 10
+
+# Serializes read-modify-write of the cache file when tables are checked in parallel
+_cache_lock = threading.Lock()
+
 
 def _load_cache(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_STATS_PATH
@@ -26,10 +33,47 @@ def _save_cache(data: dict, store_path: Optional[Path] = None) -> None:
     path.write_text(json.dumps(data, indent=2, default=str))
 
 
+def _column_stats(conn, schema) -> dict:
+    """Per-column stats over the registered ``data`` relation, in one aggregate pass."""
+    numeric = ("long", "double", "int", "float")
+    temporal = ("date", "timestamp", "timestamptz")
+    fractions = [i / HISTOGRAM_BUCKETS for i in range(HISTOGRAM_BUCKETS + 1)]
+
+    exprs = []
+    for field in schema.fields:
+        quoted = f'"{field.name}"'
+        field_type = str(field.field_type)
+        exprs += [f"COUNT(*) - COUNT({quoted})", f"COUNT(DISTINCT {quoted})"]
+        if field_type in numeric:
+            exprs += [f"MIN({quoted})", f"MAX({quoted})", f"AVG({quoted})", f"quantile_disc({quoted}, {fractions})"]
+        elif field_type in temporal:
+            exprs += [f"MIN({quoted})", f"MAX({quoted})", f"quantile_disc({quoted}, {fractions})"]
+    values = iter(conn.execute(f"SELECT {', '.join(exprs)} FROM data").fetchone())
+
+    columns = {}
+    for field in schema.fields:
+        field_type = str(field.field_type)
+        col_info = {"type": field_type, "nulls": next(values), "unique": next(values)}
+        if field_type in numeric:
+            col_info["min"] = next(values)
+            col_info["max"] = next(values)
+            mean = next(values)
+            col_info["mean"] = round(mean, 4) if mean is not None else None
+            col_info["histogram"] = list(next(values) or [])
+        elif field_type in temporal:
+            lo, hi = next(values), next(values)
+            col_info["min"] = str(lo) if lo is not None else None
+            col_info["max"] = str(hi) if hi is not None else None
+            col_info["histogram"] = [str(v) for v in next(values) or []]
+        columns[field.name] = col_info
+    return columns
+
+
 def compute_table_stats(
     catalog: Catalog,
     table_name: str,
     store_path: Optional[Path] = None,
+    context=None,
 ) -> dict:
     """Compute and cache comprehensive statistics for a table.
 
@@ -37,26 +81,38 @@ def compute_table_stats(
         catalog: The Iceberg catalog
         table_name: Table name (with or without namespace)
         store_path: Optional path to stats cache file
+        context: Optional CheckContext; stats are then computed once per
+            snapshot for the run, reusing its scan of the table
 
     Returns:
         Dict with row_count, column_count, size_bytes, snapshot_count, etc.
     """
-    import duckdb
-    import pyarrow as pa
-
     if "." not in table_name:
         table_name = f"default.{table_name}"
 
+    if context is not None:
+        # Keep what the cache held before this run: it is the anomaly baseline
+        context.memo(table_name, ("stats_baseline", str(store_path)), lambda: get_cached_stats(table_name, store_path))
+        return context.memo(
+            table_name, ("stats", str(store_path)),
+            lambda: _compute_table_stats(table_name, context.table(table_name), lambda: context.arrow(table_name), store_path),
+        )
+
     try:
         table = catalog.load_table(table_name)
     except Exception as e:
         raise ValueError(f"Table '{table_name}' not found: {e}")
+    return _compute_table_stats(table_name, table, lambda: table.scan().to_arrow(), store_path)
+
+
+def _compute_table_stats(table_name: str, table, read, store_path: Optional[Path]) -> dict:
+    import duckdb
 
     schema = table.schema()
 
     # Read data
     try:
-        arrow_table = table.scan().to_arrow()
+        arrow_table = read()
     except Exception:
         arrow_table = None
 
@@ -85,44 +141,15 @@ def compute_table_stats(
         pass
 
     # Column stats
-    columns = {}
     if row_count > 0 and arrow_table is not None:
         conn = duckdb.connect()
-        conn.register("data", arrow_table)
-
-        for field in schema.fields:
-            col_name = field.name
-            field_type = str(field.field_type)
-            quoted = f'"{col_name}"'
-
-            col_info = {"type": field_type}
-
-            basic = conn.execute(
-                f"SELECT COUNT(*) - COUNT({quoted}) AS nulls, "
-                f"COUNT(DISTINCT {quoted}) AS uniq FROM data"
-            ).fetchone()
-            col_info["nulls"] = basic[0]
-            col_info["unique"] = basic[1]
-
-            if field_type in ("long", "double", "int", "float"):
-                num = conn.execute(
-                    f"SELECT MIN({quoted}), MAX({quoted}), AVG({quoted}) FROM data"
-                ).fetchone()
-                col_info["min"] = num[0]
-                col_info["max"] = num[1]
-                col_info["mean"] = round(num[2], 4) if num[2] is not None else None
-
-            elif field_type in ("date", "timestamp", "timestamptz"):
-                minmax = conn.execute(
-                    f"SELECT MIN({quoted}), MAX({quoted}) FROM data"
-                ).fetchone()
-                col_info["min"] = str(minmax[0]) if minmax[0] is not None else None
-                col_info["max"] = str(minmax[1]) if minmax[1] is not None else None
-
-            columns[col_name] = col_info
-
-        conn.close()
+        try:
+            conn.register("data", arrow_table)
+            columns = _column_stats(conn, schema)
+        finally:
+            conn.close()
     else:
+        columns = {}
         for field in schema.fields:
             columns[field.name] = {
                 "type": str(field.field_type),
@@ -143,9 +170,16 @@ def compute_table_stats(
     }
 
     # Save to cache
-    cache = _load_cache(store_path)
-    cache[table_name] = stats
-    _save_cache(cache, store_path)
+    with _cache_lock:
+        cache = _load_cache(store_path)
+        cache[table_name] = stats
+        _save_cache(cache, store_path)
+
+    try:
+        from .metrics_history import record_table_stats
+        record_table_stats(table_name, stats)
+    except Exception:
+        pass  # History is best-effort
 
     return stats
 
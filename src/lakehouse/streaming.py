@@ -0,0 +1,117 @@
+"""Write Arrow record batch streams to files or stdout in bounded memory."""
+
+import json
+from pathlib import Path
+from typing import BinaryIO
+
+import pyarrow as pa
+
+from .tracing import span
+
+STREAM_FORMATS = ("csv", "ndjson", "parquet", "arrow")
+FORMAT_EXTENSIONS = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".parquet": "parquet",
+    ".arrow": "arrow",
+    ".arrows": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def format_from_path(path: str | Path, default: str = "csv") -> str:
+    """Stream format implied by a file extension (``default`` if unknown)."""
+    return FORMAT_EXTENSIONS.get(Path(path).suffix.lower(), default)
+
+
+class _NdjsonWriter:
+    def __init__(self, sink: BinaryIO):
+        self.sink = sink
+
+    def write_batch(self, batch: pa.RecordBatch) -> None:
+        lines = [json.dumps(row, default=str) for row in batch.to_pylist()]
+        if lines:
+            self.sink.write(("\n".join(lines) + "\n").encode())
+
+    def close(self) -> None:
+        pass
+
+
+def _open_writer(sink: BinaryIO, schema: pa.Schema, file_format: str):
+    if file_format == "csv":
+        import pyarrow.csv as pa_csv
+        return pa_csv.CSVWriter(sink, schema)
+    if file_format == "ndjson":
+        return _NdjsonWriter(sink)
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(sink, schema)
+    if file_format == "arrow":
+        return pa.ipc.new_stream(sink, schema)
+    raise ValueError(f"Unsupported format '{file_format}'. Supported: {', '.join(STREAM_FORMATS)}.")
+
+
+def write_stream(
+    reader: pa.RecordBatchReader,
+    sink: str | Path | BinaryIO,
+    file_format: str,
+    max_rows: int | None = None,
+) -> dict:
+    """Write batches from ``reader`` to ``sink`` as they arrive.
+
+    Only one batch is held at a time, so output size is not bounded by memory.
+
+    Args:
+        reader: Arrow record batch reader (e.g. from QueryEngine.execute_stream)
+        sink: Output file path or a binary file object such as stdout
+        file_format: One of 'csv', 'ndjson', 'parquet', 'arrow' (Arrow IPC stream)
+        max_rows: Stop after this many rows (default: no limit)
+
+    Returns:
+        Dict with format, rows, batches, output and message
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if file_format not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported format '{file_format}'. Supported: {', '.join(STREAM_FORMATS)}.")
+
+    output = None
+    if isinstance(sink, (str, Path)):
+        output = Path(sink)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        handle = open(output, "wb")
+    else:
+        handle = sink
+
+    rows = batches = 0
+    try:
+        with span("stream.write", format=file_format) as s:
+            writer = _open_writer(handle, reader.schema, file_format)
+            try:
+                for batch in reader:
+                    if max_rows is not None and rows + batch.num_rows > max_rows:
+                        batch = batch.slice(0, max_rows - rows)
+                    if batch.num_rows:
+                        writer.write_batch(batch)
+                        rows += batch.num_rows
+                        batches += 1
+                    if max_rows is not None and rows >= max_rows:
+                        break
+            finally:
+                writer.close()
+            s.set(rows=rows, batches=batches)
+        handle.flush()
+    finally:
+        if output is not None:
+            handle.close()
+
+    target = str(output) if output is not None else "stdout"
+    return {
+        "format": file_format,
+        "rows": rows,
+        "batches": batches,
+        "output": str(output) if output is not None else None,
+        "message": f"Wrote {rows} rows as {file_format} to {target}",
+    }
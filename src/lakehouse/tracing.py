@@ -0,0 +1,267 @@
+"""Lightweight span tracing with Chrome-trace export and flame summaries."""
+
+import atexit
+import collections
+import contextvars
+import datetime
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+
+PROFILE_ENV_VAR = "LAKEHOUSE_PROFILE"
+DEFAULT_TRACE_DIR = Path.home() / ".lakehouse" / "traces"
+MAX_SPANS = 100_000
+
+_enabled = os.environ.get(PROFILE_ENV_VAR, "").lower() not in ("", "0", "false", "no")
+_spans: collections.deque = collections.deque(maxlen=MAX_SPANS)
+# Span lists of the profile() blocks active in the current context, so
+# concurrent callers only see (and only switch on) their own spans.
+_profiles: contextvars.ContextVar[tuple] = contextvars.ContextVar("lakehouse_profiles", default=())
+_local = threading.local()
+_origin_ns = time.perf_counter_ns()
+_pid = os.getpid()
+
+
+class _NoopSpan:
+    """Shared do-nothing span returned while tracing is off."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs) -> None:
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    """An active span; recorded on exit with its parent stack."""
+
+    __slots__ = ("name", "attrs", "start_ns", "stack")
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.stack = tuple(stack)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end_ns = time.perf_counter_ns()
+        _local.stack.pop()
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        record = {
+            "name": self.name,
+            "stack": self.stack,
+            "start_us": (self.start_ns - _origin_ns) / 1000,
+            "dur_us": (end_ns - self.start_ns) / 1000,
+            "tid": threading.get_ident(),
+            "args": self.attrs,
+        }
+        if _enabled:
+            _spans.append(record)
+        for collected in _profiles.get():
+            collected.append(record)
+        return False
+
+    def set(self, **attrs) -> None:
+        """Attach attributes discovered while the span is running."""
+        self.attrs.update(attrs)
+
+
+def is_enabled() -> bool:
+    """Whether spans are currently being recorded in this context."""
+    return _enabled or bool(_profiles.get())
+
+
+def enable() -> None:
+    """Start recording spans."""
+    global _enabled
+    _enabled = True
+
+
+def disable() -> None:
+    """Stop recording spans (already collected spans are kept)."""
+    global _enabled
+    _enabled = False
+
+
+def clear() -> None:
+    """Drop all collected spans."""
+    _spans.clear()
+
+
+def get_spans() -> list[dict]:
+    """Snapshot of collected spans, oldest first."""
+    return list(_spans)
+
+
+def span(name: str, **attrs):
+    """Context manager timing a named section.
+
+    Names use ``<area>.<action>`` (e.g. ``catalog.commit``); the area becomes
+    the Chrome-trace category. Returns a shared no-op object when tracing is
+    off, so instrumented code pays only a flag check.
+    """
+    if not _enabled and not _profiles.get():
+        return _NOOP
+    return _Span(name, attrs)
+
+
+def traced(name: str):
+    """Decorator wrapping every call of a function in a span."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled and not _profiles.get():
+                return func(*args, **kwargs)
+            with _Span(name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profile():
+    """Record spans for the enclosed block only.
+
+    Yields a list that fills with the block's spans as they finish. Only the
+    current context (thread or task) is traced, so concurrent profiles don't
+    see each other's spans, and the global enabled flag is left untouched.
+    """
+    collected: list[dict] = []
+    token = _profiles.set(_profiles.get() + (collected,))
+    try:
+        yield collected
+    finally:
+        _profiles.reset(token)
+
+
+def to_chrome_trace(spans: Optional[list[dict]] = None) -> dict:
+    """Convert spans to the Chrome trace event format (loadable in Perfetto)."""
+    spans = get_spans() if spans is None else spans
+    events = []
+    for s in spans:
+        events.append({
+            "name": s["name"],
+            "cat": s["name"].split(".", 1)[0],
+            "ph": "X",
+            "ts": round(s["start_us"], 3),
+            "dur": round(s["dur_us"], 3),
+            "pid": _pid,
+            "tid": s["tid"],
+            "args": {k: _jsonable(v) for k, v in s["args"].items()},
+        })
+    events.sort(key=lambda e: (e["ts"], -e["dur"]))
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def write_trace(path: Optional[Path] = None, spans: Optional[list[dict]] = None) -> Path:
+    """Write spans as a Chrome-trace JSON file.
+
+    Args:
+        path: Output file (default: timestamped file under ~/.lakehouse/traces)
+        spans: Spans to write (default: everything collected)
+
+    Returns:
+        Path of the written trace
+    """
+    if path is None:
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = DEFAULT_TRACE_DIR / f"trace-{stamp}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(to_chrome_trace(spans)))
+    return path
+
+
+def flame_summary(spans: Optional[list[dict]] = None, top: int = 30) -> list[dict]:
+    """Aggregate spans by call stack with total and self time.
+
+    Returns:
+        One entry per distinct stack (``path``, ``name``, ``depth``, ``calls``,
+        ``total_ms``, ``self_ms``), ordered as a depth-first tree with the
+        costliest children first, truncated to ``top`` entries.
+    """
+    spans = get_spans() if spans is None else spans
+    nodes: dict[tuple, dict] = {}
+    for s in spans:
+        node = nodes.setdefault(s["stack"], {"calls": 0, "total_us": 0.0, "child_us": 0.0})
+        node["calls"] += 1
+        node["total_us"] += s["dur_us"]
+        if len(s["stack"]) > 1:
+            parent = nodes.setdefault(s["stack"][:-1], {"calls": 0, "total_us": 0.0, "child_us": 0.0})
+            parent["child_us"] += s["dur_us"]
+
+    children = collections.defaultdict(list)
+    for stack in nodes:
+        children[stack[:-1]].append(stack)
+
+    ordered = []
+
+    def visit(parent: tuple) -> None:
+        for stack in sorted(children.get(parent, []), key=lambda k: -nodes[k]["total_us"]):
+            node = nodes[stack]
+            ordered.append({
+                "path": ";".join(stack),
+                "name": stack[-1],
+                "depth": len(stack) - 1,
+                "calls": node["calls"],
+                "total_ms": round(node["total_us"] / 1000, 3),
+                "self_ms": round(max(node["total_us"] - node["child_us"], 0.0) / 1000, 3),
+            })
+            visit(stack)
+
+    visit(())
+    return ordered[:top]
+
+
+def format_flame_summary(spans: Optional[list[dict]] = None, top: int = 30) -> str:
+    """Render :func:`flame_summary` as an indented text tree."""
+    rows = flame_summary(spans, top=top)
+    if not rows:
+        return "No spans recorded."
+    lines = [f"{'total ms':>10} {'self ms':>10} {'calls':>6}  span"]
+    for row in rows:
+        indent = "  " * row["depth"]
+        lines.append(
+            f"{row['total_ms']:>10.2f} {row['self_ms']:>10.2f} {row['calls']:>6}  {indent}{row['name']}"
+        )
+    return "\n".join(lines)
+
+
+def _write_on_exit() -> None:
+    if _enabled and _spans:
+        try:
+            target = os.environ.get(PROFILE_ENV_VAR, "")
+            path = Path(target) if target.endswith(".json") else None
+            write_trace(path)
+        except Exception:
+            pass
+
+
+atexit.register(_write_on_exit)
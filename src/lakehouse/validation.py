@@ -279,6 +279,127 @@ def validate_rows(
     }
 
 
+def validate_arrow(
+    data,
+    rules: list[dict],
+    existing=None,
+    sample_size: int = 5,
+) -> dict:
+    """Validate an Arrow table against rules, one DuckDB query per rule.
+
+    The columnar counterpart of validate_rows for batches that are already
+    Arrow (e.g. staged files awaiting publish): each failure reports how many
+    rows broke a rule and the first few row indexes, not one entry per row.
+
+    Args:
+        data: Arrow table to validate
+        rules: Validation rules to check
+        existing: Arrow table of rows already in the table; only the unique
+            rules' key columns are read
+        sample_size: Row indexes to report per failure
+
+    Returns:
+        Dict with 'valid' bool, 'failures' list, and 'checked' count
+    """
+    import duckdb
+
+    if not rules or data.num_rows == 0:
+        return {"valid": True, "failures": [], "checked": data.num_rows}
+
+    conn = duckdb.connect()
+    conn.register("candidate_rows", data)
+    conn.execute("CREATE TEMP VIEW candidate AS SELECT row_number() OVER () - 1 AS __row, * FROM candidate_rows")
+    if existing is not None:
+        conn.register("existing", existing)
+
+    def violations(where: str, params=None) -> tuple[int, list[int]]:
+        count, sample = conn.execute(
+            f"SELECT COUNT(*), list(__row ORDER BY __row)[1:{sample_size}] FROM candidate WHERE {where}",
+            params or [],
+        ).fetchone()
+        return int(count), [int(r) for r in sample or []]
+
+    failures = []
+
+    def fail(rule, count, sample, message, **extra):
+        failures.append({
+            "rule_id": rule["id"],
+            "rule_type": rule["type"],
+            **extra,
+            "row_index": sample[0] if sample else -1,
+            "row_indexes": sample,
+            "violation_count": count,
+            "message": f"{message} ({count} rows, first at row {sample[0] if sample else '?'})",
+        })
+
+    try:
+        for rule in rules:
+            rule_type = rule["type"]
+
+            if rule_type == "not_null":
+                col = rule["column"]
+                count, sample = violations(f'"{col}" IS NULL')
+                if count:
+                    fail(rule, count, sample, f"Column '{col}' must not be null", column=col)
+
+            elif rule_type == "range":
+                col = rule["column"]
+                for bound, op, word in (("min", "<", "below minimum"), ("max", ">", "above maximum")):
+                    if rule.get(bound) is None:
+                        continue
+                    count, sample = violations(f'TRY_CAST("{col}" AS DOUBLE) {op} {float(rule[bound])}')
+                    if count:
+                        fail(rule, count, sample, f"Column '{col}' value is {word} {rule[bound]}", column=col)
+
+            elif rule_type == "regex":
+                col = rule["column"]
+                # validate_rows uses re.match, which anchors at the start only
+                count, sample = violations(
+                    f'"{col}" IS NOT NULL AND NOT regexp_matches(CAST("{col}" AS VARCHAR), ?)',
+                    [f"^(?:{rule['pattern']})"],
+                )
+                if count:
+                    fail(rule, count, sample, f"Column '{col}' does not match pattern '{rule['pattern']}'", column=col)
+
+            elif rule_type == "expression":
+                sql_expr = rule["sql"]
+                try:
+                    count, sample = violations(f"NOT ({sql_expr})")
+                except Exception as e:
+                    failures.append({
+                        "rule_id": rule["id"],
+                        "rule_type": "expression",
+                        "row_index": -1,
+                        "message": f"Expression rule error: {e}",
+                    })
+                    continue
+                if count:
+                    fail(rule, count, sample, f"Rows failed expression: {sql_expr}")
+
+            elif rule_type == "unique":
+                cols = rule["columns"]
+                keys = ", ".join(f'"{c}"' for c in cols)
+                count, sample = violations(
+                    f"__row IN (SELECT __row FROM (SELECT __row, row_number() OVER "
+                    f"(PARTITION BY {keys} ORDER BY __row) AS seen FROM candidate) WHERE seen > 1)"
+                )
+                if count:
+                    fail(rule, count, sample, f"Duplicate value for columns {cols}", columns=cols)
+                if existing is not None and existing.num_rows:
+                    match = " AND ".join(f'e."{c}" IS NOT DISTINCT FROM candidate."{c}"' for c in cols)
+                    count, sample = violations(f"EXISTS (SELECT 1 FROM existing e WHERE {match})")
+                    if count:
+                        fail(rule, count, sample, f"Value for columns {cols} already exists in table", columns=cols)
+    finally:
+        conn.close()
+
+    return {
+        "valid": len(failures) == 0,
+        "failures": failures,
+        "checked": data.num_rows,
+    }
+
+
 def _rows_to_duckdb(rows: list[dict]):
     """Convert row dicts to a format DuckDB can consume."""
     import pyarrow as pa
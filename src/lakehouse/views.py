@@ -7,9 +7,12 @@ from typing import Optional
 
 import pandas as pd
 
+from .tracing import traced
+
 DEFAULT_VIEWS_PATH = Path.home() / ".lakehouse" / "views.json"
 
 
+@traced("store.views.load")
 def _load_store(store_path: Optional[Path] = None) -> dict:
     path = store_path or DEFAULT_VIEWS_PATH
     if not path.exists():
@@ -20,6 +23,7 @@ def _load_store(store_path: Optional[Path] = None) -> dict:
         return {}
 
 
+@traced("store.views.save")
 def _save_store(data: dict, store_path: Optional[Path] = None) -> None:
     path = store_path or DEFAULT_VIEWS_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
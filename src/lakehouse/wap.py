@@ -0,0 +1,402 @@
+"""Write-audit-publish — stage batch writes on a branch, check them, then publish.
+
+In WAP mode batch writers (``import_file``, ``execute_batch`` and pipeline
+runs) commit to a staging branch of each table instead of ``main``, so
+readers never see the new rows until they pass the audit. The audit reads
+only the files the branch added and checks them column-wise in DuckDB:
+validation rules (unique rules also join against the key columns of the
+files the branch kept), the table contract's constraints and, when a
+threshold applies, a batch quality score. Publishing is metadata-only: it
+fast-forwards ``main`` to the branch head, or, when ``main`` moved on while
+the batch was staged and the batch only appended, adds the staged files to
+``main`` in one fast-append commit. A failed audit drops the branch; its
+files are reclaimed by snapshot expiry and orphan cleanup like any other
+unreferenced data.
+"""
+
+import uuid
+from pathlib import Path
+from typing import Optional
+
+from .tracing import span
+
+STAGING_PREFIX = "wap_"
+
+
+def _normalize_name(table_name: str) -> str:
+    if "." not in table_name:
+        return f"default.{table_name}"
+    return table_name
+
+
+def _load(catalog, table_name: str):
+    try:
+        return catalog.load_table(table_name)
+    except Exception as e:
+        raise ValueError(f"Table '{table_name}' not found: {e}")
+
+
+def staging_branch_name() -> str:
+    """A fresh staging branch name, e.g. ``wap_3f2a9c1b7d04``."""
+    return f"{STAGING_PREFIX}{uuid.uuid4().hex[:12]}"
+
+
+def stage_branch(catalog, table_name: str, branch: Optional[str] = None) -> str:
+    """Create a staging branch at the head of ``main``.
+
+    Iceberg only accepts the first write of a table on ``main``, so a table
+    without snapshots first gets an empty one to branch from.
+
+    Args:
+        catalog: Iceberg catalog
+        table_name: Table to stage writes for
+        branch: Branch name (default: a fresh ``wap_`` name)
+
+    Returns:
+        The branch name
+    """
+    import pyarrow as pa
+    from pyiceberg.io.pyarrow import schema_to_pyarrow
+
+    table_name = _normalize_name(table_name)
+    table = _load(catalog, table_name)
+    branch = branch or staging_branch_name()
+    if branch in table.metadata.refs:
+        raise ValueError(f"Branch '{branch}' already exists on '{table_name}'")
+
+    with span("wap.stage", table=table_name, branch=branch):
+        if table.current_snapshot() is None:
+            table.append(pa.Table.from_batches([], schema=schema_to_pyarrow(table.schema())))
+        table.manage_snapshots().create_branch(table.current_snapshot().snapshot_id, branch).commit()
+    return branch
+
+
+def _fork_point(table, table_name: str, branch: str):
+    """(branch head, last snapshot shared with main, snapshots only on the branch)."""
+    from pyiceberg.table.snapshots import ancestors_of
+
+    head = table.metadata.snapshot_by_name(branch)
+    if head is None:
+        raise ValueError(f"Staging branch '{branch}' not found on '{table_name}'")
+
+    on_main = {s.snapshot_id for s in ancestors_of(table.current_snapshot(), table.metadata)}
+    staged = []
+    snapshot = head
+    while snapshot is not None and snapshot.snapshot_id not in on_main:
+        staged.append(snapshot)
+        parent = snapshot.parent_snapshot_id
+        snapshot = table.snapshot_by_id(parent) if parent is not None else None
+    return head, snapshot, staged
+
+
+def _split_tasks(table, head, base) -> tuple[list, list]:
+    """Scan tasks of the branch head split into (staged, retained) by whether ``base`` had the file."""
+    base_paths = set()
+    if base is not None:
+        base_paths = {task.file.file_path for task in table.scan(snapshot_id=base.snapshot_id).plan_files()}
+    staged, retained = [], []
+    for task in table.scan(snapshot_id=head.snapshot_id).plan_files():
+        (retained if task.file.file_path in base_paths else staged).append(task)
+    return staged, retained
+
+
+def _read_tasks(table, tasks: list, columns: Optional[list[str]] = None):
+    """Arrow rows of just these scan tasks, optionally projected to ``columns``."""
+    from pyiceberg.expressions import AlwaysTrue
+    from pyiceberg.io.pyarrow import ArrowScan, schema_to_pyarrow
+
+    schema = table.schema().select(*columns) if columns else table.schema()
+    if not tasks:
+        return schema_to_pyarrow(schema).empty_table()
+    return ArrowScan(table.metadata, table.io, schema, AlwaysTrue()).to_table(tasks)
+
+
+def staged_changes(catalog, table_name: str, branch: str) -> dict:
+    """Describe what a staging branch would publish.
+
+    Returns:
+        Dict with the branch head snapshot, the staged snapshot count, the
+        files added since the fork from ``main`` and whether ``main`` has
+        moved on since then.
+    """
+    table_name = _normalize_name(table_name)
+    table = _load(catalog, table_name)
+    head, base, staged = _fork_point(table, table_name, branch)
+    staged_tasks, retained = _split_tasks(table, head, base)
+    current = table.current_snapshot()
+    return {
+        "table": table_name,
+        "branch": branch,
+        "snapshot_id": head.snapshot_id,
+        "snapshots": len(staged),
+        "files": len(staged_tasks),
+        "rows": sum(task.file.record_count for task in staged_tasks),
+        "files_retained": len(retained),
+        "main_moved": base is None or current is None or current.snapshot_id != base.snapshot_id,
+    }
+
+
+def list_staged(catalog, table_name: str) -> list[dict]:
+    """Staging branches open on a table."""
+    table_name = _normalize_name(table_name)
+    table = _load(catalog, table_name)
+    return [
+        staged_changes(catalog, table_name, name)
+        for name in sorted(table.metadata.refs)
+        if name.startswith(STAGING_PREFIX)
+    ]
+
+
+def audit_staged(
+    catalog,
+    table_name: str,
+    branch: str,
+    validation_path: Optional[Path] = None,
+    contracts_path: Optional[Path] = None,
+    min_quality: Optional[float] = None,
+) -> dict:
+    """Audit only the files a staging branch added.
+
+    Unique rules are checked against the files the batch will be published
+    next to: those the branch kept, or ``main``'s current files when ``main``
+    has moved on since the branch was created.
+
+    Args:
+        catalog: Iceberg catalog
+        table_name: Table name
+        branch: Staging branch
+        validation_path: Optional path to validation rules store
+        contracts_path: Optional path to contracts store
+        min_quality: Minimum batch quality score; defaults to the contract's
+            ``quality.min_score``, and no quality gate applies without either
+
+    Returns:
+        Dict with 'passed', the validation, contract and quality results,
+        and 'failures' (dicts with 'check' and 'message').
+    """
+    from .contracts import get_contract, validate_contract
+    from .quality import compute_batch_quality
+    from .validation import list_validation_rules, validate_arrow
+
+    table_name = _normalize_name(table_name)
+    table = _load(catalog, table_name)
+    head, base, _ = _fork_point(table, table_name, branch)
+    staged_tasks, retained = _split_tasks(table, head, base)
+
+    with span("wap.audit", table=table_name, branch=branch, files=len(staged_tasks)):
+        data = _read_tasks(table, staged_tasks)
+        failures = []
+
+        rules = list_validation_rules(table_name, store_path=validation_path)
+        key_columns = sorted({c for r in rules if r["type"] == "unique" for c in r["columns"]})
+        current = table.current_snapshot()
+        if current is not None and (base is None or current.snapshot_id != base.snapshot_id):
+            # Main moved on: staged appends are published on top of its current files
+            retained = list(table.scan(snapshot_id=current.snapshot_id).plan_files())
+        existing = _read_tasks(table, retained, key_columns) if key_columns and retained else None
+        validation = validate_arrow(data, rules, existing)
+        failures.extend({"check": "validation", "message": f["message"]} for f in validation["failures"])
+
+        # Schema terms describe the table, not the batch; only constraints apply to staged rows
+        contract = validate_contract(catalog, table_name, store_path=contracts_path, data=data)
+        violations = [v for v in contract["violations"] if v["type"] == "constraint"]
+        failures.extend({"check": "contract", "message": v["message"]} for v in violations)
+
+        if min_quality is None:
+            terms = (get_contract(table_name, store_path=contracts_path) or {}).get("quality", {})
+            min_quality = terms.get("min_score")
+        quality = None
+        if min_quality is not None and data.num_rows:
+            quality = compute_batch_quality(data, rules)
+            quality["min_score"] = min_quality
+            quality["passing"] = quality["overall_score"] >= min_quality
+            if not quality["passing"]:
+                failures.append({
+                    "check": "quality",
+                    "message": f"Batch quality score {quality['overall_score']} is below {min_quality}",
+                })
+
+    passed = not failures
+    return {
+        "table": table_name,
+        "branch": branch,
+        "snapshot_id": head.snapshot_id,
+        "files": len(staged_tasks),
+        "rows": data.num_rows,
+        "validation": validation,
+        "contract_violations": violations,
+        "quality": quality,
+        "passed": passed,
+        "failures": failures,
+        "message": (
+            f"Audit of {len(staged_tasks)} staged files ({data.num_rows} rows) on "
+            f"'{table_name}@{branch}': {'PASS' if passed else f'FAIL ({len(failures)} issues)'}"
+        ),
+    }
+
+
+def _publish_mode(table, table_name: str, branch: str) -> str:
+    """How a staging branch would be published: 'noop', 'fast_forward' or 'cherry_pick'.
+
+    Raises:
+        ValueError: If the branch is missing, or ``main`` moved under a staged rewrite
+    """
+    _, base, staged = _fork_point(table, table_name, branch)
+    current = table.current_snapshot()
+    if not staged:
+        return "noop"
+    if base is not None and current is not None and current.snapshot_id == base.snapshot_id:
+        return "fast_forward"
+    if all(s.summary is not None and s.summary.operation.value == "append" for s in staged):
+        return "cherry_pick"
+    raise ValueError(
+        f"Cannot publish '{table_name}@{branch}': main has moved since staging and the "
+        f"staged changes rewrite existing files; discard the branch and re-run the write"
+    )
+
+
+def publish_staged(catalog, table_name: str, branch: str) -> dict:
+    """Make a staging branch's changes visible on ``main`` and drop the branch.
+
+    Fast-forwards ``main`` to the branch head when ``main`` has not moved
+    since the branch was created. Otherwise staged appends are added to the
+    current ``main`` in a single fast-append; staged rewrites (overwrites,
+    updates, deletes) cannot be reapplied and must be discarded and re-run.
+    Both paths only write metadata.
+
+    Raises:
+        ValueError: If the table or branch is missing, or ``main`` moved
+            under a staged rewrite
+    """
+    table_name = _normalize_name(table_name)
+    table = _load(catalog, table_name)
+    head, base, staged = _fork_point(table, table_name, branch)
+    mode = _publish_mode(table, table_name, branch)
+
+    with span("wap.publish", table=table_name, branch=branch, snapshots=len(staged)):
+        if mode == "noop":
+            table.manage_snapshots().remove_branch(branch).commit()
+        elif mode == "fast_forward":
+            table.manage_snapshots().set_current_snapshot(ref_name=branch).remove_branch(branch).commit()
+        else:
+            staged_tasks, _ = _split_tasks(table, head, base)
+            with table.transaction() as tx:
+                with tx.update_snapshot(snapshot_properties={"wap.branch": branch}).fast_append() as append:
+                    for task in staged_tasks:
+                        append.append_data_file(task.file)
+            table.manage_snapshots().remove_branch(branch).commit()
+    if mode != "noop":
+        from .auto_refresh import notify_commit
+        notify_commit(catalog, table_name)
+
+    table = catalog.load_table(table_name)
+    current = table.current_snapshot()
+    return {
+        "table": table_name,
+        "branch": branch,
+        "mode": mode,
+        "snapshot_id": current.snapshot_id if current else None,
+        "message": f"Published '{table_name}@{branch}' to main ({mode.replace('_', '-')})",
+    }
+
+
+def discard_staged(catalog, table_name: str, branch: str) -> dict:
+    """Drop a staging branch without publishing it."""
+    table_name = _normalize_name(table_name)
+    table = _load(catalog, table_name)
+    if branch not in table.metadata.refs:
+        raise ValueError(f"Staging branch '{branch}' not found on '{table_name}'")
+    with span("wap.discard", table=table_name, branch=branch):
+        table.manage_snapshots().remove_branch(branch).commit()
+    return {
+        "table": table_name,
+        "branch": branch,
+        "message": f"Discarded staging branch '{table_name}@{branch}'",
+    }
+
+
+def audit_and_publish(
+    catalog,
+    staged: dict[str, str],
+    validation_path: Optional[Path] = None,
+    contracts_path: Optional[Path] = None,
+    min_quality: Optional[float] = None,
+) -> dict:
+    """Audit every staged table, then publish all of them or none.
+
+    Every table must pass its audit and be publishable (see publish_staged)
+    before any is published. Publishing itself is one commit per table, so
+    a commit that still fails part-way (a concurrent writer, say) leaves the
+    tables before it published; the result then lists them under
+    'publishes' and the rest are discarded.
+
+    Args:
+        catalog: Iceberg catalog
+        staged: Table name -> staging branch
+        validation_path, contracts_path, min_quality: As for audit_staged
+
+    Returns:
+        Dict with 'published' (True only if every table was), per-table
+        'audits' and 'publishes' (the tables actually published), and
+        'failures' (each with the table and check it came from).
+    """
+    audits = {
+        table_name: audit_staged(catalog, table_name, branch, validation_path, contracts_path, min_quality)
+        for table_name, branch in staged.items()
+    }
+    failures = [{"table": t, **f} for t, audit in audits.items() for f in audit["failures"]]
+    if failures:
+        discard_all(catalog, staged)
+        return {
+            "published": False,
+            "audits": audits,
+            "publishes": {},
+            "failures": failures,
+            "message": f"Audit failed for {', '.join(t for t, a in audits.items() if not a['passed'])}; nothing published",
+        }
+
+    for table_name, branch in staged.items():
+        try:
+            _publish_mode(_load(catalog, table_name), table_name, branch)
+        except ValueError as e:
+            failures.append({"table": table_name, "check": "publish", "message": str(e)})
+    if failures:
+        discard_all(catalog, staged)
+        return {
+            "published": False,
+            "audits": audits,
+            "publishes": {},
+            "failures": failures,
+            "message": f"Cannot publish {', '.join(f['table'] for f in failures)}; nothing published",
+        }
+
+    publishes = {}
+    for table_name, branch in staged.items():
+        try:
+            publishes[table_name] = publish_staged(catalog, table_name, branch)
+        except Exception as e:
+            discard_all(catalog, {t: b for t, b in staged.items() if t not in publishes})
+            done = ", ".join(publishes) or "nothing"
+            return {
+                "published": False,
+                "audits": audits,
+                "publishes": publishes,
+                "failures": [{"table": table_name, "check": "publish", "message": str(e)}],
+                "message": f"Publish of {table_name} failed: {e}; published only {done}",
+            }
+    return {
+        "published": True,
+        "audits": audits,
+        "publishes": publishes,
+        "failures": [],
+        "message": f"Audited and published {len(publishes)} table(s)",
+    }
+
+
+def discard_all(catalog, staged: dict[str, str]) -> None:
+    """Drop every staging branch in ``staged`` (best-effort)."""
+    for table_name, branch in staged.items():
+        try:
+            discard_staged(catalog, table_name, branch)
+        except Exception:
+            pass  # A missing branch has nothing to discard
@@ -13,6 +13,46 @@ from lakehouse.catalog import (
 from lakehouse.query import QueryEngine
 
 
+@pytest.fixture(autouse=True)
+def isolated_query_history(tmp_path, monkeypatch):
+    """Keep QueryEngine's automatic execution history out of the user's home."""
+    history_dir = tmp_path / "engine_history"
+    monkeypatch.setattr("lakehouse.queries.DEFAULT_HISTORY_DIR", history_dir)
+    return history_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_matview_store(tmp_path, monkeypatch):
+    """Keep QueryEngine's materialized view rewrites from reading the user's views."""
+    store_path = tmp_path / "engine_matviews.json"
+    monkeypatch.setattr("lakehouse.matviews.DEFAULT_MATVIEW_PATH", store_path)
+    return store_path
+
+
+@pytest.fixture(autouse=True)
+def isolated_metrics_history(tmp_path, monkeypatch):
+    """Keep metrics recorded by stats, quality and SLA checks out of the user's home."""
+    history_dir = tmp_path / "metrics_history"
+    monkeypatch.setattr("lakehouse.metrics_history.DEFAULT_METRICS_HISTORY_DIR", history_dir)
+    return history_dir
+
+
+@pytest.fixture(autouse=True)
+def isolated_clones_store(tmp_path, monkeypatch):
+    """Keep orphan cleanup's clone lookups from reading the user's clones store."""
+    store_path = tmp_path / "engine_clones.json"
+    monkeypatch.setattr("lakehouse.cloning.DEFAULT_CLONES_PATH", store_path)
+    return store_path
+
+
+@pytest.fixture(autouse=True)
+def isolated_auto_refresh_store(tmp_path, monkeypatch):
+    """Keep commits from requesting refreshes configured in the user's auto-refresh store."""
+    store_path = tmp_path / "engine_auto_refresh.json"
+    monkeypatch.setattr("lakehouse.auto_refresh.DEFAULT_REFRESH_PATH", store_path)
+    return store_path
+
+
 @pytest.fixture
 def test_catalog(tmp_path):
     """Create isolated catalog for testing.
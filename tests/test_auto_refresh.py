@@ -1,7 +1,10 @@
 """Tests for dependency auto-refresh."""
 
+import time
+
 import pytest
 
+from lakehouse import auto_refresh
 from lakehouse.auto_refresh import (
     set_auto_refresh,
     get_auto_refresh,
@@ -10,7 +13,12 @@ from lakehouse.auto_refresh import (
     get_refresh_plan,
     trigger_refresh,
     get_refresh_history,
+    run_refresh,
+    request_refresh,
+    pending_refreshes,
+    flush_refreshes,
 )
+from lakehouse.catalog import create_table, insert_rows
 from lakehouse.lineage import record_lineage
 
 
@@ -148,6 +156,156 @@ class TestTriggerRefresh:
         assert result["actions_executed"] >= 1
 
 
+# --- cascade scheduling ---
+
+
+@pytest.fixture
+def no_pending():
+    flush_refreshes()
+    yield
+    with auto_refresh._pending_lock:
+        auto_refresh._pending.clear()
+
+
+class TestRunRefresh:
+    def test_overlapping_cascades_deduplicated(self, test_catalog, store, lineage_store):
+        """A table downstream of several changed sources is refreshed once."""
+        record_lineage(["default.a", "default.b"], "default.c", operation="pipeline", store_path=lineage_store)
+        result = run_refresh(test_catalog, ["a", "b"], store_path=store, lineage_store_path=lineage_store)
+        actions = [(r["table"], r["action"]) for r in result["results"]]
+        assert actions.count(("default.c", "invalidate_cache")) == 1
+        assert actions.count(("default.c", "rerun_pipeline")) == 1
+        assert get_refresh_history(table_name="b", store_path=store)[0]["tables"] == ["default.a", "default.b"]
+
+    def test_levels_follow_longest_path(self, test_catalog, store, lineage_store):
+        """A table fed directly and through another table waits for both."""
+        record_lineage(["default.a"], "default.b", operation="pipeline", store_path=lineage_store)
+        record_lineage(["default.a", "default.b"], "default.c", operation="pipeline", store_path=lineage_store)
+        result = run_refresh(test_catalog, ["a"], store_path=store, lineage_store_path=lineage_store)
+        levels = {r["table"]: r["level"] for r in result["results"]}
+        assert levels == {"default.a": 0, "default.b": 1, "default.c": 2}
+        assert result["levels"] == 3
+
+    def test_skips_unchanged_inputs(self, test_catalog, store, lineage_store, tmp_path, monkeypatch):
+        """A pipeline rerun is skipped when its inputs' snapshots have not moved."""
+        from lakehouse.pipelines import create_pipeline
+
+        monkeypatch.setattr("lakehouse.pipelines.DEFAULT_PIPELINE_PATH", tmp_path / "pipelines.json")
+        monkeypatch.setattr("lakehouse.lineage.DEFAULT_LINEAGE_PATH", tmp_path / "run_lineage.json")
+        monkeypatch.setattr("lakehouse.audit.DEFAULT_AUDIT_PATH", tmp_path / "audit.log")
+        create_table(test_catalog, "src", columns={"id": "long"})
+        insert_rows(test_catalog, "default.src", [{"id": 1}])
+        create_pipeline("derived", [{"sql": "SELECT * FROM src", "target_table": "derived"}])
+        record_lineage(["default.src"], "default.derived", operation="pipeline", store_path=lineage_store)
+        set_auto_refresh("src", config={"refresh_matviews": False}, store_path=store)
+
+        def rerun_status():
+            result = run_refresh(test_catalog, ["src"], store_path=store, lineage_store_path=lineage_store)
+            return next(r for r in result["results"] if r["action"] == "rerun_pipeline")
+
+        assert rerun_status()["status"] == "success"
+        second = rerun_status()
+        assert (second["status"], second["reason"]) == ("skipped", "inputs unchanged")
+        insert_rows(test_catalog, "default.src", [{"id": 2}])
+        assert rerun_status()["status"] == "success"
+
+
+class TestRequestRefresh:
+    def test_requests_coalesce(self, test_catalog, store, lineage_chain, no_pending):
+        """A burst of requests for a table becomes one cascade."""
+        for _ in range(10):
+            request_refresh(test_catalog, "table_a", debounce_seconds=60, store_path=store, lineage_store_path=lineage_chain)
+        assert pending_refreshes()[0]["triggers"] == 10
+
+        results = flush_refreshes()
+        assert len(results) == 1
+        assert pending_refreshes() == []
+        history = get_refresh_history(store_path=store)
+        assert len(history) == 1
+        assert history[0]["triggers"] == 10
+
+    def test_runs_after_debounce_window(self, test_catalog, store, lineage_chain, no_pending):
+        """Requests run in the background once their window passes."""
+        request_refresh(test_catalog, "table_a", debounce_seconds=0.05, store_path=store, lineage_store_path=lineage_chain)
+        request_refresh(test_catalog, "table_b", debounce_seconds=0.05, store_path=store, lineage_store_path=lineage_chain)
+        deadline = time.monotonic() + 10
+        while len(get_refresh_history(store_path=store)) < 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        history = get_refresh_history(store_path=store)
+        assert len(history) == 1
+        assert history[0]["tables"] == ["default.table_a", "default.table_b"]
+
+    def test_debounce_from_config(self, test_catalog, store, lineage_chain, no_pending):
+        """The table's configured debounce window is used by default."""
+        set_auto_refresh("table_a", config={"debounce_seconds": 30}, store_path=store)
+        result = request_refresh(test_catalog, "table_a", store_path=store, lineage_store_path=lineage_chain)
+        assert 25_000 < result["due_in_ms"] <= 30_000
+
+
+class TestCommitRequests:
+    def test_commits_request_refresh_when_enabled(self, test_catalog, no_pending):
+        """Row writes to a table with auto-refresh enabled queue one coalesced request."""
+        create_table(test_catalog, "hot", columns={"id": "long"})
+        insert_rows(test_catalog, "default.hot", [{"id": 1}])
+        assert pending_refreshes() == []
+
+        set_auto_refresh("hot", config={"debounce_seconds": 60})
+        for i in range(3):
+            insert_rows(test_catalog, "default.hot", [{"id": 2 + i}])
+        assert pending_refreshes()[0]["table"] == "default.hot"
+        assert pending_refreshes()[0]["triggers"] == 3
+
+    def test_pipeline_commits_request_refresh(self, test_catalog, tmp_path, monkeypatch, no_pending):
+        """A pipeline committing to an auto-refreshed target requests its cascade."""
+        from lakehouse.pipelines import create_pipeline, run_pipeline
+
+        monkeypatch.setattr("lakehouse.pipelines.DEFAULT_PIPELINE_PATH", tmp_path / "pipelines.json")
+        monkeypatch.setattr("lakehouse.lineage.DEFAULT_LINEAGE_PATH", tmp_path / "run_lineage.json")
+        set_auto_refresh("derived", config={"debounce_seconds": 60})
+        create_pipeline("derive", [{"sql": "SELECT 1 AS id", "target_table": "derived"}])
+        run_pipeline("derive", test_catalog, None)
+        assert [p["table"] for p in pending_refreshes()] == ["default.derived"]
+
+    def test_cascade_actions_do_not_request_refresh(self, test_catalog, no_pending):
+        """Commits made by a cascade's own actions are already covered by it."""
+        set_auto_refresh("hot", config={"debounce_seconds": 60})
+        create_table(test_catalog, "hot", columns={"id": "long"})
+        token = auto_refresh._in_cascade.set(True)
+        try:
+            insert_rows(test_catalog, "default.hot", [{"id": 1}])
+        finally:
+            auto_refresh._in_cascade.reset(token)
+        assert pending_refreshes() == []
+
+
+class TestSerializedTargets:
+    def test_actions_on_one_table_do_not_overlap(self, test_catalog, store, lineage_store, monkeypatch):
+        """A table's matview refresh and pipeline rerun never run at the same time."""
+        import threading
+
+        # An edge with no operation gets both a matview refresh and a pipeline rerun
+        record_lineage(["default.src"], "default.out", operation="", store_path=lineage_store)
+        running = {}
+        overlaps = []
+        lock = threading.Lock()
+
+        def slow_action(catalog, action):
+            with lock:
+                if running.get(action["table"]):
+                    overlaps.append(action["table"])
+                running[action["table"]] = True
+            time.sleep(0.05)
+            with lock:
+                running[action["table"]] = False
+            return {"table": action["table"], "action": action["action"], "status": "success"}
+
+        monkeypatch.setattr(auto_refresh, "_execute_action", slow_action)
+        result = run_refresh(test_catalog, ["src"], store_path=store, lineage_store_path=lineage_store, max_workers=4)
+        actions = {r["action"] for r in result["results"] if r["table"] == "default.out"}
+        assert actions == {"invalidate_cache", "refresh_matview", "rerun_pipeline"}
+        assert overlaps == []
+
+
 # --- refresh history ---
 
 
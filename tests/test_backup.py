@@ -1,5 +1,6 @@
 """Tests for backup and restore."""
 
+import io
 import json
 import tarfile
 import pytest
@@ -10,6 +11,7 @@ from lakehouse.backup import (
     restore_table,
     restore_namespace,
     list_backups,
+    list_backup_snapshots,
     verify_backup,
 )
 from lakehouse.catalog import create_table, insert_rows, list_tables
@@ -99,6 +101,35 @@ class TestRestoreTable:
         with pytest.raises(FileNotFoundError):
             restore_table(backup_table_data, "/nonexistent/archive.tar.gz")
 
+    def test_restore_registers_archived_file(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir)
+        restore_table(backup_table_data, result["archive"], table_name="registered")
+
+        tbl = backup_table_data.load_table("default.registered")
+        paths = [task.file.file_path for task in tbl.scan().plan_files()]
+        assert len(paths) == 1
+        assert "/registered/data/restored-" in paths[0]
+        assert tbl.schema().find_field("value").field_type == backup_table_data.load_table(
+            "default.backup_src"
+        ).schema().find_field("value").field_type
+
+    def test_restore_checksum_mismatch(self, backup_table_data, backup_dir, tmp_path):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir)
+        tampered = tmp_path / "tampered.tar.gz"
+        with tarfile.open(result["archive"], "r:gz") as src, tarfile.open(tampered, "w:gz") as dst:
+            for member in src.getmembers():
+                data = src.extractfile(member).read()
+                if member.name.endswith("metadata.json"):
+                    meta = json.loads(data)
+                    meta["data_checksum"] = "0" * 64
+                    data = json.dumps(meta).encode()
+                    member.size = len(data)
+                dst.addfile(member, io.BytesIO(data))
+
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            restore_table(backup_table_data, tampered, table_name="tampered_tbl")
+        assert "default.tampered_tbl" not in list_tables(backup_table_data)
+
 
 # --- Backup namespace ---
 
@@ -125,6 +156,26 @@ class TestRestoreNamespace:
         result = restore_namespace(backup_table_data, bk["archive"], overwrite=True)
         assert result["table_count"] >= 1
 
+    def test_restore_namespace_parallel_matches_source(self, backup_table_data, backup_dir):
+        counts = {
+            t: backup_table_data.load_table(t).scan().to_arrow().num_rows
+            for t in list_tables(backup_table_data, "default")
+        }
+        bk = backup_namespace(backup_table_data, "default", output_dir=backup_dir)
+
+        result = restore_namespace(backup_table_data, bk["archive"], overwrite=True, max_workers=4)
+        assert result["errors"] == []
+        assert result["table_count"] == len(counts)
+        for entry in result["restored"]:
+            assert entry["rows"] == counts[entry["table"]]
+            assert backup_table_data.load_table(entry["table"]).scan().to_arrow().num_rows == counts[entry["table"]]
+
+    def test_restore_namespace_reports_existing_tables(self, backup_table_data, backup_dir):
+        bk = backup_namespace(backup_table_data, "default", output_dir=backup_dir)
+        result = restore_namespace(backup_table_data, bk["archive"])
+        assert result["table_count"] == 0
+        assert all("already exists" in e for e in result["errors"])
+
 
 # --- List backups ---
 
@@ -163,3 +214,128 @@ class TestVerifyBackup:
         result = backup_table(test_catalog, "empty_tbl", output_dir=backup_dir)
         verify = verify_backup(result["archive"])
         assert verify["valid"] is True
+
+
+# --- Incremental backups ---
+
+
+class TestIncrementalBackup:
+    def test_backup_writes_manifest_and_objects(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        assert result["archive"].endswith(".backup.json")
+        assert result["row_count"] == 3
+        assert result["files_copied"] == result["files"] > 0
+
+        manifest = json.loads(open(result["archive"]).read())
+        entry = manifest["tables"][0]
+        kinds = {info["kind"] for info in entry["files"].values()}
+        assert {"metadata", "manifest_list", "manifest", "data"} <= kinds
+        for info in entry["files"].values():
+            assert (backup_dir / "objects" / info["sha256"][:2] / f"{info['sha256']}.zst").exists()
+
+    def test_second_backup_skips_unchanged_files(self, backup_table_data, backup_dir):
+        first = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        insert_rows(backup_table_data, "default.backup_src", [{"id": 4, "name": "dave", "value": 40.0}])
+        second = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+
+        # Everything but the superseded metadata.json is reused; only the new commit's files are copied
+        assert second["files_skipped"] == first["files"] - 1
+        assert 0 < second["files_copied"] < second["files"]
+        assert second["snapshot_count"] == 2
+
+        unchanged = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        assert unchanged["files_copied"] == 0
+        assert unchanged["size_bytes"] == 0
+
+    def test_restore_current_snapshot(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        restored = restore_table(backup_table_data, result["archive"], table_name="inc_restored")
+        assert restored["rows_restored"] == 3
+        rows = backup_table_data.load_table("default.inc_restored").scan().to_arrow().to_pylist()
+        assert sorted(r["name"] for r in rows) == ["alice", "bob", "charlie"]
+
+    def test_point_in_time_restore(self, backup_table_data, backup_dir):
+        first_snapshot = backup_table_data.load_table("default.backup_src").current_snapshot().snapshot_id
+        insert_rows(backup_table_data, "default.backup_src", [{"id": 4, "name": "dave", "value": 40.0}])
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+
+        restored = restore_table(
+            backup_table_data, result["archive"], table_name="pit_restored", snapshot_id=first_snapshot,
+        )
+        assert restored["snapshot_id"] == first_snapshot
+        assert backup_table_data.load_table("default.pit_restored").scan().to_arrow().num_rows == 3
+
+    def test_restore_unknown_snapshot_raises(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        with pytest.raises(ValueError, match="not in this backup"):
+            restore_table(backup_table_data, result["archive"], table_name="nope", snapshot_id=1)
+
+    def test_snapshot_id_requires_incremental_backup(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir)
+        with pytest.raises(ValueError, match="incremental"):
+            restore_table(backup_table_data, result["archive"], table_name="nope", snapshot_id=1)
+
+    def test_restore_overwrite_source(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        insert_rows(backup_table_data, "default.backup_src", [{"id": 4, "name": "dave", "value": 40.0}])
+        with pytest.raises(ValueError, match="already exists"):
+            restore_table(backup_table_data, result["archive"])
+        restore_table(backup_table_data, result["archive"], overwrite=True)
+        assert backup_table_data.load_table("default.backup_src").scan().to_arrow().num_rows == 3
+
+    def test_corrupt_object_leaves_target_untouched(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        insert_rows(backup_table_data, "default.backup_src", [{"id": 4, "name": "dave", "value": 40.0}])
+        entry = json.loads(open(result["archive"]).read())["tables"][0]
+        data = next(info for info in entry["files"].values() if info["kind"] == "data")
+        (backup_dir / "objects" / data["sha256"][:2] / f"{data['sha256']}.zst").unlink()
+
+        with pytest.raises(ValueError, match="Missing object"):
+            restore_table(backup_table_data, result["archive"], overwrite=True)
+        assert backup_table_data.load_table("default.backup_src").scan().to_arrow().num_rows == 4
+
+    def test_restore_empty_table(self, test_catalog, backup_dir):
+        create_table(test_catalog, "empty_inc", columns={"id": "long"})
+        result = backup_table(test_catalog, "empty_inc", output_dir=backup_dir, incremental=True)
+        restored = restore_table(test_catalog, result["archive"], table_name="empty_inc_restored")
+        assert restored["rows_restored"] == 0
+        assert "default.empty_inc_restored" in list_tables(test_catalog)
+
+    def test_list_backup_snapshots(self, backup_table_data, backup_dir):
+        backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        insert_rows(backup_table_data, "default.backup_src", [{"id": 4, "name": "dave", "value": 40.0}])
+        second = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+
+        snapshots = list_backup_snapshots("backup_src", backup_dir)
+        assert [s["row_count"] for s in snapshots] == [3, 4]
+        assert all(s["archive"] == second["archive"] for s in snapshots)
+
+    def test_list_and_verify(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        backups = list_backups(backup_dir)
+        assert backups[0]["incremental"] is True
+        assert backups[0]["row_count"] == 3
+        assert verify_backup(result["archive"])["valid"] is True
+
+    def test_verify_detects_corrupt_object(self, backup_table_data, backup_dir):
+        result = backup_table(backup_table_data, "backup_src", output_dir=backup_dir, incremental=True)
+        entry = json.loads(open(result["archive"]).read())["tables"][0]
+        data = next(info for info in entry["files"].values() if info["kind"] == "data")
+        obj = backup_dir / "objects" / data["sha256"][:2] / f"{data['sha256']}.zst"
+        obj.unlink()
+        verify = verify_backup(result["archive"])
+        assert verify["valid"] is False
+        assert any("Missing object" in issue for issue in verify["issues"])
+
+    def test_namespace_round_trip(self, backup_table_data, backup_dir):
+        bk = backup_namespace(backup_table_data, "default", output_dir=backup_dir, incremental=True)
+        assert bk["archive"].endswith(".backup.json")
+        assert "default.backup_src" in bk["tables"]
+
+        again = backup_namespace(backup_table_data, "default", output_dir=backup_dir, incremental=True)
+        assert again["files_copied"] == 0
+
+        result = restore_namespace(backup_table_data, bk["archive"], overwrite=True)
+        assert result["table_count"] == bk["table_count"]
+        assert result["errors"] == []
+        assert backup_table_data.load_table("default.backup_src").scan().to_arrow().num_rows == 3
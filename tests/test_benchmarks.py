@@ -15,6 +15,7 @@ from benchmarks.format_comparison import (
     generate_report,
     system_info,
 )
+from benchmarks import join_filters, lineage_graph, startup
 
 
 class TestDataGenerators:
@@ -152,3 +153,75 @@ class TestRunBenchmarks:
         assert "Python" in info
         assert "Platform" in info
         assert "DuckDB" in info
+
+
+class TestStartupBenchmarks:
+    """Test the cold-start benchmark helpers."""
+
+    def test_parse_importtime(self):
+        """Test parsing -X importtime output."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   json.decoder\n"
+            "import time:       300 |        420 | json\n"
+        )
+        rows = startup.parse_importtime(stderr)
+        assert rows == [
+            {"module": "json.decoder", "self_us": 120, "cumulative_us": 120, "depth": 1},
+            {"module": "json", "self_us": 300, "cumulative_us": 420, "depth": 0},
+        ]
+
+    def test_measure_import(self):
+        """Test measuring a module import in a fresh interpreter."""
+        result = startup.measure_import("json")
+        assert result["ok"]
+        assert result["import_ms"] is not None
+        assert result["heavy_modules"] == []
+
+    def test_cli_import_stays_light(self):
+        """Importing the CLI must not pull in pandas, pyiceberg, DuckDB or Arrow."""
+        result = startup.measure_import("lakehouse.cli")
+        assert result["ok"]
+        assert result["heavy_modules"] == []
+
+    def test_query_module_defers_pandas(self):
+        """The query engine only needs pandas once results are fetched."""
+        result = startup.measure_import("lakehouse.query")
+        assert result["ok"]
+        assert "pandas" not in result["heavy_modules"]
+
+    def test_measure_cli_and_report(self):
+        """Test timing a CLI command and rendering the report."""
+        cli = startup.measure_cli(["--help"], repeats=1)
+        assert cli["ok"]
+        assert cli["median_ms"] > 0
+        report = startup.generate_report({"imports": [startup.measure_import("json")], "cli": [cli], "mcp": None})
+        assert "# Startup Benchmarks" in report
+        assert "`lakehouse --help`" in report
+
+
+class TestJoinFilterBenchmarks:
+    """Test the skewed-join benchmark."""
+
+    def test_run_and_report(self):
+        """Filtered and unfiltered joins agree and the fact scan shrinks."""
+        results = join_filters.run_join_benchmarks(rows=2000, files=4, repeats=1)
+        assert results["same_result"]
+        assert results["filtered_fact_rows"] < results["unfiltered_rows_scanned"]
+        report = join_filters.generate_report(results)
+        assert "# Join Filter Benchmarks" in report
+        assert "dynamic join filters" in report
+
+
+class TestLineageBenchmarks:
+    """Test the lineage lookup benchmark on a small graph."""
+
+    def test_small_graph(self):
+        """Indexed and edge-scan lookups agree."""
+        results = lineage_graph.run_lineage_benchmarks(nodes=400, lookups=3)
+        assert results["same_result"]
+        assert results["affected_tables"] > 0
+        report = lineage_graph.generate_report(results)
+        assert "# Lineage Lookup Benchmarks" in report
+        assert "adjacency index" in report
+
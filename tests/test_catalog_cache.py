@@ -0,0 +1,95 @@
+"""Tests for the cached catalog handle and table-metadata cache."""
+
+import pytest
+from pyiceberg.catalog.sql import SqlCatalog
+
+from lakehouse import catalog as catalog_module
+from lakehouse.catalog import (
+    CachedSqlCatalog,
+    clear_catalog_cache,
+    get_catalog,
+    init_catalog,
+    create_sample_tables,
+    insert_rows,
+)
+from lakehouse.metrics import get_counter, reset
+
+
+@pytest.fixture
+def paths(tmp_path):
+    return {"warehouse_path": tmp_path / "warehouse", "catalog_db": tmp_path / "catalog.db"}
+
+
+@pytest.fixture
+def cached_catalog(paths):
+    catalog = get_catalog(**paths, name="cachetest")
+    init_catalog(catalog)
+    create_sample_tables(catalog)
+    reset("lakehouse_cache_requests")
+    return catalog
+
+
+def _metadata_lookups(result):
+    return get_counter("lakehouse_cache_requests", cache="table_metadata", result=result)
+
+
+# --- get_catalog ---
+
+class TestGetCatalog:
+    def test_reuses_handle(self, paths):
+        first = get_catalog(**paths, name="reuse")
+        assert isinstance(first, CachedSqlCatalog)
+        assert get_catalog(**paths, name="reuse") is first
+        assert get_catalog(**paths, name="other") is not first
+
+    def test_recreates_after_db_removed(self, paths):
+        first = get_catalog(**paths, name="removed")
+        paths["catalog_db"].unlink()
+        second = get_catalog(**paths, name="removed")
+        assert second is not first
+        assert paths["catalog_db"].exists()
+
+    def test_clear_catalog_cache(self, paths):
+        first = get_catalog(**paths, name="cleared")
+        clear_catalog_cache()
+        assert get_catalog(**paths, name="cleared") is not first
+
+
+# --- load_table ---
+
+class TestMetadataCache:
+    def test_repeated_loads_hit_cache(self, cached_catalog):
+        a = cached_catalog.load_table("default.expenses")
+        b = cached_catalog.load_table("default.expenses")
+        assert a.metadata is b.metadata
+        assert a.name() == ("default", "expenses")
+        assert _metadata_lookups("hit") >= 1
+
+    def test_commit_writes_through(self, cached_catalog):
+        cached_catalog.load_table("default.expenses")
+        insert_rows(cached_catalog, "expenses", [{"id": 1, "amount": 5.0}])
+        misses = _metadata_lookups("miss")
+        table = cached_catalog.load_table("default.expenses")
+        assert table.current_snapshot() is not None
+        assert table.scan().to_arrow().num_rows == 1
+        assert _metadata_lookups("miss") == misses
+
+    def test_pointer_check_sees_external_commit(self, cached_catalog, paths):
+        cached_catalog.load_table("default.expenses")
+        # Another process committing through its own catalog connection
+        external = SqlCatalog(
+            "cachetest",
+            uri=f"sqlite:///{paths['catalog_db']}",
+            warehouse=f"file://{paths['warehouse_path']}",
+        )
+        insert_rows(external, "expenses", [{"id": 7, "amount": 1.0}])
+        table = cached_catalog.load_table("default.expenses")
+        assert table.scan().to_arrow().column("id").to_pylist() == [7]
+
+    def test_lru_bound(self, cached_catalog, monkeypatch):
+        monkeypatch.setattr(catalog_module, "MAX_METADATA_CACHE_ENTRIES", 2)
+        catalog_module._metadata_cache.clear()
+        for name in ("expenses", "health", "notes"):
+            cached_catalog.load_table(f"default.{name}")
+        assert len(catalog_module._metadata_cache) == 2
+        assert _metadata_lookups("miss") >= 3
@@ -0,0 +1,117 @@
+"""Tests for the shared check context."""
+
+import threading
+
+import pytest
+
+from lakehouse.catalog import create_table, insert_rows
+from lakehouse.checks import CheckContext
+from lakehouse.quality import compute_quality_score, detect_anomalies
+from lakehouse.stats import compute_table_stats
+
+
+@pytest.fixture
+def orders(test_catalog):
+    create_table(test_catalog, "orders", columns={"id": "long", "amount": "double"})
+    insert_rows(test_catalog, "default.orders", [{"id": i, "amount": float(i)} for i in range(10)])
+    return test_catalog
+
+
+@pytest.fixture
+def count_scans(monkeypatch):
+    """Count full table scans made through the context."""
+    scans = []
+    original = CheckContext.arrow
+
+    def arrow(self, table_name):
+        def counted():
+            scans.append(table_name)
+        self.memo(table_name, "counted", counted)
+        return original(self, table_name)
+
+    monkeypatch.setattr(CheckContext, "arrow", arrow)
+    return scans
+
+
+# --- memoization ---
+
+
+class TestCheckContext:
+    def test_memo_once_per_snapshot(self, orders):
+        context = CheckContext(orders)
+        calls = []
+        for _ in range(3):
+            context.memo("default.orders", "x", lambda: calls.append(1) or len(calls))
+        assert calls == [1]
+        assert context.summary() == {"tables": 1, "computed": 1, "reused": 2}
+
+    def test_new_context_sees_new_snapshot(self, orders):
+        first = CheckContext(orders)
+        before = first.snapshot_id("default.orders")
+        insert_rows(orders, "default.orders", [{"id": 99, "amount": 1.0}])
+        # A context keeps the state it first loaded; a new run sees the write
+        assert first.snapshot_id("default.orders") == before
+        assert CheckContext(orders).snapshot_id("default.orders") != before
+        assert first.arrow("default.orders").num_rows == 10
+
+    def test_concurrent_requests_compute_once(self, orders):
+        context = CheckContext(orders)
+        calls = []
+
+        def slow():
+            calls.append(1)
+            threading.Event().wait(0.1)
+            return "done"
+
+        threads = [threading.Thread(target=context.memo, args=("default.orders", "slow", slow)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(calls) == 1
+
+    def test_missing_table(self, test_catalog):
+        with pytest.raises(ValueError, match="not found"):
+            CheckContext(test_catalog).table("default.nope")
+
+    def test_failures_not_cached(self, orders):
+        context = CheckContext(orders)
+        with pytest.raises(RuntimeError):
+            context.memo("default.orders", "x", lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+        assert context.memo("default.orders", "x", lambda: 1) == 1
+
+
+# --- shared across checks ---
+
+
+class TestSharedChecks:
+    def test_stats_and_quality_share_one_scan(self, orders, tmp_path, count_scans):
+        context = CheckContext(orders)
+        stats = compute_table_stats(orders, "orders", store_path=tmp_path / "stats.json", context=context)
+        score = compute_quality_score(
+            orders, "orders",
+            stats_path=tmp_path / "stats.json", validation_path=tmp_path / "rules.json",
+            store_path=tmp_path / "quality.json", context=context,
+        )
+        again = compute_table_stats(orders, "orders", store_path=tmp_path / "stats.json", context=context)
+        assert again is stats
+        assert score["row_count"] == 10
+        assert count_scans == ["default.orders"]
+
+    def test_anomaly_baseline_survives_shared_stats(self, orders, tmp_path):
+        stats_path = tmp_path / "stats.json"
+        compute_table_stats(orders, "orders", store_path=stats_path)
+        insert_rows(orders, "default.orders", [{"id": 100 + i, "amount": 1.0} for i in range(20)])
+
+        context = CheckContext(orders)
+        # Another check caches this run's stats before anomalies are looked for
+        compute_table_stats(orders, "orders", store_path=stats_path, context=context)
+        anomalies = detect_anomalies(orders, "orders", stats_path=stats_path, context=context)
+        assert any(a["type"] == "row_count_change" for a in anomalies)
+
+    def test_column_stats_match(self, orders, tmp_path):
+        stats = compute_table_stats(orders, "orders", store_path=tmp_path / "stats.json")
+        amount = stats["columns"]["amount"]
+        assert (amount["nulls"], amount["unique"], amount["min"], amount["max"]) == (0, 10, 0.0, 9.0)
+        assert amount["mean"] == 4.5
+        assert len(amount["histogram"]) == 11
@@ -4,14 +4,21 @@ import json
 import pytest
 from pathlib import Path
 
+import pyarrow as pa
+
 from lakehouse.cloning import (
     clone_table,
     list_clones,
     promote_clone,
     discard_clone,
+    shared_file_references,
 )
 from lakehouse.catalog import (
+    cleanup_orphans,
+    compact_table,
     create_table,
+    delete_rows,
+    expire_snapshots,
     insert_rows,
     get_table_schema,
     list_tables,
@@ -224,3 +231,145 @@ class TestStorageFormat:
         assert entry["row_count"] == 3
         assert "cloned_at" in entry
         assert "source_snapshot_id" in entry
+
+
+# --- Zero-copy sharing ---
+
+
+def _data_files(catalog, table_name):
+    tbl = catalog.load_table(table_name)
+    return sorted(task.file.file_path for task in tbl.scan().plan_files())
+
+
+@pytest.fixture
+def default_clones_path(isolated_clones_store):
+    """The clones store orphan cleanup consults."""
+    return isolated_clones_store
+
+
+class TestZeroCopy:
+    def test_clone_references_source_files(self, test_catalog, source_table, clones_path):
+        result = clone_table(test_catalog, source_table, "zc_clone", store_path=clones_path)
+        assert result["files_shared"] == 1
+        assert _data_files(test_catalog, "default.zc_clone") == _data_files(test_catalog, "default.clone_source")
+
+        clone_dir = Path(test_catalog.load_table("default.zc_clone").location().removeprefix("file://")) / "data"
+        assert not list(clone_dir.rglob("*.parquet"))
+
+    def test_clone_keeps_field_ids(self, test_catalog, source_table, clones_path):
+        clone_table(test_catalog, source_table, "zc_ids", store_path=clones_path)
+        src = test_catalog.load_table("default.clone_source").schema()
+        tgt = test_catalog.load_table("default.zc_ids").schema()
+        assert [(f.field_id, f.name) for f in src.fields] == [(f.field_id, f.name) for f in tgt.fields]
+
+    def test_writes_to_clone_are_copy_on_write(self, test_catalog, source_table, clones_path):
+        shared = _data_files(test_catalog, "default.clone_source")
+        clone_table(test_catalog, source_table, "zc_cow", store_path=clones_path)
+        delete_rows(test_catalog, "default.zc_cow", "id = 1")
+
+        assert test_catalog.load_table("default.zc_cow").scan().to_arrow().num_rows == 2
+        assert test_catalog.load_table("default.clone_source").scan().to_arrow().num_rows == 3
+        assert _data_files(test_catalog, "default.clone_source") == shared
+        assert all(Path(p.removeprefix("file://")).exists() for p in shared)
+        assert all("/zc_cow/" in p for p in _data_files(test_catalog, "default.zc_cow"))
+
+    def test_promote_swaps_files_without_copying(self, test_catalog, source_table, clones_path):
+        clone_table(test_catalog, source_table, "zc_promo", store_path=clones_path)
+        insert_rows(test_catalog, "default.zc_promo", [{"id": 4, "name": "Dana", "value": 40.0}])
+        clone_files = _data_files(test_catalog, "default.zc_promo")
+
+        result = promote_clone(test_catalog, "zc_promo", source_table, store_path=clones_path)
+        assert result["method"] == "file swap"
+        assert _data_files(test_catalog, "default.clone_source") == clone_files
+
+    def test_orphan_cleanup_keeps_files_used_by_clone(self, test_catalog, source_table, default_clones_path):
+        shared = _data_files(test_catalog, "default.clone_source")
+        clone_table(test_catalog, source_table, "zc_keep", store_path=default_clones_path)
+
+        # Rewrite the source and drop the old snapshots: its original files are now unreferenced by it
+        compact_table(test_catalog, "default.clone_source")
+        expire_snapshots(test_catalog, "default.clone_source", retain_last=1)
+        assert shared_file_references(test_catalog, "default.clone_source", default_clones_path) >= set(shared)
+
+        result = cleanup_orphans(test_catalog, "default.clone_source", dry_run=False)
+        assert result["orphan_files_removed"] == 0
+        assert test_catalog.load_table("default.zc_keep").scan().to_arrow().num_rows == 3
+
+        # Once the clone is gone the files become real orphans
+        discard_clone(test_catalog, "zc_keep", store_path=default_clones_path)
+        result = cleanup_orphans(test_catalog, "default.clone_source", dry_run=False)
+        assert result["orphan_files_removed"] == len(shared)
+
+    def test_orphan_cleanup_aborts_when_clone_unreadable(self, test_catalog, source_table, default_clones_path, monkeypatch):
+        shared = _data_files(test_catalog, "default.clone_source")
+        clone_table(test_catalog, source_table, "zc_broken", store_path=default_clones_path)
+        compact_table(test_catalog, "default.clone_source")
+        expire_snapshots(test_catalog, "default.clone_source", retain_last=1)
+
+        load_table = test_catalog.load_table
+
+        def flaky_load(name):
+            if name == "default.zc_broken":
+                raise OSError("metadata unavailable")
+            return load_table(name)
+
+        monkeypatch.setattr(test_catalog, "load_table", flaky_load)
+        with pytest.raises(OSError):
+            cleanup_orphans(test_catalog, "default.clone_source", dry_run=False)
+        assert all(Path(p.removeprefix("file://")).exists() for p in shared)
+
+    def test_promoted_clone_files_stay_protected(self, test_catalog, source_table, default_clones_path):
+        clone_table(test_catalog, source_table, "zc_link", store_path=default_clones_path)
+        insert_rows(test_catalog, "default.zc_link", [{"id": 4, "name": "Dana", "value": 40.0}])
+        promote_clone(test_catalog, "zc_link", source_table, store_path=default_clones_path)
+        assert "default.zc_link" not in [c["clone"] for c in list_clones(store_path=default_clones_path)]
+
+        # The clone's own table has been rewritten; its old files now belong to the original
+        compact_table(test_catalog, "default.zc_link")
+        expire_snapshots(test_catalog, "default.zc_link", retain_last=1)
+        cleanup_orphans(test_catalog, "default.zc_link", dry_run=False)
+        assert test_catalog.load_table("default.clone_source").scan().to_arrow().num_rows == 4
+
+
+class TestBranchClone:
+    def test_branch_clone_and_promote(self, test_catalog, source_table, clones_path):
+        result = clone_table(test_catalog, source_table, "experiment", mode="branch", store_path=clones_path)
+        assert result["target"] == "default.clone_source@experiment"
+        assert list_clones(store_path=clones_path)[0]["mode"] == "branch"
+
+        tbl = test_catalog.load_table("default.clone_source")
+        tbl.append(pa.table({"id": [4], "name": ["Dana"], "value": [40.0]}), branch="experiment")
+        assert test_catalog.load_table("default.clone_source").scan().to_arrow().num_rows == 3
+
+        promoted = promote_clone(test_catalog, "clone_source@experiment", source_table, store_path=clones_path)
+        assert promoted["method"] == "fast-forward"
+        tbl = test_catalog.load_table("default.clone_source")
+        assert tbl.scan().to_arrow().num_rows == 4
+        assert "experiment" not in tbl.metadata.refs
+        assert list_clones(store_path=clones_path) == []
+
+    def test_discard_branch_clone(self, test_catalog, source_table, clones_path):
+        clone_table(test_catalog, source_table, "scratch", mode="branch", store_path=clones_path)
+        discard_clone(test_catalog, "clone_source@scratch", store_path=clones_path)
+        assert "scratch" not in test_catalog.load_table("default.clone_source").metadata.refs
+        assert list_clones(store_path=clones_path) == []
+
+    def test_duplicate_branch_raises(self, test_catalog, source_table, clones_path):
+        clone_table(test_catalog, source_table, "dup", mode="branch", store_path=clones_path)
+        with pytest.raises(ValueError, match="already exists"):
+            clone_table(test_catalog, source_table, "dup", mode="branch", store_path=clones_path)
+
+    def test_expire_keeps_branch_head(self, test_catalog, source_table, clones_path):
+        clone_table(test_catalog, source_table, "pinned", mode="branch", store_path=clones_path)
+        insert_rows(test_catalog, "default.clone_source", [{"id": 4, "name": "Dana", "value": 40.0}])
+        insert_rows(test_catalog, "default.clone_source", [{"id": 5, "name": "Eve", "value": 50.0}])
+
+        expire_snapshots(test_catalog, "default.clone_source", retain_last=1)
+        tbl = test_catalog.load_table("default.clone_source")
+        head = tbl.metadata.snapshot_by_name("pinned")
+        assert head is not None
+        assert tbl.scan(snapshot_id=head.snapshot_id).to_arrow().num_rows == 3
+
+    def test_invalid_mode_raises(self, test_catalog, source_table, clones_path):
+        with pytest.raises(ValueError, match="Unsupported clone mode"):
+            clone_table(test_catalog, source_table, "x", mode="deep", store_path=clones_path)
@@ -10,7 +10,10 @@ from lakehouse.config import (
     get_config_summary,
     resolve_format,
     resolve_format_with_table,
+    get_query_limits,
+    set_query_limit,
     VALID_FORMATS,
+    DEFAULT_QUERY_LIMITS,
 )
 
 
@@ -183,3 +186,28 @@ class TestResolveFormatWithTable:
         assert resolve_format_with_table(
             "expenses", props, config_path=config_path
         ) == "vortex"
+
+
+class TestQueryLimits:
+    """Test query admission limit management."""
+
+    def test_defaults(self, config_path):
+        """Test that defaults apply when no config exists."""
+        assert get_query_limits(config_path) == DEFAULT_QUERY_LIMITS
+
+    def test_set_limit(self, config_path):
+        """Test overriding one limit keeps the others at default."""
+        set_query_limit("max_rows_scanned", 500, config_path)
+        limits = get_query_limits(config_path)
+        assert limits["max_rows_scanned"] == 500
+        assert limits["max_bytes_scanned"] == DEFAULT_QUERY_LIMITS["max_bytes_scanned"]
+
+    def test_invalid_limit_name(self, config_path):
+        """Test that unknown limit names raise ValueError."""
+        with pytest.raises(ValueError, match="Invalid limit"):
+            set_query_limit("max_widgets", 1, config_path)
+
+    def test_non_positive_limit(self, config_path):
+        """Test that zero or negative limits raise ValueError."""
+        with pytest.raises(ValueError, match="must be positive"):
+            set_query_limit("max_output_rows", 0, config_path)
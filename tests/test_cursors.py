@@ -0,0 +1,119 @@
+"""Tests for server-side result cursors."""
+
+import pytest
+
+from lakehouse import cursors
+from lakehouse.catalog import insert_rows
+from lakehouse.cursors import close_cursor, expire_cursors, fetch_more, list_cursors, open_cursor
+
+
+@pytest.fixture(autouse=True)
+def clean_cursors():
+    cursors.close_all_cursors()
+    yield
+    cursors.close_all_cursors()
+
+
+@pytest.fixture
+def engine(test_catalog, query_engine):
+    insert_rows(test_catalog, "expenses", [
+        {"id": i, "category": "food" if i % 2 else "rent", "amount": float(i), "currency": "USD"}
+        for i in range(25)
+    ])
+    return query_engine
+
+
+# --- open_cursor ---
+
+class TestOpenCursor:
+    def test_first_page_and_cursor(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses ORDER BY id", page_size=10)
+        assert page["page"].column("id").to_pylist() == list(range(10))
+        assert page["has_more"] is True
+        assert page["cursor_id"] in {c["cursor_id"] for c in list_cursors()}
+
+    def test_small_result_closes_immediately(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses WHERE id < 3 ORDER BY id", page_size=10)
+        assert page["page"].num_rows == 3
+        assert page["cursor_id"] is None
+        assert page["has_more"] is False
+        assert list_cursors() == []
+
+    def test_exact_page_boundary(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses", page_size=25)
+        assert page["page"].num_rows == 25
+        assert page["has_more"] is False
+
+    def test_no_row_limit_added(self, engine):
+        page = open_cursor(engine, "SELECT COUNT(*) AS n FROM expenses")
+        assert page["page"].column("n").to_pylist() == [25]
+
+    def test_engine_usable_while_open(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses ORDER BY id", page_size=5)
+        assert len(engine.execute("SELECT * FROM expenses")) == 25
+        more = fetch_more(page["cursor_id"])
+        assert more["page"].column("id").to_pylist() == list(range(5, 10))
+
+    def test_sees_views_on_main_connection(self, engine):
+        engine.execute_raw("CREATE VIEW big_expenses AS SELECT * FROM expenses WHERE amount >= 20")
+        page = open_cursor(engine, "SELECT id FROM big_expenses ORDER BY id")
+        assert page["page"].column("id").to_pylist() == [20, 21, 22, 23, 24]
+
+    def test_invalid_sql_raises(self, engine):
+        with pytest.raises(Exception):
+            open_cursor(engine, "SELECT * FROM missing_table")
+        assert list_cursors() == []
+
+
+# --- fetch_more ---
+
+class TestFetchMore:
+    def test_pages_through_result(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses ORDER BY id", page_size=10)
+        ids = page["page"].column("id").to_pylist()
+        while page["has_more"]:
+            page = fetch_more(page["cursor_id"])
+            ids += page["page"].column("id").to_pylist()
+        assert ids == list(range(25))
+        assert page["offset"] == 20
+        assert page["rows_fetched"] == 25
+        assert list_cursors() == []
+
+    def test_custom_page_size(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses ORDER BY id", page_size=5)
+        more = fetch_more(page["cursor_id"], page_size=15)
+        assert more["page"].column("id").to_pylist() == list(range(5, 20))
+
+    def test_unknown_cursor(self):
+        with pytest.raises(ValueError, match="not found or expired"):
+            fetch_more("nope")
+
+
+# --- expiry and caps ---
+
+class TestCursorLimits:
+    def test_close_cursor(self, engine):
+        page = open_cursor(engine, "SELECT id FROM expenses", page_size=5)
+        assert close_cursor(page["cursor_id"]) is True
+        assert close_cursor(page["cursor_id"]) is False
+
+    def test_idle_expiry(self, engine, monkeypatch):
+        page = open_cursor(engine, "SELECT id FROM expenses", page_size=5)
+        monkeypatch.setattr(cursors, "CURSOR_IDLE_SECONDS", -1)
+        assert expire_cursors() == [page["cursor_id"]]
+        with pytest.raises(ValueError):
+            fetch_more(page["cursor_id"])
+
+    def test_open_cursor_cap_evicts_lru(self, engine, monkeypatch):
+        monkeypatch.setattr(cursors, "MAX_OPEN_CURSORS", 2)
+        ids = [open_cursor(engine, "SELECT id FROM expenses", page_size=5)["cursor_id"] for _ in range(3)]
+        assert [c["cursor_id"] for c in list_cursors()] == ids[1:]
+
+    def test_memory_cap_closes_cursor(self, engine, monkeypatch):
+        monkeypatch.setattr(cursors, "MAX_CURSOR_BYTES", 0)
+        page = open_cursor(engine, "SELECT id FROM expenses", page_size=5)
+        assert page["page"].num_rows == 5
+        assert page["truncated"] is True
+        assert page["cursor_id"] is None
+        assert "memory cap" in page["message"]
+        assert list_cursors() == []
@@ -212,6 +212,142 @@ class TestRunPipelineIncremental:
             run_pipeline_incremental("nope", inc_table, engine, store_path=pipe_path, watermark_path=wm_path)
 
 
+# --- delta-bound steps ---
+
+
+@pytest.fixture
+def orders(test_catalog):
+    """An orders fact table and a customers dimension."""
+    create_table(test_catalog, "customers", columns={"customer_id": "long", "region": "string"})
+    insert_rows(test_catalog, "default.customers", [
+        {"customer_id": 1, "region": "north"},
+        {"customer_id": 2, "region": "south"},
+    ])
+    create_table(test_catalog, "orders", columns={"order_id": "long", "customer_id": "long", "amount": "double"})
+    insert_rows(test_catalog, "default.orders", [
+        {"order_id": 1, "customer_id": 1, "amount": 10.0},
+        {"order_id": 2, "customer_id": 2, "amount": 20.0},
+    ])
+    return test_catalog
+
+
+ENRICH_SQL = (
+    "SELECT d.order_id, d.amount, c.region FROM {{delta}} d "
+    "JOIN customers c ON d.customer_id = c.customer_id"
+)
+
+
+class TestDeltaSteps:
+    def test_delta_joins_full_dimension(self, orders, wm_path, pipe_path):
+        """{{delta}} is the new rows; other tables are read in full."""
+        create_pipeline(
+            "enrich",
+            [{"source_table": "orders", "target_table": "orders_enriched", "sql": ENRICH_SQL}],
+            store_path=pipe_path,
+        )
+        engine = QueryEngine(catalog=orders)
+        run_pipeline_incremental("enrich", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        insert_rows(orders, "default.orders", [{"order_id": 3, "customer_id": 2, "amount": 5.0}])
+
+        result = run_pipeline_incremental("enrich", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        assert result["steps"][0]["rows_read"] == 1
+        assert result["steps"][0]["is_full"] is False
+        df = engine.execute("SELECT * FROM orders_enriched ORDER BY order_id")
+        assert df["region"].tolist() == ["north", "south", "south"]
+
+    def test_target_types_inferred(self, orders, wm_path, pipe_path):
+        """New targets keep the result's types instead of strings."""
+        create_pipeline(
+            "typed",
+            [{"source_table": "orders", "target_table": "order_totals",
+              "sql": "SELECT customer_id, SUM(amount) AS total, COUNT(*) AS n FROM {{delta}} GROUP BY customer_id"}],
+            store_path=pipe_path,
+        )
+        run_pipeline_incremental("typed", orders, QueryEngine(catalog=orders), store_path=pipe_path, watermark_path=wm_path)
+        schema = orders.load_table("default.order_totals").schema()
+        assert {f.name: str(f.field_type) for f in schema.fields} == {"customer_id": "long", "total": "double", "n": "long"}
+
+    def test_merge_keys_upsert(self, orders, wm_path, pipe_path):
+        """Steps with merge_keys upsert the result into the target."""
+        create_pipeline(
+            "latest",
+            [{"source_table": "orders", "target_table": "latest_order", "merge_keys": ["customer_id"],
+              "sql": "SELECT customer_id, MAX(order_id) AS order_id FROM {{delta}} GROUP BY customer_id"}],
+            store_path=pipe_path,
+        )
+        engine = QueryEngine(catalog=orders)
+        run_pipeline_incremental("latest", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        insert_rows(orders, "default.orders", [{"order_id": 7, "customer_id": 1, "amount": 1.0}])
+        result = run_pipeline_incremental("latest", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+
+        assert result["steps"][0]["mode"] == "merge"
+        df = engine.execute("SELECT * FROM latest_order ORDER BY customer_id")
+        assert df["order_id"].tolist() == [7, 2]
+
+    def test_one_commit_per_step(self, orders, wm_path, pipe_path):
+        """Each step writes its result in a single commit."""
+        create_pipeline(
+            "copy",
+            [{"source_table": "orders", "target_table": "orders_copy", "sql": "SELECT * FROM {{delta}}"}],
+            store_path=pipe_path,
+        )
+        run_pipeline_incremental("copy", orders, QueryEngine(catalog=orders), store_path=pipe_path, watermark_path=wm_path)
+        assert len(orders.load_table("default.orders_copy").metadata.snapshots) == 1
+
+    def test_only_written_targets_reregistered(self, orders, wm_path, pipe_path, monkeypatch):
+        """Committing steps re-register their target, not the whole catalog."""
+        create_pipeline(
+            "chain",
+            [
+                {"source_table": "orders", "target_table": "orders_copy", "sql": "SELECT * FROM {{delta}}"},
+                {"source_table": "orders", "target_table": "orders_count",
+                 "sql": "SELECT COUNT(*) AS n FROM orders_copy, (SELECT 1 FROM {{delta}} LIMIT 1) d"},
+            ],
+            store_path=pipe_path,
+        )
+        engine = QueryEngine(catalog=orders)
+        engine.execute("SELECT 1")
+        scans = []
+        register = QueryEngine._register_tables
+        monkeypatch.setattr(QueryEngine, "_register_tables", lambda self: scans.append(1) or register(self))
+
+        run_pipeline_incremental("chain", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        assert scans == []
+        # The second step saw the first step's target
+        assert engine.execute("SELECT n FROM orders_count")["n"].tolist() == [2]
+        assert len(engine.execute("SELECT * FROM orders_copy")) == 2
+
+    def test_resumes_from_target_commit(self, orders, wm_path, pipe_path):
+        """A commit whose watermark was never saved is not processed again."""
+        create_pipeline(
+            "resume",
+            [{"source_table": "orders", "target_table": "orders_copy", "sql": "SELECT * FROM {{delta}}"}],
+            store_path=pipe_path,
+        )
+        engine = QueryEngine(catalog=orders)
+        run_pipeline_incremental("resume", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        wm_path.unlink()  # As if the run stopped between the commit and the watermark update
+
+        result = run_pipeline_incremental("resume", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        assert result["steps"][0]["status"] == "skipped"
+        assert len(engine.execute("SELECT * FROM orders_copy")) == 2
+
+    def test_reset_reprocesses_everything(self, orders, wm_path, pipe_path):
+        """Resetting the watermark ignores source snapshots recorded by earlier commits."""
+        create_pipeline(
+            "again",
+            [{"source_table": "orders", "target_table": "orders_copy", "sql": "SELECT * FROM {{delta}}"}],
+            store_path=pipe_path,
+        )
+        engine = QueryEngine(catalog=orders)
+        run_pipeline_incremental("again", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        reset_watermark("again", store_path=wm_path)
+
+        result = run_pipeline_incremental("again", orders, engine, store_path=pipe_path, watermark_path=wm_path)
+        assert result["steps"][0]["is_full"] is True
+        assert len(engine.execute("SELECT * FROM orders_copy")) == 4
+
+
 # --- Storage format ---
 
 
@@ -2,6 +2,7 @@
 
 import pytest
 
+from lakehouse import joins
 from lakehouse.joins import execute_join, join_to_table, suggest_joins
 from lakehouse.catalog import create_table, insert_rows, list_tables
 from lakehouse.query import QueryEngine
@@ -103,6 +104,81 @@ class TestExecuteJoin:
         assert hasattr(result["dataframe"], "to_csv")  # It's a DataFrame
 
 
+# --- dynamic join filters ---
+
+
+@pytest.fixture
+def skewed_tables(test_catalog):
+    """A small dimension table and a fact table written in several files."""
+    create_table(test_catalog, "regions", columns={"region_id": "long", "name": "string"})
+    insert_rows(test_catalog, "default.regions", [
+        {"region_id": i, "name": "north" if i < 3 else "south"} for i in range(10)
+    ])
+    create_table(test_catalog, "sales", columns={"sale_id": "long", "region_id": "long", "amount": "double"})
+    for batch in range(5):
+        insert_rows(test_catalog, "default.sales", [
+            {"sale_id": batch * 100 + i, "region_id": batch * 2 + i % 2, "amount": float(i)}
+            for i in range(100)
+        ])
+    return test_catalog
+
+
+class TestJoinFilters:
+    def test_build_keys_filter_probe_scan(self, skewed_tables):
+        result = execute_join(
+            skewed_tables,
+            "SELECT r.name, COUNT(*) AS n FROM regions r JOIN sales s ON r.region_id = s.region_id "
+            "WHERE r.name = 'north' GROUP BY r.name",
+        )
+        assert result["dataframe"]["n"].tolist() == [150]
+        applied = [f for f in result["join_filters"] if f["table"] == "default.sales"]
+        assert applied[0]["kind"] == "in"
+        assert applied[0]["keys"] == 3
+        assert applied[0]["rows_after"] == 150
+
+    def test_only_referenced_tables_registered(self, skewed_tables):
+        result = execute_join(skewed_tables, "SELECT * FROM regions r JOIN sales s ON r.region_id = s.region_id")
+        assert sorted(result["registered_tables"]) == ["default.regions", "default.sales"]
+
+    def test_large_key_set_uses_range(self, skewed_tables, monkeypatch):
+        monkeypatch.setattr(joins, "MAX_IN_LIST_KEYS", 2)
+        result = execute_join(
+            skewed_tables,
+            "SELECT COUNT(*) AS n FROM regions r JOIN sales s ON r.region_id = s.region_id WHERE r.region_id < 4",
+        )
+        assert result["dataframe"]["n"].tolist() == [200]
+        applied = [f for f in result["join_filters"] if f["table"] == "default.sales"]
+        assert applied[0]["kind"] == "range"
+        assert (applied[0]["min"], applied[0]["max"]) == (0, 3)
+
+    def test_empty_build_side(self, skewed_tables):
+        result = execute_join(
+            skewed_tables,
+            "SELECT COUNT(*) AS n FROM regions r JOIN sales s ON r.region_id = s.region_id WHERE r.name = 'west'",
+        )
+        assert result["dataframe"]["n"].tolist() == [0]
+        assert any(f["kind"] == "empty" for f in result["join_filters"])
+
+    def test_left_join_keeps_unmatched_rows(self, skewed_tables):
+        result = execute_join(
+            skewed_tables,
+            "SELECT COUNT(*) AS n FROM sales s LEFT JOIN regions r ON s.region_id = r.region_id "
+            "WHERE r.name IS NULL",
+        )
+        assert result["dataframe"]["n"].tolist() == [0]
+        # The preserved side is never filtered by the NULL-padded side
+        assert all(f["table"] != "default.sales" for f in result["join_filters"])
+
+    def test_matches_unfiltered_result(self, skewed_tables):
+        sql = (
+            "SELECT s.region_id, SUM(s.amount) AS total FROM sales s JOIN regions r "
+            "ON s.region_id = r.region_id WHERE r.name = 'south' GROUP BY s.region_id ORDER BY s.region_id"
+        )
+        filtered = execute_join(skewed_tables, sql)["dataframe"]
+        expected = QueryEngine(catalog=skewed_tables).execute(sql)
+        assert filtered["total"].tolist() == expected["total"].tolist()
+
+
 # --- join_to_table ---
 
 
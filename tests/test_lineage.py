@@ -4,13 +4,17 @@ import json
 import pytest
 from pathlib import Path
 
+from lakehouse import lineage
 from lakehouse.lineage import (
     record_lineage,
     get_upstream,
     get_downstream,
+    get_downstream_many,
+    get_upstream_many,
     get_lineage_graph,
     remove_lineage,
     get_impact_analysis,
+    get_impact_analysis_many,
 )
 
 
@@ -303,3 +307,94 @@ class TestStorageFormat:
         assert edge["operation"] == "insert_from"
         assert edge["sql"] is not None
         assert "recorded_at" in edge
+
+
+# --- adjacency index ---
+
+
+def _naive_downstream(edges, table):
+    visited, queue, results = set(), [(table, 0)], []
+    while queue:
+        current, depth = queue.pop(0)
+        for edge in edges:
+            if current in edge["sources"] and edge["target"] not in visited:
+                visited.add(edge["target"])
+                results.append((edge["target"], depth + 1))
+                queue.append((edge["target"], depth + 1))
+    return sorted(results, key=lambda r: (r[1], r[0]))
+
+
+class TestLineageIndex:
+    def test_store_read_once(self, lineage_path, monkeypatch):
+        record_lineage(["a"], "b", store_path=lineage_path)
+        record_lineage(["b"], "c", store_path=lineage_path)
+        loads = []
+        original = lineage._load_store
+        monkeypatch.setattr(lineage, "_load_store", lambda p=None: loads.append(p) or original(p))
+        for _ in range(5):
+            get_downstream("a", store_path=lineage_path)
+            get_upstream("c", store_path=lineage_path)
+        get_lineage_graph(store_path=lineage_path)
+        assert loads == []
+
+    def test_record_updates_cached_closures(self, lineage_path):
+        record_lineage(["a"], "b", store_path=lineage_path)
+        record_lineage(["x"], "y", store_path=lineage_path)
+        assert [d["table"] for d in get_downstream("a", store_path=lineage_path)] == ["default.b"]
+        get_downstream("x", store_path=lineage_path)
+        record_lineage(["b"], "c", store_path=lineage_path)
+        assert [d["table"] for d in get_downstream("a", store_path=lineage_path)] == ["default.b", "default.c"]
+        assert [d["table"] for d in get_upstream("c", store_path=lineage_path)] == ["default.b", "default.a"]
+        # Closures the new edge cannot reach are kept
+        closures = lineage._indexes[str(lineage_path)]["closures"]
+        assert ("downstream", "default.x") in closures
+        assert ("downstream", "default.a") in closures
+
+    def test_remove_multi_source_edge(self, lineage_path):
+        record_lineage(["a", "b"], "c", store_path=lineage_path)
+        assert get_downstream("b", store_path=lineage_path)[0]["table"] == "default.c"
+        remove_lineage("a", "c", store_path=lineage_path)
+        assert get_downstream("b", store_path=lineage_path) == []
+
+    def test_external_change_detected(self, lineage_path):
+        record_lineage(["a"], "b", store_path=lineage_path)
+        get_downstream("a", store_path=lineage_path)
+        # Another process rewrites the store
+        data = json.loads(lineage_path.read_text())
+        data["edges"].append({"sources": ["default.b"], "target": "default.zz", "operation": "manual", "sql": None})
+        lineage_path.write_text(json.dumps(data, indent=4))
+        assert [d["table"] for d in get_downstream("a", store_path=lineage_path)] == ["default.b", "default.zz"]
+
+    def test_results_are_copies(self, lineage_path):
+        record_lineage(["a"], "b", store_path=lineage_path)
+        get_downstream("a", store_path=lineage_path)[0]["table"] = "mutated"
+        assert get_downstream("a", store_path=lineage_path)[0]["table"] == "default.b"
+
+    def test_batched_lookups(self, lineage_path):
+        record_lineage(["a"], "b", store_path=lineage_path)
+        record_lineage(["b"], "c", store_path=lineage_path)
+        down = get_downstream_many(["a", "b", "c"], store_path=lineage_path)
+        assert {t: len(v) for t, v in down.items()} == {"default.a": 2, "default.b": 1, "default.c": 0}
+        up = get_upstream_many(["c"], store_path=lineage_path, transitive=False)
+        assert up == {"default.c": [{"table": "default.b", "operation": "manual", "depth": 1}]}
+        impact = get_impact_analysis_many(["a", "c"], store_path=lineage_path)
+        assert impact["default.a"]["affected_count"] == 2
+        assert impact["default.c"]["affected_count"] == 0
+
+    def test_matches_edge_scan(self, lineage_path):
+        import random
+
+        rng = random.Random(7)
+        for i in range(60):
+            sources = [f"t{rng.randrange(30)}" for _ in range(rng.randint(1, 3))]
+            record_lineage(sources, f"t{rng.randrange(30)}", store_path=lineage_path)
+            if i % 10 == 9:
+                edge = rng.choice(json.loads(lineage_path.read_text())["edges"])
+                remove_lineage(edge["sources"][0], edge["target"], store_path=lineage_path)
+            # Interleave lookups so closures are cached across changes
+            get_downstream(f"t{rng.randrange(30)}", store_path=lineage_path)
+        edges = json.loads(lineage_path.read_text())["edges"]
+        for n in range(30):
+            found = [(d["table"], d["depth"]) for d in get_downstream(f"t{n}", store_path=lineage_path)]
+            assert found == _naive_downstream(edges, f"default.t{n}")
+
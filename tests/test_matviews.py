@@ -11,8 +11,9 @@ from lakehouse.matviews import (
     drop_materialized_view,
     query_materialized_view,
     check_materialized_view_freshness,
+    rewrite_query,
 )
-from lakehouse.catalog import create_table, insert_rows, list_tables
+from lakehouse.catalog import create_table, delete_rows, insert_rows, list_tables
 from lakehouse.query import QueryEngine
 
 
@@ -138,6 +139,148 @@ class TestRefreshMaterializedView:
             refresh_materialized_view("no_such", engine, mv_data, store_path=mv_path)
 
 
+class TestIncrementalRefresh:
+    ROLLUP_SQL = (
+        "SELECT category, COUNT(*) AS n, SUM(amount) AS total, MIN(amount) AS lo, "
+        "MAX(amount) AS hi, AVG(amount) AS mean FROM mv_source GROUP BY category"
+    )
+
+    def _create(self, mv_data, mv_path, sql=None):
+        create_materialized_view("rollup", sql or self.ROLLUP_SQL, QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+
+    def _view_rows(self, mv_data):
+        engine = QueryEngine(catalog=mv_data, rewrite_matviews=False)
+        return engine.execute("SELECT * FROM mv_rollup ORDER BY category").to_dict(orient="records")
+
+    def _expected_rows(self, mv_data, sql=None):
+        engine = QueryEngine(catalog=mv_data, rewrite_matviews=False)
+        return engine.execute(f"{sql or self.ROLLUP_SQL} ORDER BY category").to_dict(orient="records")
+
+    def test_appends_merged_incrementally(self, mv_data, mv_path):
+        self._create(mv_data, mv_path)
+        insert_rows(mv_data, "default.mv_source", [
+            {"id": 4, "category": "food", "amount": 1.0},
+            {"id": 5, "category": "misc", "amount": 7.0},
+        ])
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "incremental"
+        assert result["rows_read"] == 2
+        assert result["rows_after"] == 3
+        assert self._view_rows(mv_data) == self._expected_rows(mv_data)
+
+    def test_repeated_incremental_refreshes(self, mv_data, mv_path):
+        self._create(mv_data, mv_path)
+        for i in range(3):
+            insert_rows(mv_data, "default.mv_source", [{"id": 10 + i, "category": "travel", "amount": 2.0 * i}])
+            result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+            assert result["mode"] == "incremental"
+        assert self._view_rows(mv_data) == self._expected_rows(mv_data)
+        assert check_materialized_view_freshness("rollup", mv_data, store_path=mv_path)["stale"] is False
+
+    def test_source_changed_outside_engine(self, mv_data, mv_path):
+        engine = QueryEngine(catalog=mv_data)
+        engine.execute("SELECT 1")
+        # Committed after the engine registered its tables: the view doesn't include it yet
+        insert_rows(mv_data, "default.mv_source", [{"id": 4, "category": "food", "amount": 10.0}])
+        create_materialized_view("rollup", self.ROLLUP_SQL, engine, mv_data, store_path=mv_path)
+        insert_rows(mv_data, "default.mv_source", [
+            {"id": 100 + i, "category": "misc", "amount": 1.0} for i in range(100)
+        ])
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "incremental"
+        assert result["rows_read"] == 101
+        assert self._view_rows(mv_data) == self._expected_rows(mv_data)
+
+    def test_delete_falls_back_to_full(self, mv_data, mv_path):
+        self._create(mv_data, mv_path)
+        delete_rows(mv_data, "default.mv_source", "id = 1")
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "full"
+        assert "delete" in result["fallback_reason"]
+        assert self._view_rows(mv_data) == self._expected_rows(mv_data)
+
+    def test_appends_after_full_refresh_are_incremental(self, mv_data, mv_path):
+        self._create(mv_data, mv_path)
+        delete_rows(mv_data, "default.mv_source", "id = 1")
+        refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        insert_rows(mv_data, "default.mv_source", [{"id": 6, "category": "food", "amount": 4.0}])
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "incremental"
+        assert self._view_rows(mv_data) == self._expected_rows(mv_data)
+
+    def test_global_aggregate_with_where(self, mv_data, mv_path):
+        sql = "SELECT COUNT(*) AS n, SUM(amount) AS total FROM mv_source WHERE amount > 15"
+        self._create(mv_data, mv_path, sql)
+        insert_rows(mv_data, "default.mv_source", [
+            {"id": 7, "category": "food", "amount": 100.0},
+            {"id": 8, "category": "food", "amount": 1.0},
+        ])
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "incremental"
+        rows = QueryEngine(catalog=mv_data, rewrite_matviews=False).execute("SELECT * FROM mv_rollup")
+        assert rows.to_dict(orient="records") == [{"n": 3, "total": 150.0}]
+
+    def test_non_aggregate_view_is_full(self, mv_data, mv_path):
+        self._create(mv_data, mv_path, "SELECT * FROM mv_source")
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "full"
+        assert "not a mergeable aggregate" in result["fallback_reason"]
+
+    def test_no_new_data(self, mv_data, mv_path):
+        self._create(mv_data, mv_path)
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "incremental"
+        assert result["rows_read"] == 0
+
+    def test_positional_group_by(self, mv_data, mv_path):
+        sql = "SELECT category, SUM(amount) AS total FROM mv_source GROUP BY 1"
+        self._create(mv_data, mv_path, sql)
+        insert_rows(mv_data, "default.mv_source", [{"id": 4, "category": "misc", "amount": 3.0}])
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        assert result["mode"] == "incremental"
+        assert self._view_rows(mv_data) == self._expected_rows(mv_data, sql)
+
+    def test_date_trunc_key(self, test_catalog, mv_path):
+        sql = "SELECT date_trunc('month', date) AS month, COUNT(*) AS n, SUM(amount) AS total FROM expenses GROUP BY 1"
+        insert_rows(test_catalog, "default.expenses", [
+            {"id": 1, "date": "2024-01-05", "amount": 5.0},
+            {"id": 2, "date": "2024-02-01", "amount": 7.0},
+        ])
+        create_materialized_view("rollup", sql, QueryEngine(catalog=test_catalog), test_catalog, store_path=mv_path)
+        insert_rows(test_catalog, "default.expenses", [
+            {"id": 3, "date": "2024-02-20", "amount": 1.0},
+            {"id": 4, "date": "2024-03-02", "amount": 2.0},
+        ])
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=test_catalog), test_catalog, store_path=mv_path)
+        assert result["mode"] == "incremental", result["fallback_reason"]
+        engine = QueryEngine(catalog=test_catalog, rewrite_matviews=False)
+        assert (
+            engine.execute("SELECT * FROM mv_rollup ORDER BY month").to_dict(orient="records")
+            == engine.execute(f"{sql} ORDER BY month").to_dict(orient="records")
+        )
+
+    def test_full_refresh_keeps_types(self, test_catalog, mv_path):
+        sql = "SELECT date, COUNT(*) AS n FROM expenses GROUP BY date"
+        insert_rows(test_catalog, "default.expenses", [{"id": 1, "date": "2024-01-05", "amount": 5.0}])
+        create_materialized_view("rollup", sql, QueryEngine(catalog=test_catalog), test_catalog, store_path=mv_path)
+        delete_rows(test_catalog, "default.expenses", "id = 1")
+        insert_rows(test_catalog, "default.expenses", [{"id": 2, "date": "2024-01-06", "amount": 5.0}])
+
+        result = refresh_materialized_view("rollup", QueryEngine(catalog=test_catalog), test_catalog, store_path=mv_path)
+        assert result["mode"] == "full"
+        rows = test_catalog.load_table("default.mv_rollup").scan().to_arrow()
+        assert str(rows.schema.field("date").type) == "date32[day]"
+        assert [str(d) for d in rows.column("date").to_pylist()] == ["2024-01-06"]
+
+    def test_incremental_disabled(self, mv_data, mv_path):
+        self._create(mv_data, mv_path)
+        insert_rows(mv_data, "default.mv_source", [{"id": 9, "category": "food", "amount": 1.0}])
+        result = refresh_materialized_view(
+            "rollup", QueryEngine(catalog=mv_data), mv_data, store_path=mv_path, incremental=False,
+        )
+        assert result["mode"] == "full"
+
+
 # --- check_materialized_view_freshness ---
 
 
@@ -239,3 +382,158 @@ class TestStorageFormat:
         assert "created_at" in entry
         assert "last_refreshed" in entry
         assert "source_snapshot_ids" in entry
+
+
+# --- query rewriting ---
+
+
+TOTALS_SQL = "SELECT category, SUM(amount) AS total FROM mv_source GROUP BY category"
+
+
+@pytest.fixture
+def totals_view(mv_data, mv_path):
+    """A materialized view over mv_source, and an engine that can rewrite to it."""
+    create_materialized_view("totals", TOTALS_SQL, QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+    return QueryEngine(catalog=mv_data, matview_store_path=mv_path)
+
+
+class TestQueryRewriting:
+    def test_exact_query_answered_from_view(self, totals_view):
+        df = totals_view.execute(TOTALS_SQL)
+        assert totals_view.last_rewrite["views"] == ["totals"]
+        assert "mv_totals" in totals_view.last_rewrite["sql"]
+        assert sorted(df["total"].tolist()) == [30.0, 30.0]
+        assert totals_view.last_execution["tables"] == ["mv_totals"]
+
+    def test_formatting_and_order_by_ignored(self, totals_view):
+        df = totals_view.execute(
+            "select CATEGORY, sum(amount) as total\n from default.mv_source group by category order by category"
+        )
+        assert totals_view.last_rewrite is not None
+        assert df["category"].tolist() == ["food", "travel"]
+
+    def test_subquery_rewritten(self, totals_view):
+        df = totals_view.execute(f"SELECT category FROM ({TOTALS_SQL}) t WHERE total > 25 ORDER BY category")
+        assert totals_view.last_rewrite["views"] == ["totals"]
+        assert df["category"].tolist() == ["food", "travel"]
+
+    def test_different_query_not_rewritten(self, totals_view):
+        totals_view.execute("SELECT category, SUM(amount) AS total FROM mv_source WHERE id > 1 GROUP BY category")
+        assert totals_view.last_rewrite is None
+
+    def test_order_by_expression_not_rewritten(self, totals_view):
+        totals_view.execute(f"{TOTALS_SQL} ORDER BY SUM(amount)")
+        assert totals_view.last_rewrite is None
+
+    def test_stale_view_not_used(self, totals_view, mv_data):
+        insert_rows(mv_data, "default.mv_source", [{"id": 4, "category": "food", "amount": 5.0}])
+        totals_view.refresh()
+        df = totals_view.execute(TOTALS_SQL)
+        assert totals_view.last_rewrite is None
+        assert sorted(df["total"].tolist()) == [30.0, 35.0]
+
+    def test_disabled(self, mv_data, mv_path, totals_view):
+        engine = QueryEngine(catalog=mv_data, matview_store_path=mv_path, rewrite_matviews=False)
+        engine.execute(TOTALS_SQL)
+        assert engine.last_rewrite is None
+
+    def test_stream_rewritten(self, totals_view):
+        conn, reader = totals_view.execute_stream(TOTALS_SQL)
+        try:
+            assert reader.read_all().num_rows == 2
+        finally:
+            conn.close()
+        assert totals_view.last_rewrite["views"] == ["totals"]
+
+    def test_rewrite_query_requires_snapshot_match(self, totals_view, mv_path):
+        assert rewrite_query(TOTALS_SQL, {"mv_source": -1, "mv_totals": 1}, mv_path)["views"] == []
+
+    def test_view_order_by_kept_on_exact_match(self, mv_data, mv_path):
+        sql = "SELECT category, SUM(amount) AS total FROM mv_source GROUP BY category ORDER BY category DESC"
+        create_materialized_view("ordered", sql, QueryEngine(catalog=mv_data), mv_data, store_path=mv_path)
+        engine = QueryEngine(catalog=mv_data, matview_store_path=mv_path)
+        df = engine.execute(f"SELECT category FROM ({sql}) t")
+        assert engine.last_rewrite["views"] == ["ordered"]
+        assert df["category"].tolist() == ["travel", "food"]
+
+    def test_failed_rewrite_runs_query_as_written(self, totals_view, monkeypatch):
+        monkeypatch.setattr(
+            "lakehouse.matviews.rewrite_query",
+            lambda sql, *args: {"sql": "SELECT * FROM no_such_table", "views": ["totals"], "message": ""},
+        )
+        from lakehouse.queries import read_execution_history
+
+        before = read_execution_history(totals_view.history_dir).num_rows
+        df = totals_view.execute(TOTALS_SQL)
+        assert totals_view.last_rewrite is None
+        assert sorted(df["total"].tolist()) == [30.0, 30.0]
+        # Only the attempt that served the query is recorded
+        history = read_execution_history(totals_view.history_dir)
+        assert history.num_rows == before + 1
+        assert history.column("status").to_pylist()[-1] == "ok"
+
+
+class TestTypedViews:
+    @pytest.fixture
+    def expenses(self, test_catalog):
+        insert_rows(test_catalog, "default.expenses", [
+            {"id": 1, "date": "2024-01-01", "amount": 5.0},
+            {"id": 2, "date": "2024-01-02", "amount": 7.0},
+            {"id": 3, "date": "2024-01-02", "amount": 1.0},
+        ])
+        return test_catalog
+
+    def test_backing_table_keeps_types(self, expenses, mv_path):
+        sql = "SELECT date, COUNT(*) AS n FROM expenses GROUP BY date"
+        create_materialized_view("daily", sql, QueryEngine(catalog=expenses), expenses, store_path=mv_path)
+        types = {f.name: str(f.field_type) for f in expenses.load_table("default.mv_daily").schema().fields}
+        assert types == {"date": "date", "n": "long"}
+
+    def test_date_predicates_over_rewritten_view(self, expenses, mv_path):
+        sql = "SELECT date, COUNT(*) AS n FROM expenses GROUP BY date"
+        create_materialized_view("daily", sql, QueryEngine(catalog=expenses), expenses, store_path=mv_path)
+        engine = QueryEngine(catalog=expenses, matview_store_path=mv_path)
+
+        df = engine.execute(f"SELECT * FROM ({sql}) t WHERE t.date >= DATE '2024-01-02'")
+        assert engine.last_rewrite["views"] == ["daily"]
+        assert df["n"].tolist() == [2]
+        df = engine.execute(f"SELECT t.date + INTERVAL 1 DAY AS next FROM ({sql}) t ORDER BY next")
+        assert engine.last_rewrite["views"] == ["daily"]
+        assert str(df["next"].iloc[0]).startswith("2024-01-02")
+
+    def test_integer_sum_rewritten_with_query_types(self, expenses, mv_path):
+        # SUM over BIGINT is a HUGEINT, stored as a long and cast back on rewrite
+        sql = "SELECT date, SUM(id) AS ids FROM expenses GROUP BY date"
+        create_materialized_view("ids", sql, QueryEngine(catalog=expenses), expenses, store_path=mv_path)
+        engine = QueryEngine(catalog=expenses, matview_store_path=mv_path)
+        expected = engine.execute_raw(f"DESCRIBE {sql}").fetchall()
+        df = engine.execute(f"{sql} ORDER BY date")
+        assert engine.last_rewrite["views"] == ["ids"]
+        assert df["ids"].tolist() == [1, 5]
+        assert engine.execute_raw(f"DESCRIBE {engine.last_rewrite['sql']}").fetchall() == expected
+
+    def test_mismatched_types_not_rewritten(self, expenses, mv_path):
+        from pyiceberg.types import StringType
+
+        sql = "SELECT date, COUNT(*) AS n FROM expenses GROUP BY date"
+        create_materialized_view("daily", sql, QueryEngine(catalog=expenses), expenses, store_path=mv_path)
+        backing = expenses.load_table("default.mv_daily")
+        with backing.update_schema() as update:
+            update.add_column("extra", StringType())
+        engine = QueryEngine(catalog=expenses, matview_store_path=mv_path)
+        engine.execute(sql)
+        assert engine.last_rewrite is None
+
+    def test_stale_engine_view_not_used_for_current_data(self, expenses, mv_path):
+        sql = "SELECT date, COUNT(*) AS n FROM expenses GROUP BY date"
+        stale = QueryEngine(catalog=expenses, matview_store_path=mv_path)
+        stale.execute("SELECT 1")
+        insert_rows(expenses, "default.expenses", [{"id": 4, "date": "2024-01-03", "amount": 2.0}])
+        create_materialized_view("daily", sql, stale, expenses, store_path=mv_path)
+        assert expenses.load_table("default.mv_daily").scan().to_arrow().num_rows == 2
+
+        # Recorded at the snapshot the stale engine read, not the catalog's current one
+        engine = QueryEngine(catalog=expenses, matview_store_path=mv_path)
+        df = engine.execute(sql)
+        assert engine.last_rewrite is None
+        assert len(df) == 3
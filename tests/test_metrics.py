@@ -0,0 +1,134 @@
+"""Tests for the metrics registry and OpenMetrics exporter."""
+
+import urllib.error
+import urllib.request
+
+import pytest
+
+from lakehouse import metrics
+from lakehouse.audit import log_operation
+from lakehouse.metrics import (
+    get_counter,
+    get_metrics,
+    get_metrics_summary,
+    inc,
+    observe,
+    render_openmetrics,
+    reset,
+    serve_metrics,
+    set_gauge,
+)
+from lakehouse.query_cache import cache_query, get_cache_stats, get_cached
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    reset()
+    yield
+    reset()
+
+
+def _family(name):
+    return next(f for f in get_metrics() if f["name"] == name)
+
+
+# --- registry ---
+
+class TestRegistry:
+    def test_counter_labels(self):
+        inc("lakehouse_tool_requests", tool="query")
+        inc("lakehouse_tool_requests", tool="query")
+        inc("lakehouse_tool_requests", tool="list_tables")
+        assert get_counter("lakehouse_tool_requests", tool="query") == 2
+        assert get_counter("lakehouse_tool_requests", tool="missing") == 0
+        assert len(_family("lakehouse_tool_requests")["samples"]) == 2
+
+    def test_histogram_buckets(self):
+        observe("lakehouse_tool_duration_seconds", 0.003, tool="query")
+        observe("lakehouse_tool_duration_seconds", 0.2, tool="query")
+        observe("lakehouse_tool_duration_seconds", 100.0, tool="query")
+        sample = _family("lakehouse_tool_duration_seconds")["samples"][0]
+        assert sample["count"] == 3
+        assert sample["sum"] == pytest.approx(100.203)
+        buckets = dict(sample["buckets"])
+        assert buckets[0.005] == 1
+        assert buckets[0.25] == 2
+        assert buckets[30.0] == 2
+
+    def test_gauge_and_collectors(self):
+        set_gauge("lakehouse_duckdb_memory_bytes", 42)
+        assert _family("lakehouse_duckdb_memory_bytes")["samples"][0]["value"] == 42
+        # Built-in process collector refreshes on every read
+        assert _family("lakehouse_process_max_rss_bytes")["samples"][0]["value"] > 0
+
+    def test_reset_by_label(self):
+        inc("lakehouse_cache_requests", cache="query", result="hit")
+        inc("lakehouse_cache_requests", cache="engine", result="hit")
+        reset("lakehouse_cache_requests", cache="query")
+        assert get_counter("lakehouse_cache_requests", cache="query", result="hit") == 0
+        assert get_counter("lakehouse_cache_requests", cache="engine", result="hit") == 1
+
+
+# --- render_openmetrics ---
+
+class TestRenderOpenMetrics:
+    def test_format(self):
+        inc("lakehouse_commits", operation="insert")
+        observe("lakehouse_tool_duration_seconds", 0.01, tool='we"ird')
+        text = render_openmetrics()
+        assert "# TYPE lakehouse_commits counter" in text
+        assert 'lakehouse_commits_total{operation="insert"} 1' in text
+        assert '# TYPE lakehouse_tool_duration_seconds histogram' in text
+        assert 'lakehouse_tool_duration_seconds_bucket{tool="we\\"ird",le="+Inf"} 1' in text
+        assert 'lakehouse_tool_duration_seconds_count{tool="we\\"ird"} 1' in text
+        assert "# TYPE lakehouse_arrow_allocated_bytes gauge" in text
+        assert text.endswith("# EOF\n")
+
+
+# --- serve_metrics ---
+
+class TestServeMetrics:
+    def test_http_endpoint(self):
+        inc("lakehouse_commits", operation="upsert")
+        httpd = serve_metrics(port=0)
+        try:
+            port = httpd.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+                body = resp.read().decode()
+                assert resp.headers["Content-Type"].startswith("application/openmetrics-text")
+            assert 'lakehouse_commits_total{operation="upsert"} 1' in body
+            with pytest.raises(urllib.error.HTTPError):
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+        finally:
+            httpd.shutdown()
+            httpd.server_close()
+
+
+# --- instrumentation ---
+
+class TestInstrumentation:
+    def test_engine_queries(self, query_engine):
+        query_engine.execute("SELECT * FROM expenses")
+        query_engine.execute("SELECT * FROM expenses")
+        summary = get_metrics_summary()
+        assert summary["queries"] == 2
+        assert summary["caches"]["engine"] == {"hits": 1, "misses": 1, "hit_ratio": 0.5}
+        assert get_counter("lakehouse_queries", method="execute", status="ok") == 2
+
+    def test_audit_counts_commits(self, tmp_path):
+        log_operation("default.expenses", "insert", rows_affected=3, store_path=tmp_path / "audit.log")
+        log_operation("default.expenses", "delete", rows_affected=1, store_path=tmp_path / "audit.log")
+        summary = get_metrics_summary()
+        assert summary["commits"] == {"insert": 1, "delete": 1}
+        assert summary["rows_written"] == 4
+
+    def test_query_cache_uses_registry(self, tmp_path):
+        meta = tmp_path / "cache.json"
+        cache_query("SELECT 1", [{"x": 1}], meta_path=meta)
+        get_cached("SELECT 1", meta_path=meta)
+        get_cached("SELECT 2", meta_path=meta)
+        stats = get_cache_stats(meta_path=meta)
+        assert stats["hits"] == 1 and stats["misses"] == 1
+        assert get_metrics_summary()["caches"]["query"]["hit_ratio"] == 0.5
+        metrics.reset()
+        assert get_cache_stats(meta_path=meta)["hits"] == 0
@@ -0,0 +1,173 @@
+"""Tests for the columnar metrics history and drift detection."""
+
+import datetime
+
+import pytest
+
+from lakehouse import metrics_history
+from lakehouse.catalog import create_table, insert_rows
+from lakehouse.metrics_history import (
+    compact_metrics_history,
+    detect_metric_anomalies,
+    get_metric_series,
+    query_metrics_history,
+    read_metrics_history,
+    record_metrics,
+)
+from lakehouse.quality import compute_quality_score, detect_anomalies
+from lakehouse.stats import compute_table_stats
+
+
+@pytest.fixture
+def history(tmp_path):
+    return tmp_path / "history"
+
+
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def _series(history, values, table="default.t", metric="row_count", column=None, step=datetime.timedelta(days=1)):
+    """Record values ending now, one ``step`` apart."""
+    for i, value in enumerate(values):
+        key = (column, metric) if column else metric
+        record_metrics(table, {key: value}, "stats", recorded_at=NOW - step * (len(values) - 1 - i), history_dir=history)
+
+
+# --- recording ---
+
+
+class TestRecordMetrics:
+    def test_long_format_rows(self, history):
+        written = record_metrics(
+            "default.t", {"row_count": 10, ("a", "null_pct"): 5.0, "skipped": None, "bad": "x"}, "stats",
+            snapshot_id=7, history_dir=history,
+        )
+        assert written == 2
+        rows = read_metrics_history(history).to_pylist()
+        assert {(r["column"], r["metric"], r["value"]) for r in rows} == {(None, "row_count", 10.0), ("a", "null_pct", 5.0)}
+        assert all(r["snapshot_id"] == 7 and r["granularity"] == "raw" for r in rows)
+
+    def test_stats_are_recorded(self, test_catalog, tmp_path, isolated_metrics_history):
+        create_table(test_catalog, "orders", columns={"id": "long", "note": "string"})
+        insert_rows(test_catalog, "default.orders", [{"id": 1, "note": None}, {"id": 2, "note": "x"}])
+        compute_table_stats(test_catalog, "orders", store_path=tmp_path / "stats.json")
+        assert get_metric_series("orders", "row_count")[0]["value"] == 2
+        assert get_metric_series("orders", "null_pct", column="note")[0]["value"] == 50.0
+        assert get_metric_series("orders", "max", column="id")[0]["value"] == 2
+
+    def test_quality_is_recorded(self, test_catalog, tmp_path):
+        create_table(test_catalog, "orders", columns={"id": "long"})
+        insert_rows(test_catalog, "default.orders", [{"id": 1}])
+        score = compute_quality_score(
+            test_catalog, "orders", stats_path=tmp_path / "s.json",
+            validation_path=tmp_path / "v.json", store_path=tmp_path / "q.json",
+        )
+        series = get_metric_series("orders", "overall_score")
+        assert series[0]["value"] == score["overall_score"]
+        assert series[0]["source"] == "quality"
+
+    def test_sql_over_history(self, history):
+        _series(history, [1, 2, 3])
+        df = query_metrics_history("SELECT sum(value) AS total FROM metrics_history", history)
+        assert df["total"][0] == 6
+
+
+# --- retention ---
+
+
+class TestCompaction:
+    def test_downsamples_old_points(self, history, monkeypatch):
+        monkeypatch.setattr(metrics_history, "HISTORY_COMPACT_SEGMENTS", 1000)
+        # Four points a day for 60 days
+        _series(history, [100 + i % 4 for i in range(240)], step=datetime.timedelta(hours=6))
+        result = compact_metrics_history(history, raw_days=10, keep_days=365)
+        assert result["rows_before"] == 240
+        rows = read_metrics_history(history).to_pylist()
+        days = [r for r in rows if r["granularity"] == "day"]
+        raw = [r for r in rows if r["granularity"] == "raw"]
+        assert 40 <= len(days) <= 51 and 38 <= len(raw) <= 42
+        full_day = max(days, key=lambda r: r["samples"])
+        assert full_day["samples"] == 4
+        assert (full_day["min_value"], full_day["max_value"], full_day["value"]) == (100, 103, 101.5)
+        assert len(list(history.glob("*.parquet"))) == 1
+
+    def test_compaction_is_idempotent(self, history):
+        _series(history, list(range(50)))
+        compact_metrics_history(history, raw_days=10)
+        first = read_metrics_history(history).sort_by("recorded_at").to_pylist()
+        compact_metrics_history(history, raw_days=10)
+        assert read_metrics_history(history).sort_by("recorded_at").to_pylist() == first
+
+    def test_expired_points_dropped(self, history):
+        _series(history, list(range(100)))
+        compact_metrics_history(history, raw_days=10, keep_days=30)
+        assert read_metrics_history(history).num_rows <= 31
+
+    def test_compacts_automatically(self, history, monkeypatch):
+        monkeypatch.setattr(metrics_history, "HISTORY_COMPACT_SEGMENTS", 5)
+        _series(history, list(range(12)))
+        assert len(list(history.glob("*.parquet"))) <= 5
+        assert read_metrics_history(history).num_rows == 12
+
+
+# --- detection ---
+
+
+class TestDetectMetricAnomalies:
+    def test_flags_latest_outlier(self, history):
+        _series(history, [1000, 1004, 998, 1001, 1003, 999, 1002, 1000, 997, 1001, 5000])
+        anomalies = detect_metric_anomalies(history_dir=history)
+        assert len(anomalies) == 1
+        assert anomalies[0]["metric"] == "row_count"
+        assert anomalies[0]["severity"] == "critical"
+        assert anomalies[0]["value"] == 5000
+
+    def test_normal_noise_not_flagged(self, history):
+        _series(history, [1000, 1004, 998, 1001, 1003, 999, 1002, 1000, 997, 1001, 1003])
+        assert detect_metric_anomalies(history_dir=history) == []
+
+    def test_all_tables_in_one_pass(self, history):
+        for i in range(20):
+            values = [10.0] * 12
+            if i % 5 == 0:
+                values[-1] = 80.0
+            _series(history, values, table=f"default.t{i}", metric="null_pct", column="c")
+        flagged = {a["table"] for a in detect_metric_anomalies(history_dir=history)}
+        assert flagged == {"default.t0", "default.t5", "default.t10", "default.t15"}
+
+    def test_needs_min_points(self, history):
+        _series(history, [1, 1, 1, 50])
+        assert detect_metric_anomalies(history_dir=history) == []
+
+    def test_since_scores_history(self, history):
+        values = [100.0] * 20
+        values[12] = 900.0
+        _series(history, values)
+        assert detect_metric_anomalies(history_dir=history) == []
+        since = (NOW - datetime.timedelta(days=30)).isoformat()
+        found = detect_metric_anomalies(since=since, history_dir=history)
+        assert [a["value"] for a in found] == [900.0]
+
+    def test_seasonality(self, history):
+        # Hourly points for three weeks where 02:00 is always a quiet hour
+        start = NOW.replace(minute=0, second=0, microsecond=0) - datetime.timedelta(days=21)
+        for h in range(21 * 24 + 1):
+            at = start + datetime.timedelta(hours=h)
+            value = 10.0 if at.hour == 2 else 100.0 + h % 3
+            record_metrics("default.t", {"rows_written": value}, "stats", recorded_at=at, history_dir=history)
+        since = (start + datetime.timedelta(days=14)).isoformat()
+        plain = detect_metric_anomalies(since=since, history_dir=history)
+        seasonal = detect_metric_anomalies(since=since, seasonality="hour_of_day", history_dir=history)
+        assert plain and not seasonal
+
+    def test_unknown_seasonality(self, history):
+        with pytest.raises(ValueError, match="seasonality"):
+            detect_metric_anomalies(seasonality="monthly", history_dir=history)
+
+    def test_detect_anomalies_includes_history(self, test_catalog, tmp_path, isolated_metrics_history):
+        create_table(test_catalog, "orders", columns={"id": "long"})
+        insert_rows(test_catalog, "default.orders", [{"id": 1}, {"id": None}])
+        # Weeks of fully populated ids; the stats computed now record 50% nulls
+        _series(isolated_metrics_history, [0.0] * 10, table="default.orders", metric="null_pct", column="id")
+        anomalies = detect_anomalies(test_catalog, "orders", stats_path=tmp_path / "stats.json")
+        assert any(a["type"] == "metric_outlier" and a["column"] == "id" for a in anomalies)
@@ -1,15 +1,22 @@
 """Tests for event notifications."""
 
 import json
+import threading
+import time
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+from lakehouse import notifications
 from lakehouse.notifications import (
     register_handler,
     list_handlers,
     remove_handler,
     fire_event,
+    flush_notifications,
     get_event_history,
+    list_dead_letters,
+    retry_dead_letters,
     send_test_event,
     VALID_EVENT_TYPES,
     VALID_HANDLER_TYPES,
@@ -115,9 +122,10 @@ class TestFireEvent:
         register_handler("tbl", "write", "log", {"file": log_file}, store_path=store)
         result = fire_event("tbl", "write", {"rows": 10}, store_path=store)
         assert result["handlers_triggered"] == 1
-        assert result["results"][0]["status"] == "success"
+        assert result["results"][0]["status"] == "queued"
+        flush_notifications(store_path=store)
         # Verify log file written
-        assert Path(log_file).exists()
+        assert json.loads(Path(log_file).read_text())["payload"] == {"rows": 10}
 
     def test_fire_no_match(self, store):
         register_handler("tbl", "write", "log", {"file": "/tmp/l.log"}, store_path=store)
@@ -142,7 +150,10 @@ class TestFireEvent:
         register_handler("tbl", "write", "shell", {"command": "echo test"}, store_path=store)
         result = fire_event("tbl", "write", {"rows": 5}, store_path=store)
         assert result["handlers_triggered"] == 1
-        assert result["results"][0]["status"] == "success"
+        flush_notifications(store_path=store)
+        history = get_event_history(store_path=store)
+        assert history[0]["results"][0]["status"] == "delivered"
+        assert history[0]["results"][0]["returncode"] == 0
 
     def test_fire_multiple_handlers(self, store):
         log1 = str(store.parent / "e1.log")
@@ -195,6 +206,142 @@ class TestGetEventHistory:
         assert len(history) == 3
 
 
+# --- delivery queue ---
+
+
+class _Recorder(BaseHTTPRequestHandler):
+    """Local webhook stand-in; behaviour is set on the server object."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server = self.server
+        with server.lock:
+            server.active += 1
+            server.peak = max(server.peak, server.active)
+            server.calls += 1
+            fail = server.calls <= server.fail_first
+        time.sleep(server.delay)
+        with server.lock:
+            server.active -= 1
+            if not fail:
+                server.bodies.append(body)
+        self.send_response(500 if fail else 200)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Recorder)
+    server.lock = threading.Lock()
+    server.active = server.peak = server.calls = server.fail_first = 0
+    server.delay = 0.0
+    server.bodies = []
+    server.url = f"http://127.0.0.1:{server.server_port}/hook"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(notifications, "RETRY_BASE_SECONDS", 0.01)
+
+
+class TestDeliveryQueue:
+    def test_fire_returns_before_slow_webhook(self, store, webhook):
+        webhook.delay = 1.0
+        register_handler("tbl", "write", "webhook", {"url": webhook.url}, store_path=store)
+        started = time.perf_counter()
+        fire_event("tbl", "write", {"rows": 1}, store_path=store)
+        assert time.perf_counter() - started < 0.5
+        result = flush_notifications(store_path=store)
+        assert result["delivered"] == 1
+        assert webhook.bodies[0]["payload"] == {"rows": 1}
+
+    def test_retries_with_backoff_then_delivers(self, store, webhook, fast_retries):
+        webhook.fail_first = 2
+        register_handler("tbl", "write", "webhook", {"url": webhook.url}, store_path=store)
+        fire_event("tbl", "write", {}, store_path=store)
+        flush_notifications(store_path=store)
+        assert webhook.calls == 3
+        entry = get_event_history(store_path=store)[0]["results"][0]
+        assert entry["status"] == "delivered"
+        assert entry["attempts"] == 3
+
+    def test_dead_letter_and_retry(self, store, webhook, fast_retries):
+        webhook.fail_first = 2
+        reg = register_handler(
+            "tbl", "write", "webhook", {"url": webhook.url, "max_attempts": 2}, store_path=store,
+        )
+        fire_event("tbl", "write", {"n": 1}, store_path=store)
+        assert flush_notifications(store_path=store)["dead"] == 1
+        dead = list_dead_letters(store_path=store)
+        assert dead[0]["handler_id"] == reg["handler_id"]
+        assert dead[0]["attempts"] == 2
+        assert "500" in dead[0]["error"]
+
+        assert retry_dead_letters(store_path=store)["requeued"] == 1
+        result = flush_notifications(store_path=store)
+        assert result["delivered"] == 1 and result["dead"] == 0
+        assert webhook.bodies[0]["payload"] == {"n": 1}
+
+    def test_batches_events_per_handler(self, store, webhook):
+        webhook.delay = 0.3
+        register_handler("tbl", "write", "webhook", {"url": webhook.url, "batch_size": 10}, store_path=store)
+        for i in range(5):
+            fire_event("tbl", "write", {"i": i}, store_path=store)
+        flush_notifications(store_path=store)
+        # The first event may go out alone; the rest queue up behind it and share a request
+        assert webhook.calls <= 2
+        received = [e["payload"]["i"] for body in webhook.bodies for e in body["events"]]
+        assert sorted(received) == list(range(5))
+
+    def test_per_handler_concurrency(self, store, webhook):
+        webhook.delay = 0.2
+        register_handler("tbl", "write", "webhook", {"url": webhook.url, "max_concurrency": 2}, store_path=store)
+        for _ in range(6):
+            fire_event("tbl", "write", {}, store_path=store)
+        flush_notifications(store_path=store)
+        assert len(webhook.bodies) == 6
+        assert webhook.peak == 2
+
+    def test_queue_survives_restart(self, store, webhook, monkeypatch):
+        register_handler("tbl", "write", "webhook", {"url": webhook.url}, store_path=store)
+        # Queue without a running dispatcher, as if the process exited right after firing
+        monkeypatch.setattr(notifications, "_wake", lambda queue_path: None)
+        fire_event("tbl", "write", {}, store_path=store)
+        monkeypatch.undo()
+        assert flush_notifications(store_path=store)["delivered"] == 1
+        assert len(webhook.bodies) == 1
+
+    def test_live_claims_left_to_their_owner(self, store, webhook, monkeypatch):
+        register_handler("tbl", "write", "webhook", {"url": webhook.url}, store_path=store)
+        monkeypatch.setattr(notifications, "_wake", lambda queue_path: None)
+        fire_event("tbl", "write", {}, store_path=store)
+        monkeypatch.undo()
+        # Claimed by another process that is still delivering it
+        conn = notifications._connect(notifications._queue_path(store))
+        conn.execute("UPDATE deliveries SET status = 'in_flight', claimed_by = 'other', claimed_at = ?", (time.time(),))
+        conn.close()
+
+        assert flush_notifications(store_path=store, timeout=0.5)["in_flight"] == 1
+        assert webhook.calls == 0
+
+        # Its lease runs out once that process stops renewing it
+        monkeypatch.setattr(notifications, "DELIVERY_LEASE_SECONDS", 0.0)
+        assert flush_notifications(store_path=store)["delivered"] == 1
+        assert webhook.calls == 1
+
+    def test_invalid_delivery_config(self, store):
+        with pytest.raises(ValueError, match="batch_size"):
+            register_handler("tbl", "write", "log", {"file": "/tmp/x.log", "batch_size": 0}, store_path=store)
+
+
 # --- test_handler ---
 
 
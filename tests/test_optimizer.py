@@ -9,6 +9,8 @@ from lakehouse.optimizer import (
     suggest_materializations,
     get_optimization_report,
     estimate_query_cost,
+    check_admission,
+    simulate_layouts,
     _extract_tables_from_sql,
     _extract_filters_from_sql,
     _has_aggregation,
@@ -16,6 +18,8 @@ from lakehouse.optimizer import (
 )
 from lakehouse.queries import add_history_entry
 from lakehouse.catalog import create_table, insert_rows
+from lakehouse.config import set_query_limit
+from lakehouse.stats import compute_table_stats
 
 
 @pytest.fixture
@@ -144,6 +148,95 @@ class TestSuggestPartitions:
                 assert "rationale" in s
 
 
+# --- simulate_layouts ---
+
+
+@pytest.fixture
+def batched_table(test_catalog):
+    """Orders written in four batches (four data files, clustered by id)."""
+    create_table(test_catalog, "orders", columns={"id": "long", "status": "string", "region": "string", "amount": "double"})
+    for batch in range(4):
+        rows = [
+            {"id": i, "status": "active" if i % 4 == 0 else "closed", "region": ["US", "EU", "APAC"][i % 3], "amount": float(i * 10)}
+            for i in range(batch * 10, (batch + 1) * 10)
+        ]
+        insert_rows(test_catalog, "default.orders", rows)
+    return test_catalog
+
+
+class TestSimulateLayouts:
+    def test_no_history(self, batched_table, query_path):
+        result = simulate_layouts(batched_table, "orders", store_path=query_path)
+        assert result["queries_analyzed"] == 0
+        current = [l for l in result["layouts"] if l["is_current"]][0]
+        assert current["file_count"] == 4
+
+    def test_current_layout_uses_manifests(self, batched_table, query_path):
+        add_history_entry("SELECT * FROM orders WHERE id >= 35", 5, 1, store_path=query_path)
+        result = simulate_layouts(batched_table, "orders", partition_candidates=[], sort_candidates=[], store_path=query_path)
+        current = result["layouts"][0]
+        assert current["is_current"] is True
+        assert current["files_scanned"] == 1
+        assert current["queries"][0]["files_scanned"] == 1
+
+    def test_partition_candidate_prunes(self, batched_table, query_path):
+        add_history_entry("SELECT * FROM orders WHERE status = 'active'", 10, 1, store_path=query_path)
+        result = simulate_layouts(
+            batched_table, "orders",
+            partition_candidates=[["identity(status)"]],
+            sort_candidates=[],
+            store_path=query_path,
+        )
+        layouts = {l["name"]: l for l in result["layouts"]}
+        candidate = layouts["partition by identity(status)"]
+        assert candidate["file_count"] == 2
+        assert candidate["files_scanned"] == 1
+        assert candidate["scan_reduction_pct"] > 0
+        assert result["best_layout"] == "partition by identity(status)"
+
+    def test_rewrite_cost(self, batched_table, query_path):
+        add_history_entry("SELECT * FROM orders WHERE region = 'US'", 10, 1, store_path=query_path)
+        result = simulate_layouts(
+            batched_table, "orders",
+            partition_candidates=[["region"]],
+            sort_candidates=[],
+            store_path=query_path,
+        )
+        current = [l for l in result["layouts"] if l["is_current"]][0]
+        candidate = [l for l in result["layouts"] if not l["is_current"]][0]
+        assert current["rewrite_cost"]["bytes_written"] == 0
+        assert candidate["rewrite_cost"]["bytes_read"] == result["total_bytes"]
+        assert candidate["rewrite_cost"]["files_removed"] == 4
+
+    def test_sort_candidate(self, batched_table, query_path):
+        add_history_entry("SELECT * FROM orders WHERE amount > 350", 4, 1, store_path=query_path)
+        result = simulate_layouts(
+            batched_table, "orders",
+            partition_candidates=[],
+            sort_candidates=[["amount"]],
+            target_file_size_bytes=1,
+            store_path=query_path,
+        )
+        candidate = [l for l in result["layouts"] if not l["is_current"]][0]
+        assert candidate["sort_by"] == ["amount"]
+        assert candidate["file_count"] == 40
+        assert candidate["files_scanned"] == 4
+
+    def test_default_candidates(self, batched_table, query_path):
+        add_history_entry("SELECT * FROM orders WHERE status = 'active'", 10, 1, store_path=query_path)
+        result = simulate_layouts(batched_table, "orders", store_path=query_path)
+        names = [l["name"] for l in result["layouts"]]
+        assert "partition by identity(status)" in names
+
+    def test_unknown_column(self, batched_table, query_path):
+        with pytest.raises(ValueError):
+            simulate_layouts(batched_table, "orders", partition_candidates=[["nope"]], store_path=query_path)
+
+    def test_table_not_found(self, test_catalog, query_path):
+        with pytest.raises(ValueError, match="not found"):
+            simulate_layouts(test_catalog, "missing", store_path=query_path)
+
+
 # --- suggest_materializations ---
 
 
@@ -202,3 +295,83 @@ class TestEstimateQueryCost:
         assert result["complexity"] == "complex"
         assert result["has_aggregation"] is True
         assert result["has_join"] is True
+
+    def test_missing_table_does_not_fail(self, opt_table):
+        result = estimate_query_cost(opt_table, "SELECT * FROM no_such_table WHERE x = 1")
+        assert result["total_source_rows"] == 0
+        assert result["files_scanned"] == 0
+
+    def test_manifest_pruning(self, batched_table):
+        result = estimate_query_cost(batched_table, "SELECT * FROM orders WHERE id >= 35")
+        assert result["files_planned"] == 4
+        assert result["files_scanned"] == 1
+        assert result["bytes_scanned"] < sum(t["size_bytes"] for t in result["tables_involved"])
+        assert 1 <= result["estimated_rows_scanned"] <= 10
+
+    def test_range_interpolation(self, batched_table):
+        result = estimate_query_cost(batched_table, "SELECT * FROM orders WHERE amount < 200")
+        # Two of four files are fully below 200, interpolation covers the rest
+        assert 15 <= result["estimated_rows_scanned"] <= 25
+
+    def test_projection_reduces_bytes(self, batched_table):
+        star = estimate_query_cost(batched_table, "SELECT * FROM orders")
+        one_col = estimate_query_cost(batched_table, "SELECT id FROM orders")
+        assert one_col["bytes_scanned"] < star["bytes_scanned"]
+
+    def test_uses_cached_ndv(self, batched_table, tmp_path):
+        stats_path = tmp_path / "stats.json"
+        compute_table_stats(batched_table, "orders", store_path=stats_path)
+        result = estimate_query_cost(batched_table, "SELECT * FROM orders WHERE status = 'active'", store_path=stats_path)
+        # status has 2 distinct values
+        assert result["estimated_rows_scanned"] == 20
+
+    def test_join_fan_out(self, batched_table, tmp_path):
+        stats_path = tmp_path / "stats.json"
+        compute_table_stats(batched_table, "orders", store_path=stats_path)
+        result = estimate_query_cost(
+            batched_table,
+            "SELECT * FROM orders a JOIN orders b ON a.region = b.region",
+            store_path=stats_path,
+        )
+        # 40 * 40 / 3 regions
+        assert result["join_rows"] == 533
+        assert result["join_fan_out"] > 1
+
+    def test_explain_estimates(self, batched_table):
+        result = estimate_query_cost(batched_table, "SELECT * FROM orders")
+        assert result["explain"] is not None
+        assert result["explain"]["output_rows"] == 40
+        assert result["estimated_output_rows"] == 40
+
+    def test_explain_connection_reused(self, batched_table):
+        from lakehouse import optimizer
+
+        estimate_query_cost(batched_table, "SELECT * FROM orders")
+        conn = optimizer._explain_conn
+        estimate_query_cost(batched_table, "SELECT COUNT(*) FROM orders")
+        assert optimizer._explain_conn is conn
+        # Views are dropped after each EXPLAIN
+        assert conn.execute("SELECT COUNT(*) FROM duckdb_views() WHERE NOT internal").fetchone()[0] == 0
+
+
+# --- check_admission ---
+
+
+class TestCheckAdmission:
+    def test_within_limits(self, batched_table, tmp_path):
+        estimate = estimate_query_cost(batched_table, "SELECT * FROM orders")
+        assert check_admission(estimate, config_path=tmp_path / "config.toml") is None
+
+    def test_exceeds_row_limit(self, batched_table, tmp_path):
+        config_path = tmp_path / "config.toml"
+        set_query_limit("max_rows_scanned", 10, config_path=config_path)
+        estimate = estimate_query_cost(batched_table, "SELECT * FROM orders")
+        warning = check_admission(estimate, config_path=config_path)
+        assert warning is not None
+        assert "rows scanned" in warning
+
+    def test_pruned_query_admitted(self, batched_table, tmp_path):
+        config_path = tmp_path / "config.toml"
+        set_query_limit("max_rows_scanned", 15, config_path=config_path)
+        estimate = estimate_query_cost(batched_table, "SELECT * FROM orders WHERE id >= 35")
+        assert check_admission(estimate, config_path=config_path) is None
@@ -174,18 +174,69 @@ class TestRunPipeline:
         assert result["step_results"][1]["rows_affected"] == 2
 
     def test_failure_stops_execution(self, pipe_data, pipe_path):
-        """Step failure stops the pipeline."""
+        """Step failure stops the pipeline and commits nothing."""
         steps = [
             {"sql": "SELECT * FROM nonexistent_table", "target_table": "out"},
             {"sql": "SELECT 1 AS val", "target_table": "out2"},
         ]
         create_pipeline("fail", steps, store_path=pipe_path)
         engine = QueryEngine(catalog=pipe_data)
-        result = run_pipeline("fail", pipe_data, engine, store_path=pipe_path)
+        result = run_pipeline("fail", pipe_data, engine, store_path=pipe_path, max_workers=1)
         assert result["steps_failed"] == 1
         assert result["steps_completed"] == 0
         # Second step should not have run
         assert len(result["step_results"]) == 1
+        assert result["tables_committed"] == []
+        assert "nothing committed" in result["message"]
+
+    def test_failed_commit_reports_committed_targets(self, pipe_data, pipe_path, monkeypatch):
+        """A target whose commit fails does not hide the targets committed before it."""
+        from lakehouse import pipelines
+
+        commit = pipelines._commit_target
+
+        def flaky(catalog, target, *args, **kwargs):
+            if target == "default.second":
+                raise RuntimeError("disk full")
+            return commit(catalog, target, *args, **kwargs)
+
+        monkeypatch.setattr(pipelines, "_commit_target", flaky)
+        steps = [
+            {"sql": "SELECT 1 AS val", "target_table": "first"},
+            {"sql": "SELECT 2 AS val", "target_table": "second"},
+        ]
+        create_pipeline("partial", steps, store_path=pipe_path)
+        result = run_pipeline("partial", pipe_data, QueryEngine(catalog=pipe_data), store_path=pipe_path)
+        assert result["tables_committed"] == ["default.first"]
+        assert "only default.first committed" in result["message"]
+        assert "already committed: default.first" in result["step_results"][1]["error"]
+
+    def test_extra_columns_rejected(self, pipe_data, pipe_path):
+        """A result with columns the existing target lacks fails instead of dropping them."""
+        create_table(pipe_data, "narrow", columns={"id": "long", "category": "string"})
+        create_pipeline(
+            "wide",
+            [{"sql": "SELECT id, category, amount FROM raw_events", "target_table": "narrow", "mode": "append"}],
+            store_path=pipe_path,
+        )
+        result = run_pipeline("wide", pipe_data, QueryEngine(catalog=pipe_data), store_path=pipe_path)
+        assert result["tables_committed"] == []
+        assert "Schema mismatch" in result["step_results"][0]["error"]
+        assert "amount" in result["step_results"][0]["error"]
+        assert pipe_data.load_table("default.narrow").scan().to_arrow().num_rows == 0
+
+    def test_failure_discards_completed_steps(self, pipe_data, pipe_path):
+        """Independent steps that succeeded are not committed when another fails."""
+        steps = [
+            {"sql": "SELECT 1 AS val", "target_table": "out2"},
+            {"sql": "SELECT * FROM out2 JOIN nonexistent_table USING (val)", "target_table": "out3"},
+        ]
+        create_pipeline("partial", steps, store_path=pipe_path)
+        engine = QueryEngine(catalog=pipe_data)
+        result = run_pipeline("partial", pipe_data, engine, store_path=pipe_path)
+        assert [r["status"] for r in result["step_results"]] == ["completed", "error"]
+        assert "default.out2" not in list_tables(pipe_data)
+        assert get_pipeline("partial", store_path=pipe_path)["last_run_status"] == "failed"
 
     def test_updates_last_run(self, pipe_data, pipe_path):
         """Running a pipeline updates last_run metadata."""
@@ -269,6 +320,79 @@ class TestRunPipeline:
         assert result["step_results"][0]["rows_affected"] == 4
 
 
+# --- step DAG ---
+
+
+class TestPipelineDag:
+    def test_dependencies_from_sql(self, pipe_data, pipe_path):
+        """Steps depend on the steps whose targets they read."""
+        steps = [
+            {"sql": "SELECT * FROM raw_events WHERE category = 'food'", "target_table": "food"},
+            {"sql": "SELECT * FROM raw_events WHERE category = 'travel'", "target_table": "travel"},
+            {"sql": "SELECT * FROM food UNION ALL SELECT * FROM travel", "target_table": "combined"},
+        ]
+        create_pipeline("dag", steps, store_path=pipe_path)
+        result = run_pipeline("dag", pipe_data, QueryEngine(catalog=pipe_data), store_path=pipe_path)
+        assert [r["depends_on"] for r in result["step_results"]] == [[], [], [0, 1]]
+        assert result["step_results"][2]["rows_affected"] == 4
+
+    def test_intermediate_results_read_in_memory(self, pipe_data, pipe_path):
+        """A later step sees an earlier step's output before anything is committed."""
+        steps = [
+            {"sql": "SELECT category, SUM(amount) AS total FROM raw_events GROUP BY category", "target_table": "totals"},
+            {"sql": "SELECT MAX(total) AS top FROM default.totals", "target_table": "top_total"},
+        ]
+        create_pipeline("chain", steps, store_path=pipe_path)
+        engine = QueryEngine(catalog=pipe_data)
+        result = run_pipeline("chain", pipe_data, engine, store_path=pipe_path)
+        assert result["steps_failed"] == 0
+        assert set(result["tables_committed"]) == {"default.totals", "default.top_total"}
+        assert engine.execute("SELECT top FROM top_total")["top"].tolist() == [70.0]
+
+    def test_append_then_read(self, pipe_data, pipe_path):
+        """Appends accumulate in memory for later steps and commit once."""
+        steps = [
+            {"sql": "SELECT * FROM raw_events WHERE category = 'food'", "target_table": "acc"},
+            {"sql": "SELECT * FROM raw_events WHERE category = 'travel'", "target_table": "acc", "mode": "append"},
+            {"sql": "SELECT COUNT(*) AS n FROM acc", "target_table": "acc_count"},
+        ]
+        create_pipeline("accumulate", steps, store_path=pipe_path)
+        engine = QueryEngine(catalog=pipe_data)
+        result = run_pipeline("accumulate", pipe_data, engine, store_path=pipe_path)
+        assert [r["depends_on"] for r in result["step_results"]] == [[], [0], [1]]
+        assert engine.execute("SELECT n FROM acc_count")["n"].tolist() == [4]
+        assert len(engine.execute("SELECT * FROM acc")) == 4
+        assert len(pipe_data.load_table("default.acc").metadata.snapshots) == 1
+
+    def test_independent_steps_run_concurrently(self, pipe_data, pipe_path):
+        """Independent steps are submitted together and report timing and size."""
+        steps = [
+            {"sql": f"SELECT * FROM raw_events WHERE id > {i}", "target_table": f"part_{i}"}
+            for i in range(4)
+        ]
+        create_pipeline("fan_out", steps, store_path=pipe_path)
+        result = run_pipeline("fan_out", pipe_data, QueryEngine(catalog=pipe_data), store_path=pipe_path, max_workers=4)
+        assert result["steps_completed"] == 4
+        assert all(r["depends_on"] == [] for r in result["step_results"])
+        assert all(r["output_bytes"] > 0 for r in result["step_results"])
+        assert all("started_ms" in r for r in result["step_results"])
+        assert [r["rows_affected"] for r in result["step_results"]] == [4, 3, 2, 1]
+
+    def test_rewriting_a_source_waits_for_readers(self, pipe_data, pipe_path):
+        """A step overwriting a table runs after the steps that read it."""
+        steps = [
+            {"sql": "SELECT * FROM raw_events", "target_table": "snapshot_copy"},
+            {"sql": "SELECT * FROM raw_events WHERE id = 1", "target_table": "raw_events"},
+        ]
+        create_pipeline("rewrite", steps, store_path=pipe_path)
+        engine = QueryEngine(catalog=pipe_data)
+        result = run_pipeline("rewrite", pipe_data, engine, store_path=pipe_path)
+        assert result["steps_failed"] == 0, result
+        assert result["step_results"][1]["depends_on"] == [0]
+        assert len(engine.execute("SELECT * FROM snapshot_copy")) == 4
+        assert len(engine.execute("SELECT * FROM raw_events")) == 1
+
+
 # --- dry_run ---
 
 
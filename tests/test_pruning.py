@@ -0,0 +1,205 @@
+"""Tests for SQL predicate extraction and manifest-based file pruning."""
+
+import datetime
+
+import pytest
+
+from lakehouse.pruning import (
+    extract_scans,
+    extract_join_keys,
+    extract_join_graph,
+    predicate_columns,
+    scans_for_table,
+    get_file_bounds,
+    file_may_match,
+    prune_files,
+)
+from lakehouse.catalog import create_table, insert_rows
+
+
+def _file(lower, upper, nulls=None, rows=10):
+    return {
+        "file_path": None,
+        "record_count": rows,
+        "file_size_in_bytes": 100,
+        "lower_bounds": lower,
+        "upper_bounds": upper,
+        "null_value_counts": nulls or {},
+        "value_counts": {},
+    }
+
+
+@pytest.fixture
+def pruned_table(test_catalog):
+    """Table written in three batches so each data file covers a distinct id range."""
+    create_table(test_catalog, "events", columns={"id": "long", "kind": "string", "day": "date"})
+    for batch in range(3):
+        rows = [
+            {"id": batch * 10 + i, "kind": "click" if i % 2 else "view", "day": f"2025-0{batch + 1}-15"}
+            for i in range(10)
+        ]
+        insert_rows(test_catalog, "default.events", rows)
+    return test_catalog
+
+
+# --- extract_scans ---
+
+
+class TestExtractScans:
+    def test_simple_filter(self):
+        scans = extract_scans("SELECT * FROM orders WHERE status = 'active'")
+        assert len(scans) == 1
+        assert scans[0]["table"] == "orders"
+        assert scans[0]["filter"] == {"qualifier": None, "column": "status", "op": "=", "value": "active"}
+
+    def test_default_namespace(self):
+        scans = extract_scans("SELECT * FROM default.orders WHERE id > 5")
+        assert scans[0]["table"] == "default.orders"
+        assert scans[0]["filter"]["op"] == ">"
+
+    def test_flipped_comparison(self):
+        scans = extract_scans("SELECT * FROM t WHERE 10 < amount")
+        assert scans[0]["filter"]["op"] == ">"
+        assert scans[0]["filter"]["value"] == 10
+
+    def test_between_in_and_date_cast(self):
+        scans = extract_scans(
+            "SELECT * FROM t WHERE d BETWEEN DATE '2025-01-01' AND DATE '2025-02-01' AND k IN ('a', 'b')"
+        )
+        tree = scans[0]["filter"]
+        assert "and" in tree
+        between, in_list = tree["and"]
+        assert between["value"] == (datetime.date(2025, 1, 1), datetime.date(2025, 2, 1))
+        assert in_list["op"] == "in"
+        assert in_list["value"] == ["a", "b"]
+
+    def test_join_restricts_by_alias(self):
+        scans = extract_scans(
+            "SELECT * FROM orders o JOIN customers c ON o.cid = c.id WHERE o.status = 'x' AND c.region = 'US'"
+        )
+        by_table = {s["table"]: s["filter"] for s in scans}
+        assert by_table["orders"]["column"] == "status"
+        assert by_table["customers"]["column"] == "region"
+
+    def test_or_with_unknown_branch(self):
+        scans = extract_scans("SELECT * FROM t WHERE a = 1 OR lower(b) = 'x'")
+        assert scans[0]["filter"] is None
+
+    def test_cte_names_skipped(self):
+        scans = extract_scans("WITH x AS (SELECT * FROM a WHERE k = 1) SELECT * FROM x")
+        assert [s["table"] for s in scans] == ["a"]
+
+    def test_unparseable(self):
+        assert extract_scans("NOT VALID SQL AT ALL (") is None
+
+    def test_predicate_columns(self):
+        scans = extract_scans("SELECT * FROM t WHERE a = 1 AND (b = 2 OR c > 3)")
+        assert sorted(predicate_columns(scans[0]["filter"])) == ["a", "b", "c"]
+
+    def test_scans_for_table(self):
+        sql = "SELECT * FROM orders o JOIN customers c ON o.id = c.id"
+        assert len(scans_for_table(sql, "default.orders")) == 1
+        assert scans_for_table(sql, "missing") == []
+
+    def test_join_keys(self):
+        keys = extract_join_keys("SELECT * FROM a JOIN b ON a.id = b.aid")
+        assert keys == [{"left": ("a", "id"), "right": ("b", "aid")}]
+
+
+# --- extract_join_graph ---
+
+
+class TestExtractJoinGraph:
+    def test_inner_join_filters_both_sides(self):
+        graph = extract_join_graph("SELECT * FROM users u JOIN orders o ON u.id = o.user_id")
+        assert [s["table"] for s in graph["scans"]] == ["users", "orders"]
+        pairs = {(e["build"], e["build_column"], e["probe"], e["probe_column"]) for e in graph["edges"]}
+        assert pairs == {(0, "id", 1, "user_id"), (1, "user_id", 0, "id")}
+
+    def test_left_join_filters_right_only(self):
+        graph = extract_join_graph("SELECT * FROM users u LEFT JOIN orders o ON o.user_id = u.id")
+        assert [(e["build"], e["probe"]) for e in graph["edges"]] == [(0, 1)]
+        assert graph["scans"][1]["null_supplying"] is True
+        assert graph["scans"][0]["null_supplying"] is False
+
+    def test_where_split_by_qualifier(self):
+        graph = extract_join_graph(
+            "SELECT * FROM users u JOIN orders o ON u.id = o.user_id WHERE u.dept = 'eng' AND amount > 5"
+        )
+        assert graph["scans"][0]["filter"]["column"] == "dept"
+        # Unqualified columns could belong to either table
+        assert graph["scans"][1]["filter"] is None
+
+    def test_full_outer_join_has_no_edges(self):
+        graph = extract_join_graph("SELECT * FROM users u FULL OUTER JOIN orders o ON u.id = o.user_id")
+        assert graph["edges"] == []
+        assert all(s["null_supplying"] for s in graph["scans"])
+
+    def test_non_column_condition_ignored(self):
+        graph = extract_join_graph("SELECT * FROM users u JOIN orders o ON u.id + 1 = o.user_id")
+        assert graph["edges"] == []
+
+    def test_unparseable(self):
+        assert extract_join_graph("SELEC nonsense") is None
+
+
+# --- file_may_match ---
+
+
+class TestFileMayMatch:
+    def test_range(self):
+        f = _file({"x": 10}, {"x": 20})
+        assert file_may_match(f, {"column": "x", "op": "=", "value": 15})
+        assert not file_may_match(f, {"column": "x", "op": "=", "value": 25})
+        assert not file_may_match(f, {"column": "x", "op": "<", "value": 10})
+        assert file_may_match(f, {"column": "x", "op": ">=", "value": 20})
+
+    def test_in_and_between(self):
+        f = _file({"x": 10}, {"x": 20})
+        assert not file_may_match(f, {"column": "x", "op": "in", "value": [1, 30]})
+        assert file_may_match(f, {"column": "x", "op": "between", "value": (18, 40)})
+
+    def test_date_literal_coercion(self):
+        f = _file({"d": datetime.date(2025, 1, 1)}, {"d": datetime.date(2025, 1, 31)})
+        assert not file_may_match(f, {"column": "d", "op": ">", "value": "2025-02-01"})
+
+    def test_nulls(self):
+        f = _file({}, {}, nulls={"x": 0})
+        assert not file_may_match(f, {"column": "x", "op": "is_null", "value": None})
+
+    def test_unknown_column_matches(self):
+        f = _file({"x": 1}, {"x": 2})
+        assert file_may_match(f, {"column": "y", "op": "=", "value": 5})
+
+    def test_or_tree(self):
+        f = _file({"x": 10}, {"x": 20})
+        tree = {"or": [{"column": "x", "op": "=", "value": 1}, {"column": "x", "op": "=", "value": 12}]}
+        assert file_may_match(f, tree)
+
+
+# --- get_file_bounds / prune_files ---
+
+
+class TestManifestPruning:
+    def test_bounds_from_manifests(self, pruned_table):
+        table = pruned_table.load_table("default.events")
+        files = get_file_bounds(table)
+        assert len(files) == 3
+        assert sum(f["record_count"] for f in files) == 30
+        assert all(isinstance(f["lower_bounds"]["day"], datetime.date) for f in files)
+
+    def test_prune_by_id(self, pruned_table):
+        table = pruned_table.load_table("default.events")
+        files = get_file_bounds(table)
+        tree = extract_scans("SELECT * FROM events WHERE id >= 25")[0]["filter"]
+        assert len(prune_files(files, tree)) == 1
+
+    def test_prune_by_date(self, pruned_table):
+        table = pruned_table.load_table("default.events")
+        files = get_file_bounds(table)
+        tree = extract_scans("SELECT * FROM events WHERE day < DATE '2025-02-01'")[0]["filter"]
+        assert len(prune_files(files, tree)) == 1
+
+    def test_empty_table(self, test_catalog):
+        create_table(test_catalog, "empty_t", columns={"id": "long"})
+        assert get_file_bounds(test_catalog.load_table("default.empty_t")) == []
@@ -5,6 +5,7 @@ import pytest
 from pathlib import Path
 
 from lakehouse.quality import (
+    compute_batch_quality,
     compute_quality_score,
     detect_anomalies,
     get_quality_report,
@@ -131,6 +132,26 @@ class TestComputeQualityScore:
         assert "overall_score" in history[0]
 
 
+# --- compute_batch_quality ---
+
+
+class TestComputeBatchQuality:
+    def test_scores_batch_components(self):
+        import pyarrow as pa
+        data = pa.table({"id": [1, 2, 3, 4], "name": ["a", None, "c", "c"]})
+        rules = [{"id": "r1", "type": "not_null", "column": "name"}]
+        score = compute_batch_quality(data, rules)
+        assert score["completeness"] == 87.5
+        assert score["uniqueness"] == 75.0
+        assert score["rule_compliance"] == 75.0
+        assert score["freshness"] == 100.0
+        assert 0 < score["overall_score"] < 100
+
+    def test_empty_batch(self):
+        import pyarrow as pa
+        assert compute_batch_quality(pa.table({"id": pa.array([], pa.int64())}))["overall_score"] == 100.0
+
+
 # --- detect_anomalies ---
 
 
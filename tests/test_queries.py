@@ -15,7 +15,15 @@ from lakehouse.queries import (
     MAX_HISTORY_ENTRIES,
     _load_store,
     _save_store,
+    record_execution,
+    flush_executions,
+    read_execution_history,
+    query_execution_history,
+    compact_execution_history,
+    get_execution_summary,
+    _history_dir,
 )
+from lakehouse.query import QueryEngine
 
 
 @pytest.fixture
@@ -376,3 +384,158 @@ class TestQueryWorkflow:
         history = get_history(store_path=store_path)
         assert len(history) == 3
         assert history[0]["sql"] == "SELECT 3"
+
+
+class TestExecutionHistory:
+    """Test the columnar execution history."""
+
+    def test_record_and_read(self, store_path):
+        history_dir = _history_dir(store_path)
+        record_execution({"sql": "SELECT 1", "method": "execute", "status": "ok", "rows_returned": 1,
+                          "duration_ms": 2.5, "cache_hit": True}, history_dir)
+        table = read_execution_history(history_dir)
+        assert table.num_rows == 1
+        assert table.column("sql").to_pylist() == ["SELECT 1"]
+
+    def test_flush_writes_segment(self, store_path):
+        history_dir = _history_dir(store_path)
+        record_execution({"sql": "SELECT 1"}, history_dir)
+        assert flush_executions(history_dir) == 1
+        assert len(list(history_dir.glob("*.parquet"))) == 1
+        assert flush_executions(history_dir) == 0
+
+    def test_sql_over_history(self, store_path):
+        history_dir = _history_dir(store_path)
+        for i in range(3):
+            record_execution({"sql": f"SELECT {i}", "method": "execute", "duration_ms": float(i)}, history_dir)
+        df = query_execution_history("SELECT max(duration_ms) AS m, count(*) AS n FROM query_history", history_dir)
+        assert df["m"][0] == 2.0
+        assert df["n"][0] == 3
+
+    def test_get_history_merges_executions(self, store_path):
+        add_history_entry("SELECT manual", store_path=store_path)
+        record_execution({"sql": "SELECT recorded", "rows_returned": 4}, _history_dir(store_path))
+        history = get_history(store_path=store_path)
+        assert [h["sql"] for h in history] == ["SELECT recorded", "SELECT manual"]
+        assert history[0]["rows_returned"] == 4
+
+    def test_compaction(self, store_path):
+        history_dir = _history_dir(store_path)
+        for i in range(5):
+            record_execution({"sql": f"SELECT {i}"}, history_dir)
+            flush_executions(history_dir)
+        result = compact_execution_history(history_dir, retain=3)
+        assert result["segments_merged"] == 5
+        assert len(list(history_dir.glob("*.parquet"))) == 1
+        sqls = read_execution_history(history_dir).column("sql").to_pylist()
+        assert sqls == ["SELECT 2", "SELECT 3", "SELECT 4"]
+
+    def test_clear_removes_executions(self, store_path):
+        history_dir = _history_dir(store_path)
+        record_execution({"sql": "SELECT 1"}, history_dir)
+        flush_executions(history_dir)
+        record_execution({"sql": "SELECT 2"}, history_dir)
+        result = clear_history(store_path=store_path)
+        assert result["cleared"] == 2
+        assert get_history(store_path=store_path) == []
+
+    def test_concurrent_compaction_keeps_each_record_once(self, store_path):
+        from concurrent.futures import ThreadPoolExecutor
+
+        history_dir = _history_dir(store_path)
+        for i in range(6):
+            record_execution({"sql": f"SELECT {i}"}, history_dir)
+            flush_executions(history_dir)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(lambda _: compact_execution_history(history_dir), range(4)))
+        sqls = read_execution_history(history_dir).column("sql").to_pylist()
+        assert sorted(sqls) == [f"SELECT {i}" for i in range(6)]
+
+    def test_read_tolerates_vanished_segment(self, store_path, monkeypatch):
+        import lakehouse.queries as queries_mod
+
+        history_dir = _history_dir(store_path)
+        record_execution({"sql": "SELECT 1"}, history_dir)
+        flush_executions(history_dir)
+        listed = queries_mod._segments
+        calls = []
+
+        def stale_listing(path):
+            calls.append(path)
+            segments = listed(path)
+            return segments + [history_dir / "seg-gone.parquet"] if len(calls) == 1 else segments
+
+        monkeypatch.setattr(queries_mod, "_segments", stale_listing)
+        assert read_execution_history(history_dir).column("sql").to_pylist() == ["SELECT 1"]
+
+    def test_summary(self, store_path):
+        history_dir = _history_dir(store_path)
+        record_execution({"sql": "SELECT 1", "duration_ms": 10.0, "status": "ok", "cache_hit": True}, history_dir)
+        record_execution({"sql": "SELECT 1", "duration_ms": 30.0, "status": "error", "cache_hit": False,
+                          "bytes_read": 100}, history_dir)
+        summary = get_execution_summary(store_path=store_path)
+        assert summary["executions"] == 2
+        assert summary["errors"] == 1
+        assert summary["avg_duration_ms"] == 20.0
+        assert summary["bytes_read"] == 100
+        assert summary["cache_hit_ratio"] == 0.5
+        assert summary["costliest"][0]["runs"] == 2
+
+
+class TestEngineRecording:
+    """Test that QueryEngine records executions automatically."""
+
+    def test_execute_recorded(self, test_catalog, tmp_path):
+        history_dir = tmp_path / "history"
+        engine = QueryEngine(catalog=test_catalog, history_dir=history_dir)
+        engine.execute("SELECT * FROM expenses")
+        engine.execute("SELECT count(*) FROM expenses")
+        rows = read_execution_history(history_dir).to_pylist()
+        assert len(rows) == 2
+        first, second = rows
+        assert first["method"] == "execute"
+        assert first["status"] == "ok"
+        assert first["tables"] == ["expenses"]
+        assert first["cache_hit"] is False
+        assert first["catalog_load_ms"] > 0
+        assert second["cache_hit"] is True
+        assert second["files_scanned"] == 0
+        assert second["execute_ms"] > 0
+
+    def test_error_recorded(self, test_catalog, tmp_path):
+        history_dir = tmp_path / "history"
+        engine = QueryEngine(catalog=test_catalog, history_dir=history_dir)
+        with pytest.raises(Exception):
+            engine.execute("SELECT * FROM no_such_table")
+        rows = read_execution_history(history_dir).to_pylist()
+        assert rows[0]["status"] == "error"
+        assert "no_such_table" in rows[0]["error"]
+
+    def test_record_phase(self, test_catalog, tmp_path):
+        history_dir = tmp_path / "history"
+        engine = QueryEngine(catalog=test_catalog, history_dir=history_dir)
+        engine.execute("SELECT 1")
+        engine.record_phase("format_ms", 7.5)
+        rows = read_execution_history(history_dir).to_pylist()
+        assert rows[0]["format_ms"] == 7.5
+
+    def test_internal_queries_kept_out_of_patterns(self, test_catalog, tmp_path):
+        from lakehouse.query import internal_queries
+
+        store_path = tmp_path / "queries.json"
+        engine = QueryEngine(catalog=test_catalog, history_dir=_history_dir(store_path))
+        engine.execute("SELECT count(*) FROM expenses")
+        with internal_queries():
+            engine.execute("SELECT category, sum(amount) FROM expenses GROUP BY category")
+        sources = read_execution_history(_history_dir(store_path)).column("source").to_pylist()
+        assert sources == ["user", "internal"]
+        assert len(get_history(store_path=store_path)) == 2
+        user_history = get_history(store_path=store_path, include_internal=False)
+        assert len(user_history) == 1
+        assert user_history[0]["sql"].startswith("SELECT count(*) FROM expenses")
+
+    def test_recording_disabled(self, test_catalog, tmp_path):
+        history_dir = tmp_path / "history"
+        engine = QueryEngine(catalog=test_catalog, history_dir=history_dir, record_history=False)
+        engine.execute("SELECT 1")
+        assert read_execution_history(history_dir).num_rows == 0
@@ -0,0 +1,77 @@
+"""Tests for snapshot-series queries."""
+
+import pytest
+
+from lakehouse.catalog import delete_rows, get_snapshots, insert_rows, scan_as_of
+from lakehouse.series import query_snapshot_series
+
+
+def _expense(i, category="food"):
+    return {"id": i, "category": category, "amount": float(i), "currency": "USD"}
+
+
+@pytest.fixture
+def history(test_catalog):
+    """Three appends then a delete (which commits a delete and a re-append)."""
+    for batch in range(3):
+        insert_rows(test_catalog, "expenses", [
+            _expense(batch * 10 + i, "food" if i % 2 else "rent") for i in range(10)
+        ])
+    delete_rows(test_catalog, "expenses", "id < 5")
+    return test_catalog
+
+
+# --- query_snapshot_series ---
+
+class TestSnapshotSeries:
+    def test_count_per_snapshot(self, history):
+        result = query_snapshot_series(history, "expenses")
+        assert result["snapshots"] == len(get_snapshots(history, "expenses"))
+        assert [r["row_count"] for r in result["rows"]] == [10, 20, 30, 0, 25]
+        assert result["columns"][:2] == ["snapshot_id", "committed_at"]
+
+    def test_matches_scan_as_of(self, history):
+        result = query_snapshot_series(history, "expenses", select="SUM(amount) AS total")
+        for row in result["rows"]:
+            expected = scan_as_of(history, "expenses", str(row["snapshot_id"])).column("amount").to_pylist()
+            assert (row["total"] or 0) == pytest.approx(sum(expected))
+
+    def test_reads_shared_files_once(self, history):
+        result = query_snapshot_series(history, "expenses")
+        assert result["files_read"] < result["file_references"]
+        assert result["rows_read"] < result["rows_referenced"]
+
+    def test_where_and_group_by(self, history):
+        result = query_snapshot_series(
+            history, "expenses", select="COUNT(*) AS n", where="amount >= 20", group_by="category", last=1,
+        )
+        assert {(r["category"], r["n"]) for r in result["rows"]} == {("food", 5), ("rent", 5)}
+
+    def test_last_and_since(self, history):
+        snaps = get_snapshots(history, "expenses")
+        result = query_snapshot_series(history, "expenses", last=2)
+        assert [r["snapshot_id"] for r in result["rows"]] == [s["snapshot_id"] for s in snaps[-2:]]
+        result = query_snapshot_series(history, "expenses", since=snaps[-1]["timestamp"])
+        assert [r["snapshot_id"] for r in result["rows"]] == [snaps[-1]["snapshot_id"]]
+
+    def test_snapshot_with_no_matching_rows(self, history):
+        result = query_snapshot_series(history, "expenses", select="COUNT(*) AS n", where="id >= 20")
+        assert [r["n"] for r in result["rows"]] == [0, 0, 10, 0, 10]
+
+    def test_empty_group_keeps_null_row(self, history):
+        result = query_snapshot_series(history, "expenses", group_by="category", where="id >= 20", last=2)
+        assert result["rows"][0]["category"] is None
+        assert result["rows"][0]["row_count"] is None
+
+    def test_table_without_snapshots(self, test_catalog):
+        result = query_snapshot_series(test_catalog, "health")
+        assert result["rows"] == []
+        assert result["files_read"] == 0
+
+    def test_invalid_expression(self, history):
+        with pytest.raises(ValueError, match="Invalid series query"):
+            query_snapshot_series(history, "expenses", select="SUM(no_such_column)")
+
+    def test_table_not_found(self, test_catalog):
+        with pytest.raises(ValueError, match="not found"):
+            query_snapshot_series(test_catalog, "nonexistent")
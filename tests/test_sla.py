@@ -172,6 +172,64 @@ class TestCheckSla:
         assert len(result["tables"][0]["recommendations"]) >= 1
 
 
+# --- unchanged tables ---
+
+
+class TestSkipUnchanged:
+    def _check(self, catalog, paths, **kwargs):
+        sla_path, quality_path, stats_path, validation_path = paths
+        return check_sla(
+            catalog, store_path=sla_path, quality_path=quality_path, stats_path=stats_path,
+            validation_path=validation_path, **kwargs,
+        )
+
+    @pytest.fixture
+    def paths(self, sla_path, quality_path, stats_path, validation_path):
+        return sla_path, quality_path, stats_path, validation_path
+
+    def test_passing_table_not_rescanned(self, sla_table, sla_path, paths, monkeypatch):
+        set_sla("metrics", {"max_staleness_hours": 24, "min_row_count": 1, "min_quality_score": 10}, store_path=sla_path)
+        first = self._check(sla_table, paths)
+        assert first["tables"][0]["status"] == "passing"
+        assert first["skipped"] == 0
+
+        import lakehouse.stats
+        monkeypatch.setattr(lakehouse.stats, "compute_table_stats", lambda *a, **k: pytest.fail("rescanned"))
+        second = self._check(sla_table, paths)
+        assert second["tables"][0]["status"] == "passing"
+        assert second["tables"][0]["skipped"] is True
+        assert "not rescanned" in second["message"]
+
+    def test_write_forces_recheck(self, sla_table, sla_path, paths):
+        set_sla("metrics", {"max_null_pct": 10.0}, store_path=sla_path)
+        self._check(sla_table, paths)
+        insert_rows(sla_table, "default.metrics", [{"id": 4, "value": None, "name": None}])
+        result = self._check(sla_table, paths)
+        assert result["skipped"] == 0
+        assert result["tables"][0]["status"] == "violation"
+
+    def test_threshold_change_forces_recheck(self, sla_table, sla_path, paths):
+        set_sla("metrics", {"min_row_count": 1}, store_path=sla_path)
+        self._check(sla_table, paths)
+        set_sla("metrics", {"min_row_count": 1000}, store_path=sla_path)
+        result = self._check(sla_table, paths)
+        assert result["tables"][0]["status"] == "violation"
+
+    def test_full_check_rescans(self, sla_table, sla_path, paths):
+        set_sla("metrics", {"min_row_count": 1}, store_path=sla_path)
+        self._check(sla_table, paths)
+        assert self._check(sla_table, paths, skip_unchanged=False)["skipped"] == 0
+
+    def test_many_tables_in_parallel(self, sla_table, sla_path, paths):
+        for i in range(5):
+            create_table(sla_table, f"t{i}", columns={"id": "long"})
+            insert_rows(sla_table, f"default.t{i}", [{"id": 1}])
+            set_sla(f"t{i}", {"min_row_count": 1}, store_path=sla_path)
+        result = self._check(sla_table, paths, max_workers=4)
+        assert result["total"] == 5 and result["violations"] == 0
+        assert all(len(get_sla_history(f"t{i}", store_path=sla_path)) == 1 for i in range(5))
+
+
 # --- SLA History ---
 
 
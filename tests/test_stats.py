@@ -13,6 +13,7 @@ from lakehouse.stats import (
     is_stats_stale,
     _load_cache,
     _save_cache,
+    HISTOGRAM_BUCKETS,
 )
 from lakehouse.catalog import (
     insert_rows,
@@ -144,6 +145,16 @@ class TestComputeTableStats:
         assert amount_col["max"] == 200.0
         assert amount_col["mean"] is not None
 
+    def test_numeric_histogram(self, test_catalog, stats_table, stats_path):
+        """Numeric columns carry equi-depth histogram boundaries spanning min to max."""
+        stats = compute_table_stats(test_catalog, stats_table, stats_path)
+        histogram = stats["columns"]["amount"]["histogram"]
+        assert len(histogram) == HISTOGRAM_BUCKETS + 1
+        assert histogram[0] == 100.5
+        assert histogram[-1] == 200.0
+        assert histogram == sorted(histogram)
+        assert "histogram" not in stats["columns"]["name"]
+
     def test_persists_to_cache(self, test_catalog, stats_table, stats_path):
         """compute_table_stats saves results to cache file."""
         compute_table_stats(test_catalog, stats_table, stats_path)
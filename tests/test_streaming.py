@@ -0,0 +1,80 @@
+"""Tests for streaming Arrow batches to files and stdout."""
+
+import io
+import json
+
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import pytest
+
+from lakehouse.catalog import insert_rows
+from lakehouse.streaming import format_from_path, write_stream
+
+
+def _reader(rows: int = 25, batch_size: int = 10) -> pa.RecordBatchReader:
+    table = pa.table({"id": list(range(rows)), "name": [f"n{i}" for i in range(rows)]})
+    return pa.RecordBatchReader.from_batches(table.schema, table.to_batches(max_chunksize=batch_size))
+
+
+# --- format_from_path ---
+
+class TestFormatFromPath:
+    def test_known_extensions(self):
+        assert format_from_path("out.parquet") == "parquet"
+        assert format_from_path("out.jsonl") == "ndjson"
+        assert format_from_path("out.arrow") == "arrow"
+
+    def test_unknown_uses_default(self):
+        assert format_from_path("out.txt") == "csv"
+
+
+# --- write_stream ---
+
+class TestWriteStream:
+    def test_csv(self, tmp_path):
+        result = write_stream(_reader(), tmp_path / "out.csv", "csv")
+        assert result["rows"] == 25
+        assert result["batches"] == 3
+        assert pa_csv.read_csv(tmp_path / "out.csv").num_rows == 25
+
+    def test_ndjson(self, tmp_path):
+        write_stream(_reader(), tmp_path / "out.ndjson", "ndjson")
+        lines = (tmp_path / "out.ndjson").read_text().splitlines()
+        assert len(lines) == 25
+        assert json.loads(lines[3]) == {"id": 3, "name": "n3"}
+
+    def test_parquet(self, tmp_path):
+        write_stream(_reader(), tmp_path / "nested" / "out.parquet", "parquet")
+        assert pq.read_table(tmp_path / "nested" / "out.parquet").column("id").to_pylist() == list(range(25))
+
+    def test_arrow_ipc_to_file_object(self):
+        sink = io.BytesIO()
+        result = write_stream(_reader(), sink, "arrow")
+        assert result["output"] is None
+        assert pa.ipc.open_stream(sink.getvalue()).read_all().num_rows == 25
+
+    def test_max_rows(self, tmp_path):
+        result = write_stream(_reader(), tmp_path / "out.csv", "csv", max_rows=12)
+        assert result["rows"] == 12
+        assert pa_csv.read_csv(tmp_path / "out.csv").column("id").to_pylist() == list(range(12))
+
+    def test_empty_result_keeps_schema(self, tmp_path):
+        write_stream(_reader(rows=0), tmp_path / "out.parquet", "parquet")
+        assert pq.read_table(tmp_path / "out.parquet").schema.names == ["id", "name"]
+
+    def test_unsupported_format(self, tmp_path):
+        with pytest.raises(ValueError, match="Unsupported format"):
+            write_stream(_reader(), tmp_path / "out.xml", "xml")
+
+    def test_from_query_engine(self, test_catalog, query_engine, tmp_path):
+        insert_rows(test_catalog, "expenses", [
+            {"id": i, "category": "food", "amount": float(i), "currency": "USD"} for i in range(50)
+        ])
+        conn, reader = query_engine.execute_stream("SELECT id, amount FROM expenses", batch_size=16)
+        try:
+            result = write_stream(reader, tmp_path / "expenses.parquet", "parquet")
+        finally:
+            conn.close()
+        assert result["rows"] == 50
+        assert pq.read_table(tmp_path / "expenses.parquet").num_rows == 50
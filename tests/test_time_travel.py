@@ -4,7 +4,16 @@ import datetime
 import time
 import pytest
 
-from lakehouse.catalog import insert_rows, get_snapshots, scan_as_of
+from lakehouse import catalog as catalog_module
+from lakehouse.catalog import (
+    insert_rows,
+    get_snapshots,
+    scan_as_of,
+    clear_snapshot_cache,
+    get_snapshot_cache_stats,
+)
+from lakehouse.metrics import get_counter, reset
+from lakehouse.query import QueryEngine
 
 
 class TestTimeTravel:
@@ -110,3 +119,84 @@ class TestTimeTravel:
         assert "timestamp" in snap
         assert "operation" in snap
         assert isinstance(snap["snapshot_id"], int)
+
+
+def _snapshot_lookups(result):
+    return get_counter("lakehouse_cache_requests", cache="snapshot_scan", result=result)
+
+
+@pytest.fixture
+def history(test_catalog):
+    """Two commits to expenses with a health commit in between; returns the instants."""
+    clear_snapshot_cache()
+    reset("lakehouse_cache_requests")
+    insert_rows(test_catalog, "expenses", [{"id": 1, "category": "food", "amount": 10.0, "currency": "USD"}])
+    time.sleep(0.01)
+    first = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    time.sleep(0.01)
+    insert_rows(test_catalog, "health", [{"id": 1, "metric_type": "steps", "value": 100.0}])
+    insert_rows(test_catalog, "expenses", [{"id": 2, "category": "rent", "amount": 20.0, "currency": "USD"}])
+    return {"first": first, "first_snapshot": str(get_snapshots(test_catalog, "expenses")[0]["snapshot_id"])}
+
+
+class TestSnapshotScanCache:
+    """Test the snapshot-keyed scan cache behind scan_as_of."""
+
+    def test_repeat_scan_hits_cache(self, test_catalog, history):
+        first = scan_as_of(test_catalog, "expenses", history["first_snapshot"])
+        again = scan_as_of(test_catalog, "expenses", history["first"])
+        assert again is first
+        assert _snapshot_lookups("hit") == 1
+        assert _snapshot_lookups("miss") == 1
+        assert get_snapshot_cache_stats()["entries"] == 1
+
+    def test_lru_bounded_by_bytes(self, test_catalog, history, monkeypatch):
+        first = scan_as_of(test_catalog, "expenses", history["first_snapshot"])
+        monkeypatch.setattr(catalog_module, "MAX_SNAPSHOT_CACHE_BYTES", first.nbytes + 1)
+        latest = str(get_snapshots(test_catalog, "expenses")[-1]["snapshot_id"])
+        scan_as_of(test_catalog, "expenses", latest)
+        stats = get_snapshot_cache_stats()
+        assert stats["entries"] == 1
+        assert stats["bytes"] <= stats["max_bytes"]
+
+
+class TestPinnedQueries:
+    """Test AS OF queries that pin every referenced table to one point in time."""
+
+    def test_execute_as_of_pins_all_tables(self, query_engine, history):
+        sql = "SELECT (SELECT COUNT(*) FROM expenses) AS e, (SELECT COUNT(*) FROM health) AS h"
+        df = query_engine.execute_as_of(sql, None, history["first"])
+        assert df.iloc[0].tolist() == [1, 0]
+
+    def test_execute_as_of_snapshot_id_pins_others_by_time(self, query_engine, history):
+        df = query_engine.execute_as_of(
+            "SELECT e.id, h.id AS hid FROM expenses e LEFT JOIN health h ON e.id = h.id",
+            None, history["first_snapshot"],
+        )
+        assert df["id"].tolist() == [1]
+        assert df["hid"].isna().all()
+
+    def test_execute_as_of_uses_engine_catalog(self, query_engine, history):
+        df = query_engine.execute_as_of("SELECT id FROM expenses", "expenses", history["first"])
+        assert df["id"].tolist() == [1]
+
+    def test_pin_main_engine(self, query_engine, history):
+        query_engine.pin(history["first"])
+        assert query_engine.execute("SELECT id FROM expenses")["id"].tolist() == [1]
+        assert len(query_engine.execute("SELECT * FROM health")) == 0
+        query_engine.pin(None)
+        assert sorted(query_engine.execute("SELECT id FROM expenses")["id"].tolist()) == [1, 2]
+
+    def test_repinning_reads_from_cache(self, test_catalog, history):
+        engine = QueryEngine(catalog=test_catalog, as_of=history["first"])
+        engine.execute("SELECT * FROM expenses")
+        misses = _snapshot_lookups("miss")
+        engine.pin(history["first"])
+        engine.execute("SELECT * FROM expenses")
+        assert _snapshot_lookups("miss") == misses
+        assert _snapshot_lookups("hit") >= 1
+
+    def test_invalid_pin(self, query_engine):
+        query_engine.pin("not-a-time")
+        with pytest.raises(ValueError, match="Invalid as_of"):
+            query_engine.execute("SELECT * FROM expenses")
@@ -0,0 +1,173 @@
+"""Tests for span tracing and profiling."""
+
+import json
+import time
+
+import pytest
+
+from lakehouse import tracing
+from lakehouse.catalog import insert_rows, upsert_rows
+from lakehouse.tracing import (
+    flame_summary,
+    format_flame_summary,
+    profile,
+    span,
+    to_chrome_trace,
+    traced,
+    write_trace,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_tracing():
+    """Start every test with tracing off and no collected spans."""
+    tracing.disable()
+    tracing.clear()
+    yield
+    tracing.disable()
+    tracing.clear()
+
+
+# --- span ---
+
+class TestSpan:
+    def test_noop_when_disabled(self):
+        with span("test.off", rows=1) as s:
+            s.set(more=2)
+        assert tracing.get_spans() == []
+        assert span("a") is span("b")
+
+    def test_records_nested_stack(self):
+        tracing.enable()
+        with span("test.outer"):
+            with span("test.inner", table="t") as s:
+                s.set(rows=3)
+        spans = tracing.get_spans()
+        assert [x["name"] for x in spans] == ["test.inner", "test.outer"]
+        assert spans[0]["stack"] == ("test.outer", "test.inner")
+        assert spans[0]["args"] == {"table": "t", "rows": 3}
+        assert spans[1]["dur_us"] >= spans[0]["dur_us"]
+
+    def test_records_error(self):
+        tracing.enable()
+        with pytest.raises(ValueError):
+            with span("test.fail"):
+                raise ValueError("boom")
+        assert tracing.get_spans()[0]["args"]["error"] == "ValueError"
+
+
+# --- traced ---
+
+class TestTraced:
+    def test_wraps_calls(self):
+        @traced("test.func")
+        def add(a, b):
+            return a + b
+
+        assert add(1, 2) == 3
+        assert tracing.get_spans() == []
+        tracing.enable()
+        assert add(2, 2) == 4
+        assert tracing.get_spans()[0]["name"] == "test.func"
+
+
+# --- profile ---
+
+class TestProfile:
+    def test_collects_block_and_restores_state(self):
+        with span("test.before"):
+            pass
+        with profile() as spans:
+            with span("test.during"):
+                pass
+        assert [s["name"] for s in spans] == ["test.during"]
+        assert not tracing.is_enabled()
+        with span("test.after"):
+            pass
+        assert len(spans) == 1
+
+    def test_concurrent_profiles_are_isolated(self):
+        import threading
+
+        entered = threading.Barrier(2)
+        results = {}
+
+        def work(name):
+            with profile() as spans:
+                entered.wait()
+                with span(f"test.{name}"):
+                    pass
+                entered.wait()
+            results[name] = [s["name"] for s in spans]
+            results[f"{name}_after"] = tracing.is_enabled()
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in ("a", "b")]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results["a"] == ["test.a"]
+        assert results["b"] == ["test.b"]
+        assert not results["a_after"] and not results["b_after"]
+        assert tracing.get_spans() == []
+
+    def test_captures_catalog_instrumentation(self, test_catalog):
+        insert_rows(test_catalog, "expenses", [
+            {"id": 1, "date": "2024-01-01", "amount": 10.0, "category": "food"},
+        ])
+        with profile() as spans:
+            upsert_rows(test_catalog, "expenses", ["id"], [
+                {"id": 1, "date": "2024-01-01", "amount": 12.0, "category": "food"},
+            ])
+        names = {s["name"] for s in spans}
+        assert {"catalog.upsert_rows", "catalog.load_table", "catalog.scan",
+                "catalog.commit", "audit.log_operation"} <= names
+        commit = next(s for s in spans if s["name"] == "catalog.commit")
+        assert commit["stack"][0] == "catalog.upsert_rows"
+        assert commit["args"]["op"] == "overwrite"
+
+    def test_captures_query_engine(self, query_engine):
+        with profile() as spans:
+            query_engine.execute("SELECT COUNT(*) FROM expenses")
+        names = {s["name"] for s in spans}
+        assert {"query.execute", "scan.plan", "scan.read", "duckdb.execute"} <= names
+
+
+# --- export ---
+
+class TestExport:
+    def _spans(self):
+        tracing.enable()
+        with span("test.root"):
+            with span("test.child"):
+                time.sleep(0.002)
+            with span("test.child"):
+                pass
+        return tracing.get_spans()
+
+    def test_chrome_trace(self):
+        trace = to_chrome_trace(self._spans())
+        events = trace["traceEvents"]
+        assert len(events) == 3
+        assert events[0]["name"] == "test.root"
+        assert all(e["ph"] == "X" and e["cat"] == "test" for e in events)
+        assert events[0]["dur"] >= events[1]["dur"]
+
+    def test_write_trace(self, tmp_path):
+        path = write_trace(tmp_path / "trace.json", self._spans())
+        data = json.loads(path.read_text())
+        assert len(data["traceEvents"]) == 3
+
+    def test_flame_summary(self):
+        rows = flame_summary(self._spans())
+        assert [r["path"] for r in rows] == ["test.root", "test.root;test.child"]
+        root, child = rows
+        assert child["calls"] == 2
+        assert child["depth"] == 1
+        assert root["self_ms"] == pytest.approx(root["total_ms"] - child["total_ms"], abs=0.01)
+
+    def test_format_flame_summary(self):
+        text = format_flame_summary(self._spans())
+        assert "test.root" in text
+        assert "  test.child" in text
+        assert format_flame_summary([]) == "No spans recorded."
@@ -8,6 +8,7 @@ from lakehouse.validation import (
     add_validation_rule,
     list_validation_rules,
     remove_validation_rule,
+    validate_arrow,
     validate_rows,
     ValidationError,
     _load_rules,
@@ -287,6 +288,40 @@ class TestValidateEmpty:
         assert result["valid"]
 
 
+class TestValidateArrow:
+    """Test column-wise validation of Arrow batches."""
+
+    def test_counts_violations_per_rule(self):
+        import pyarrow as pa
+        data = pa.table({"id": [1, 2, 2, 4], "code": ["A1", "b2", "C3", None]})
+        rules = [
+            {"id": "r1", "type": "regex", "column": "code", "pattern": "[A-Z]"},
+            {"id": "r2", "type": "unique", "columns": ["id"]},
+            {"id": "r3", "type": "expression", "sql": "id < 4"},
+        ]
+        result = validate_arrow(data, rules)
+        counts = {f["rule_id"]: (f["violation_count"], f["row_indexes"]) for f in result["failures"]}
+        assert counts == {"r1": (1, [1]), "r2": (1, [2]), "r3": (1, [3])}
+
+    def test_matches_validate_rows(self):
+        import pyarrow as pa
+        rows = [{"id": 1, "amount": -5.0}, {"id": None, "amount": 500.0}, {"id": 3, "amount": 50.0}]
+        rules = [
+            {"id": "r1", "type": "not_null", "column": "id"},
+            {"id": "r2", "type": "range", "column": "amount", "min": 0, "max": 100},
+        ]
+        by_row = validate_rows(rows, rules)["failures"]
+        columnar = validate_arrow(pa.Table.from_pylist(rows), rules)["failures"]
+        assert sorted(i for f in columnar for i in f["row_indexes"]) == sorted(f["row_index"] for f in by_row)
+
+    def test_unique_against_existing(self):
+        import pyarrow as pa
+        rules = [{"id": "r1", "type": "unique", "columns": ["id"]}]
+        result = validate_arrow(pa.table({"id": [1, 5]}), rules, existing=pa.table({"id": [5, 6]}))
+        assert result["failures"][0]["row_indexes"] == [1]
+        assert "already exists" in result["failures"][0]["message"]
+
+
 # --- Integration with write operations ---
 
 class TestInsertValidation:
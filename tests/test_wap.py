@@ -0,0 +1,310 @@
+"""Tests for write-audit-publish staging on branches."""
+
+import pytest
+
+from lakehouse.catalog import create_table, execute_batch, import_file, insert_rows, update_rows
+from lakehouse.contracts import create_contract
+from lakehouse.pipelines import create_pipeline, run_pipeline
+from lakehouse.validation import ValidationError, add_validation_rule
+from lakehouse.wap import (
+    STAGING_PREFIX,
+    audit_and_publish,
+    audit_staged,
+    discard_staged,
+    list_staged,
+    publish_staged,
+    stage_branch,
+    staged_changes,
+)
+
+
+@pytest.fixture(autouse=True)
+def rule_stores(tmp_path, monkeypatch):
+    """Keep validation rules and contracts out of the user's home."""
+    monkeypatch.setattr("lakehouse.validation.DEFAULT_VALIDATION_PATH", tmp_path / "validation.json")
+    monkeypatch.setattr("lakehouse.contracts.DEFAULT_CONTRACTS_PATH", tmp_path / "contracts.json")
+
+
+@pytest.fixture
+def orders(test_catalog):
+    create_table(test_catalog, "orders", columns={"id": "long", "status": "string", "amount": "double"})
+    insert_rows(test_catalog, "orders", [
+        {"id": 1, "status": "open", "amount": 10.0},
+        {"id": 2, "status": "closed", "amount": 20.0},
+    ])
+    return test_catalog
+
+
+def _ids(catalog, table_name="default.orders", branch=None):
+    scan = catalog.load_table(table_name).scan()
+    if branch:
+        scan = scan.use_ref(branch)
+    return sorted(scan.to_arrow().column("id").to_pylist())
+
+
+# --- staging ---
+
+
+class TestStaging:
+    def test_staged_rows_are_invisible_on_main(self, orders):
+        branch = stage_branch(orders, "orders")
+        assert branch.startswith(STAGING_PREFIX)
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+
+        assert _ids(orders) == [1, 2]
+        assert _ids(orders, branch=branch) == [1, 2, 3]
+
+    def test_staged_changes_counts_only_new_files(self, orders):
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+
+        changes = staged_changes(orders, "orders", branch)
+        assert changes["files"] == 1
+        assert changes["rows"] == 1
+        assert changes["files_retained"] == 1
+        assert changes["main_moved"] is False
+        assert [c["branch"] for c in list_staged(orders, "orders")] == [branch]
+
+    def test_stage_empty_table(self, test_catalog):
+        create_table(test_catalog, "fresh", columns={"id": "long"})
+        branch = stage_branch(test_catalog, "fresh")
+        insert_rows(test_catalog, "fresh", [{"id": 1}], branch=branch)
+        assert _ids(test_catalog, "default.fresh") == []
+        assert _ids(test_catalog, "default.fresh", branch) == [1]
+
+    def test_update_on_missing_branch(self, orders):
+        with pytest.raises(ValueError, match="not found"):
+            update_rows(orders, "orders", "id = 1", {"amount": 1.0}, branch="wap_missing")
+
+
+# --- audit ---
+
+
+class TestAudit:
+    def test_clean_batch_passes(self, orders):
+        add_validation_rule("default.orders", {"type": "not_null", "column": "status"})
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+
+        audit = audit_staged(orders, "orders", branch)
+        assert audit["passed"] is True
+        assert audit["files"] == 1
+        assert audit["rows"] == 1
+
+    def test_validation_rules_checked_on_staged_rows(self, orders):
+        add_validation_rule("default.orders", {"type": "range", "column": "amount", "min": 0})
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [
+            {"id": 3, "status": "open", "amount": -1.0},
+            {"id": 4, "status": "open", "amount": -2.0},
+        ], branch=branch)
+
+        audit = audit_staged(orders, "orders", branch)
+        assert audit["passed"] is False
+        failure = audit["validation"]["failures"][0]
+        assert failure["violation_count"] == 2
+        assert failure["row_indexes"] == [0, 1]
+
+    def test_unique_checked_against_retained_files(self, orders):
+        add_validation_rule("default.orders", {"type": "unique", "columns": ["id"]})
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 2, "status": "open", "amount": 5.0}], branch=branch)
+
+        audit = audit_staged(orders, "orders", branch)
+        assert audit["passed"] is False
+        assert "already exists" in audit["failures"][0]["message"]
+
+    def test_unique_checked_against_main_when_it_moved(self, orders):
+        add_validation_rule("default.orders", {"type": "unique", "columns": ["id"]})
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+        insert_rows(orders, "orders", [{"id": 3, "status": "closed", "amount": 6.0}])
+
+        audit = audit_staged(orders, "orders", branch)
+        assert audit["passed"] is False
+        assert "already exists" in audit["failures"][0]["message"]
+
+    def test_contract_constraints(self, orders):
+        create_contract("orders", {"constraints": [
+            {"column": "status", "rule": "enum", "values": ["open", "closed"]},
+        ]})
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "lost", "amount": 5.0}], branch=branch)
+
+        audit = audit_staged(orders, "orders", branch)
+        assert [f["check"] for f in audit["failures"]] == ["contract"]
+
+    def test_quality_threshold(self, orders):
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [
+            {"id": 3, "status": None, "amount": None},
+            {"id": 3, "status": None, "amount": None},
+        ], branch=branch)
+
+        assert audit_staged(orders, "orders", branch)["quality"] is None
+        audit = audit_staged(orders, "orders", branch, min_quality=90)
+        assert audit["quality"]["passing"] is False
+        assert audit["failures"][0]["check"] == "quality"
+
+
+# --- publish ---
+
+
+class TestPublish:
+    def test_fast_forward_reuses_staged_snapshot(self, orders):
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+        head = orders.load_table("default.orders").metadata.snapshot_by_name(branch).snapshot_id
+
+        result = publish_staged(orders, "orders", branch)
+        assert result["mode"] == "fast_forward"
+        table = orders.load_table("default.orders")
+        assert table.current_snapshot().snapshot_id == head
+        assert branch not in table.metadata.refs
+        assert _ids(orders) == [1, 2, 3]
+
+    def test_appends_cherry_picked_when_main_moved(self, orders):
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+        insert_rows(orders, "orders", [{"id": 4, "status": "open", "amount": 6.0}])
+
+        result = publish_staged(orders, "orders", branch)
+        assert result["mode"] == "cherry_pick"
+        assert _ids(orders) == [1, 2, 3, 4]
+
+    def test_rewrite_refused_when_main_moved(self, orders):
+        branch = stage_branch(orders, "orders")
+        update_rows(orders, "orders", "id = 1", {"amount": 99.0}, branch=branch)
+        insert_rows(orders, "orders", [{"id": 4, "status": "open", "amount": 6.0}])
+
+        with pytest.raises(ValueError, match="main has moved"):
+            publish_staged(orders, "orders", branch)
+
+    def test_discard(self, orders):
+        branch = stage_branch(orders, "orders")
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=branch)
+        discard_staged(orders, "orders", branch)
+        assert list_staged(orders, "orders") == []
+        assert _ids(orders) == [1, 2]
+
+    def test_failed_audit_publishes_nothing(self, orders, test_catalog):
+        add_validation_rule("default.orders", {"type": "not_null", "column": "status"})
+        create_table(test_catalog, "events", columns={"id": "long"})
+        staged = {"default.orders": stage_branch(orders, "orders"), "default.events": stage_branch(orders, "events")}
+        insert_rows(orders, "orders", [{"id": 3, "status": None, "amount": 5.0}], branch=staged["default.orders"])
+        insert_rows(orders, "events", [{"id": 1}], branch=staged["default.events"])
+
+        outcome = audit_and_publish(orders, staged)
+        assert outcome["published"] is False
+        assert outcome["failures"][0]["table"] == "default.orders"
+        assert _ids(orders, "default.events") == []
+        assert list_staged(orders, "events") == []
+
+
+    def test_unpublishable_table_publishes_nothing(self, orders, test_catalog):
+        create_table(test_catalog, "events", columns={"id": "long"})
+        staged = {"default.events": stage_branch(orders, "events"), "default.orders": stage_branch(orders, "orders")}
+        insert_rows(orders, "events", [{"id": 1}], branch=staged["default.events"])
+        update_rows(orders, "orders", "id = 1", {"amount": 99.0}, branch=staged["default.orders"])
+        insert_rows(orders, "orders", [{"id": 4, "status": "open", "amount": 6.0}])
+
+        outcome = audit_and_publish(orders, staged)
+        assert outcome["published"] is False
+        assert outcome["publishes"] == {}
+        assert outcome["failures"][0]["check"] == "publish"
+        assert _ids(orders, "default.events") == []
+        assert list_staged(orders, "events") == []
+
+    def test_failed_publish_reports_published_tables(self, orders, test_catalog, monkeypatch):
+        from lakehouse import wap
+
+        create_table(test_catalog, "events", columns={"id": "long"})
+        staged = {"default.events": stage_branch(orders, "events"), "default.orders": stage_branch(orders, "orders")}
+        insert_rows(orders, "events", [{"id": 1}], branch=staged["default.events"])
+        insert_rows(orders, "orders", [{"id": 3, "status": "open", "amount": 5.0}], branch=staged["default.orders"])
+        publish = wap.publish_staged
+
+        def flaky(catalog, table_name, branch):
+            if table_name == "default.orders":
+                raise RuntimeError("commit conflict")
+            return publish(catalog, table_name, branch)
+
+        monkeypatch.setattr(wap, "publish_staged", flaky)
+        outcome = audit_and_publish(orders, staged)
+        assert outcome["published"] is False
+        assert list(outcome["publishes"]) == ["default.events"]
+        assert "published only default.events" in outcome["message"]
+        assert _ids(orders) == [1, 2]
+        assert list_staged(orders, "orders") == []
+
+
+# --- writers in WAP mode ---
+
+
+class TestWapWriters:
+    def test_batch_published(self, orders):
+        add_validation_rule("default.orders", {"type": "unique", "columns": ["id"]})
+        results = execute_batch(orders, [
+            {"action": "insert", "table_name": "orders", "rows": [{"id": 3, "status": "open", "amount": 5.0}]},
+            {"action": "delete", "table_name": "orders", "filter": "id = 1"},
+        ], wap=True)
+        assert [r["status"] for r in results] == ["ok", "ok"]
+        assert all(r["published"] for r in results)
+        assert _ids(orders) == [2, 3]
+        assert list_staged(orders, "orders") == []
+
+    def test_batch_audit_failure_rolls_back(self, orders):
+        add_validation_rule("default.orders", {"type": "unique", "columns": ["id"]})
+        results = execute_batch(orders, [
+            {"action": "delete", "table_name": "orders", "filter": "id = 1"},
+            {"action": "insert", "table_name": "orders", "rows": [{"id": 2, "status": "open", "amount": 5.0}]},
+        ], wap=True)
+        assert [r["status"] for r in results] == ["error", "error"]
+        assert "Audit failed" in results[1]["message"]
+        assert _ids(orders) == [1, 2]
+
+    def test_batch_error_rolls_back_earlier_operations(self, orders):
+        results = execute_batch(orders, [
+            {"action": "insert", "table_name": "orders", "rows": [{"id": 3, "status": "open", "amount": 5.0}]},
+            {"action": "delete", "table_name": "missing_table", "filter": "id = 1"},
+        ], wap=True)
+        assert [r["status"] for r in results] == ["rolled_back", "error"]
+        assert _ids(orders) == [1, 2]
+        assert list_staged(orders, "orders") == []
+
+    def test_import_published(self, orders, tmp_path):
+        csv_file = tmp_path / "more.csv"
+        csv_file.write_text("id,status,amount\n3,open,5.0\n")
+        result = import_file(orders, csv_file, "orders", if_exists="append", wap=True)
+        assert "PASS" in result["audit"]
+        assert _ids(orders) == [1, 2, 3]
+
+    def test_import_rejected_drops_new_table(self, test_catalog, tmp_path):
+        add_validation_rule("default.people", {"type": "range", "column": "age", "min": 0})
+        csv_file = tmp_path / "people.csv"
+        csv_file.write_text("id,age\n1,30\n2,-4\n")
+        with pytest.raises(ValidationError, match="below minimum"):
+            import_file(test_catalog, csv_file, "people", wap=True)
+        with pytest.raises(Exception):
+            test_catalog.load_table("default.people")
+
+    def test_pipeline_published(self, orders, tmp_path):
+        store = tmp_path / "pipelines.json"
+        create_pipeline("totals", [
+            {"sql": "SELECT status, SUM(amount) AS total FROM orders GROUP BY status", "target_table": "totals"},
+        ], store_path=store)
+        result = run_pipeline("totals", orders, None, store_path=store, wap=True)
+        assert result["tables_committed"] == ["default.totals"]
+        assert orders.load_table("default.totals").scan().to_arrow().num_rows == 2
+        assert list_staged(orders, "totals") == []
+
+    def test_pipeline_audit_failure_commits_nothing(self, orders, tmp_path):
+        store = tmp_path / "pipelines.json"
+        add_validation_rule("default.orders", {"type": "range", "column": "amount", "max": 15})
+        create_pipeline("double", [
+            {"sql": "SELECT id, status, amount * 2 AS amount FROM orders", "target_table": "orders"},
+        ], store_path=store)
+        result = run_pipeline("double", orders, None, store_path=store, wap=True)
+        assert result["tables_committed"] == []
+        assert "Audit of default.orders failed" in result["step_results"][0]["error"]
+        assert orders.load_table("default.orders").scan().to_arrow().column("amount").to_pylist() == [10.0, 20.0]